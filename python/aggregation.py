@@ -0,0 +1,466 @@
+"""
+Streaming operator aggregation for Polish mobile numbers
+Counts numbers per operator, 2-digit prefix and M2M split without keeping per-number results
+
+Usage:
+    python stream_classifier.py numbers.txt --aggregate --distinct hll -o shard-1.json
+    python aggregation.py merge shard-1.json shard-2.json -o total.json
+
+Counters take memory proportional to the number of operators; exact distinct
+counts add one set entry per distinct number, HyperLogLog distinct counts a
+fixed 2**precision bytes per operator. Aggregates merge, so shards counted in
+separate processes combine into the same result as one pass over all input.
+"""
+
+import base64
+import math
+import sys
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from normalization import normalize_many
+
+
+AGGREGATE_FORMAT = 'pl-operator-aggregate'
+AGGREGATE_VERSION = 1
+DISTINCT_MODES = ('exact', 'hll')
+UNMATCHED = 'Unknown'
+DEFAULT_PRECISION = 14
+MASK64 = (1 << 64) - 1
+
+
+def mix64(value: int) -> int:
+    """
+    SplitMix64 finalizer: spread a number's bits over a 64-bit hash.
+
+    Unlike hash(), the result is the same in every process, so HyperLogLog
+    sketches built by different shards can be merged.
+    """
+    value = (value + 0x9E3779B97F4A7C15) & MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count sketch over integers.
+
+    2**precision one-byte registers; the standard error is about
+    1.04 / sqrt(2**precision), 0.8% at the default precision of 14 (16 KB).
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: Optional[bytearray] = None):
+        """
+        Args:
+            precision: Bits of the hash used to pick a register (4 to 18)
+            registers: Existing registers, e.g. from a serialized sketch
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError('precision must be between 4 and 18')
+        self.precision = precision
+        self.registers = registers if registers is not None else bytearray(1 << precision)
+        if len(self.registers) != 1 << precision:
+            raise ValueError(f'Expected {1 << precision} registers, got {len(self.registers)}')
+
+    def add(self, value: int) -> None:
+        """Add an integer to the sketch."""
+        hashed = mix64(value)
+        width = 64 - self.precision
+        rest = hashed & ((1 << width) - 1)
+        rank = width - rest.bit_length() + 1
+        index = hashed >> width
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def add_array(self, values) -> None:
+        """Add a NumPy integer array to the sketch, hashing exactly like add()."""
+        import numpy as np
+
+        hashed = values.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        hashed = (hashed ^ (hashed >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        hashed = (hashed ^ (hashed >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        hashed ^= hashed >> np.uint64(31)
+        width = 64 - self.precision
+        rest = hashed & np.uint64((1 << width) - 1)
+        # rest has up to 60 bits, more than float64 holds exactly, so take
+        # bit_length from its 32-bit halves: frexp is exact on each of them
+        high = np.frexp((rest >> np.uint64(32)).astype(np.float64))[1]
+        low = np.frexp((rest & np.uint64(0xFFFFFFFF)).astype(np.float64))[1]
+        rank = (width + 1 - np.where(high > 0, high + 32, low)).astype(np.uint8)
+        index = (hashed >> np.uint64(width)).astype(np.intp)
+        np.maximum.at(np.frombuffer(self.registers, dtype=np.uint8), index, rank)
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        """Fold another sketch of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError('Cannot merge HyperLogLog sketches of different precision')
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        """Estimated number of distinct values added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # linear counting for small cardinalities
+        return round(estimate)
+
+
+class OperatorAggregate:
+    """
+    Mergeable counters over classified numbers.
+
+    Counts rows, valid numbers, valid numbers per main operator, per detailed
+    operator (UNMATCHED when no prefix matches), per 2-digit prefix and per
+    M2M/non-M2M split, and optionally distinct numbers per detailed operator.
+    """
+
+    def __init__(self, distinct: Optional[str] = None, precision: int = DEFAULT_PRECISION):
+        """
+        Args:
+            distinct: None, 'exact' (sets of numbers) or 'hll' (HyperLogLog sketches)
+            precision: HyperLogLog precision when distinct is 'hll'
+        """
+        if distinct not in (None,) + DISTINCT_MODES:
+            raise ValueError(f'distinct must be one of {", ".join(DISTINCT_MODES)} or None')
+        self.distinct = distinct
+        self.precision = precision
+        self.rows = 0
+        self.valid = 0
+        self.m2m = 0
+        self.operators: Dict[str, int] = {}
+        self.detailed_operators: Dict[str, int] = {}
+        self.prefixes: Dict[str, int] = {}
+        self._distinct: Dict[str, Any] = {}
+
+    @property
+    def invalid(self) -> int:
+        """Rows that are not valid Polish mobile numbers."""
+        return self.rows - self.valid
+
+    @property
+    def non_m2m(self) -> int:
+        """Valid numbers outside the M2M prefixes."""
+        return self.valid - self.m2m
+
+    def _distinct_for(self, operator: str):
+        """The set or sketch collecting distinct numbers of an operator."""
+        collector = self._distinct.get(operator)
+        if collector is None:
+            collector = set() if self.distinct == 'exact' else HyperLogLog(self.precision)
+            self._distinct[operator] = collector
+        return collector
+
+    def add(self, result: Mapping[str, Any]) -> None:
+        """
+        Count one recognize_operator result or RecognitionResult.
+
+        Args:
+            result: Classification of one number
+        """
+        self.rows += 1
+        if not result['success']:
+            return
+        self.valid += 1
+        operator = result['operator']
+        self.operators[operator] = self.operators.get(operator, 0) + 1
+        detailed = result['detailed_operator'] or UNMATCHED
+        self.detailed_operators[detailed] = self.detailed_operators.get(detailed, 0) + 1
+        prefix = result['prefix']
+        self.prefixes[prefix] = self.prefixes.get(prefix, 0) + 1
+        if result['is_m2m']:
+            self.m2m += 1
+        if self.distinct is not None:
+            self._distinct_for(detailed).add(int(result['normalized']))
+
+    def _add_recognition(self, result) -> None:
+        """add() for RecognitionResult objects, reading attributes instead of mapping keys."""
+        self.rows += 1
+        if not result.success:
+            return
+        self.valid += 1
+        operators = self.operators
+        operators[result.operator] = operators.get(result.operator, 0) + 1
+        detailed = result.detailed_operator or UNMATCHED
+        self.detailed_operators[detailed] = self.detailed_operators.get(detailed, 0) + 1
+        prefix = result.normalized[:2]
+        self.prefixes[prefix] = self.prefixes.get(prefix, 0) + 1
+        if result.is_m2m:
+            self.m2m += 1
+        if self.distinct is not None:
+            self._distinct_for(detailed).add(int(result.normalized))
+
+    def add_classification(self, batch) -> None:
+        """
+        Count a BatchClassification from batch_classify with array operations.
+
+        Args:
+            batch: Result of PolishMobileValidator.batch_classify
+        """
+        import numpy as np
+
+        valid = batch.valid
+        self.rows += len(valid)
+        count = int(np.count_nonzero(valid))
+        if not count:
+            return
+        self.valid += count
+        self.m2m += int(np.count_nonzero(batch.is_m2m & valid))
+
+        for code, total in enumerate(np.bincount(batch.operator[valid]).tolist()):
+            if total:
+                name = batch.operator_names[code]
+                self.operators[name] = self.operators.get(name, 0) + total
+        numbers = batch.normalized[valid]
+        for prefix, total in enumerate(np.bincount(numbers // 10 ** 7, minlength=100).tolist()):
+            if total:
+                key = f'{prefix:02d}'
+                self.prefixes[key] = self.prefixes.get(key, 0) + total
+
+        codes = batch.detailed_operator[valid]
+        for code, total in enumerate(np.bincount(codes).tolist()):
+            if not total:
+                continue
+            name = batch.detailed_operator_names[code] or UNMATCHED
+            self.detailed_operators[name] = self.detailed_operators.get(name, 0) + total
+            if self.distinct == 'exact':
+                self._distinct_for(name).update(numbers[codes == code].tolist())
+            elif self.distinct == 'hll':
+                self._distinct_for(name).add_array(numbers[codes == code])
+
+    def add_numbers(self, validator, phone_numbers: Iterable[str]) -> None:
+        """
+        Classify and count raw phone numbers.
+
+        Uses batch_classify when NumPy is installed and recognize otherwise;
+        both count the same way.
+
+        Args:
+            validator: PolishMobileValidator used for classification
+            phone_numbers: Raw phone numbers
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        if np is None:
+            for phone_number in phone_numbers:
+                self._add_recognition(validator.recognize(phone_number))
+            return
+
+        phone_numbers = list(phone_numbers)
+        national = []
+        for phone_number, normalized in zip(phone_numbers, normalize_many(phone_numbers)):
+            if len(normalized) != 9:
+                national.append(-1)
+            elif normalized.isascii():
+                national.append(int(normalized))
+            else:
+                self._add_recognition(validator.recognize(phone_number))  # Unicode digits keep scalar semantics
+        self.add_classification(validator.batch_classify(np.array(national, dtype=np.int64)))
+
+    def distinct_counts(self) -> Dict[str, int]:
+        """
+        Distinct numbers per detailed operator (estimated when distinct is 'hll').
+
+        Returns:
+            Mapping of operator names to distinct counts, largest first
+        """
+        if self.distinct is None:
+            raise ValueError('Distinct counting was not enabled for this aggregate')
+        counts = {
+            operator: len(collector) if self.distinct == 'exact' else collector.count()
+            for operator, collector in self._distinct.items()
+        }
+        return _sorted_counts(counts)
+
+    def merge(self, other: 'OperatorAggregate') -> 'OperatorAggregate':
+        """
+        Fold another aggregate, e.g. from another shard, into this one.
+
+        Args:
+            other: Aggregate with the same distinct mode and precision
+
+        Returns:
+            This aggregate
+        """
+        if (other.distinct, other.precision if other.distinct == 'hll' else None) != \
+                (self.distinct, self.precision if self.distinct == 'hll' else None):
+            raise ValueError('Cannot merge aggregates with different distinct counting settings')
+        self.rows += other.rows
+        self.valid += other.valid
+        self.m2m += other.m2m
+        for mine, theirs in ((self.operators, other.operators),
+                             (self.detailed_operators, other.detailed_operators),
+                             (self.prefixes, other.prefixes)):
+            for key, total in theirs.items():
+                mine[key] = mine.get(key, 0) + total
+        for operator, collector in other._distinct.items():
+            if self.distinct == 'exact':
+                self._distinct_for(operator).update(collector)
+            else:
+                self._distinct_for(operator).merge(collector)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Export the aggregate as JSON-compatible data.
+
+        Returns:
+            Dictionary that from_dict turns back into an equal aggregate
+        """
+        data = {
+            'format': AGGREGATE_FORMAT,
+            'version': AGGREGATE_VERSION,
+            'rows': self.rows,
+            'valid': self.valid,
+            'invalid': self.invalid,
+            'm2m': self.m2m,
+            'non_m2m': self.non_m2m,
+            'operators': _sorted_counts(self.operators),
+            'detailed_operators': _sorted_counts(self.detailed_operators),
+            'prefixes': dict(sorted(self.prefixes.items())),
+            'distinct': self.distinct,
+        }
+        if self.distinct == 'exact':
+            data['distinct_numbers'] = {op: sorted(numbers) for op, numbers in sorted(self._distinct.items())}
+        elif self.distinct == 'hll':
+            data['precision'] = self.precision
+            data['distinct_sketches'] = {
+                op: base64.b64encode(bytes(sketch.registers)).decode('ascii')
+                for op, sketch in sorted(self._distinct.items())
+            }
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'OperatorAggregate':
+        """
+        Rebuild an aggregate exported with to_dict.
+
+        Args:
+            data: Exported aggregate
+
+        Returns:
+            The aggregate
+        """
+        if data.get('format') != AGGREGATE_FORMAT or data.get('version') != AGGREGATE_VERSION:
+            raise ValueError('Not an operator aggregate of a supported version')
+        aggregate = cls(data['distinct'], data.get('precision', DEFAULT_PRECISION))
+        aggregate.rows = data['rows']
+        aggregate.valid = data['valid']
+        aggregate.m2m = data['m2m']
+        aggregate.operators = dict(data['operators'])
+        aggregate.detailed_operators = dict(data['detailed_operators'])
+        aggregate.prefixes = dict(data['prefixes'])
+        if aggregate.distinct == 'exact':
+            aggregate._distinct = {op: set(numbers) for op, numbers in data['distinct_numbers'].items()}
+        elif aggregate.distinct == 'hll':
+            aggregate._distinct = {
+                op: HyperLogLog(aggregate.precision, bytearray(base64.b64decode(registers)))
+                for op, registers in data['distinct_sketches'].items()
+            }
+        return aggregate
+
+    def report(self) -> str:
+        """
+        Format the aggregate as a human-readable table.
+
+        Returns:
+            Multi-line report
+        """
+        lines = [
+            f'Rows: {self.rows:,}  valid: {self.valid:,}  invalid: {self.invalid:,}  '
+            f'M2M: {self.m2m:,}  non-M2M: {self.non_m2m:,}',
+            '',
+            'Operator:',
+        ]
+        lines += [f'{total:>13,}  {name}' for name, total in _sorted_counts(self.operators).items()]
+        distinct = self.distinct_counts() if self.distinct is not None else {}
+        header = f'Detailed operator{" (count, distinct)" if distinct else ""}:'
+        lines += ['', header]
+        for name, total in _sorted_counts(self.detailed_operators).items():
+            extra = f' {distinct.get(name, 0):>13,}' if distinct else ''
+            lines.append(f'{total:>13,}{extra}  {name}')
+        lines += ['', 'Prefix:']
+        lines += [f'{total:>13,}  {prefix}' for prefix, total in sorted(self.prefixes.items())]
+        return '\n'.join(lines)
+
+
+def _sorted_counts(counts: Mapping[str, int]) -> Dict[str, int]:
+    """Counts ordered largest first, then by name."""
+    return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+
+def aggregate_numbers(validator, phone_numbers: Iterable[str], distinct: Optional[str] = None,
+                      precision: int = DEFAULT_PRECISION, chunk_size: int = 10000) -> OperatorAggregate:
+    """
+    Count an iterable of phone numbers chunk by chunk.
+
+    Only the current chunk is held in memory, so the input can be a
+    generator over a file of any size.
+
+    Args:
+        validator: PolishMobileValidator used for classification
+        phone_numbers: Raw phone numbers
+        distinct: None, 'exact' or 'hll' distinct counting per detailed operator
+        precision: HyperLogLog precision when distinct is 'hll'
+        chunk_size: Numbers classified per batch
+
+    Returns:
+        The aggregate
+    """
+    aggregate = OperatorAggregate(distinct, precision)
+    iterator = iter(phone_numbers)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return aggregate
+        aggregate.add_numbers(validator, chunk)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    import argparse  # only the command line needs it
+    import json
+
+    parser = argparse.ArgumentParser(description='Merge and report operator aggregates.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    merge_parser = commands.add_parser('merge', help='combine partial aggregates from shards')
+    merge_parser.add_argument('paths', nargs='+', help='aggregate JSON files')
+    merge_parser.add_argument('-o', '--output', help='write the merged aggregate as JSON')
+    report_parser = commands.add_parser('report', help='print an aggregate as a table')
+    report_parser.add_argument('path', help='aggregate JSON file')
+    args = parser.parse_args(argv)
+
+    paths = args.paths if args.command == 'merge' else [args.path]
+    try:
+        aggregates = []
+        for path in paths:
+            with open(path, encoding='utf-8') as file:
+                aggregates.append(OperatorAggregate.from_dict(json.load(file)))
+        total = aggregates[0]
+        for aggregate in aggregates[1:]:
+            total.merge(aggregate)
+    except (OSError, ValueError, KeyError) as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 1
+
+    if args.command == 'merge' and args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(total.to_dict(), file, ensure_ascii=False)
+    print(total.report())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+Allocated-block bitmap for strict validation
+One bit per 7-digit block of the national numbering space, derived from the prefix database
+
+Usage:
+    python allocation.py build ../Mobileprefix_corrected.csv prefixes.alloc
+    python allocation.py info prefixes.alloc
+
+File layout (little-endian):
+    header  magic, format version, block digits, CRC-32 of the bitmap,
+            SHA-256 content hash of the prefix table it was built from
+    bitmap  10**7 bits, bit (block & 7) of byte (block >> 3) set when the block is allocated
+"""
+
+import mmap
+import struct
+import sys
+import zlib
+from typing import Dict, List, Optional, Union
+
+
+MAGIC = b'PLALLOCB'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sHHI32s')
+BITS_OFFSET = 64
+
+
+class AllocationError(ValueError):
+    """Raised when a bitmap file is malformed, from another version, or built from other prefix data."""
+
+
+class AllocationBitmap:
+    """
+    Bitmap of the 7-digit blocks (number // 100) covered by any prefix.
+
+    A block partly covered by an 8- or 9-digit prefix counts as allocated,
+    so strict validation never rejects a number the prefix lookup knows.
+    """
+
+    BLOCK_DIGITS = 7
+    BLOCKS = 10 ** BLOCK_DIGITS
+    NBYTES = BLOCKS // 8
+    BLOCK_SIZE = 10 ** (9 - BLOCK_DIGITS)
+
+    def __init__(self, bits: Union[bytearray, memoryview], content_hash: Optional[str] = None, owner=None):
+        """
+        Wrap an existing bitmap.
+
+        Args:
+            bits: NBYTES bytes of bitmap
+            content_hash: Content hash of the prefix table the bitmap was derived from
+            owner: Object that must stay alive while bits is used (e.g. a memory map)
+        """
+        if len(bits) != self.NBYTES:
+            raise AllocationError(f'Bitmap must be {self.NBYTES} bytes, got {len(bits)}')
+        self.bits = bits
+        self.content_hash = content_hash
+        self._owner = owner
+
+    @classmethod
+    def from_prefixes(cls, prefix_database: Dict[str, str], content_hash: Optional[str] = None) -> 'AllocationBitmap':
+        """
+        Build the bitmap from a prefix database.
+
+        Args:
+            prefix_database: Mapping of national prefixes to operator names
+            content_hash: Content hash of the prefix table, recorded for persistence
+
+        Returns:
+            The bitmap
+        """
+        bits = bytearray(cls.NBYTES)
+        for prefix in prefix_database:
+            if not (2 <= len(prefix) <= 9 and prefix.isascii() and prefix.isdigit()):
+                continue
+            if len(prefix) >= cls.BLOCK_DIGITS:
+                start = int(prefix[:cls.BLOCK_DIGITS])
+                end = start + 1
+            else:
+                scale = 10 ** (cls.BLOCK_DIGITS - len(prefix))
+                start = int(prefix) * scale
+                end = start + scale
+            _set_bits(bits, start, end)
+        return cls(bits, content_hash)
+
+    def is_allocated(self, number: int) -> bool:
+        """
+        Check whether a 9-digit national number lies in an allocated block.
+
+        Args:
+            number: National number as an integer (0 <= number < 10**9)
+
+        Returns:
+            True when a prefix covers the number's block
+        """
+        block = number // self.BLOCK_SIZE
+        return bool(self.bits[block >> 3] >> (block & 7) & 1)
+
+    def allocated_blocks(self) -> int:
+        """Number of allocated blocks."""
+        return bin(int.from_bytes(self.bits, 'little')).count('1')
+
+    def save(self, path: str) -> None:
+        """
+        Write the bitmap to a file.
+
+        Args:
+            path: Destination path
+        """
+        digest = bytes.fromhex(self.content_hash) if self.content_hash else b''
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, self.BLOCK_DIGITS, zlib.crc32(self.bits), digest.ljust(32, b'\0'))
+        with open(path, 'wb') as file:
+            file.write(header.ljust(BITS_OFFSET, b'\0'))
+            file.write(self.bits)
+
+    @classmethod
+    def load(cls, path: str, verify: bool = True) -> 'AllocationBitmap':
+        """
+        Memory-map a bitmap written by save().
+
+        Args:
+            path: Bitmap file
+            verify: Check the bitmap checksum before use
+
+        Returns:
+            The bitmap, backed by the mapping
+        """
+        with open(path, 'rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(data) != BITS_OFFSET + cls.NBYTES or data[:len(MAGIC)] != MAGIC:
+                raise AllocationError(f'Not an allocation bitmap: {path}')
+            _, version, block_digits, checksum, digest = HEADER.unpack_from(data)
+            if version != FORMAT_VERSION or block_digits != cls.BLOCK_DIGITS:
+                raise AllocationError(f'Unsupported allocation bitmap version {version}')
+            bits = memoryview(data)[BITS_OFFSET:]
+            if verify and zlib.crc32(bits) != checksum:
+                bits.release()
+                raise AllocationError(f'Allocation bitmap checksum mismatch: {path}')
+        except Exception:
+            data.close()
+            raise
+        content_hash = digest.hex() if digest.strip(b'\0') else None
+        return cls(bits, content_hash, owner=data)
+
+
+def _set_bits(bits: bytearray, start: int, end: int) -> None:
+    """Set bits [start, end), whole bytes at a time in the middle."""
+    while start < end and start & 7:
+        bits[start >> 3] |= 1 << (start & 7)
+        start += 1
+    while end > start and end & 7:
+        end -= 1
+        bits[end >> 3] |= 1 << (end & 7)
+    if start < end:
+        bits[start >> 3:end >> 3] = b'\xff' * ((end - start) >> 3)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    import argparse  # only the command line needs it
+
+    from polish_mobile_validator import PolishMobileValidator
+
+    parser = argparse.ArgumentParser(description='Build or inspect allocated-block bitmaps.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build_parser = commands.add_parser('build', help='derive a bitmap from a prefix CSV')
+    build_parser.add_argument('csv_path', help='prefix CSV, e.g. ../Mobileprefix_corrected.csv')
+    build_parser.add_argument('bitmap_path', help='bitmap file to write')
+    build_parser.add_argument('--encoding', help='CSV text encoding (detected when omitted)')
+    info_parser = commands.add_parser('info', help='describe a bitmap file')
+    info_parser.add_argument('bitmap_path', help='bitmap file to read')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        validator = PolishMobileValidator(builtin_prefixes=False)
+        validator.reload_prefix_database(args.csv_path, args.encoding)
+        bitmap = validator.get_allocation_bitmap()
+        bitmap.save(args.bitmap_path)
+        print(f'Wrote {bitmap.allocated_blocks():,} allocated blocks to {args.bitmap_path}')
+        return 0
+
+    try:
+        bitmap = AllocationBitmap.load(args.bitmap_path)
+    except AllocationError as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 1
+    allocated = bitmap.allocated_blocks()
+    print(f'Bitmap:    {args.bitmap_path}')
+    print(f'Allocated: {allocated:,} of {AllocationBitmap.BLOCKS:,} blocks ({allocated / AllocationBitmap.BLOCKS:.2%})')
+    print(f'Source:    {bitmap.content_hash or "unknown"}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
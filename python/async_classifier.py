@@ -0,0 +1,269 @@
+"""
+asyncio classification of Polish mobile numbers from async sources
+Batches an async stream of numbers by size or time window and classifies the batches off the event loop
+
+Usage:
+    from async_classifier import classify_numbers
+    async for result in classify_numbers(validator, numbers_from_queue()):
+        ...
+    async for results in classify_batches(validator, source, batch_size=5000, max_delay=0.02):
+        ...
+
+A batch is closed when it holds batch_size numbers or max_delay seconds
+after its first number arrived, whichever comes first, and is handed to
+batch_recognize in an executor: the event loop's default thread pool, any
+concurrent.futures executor, or a ParallelValidatorPool whose workers share
+the compiled prefix index. Results come back in input order. At most
+max_in_flight batches are classified or waiting to be consumed; beyond that
+the source is not read, so a slow consumer slows the producer down instead
+of buffering without limit.
+
+Worker threads share the GIL with the event loop, so they classify in
+slices of GIL_SLICE numbers and yield the GIL in between; a
+ParallelValidatorPool keeps the classification work out of the loop's
+process entirely.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, List, Optional, Union
+
+from parallel import ParallelValidatorPool
+from results import RecognitionResult
+
+
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_MAX_DELAY = 0.05
+DEFAULT_MAX_IN_FLIGHT = 4
+# Numbers a worker thread classifies between chances for the event loop to take the GIL
+GIL_SLICE = 128
+# sched_yield releases the GIL and also gives up the CPU, so the loop thread
+# gets to run even on a single core; sleep(0) only releases the GIL
+_yield = getattr(os, 'sched_yield', lambda: time.sleep(0))
+
+
+async def _iterate(numbers: Union[AsyncIterable[Any], Iterable[Any]]) -> AsyncIterator[Any]:
+    """Iterate a sync or async iterable asynchronously."""
+    if hasattr(numbers, '__aiter__'):
+        async for number in numbers:
+            yield number
+    else:
+        for number in numbers:
+            yield number
+
+
+class _BatchReader:
+    """Reads a source into the current batch, pausing while a full batch waits to be taken."""
+
+    def __init__(self, numbers: Union[AsyncIterable[Any], Iterable[Any]], batch_size: int):
+        self.numbers = numbers
+        self.batch_size = batch_size
+        self.batch: List[Any] = []
+        self.first_arrival = 0.0
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.started = asyncio.Event()
+        self.full = asyncio.Event()
+        self.space = asyncio.Event()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        source = _iterate(self.numbers)
+        try:
+            async for number in source:
+                batch = self.batch
+                batch.append(number)
+                if len(batch) == 1:
+                    self.first_arrival = loop.time()
+                    self.started.set()
+                if len(batch) >= self.batch_size:
+                    self.space.clear()
+                    self.full.set()
+                    await self.space.wait()
+        except Exception as error:
+            self.error = error
+        finally:
+            await source.aclose()
+            self.done = True
+            self.started.set()
+            self.full.set()
+
+    def take(self) -> List[Any]:
+        """Hand over the current batch and let the reader start the next one."""
+        batch, self.batch = self.batch, []
+        if not self.done:
+            self.started.clear()
+            self.full.clear()
+        self.space.set()
+        return batch
+
+
+async def batch_numbers(numbers: Union[AsyncIterable[Any], Iterable[Any]],
+                        batch_size: int = DEFAULT_BATCH_SIZE,
+                        max_delay: Optional[float] = DEFAULT_MAX_DELAY) -> AsyncIterator[List[Any]]:
+    """
+    Group a stream of numbers into batches by size or time window.
+
+    The source is read by a separate task, so a batch whose window expires
+    is yielded even while the source is waiting for its next number. The
+    reader fills at most one batch ahead of the consumer.
+
+    Args:
+        numbers: Async iterable (or plain iterable) of phone numbers
+        batch_size: Largest batch
+        max_delay: Seconds after its first number that a partial batch is yielded (None waits for a full batch)
+
+    Yields:
+        Non-empty lists of numbers, in source order
+    """
+    if batch_size < 1:
+        raise ValueError('batch_size must be at least 1')
+    loop = asyncio.get_running_loop()
+    reader = _BatchReader(numbers, batch_size)
+    task = asyncio.ensure_future(reader.run())
+    try:
+        while True:
+            await reader.started.wait()
+            if max_delay is None:
+                await reader.full.wait()
+            elif not reader.full.is_set():
+                remaining = reader.first_arrival + max_delay - loop.time()
+                if remaining > 0:
+                    try:
+                        await asyncio.wait_for(reader.full.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        pass
+            # Once the reader is done, nothing is added after this batch
+            done = reader.done
+            batch = reader.take()
+            if batch:
+                yield batch
+            if done:
+                break
+        if reader.error is not None:
+            raise reader.error
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def _recognize_batch(validator, numbers: List[Any]) -> List[RecognitionResult]:
+    """Classify one batch inside a ParallelValidatorPool worker."""
+    return validator.batch_recognize(numbers)
+
+
+def _recognize_in_slices(validator, numbers: List[Any]) -> List[RecognitionResult]:
+    """
+    Classify one batch in a thread, releasing the GIL between slices.
+
+    A thread otherwise keeps the GIL for the interpreter's switch interval
+    (5 ms by default) each time the event loop gives it up, which happens on
+    every pass of the loop; sleep(0) hands it straight back instead.
+    """
+    results: List[RecognitionResult] = []
+    for start in range(0, len(numbers), GIL_SLICE):
+        results.extend(validator.batch_recognize(numbers[start:start + GIL_SLICE]))
+        _yield()
+    return results
+
+
+def _submit(validator, executor, batch: List[Any]) -> 'asyncio.Future':
+    if isinstance(executor, ParallelValidatorPool):
+        return asyncio.wrap_future(executor.submit(_recognize_batch, batch))
+    return asyncio.get_running_loop().run_in_executor(executor, _recognize_in_slices, validator, batch)
+
+
+async def classify_batches(validator, numbers: Union[AsyncIterable[Any], Iterable[Any]],
+                           batch_size: int = DEFAULT_BATCH_SIZE,
+                           max_delay: Optional[float] = DEFAULT_MAX_DELAY,
+                           max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                           executor=None) -> AsyncIterator[List[RecognitionResult]]:
+    """
+    Classify a stream of numbers in batches off the event loop.
+
+    Args:
+        validator: PolishMobileValidator used for classification
+        numbers: Async iterable (or plain iterable) of phone numbers
+        batch_size: Largest batch handed to batch_recognize
+        max_delay: Seconds after its first number that a partial batch is classified (None waits for a full batch)
+        max_in_flight: Batches being classified or awaiting the consumer before the source is paused
+        executor: concurrent.futures executor or ParallelValidatorPool (defaults to the loop's thread pool)
+
+    Yields:
+        batch_recognize results of each batch, in source order
+    """
+    if max_in_flight < 1:
+        raise ValueError('max_in_flight must be at least 1')
+    slots = asyncio.Semaphore(max_in_flight)
+    submitted: deque = deque()
+    ready = asyncio.Event()
+
+    async def submit_batches() -> None:
+        batches = batch_numbers(numbers, batch_size, max_delay)
+        try:
+            async for batch in batches:
+                await slots.acquire()
+                submitted.append(_submit(validator, executor, batch))
+                ready.set()
+            submitted.append(None)
+        except Exception as error:
+            submitted.append(error)
+        finally:
+            ready.set()
+            await batches.aclose()
+
+    task = asyncio.ensure_future(submit_batches())
+    try:
+        while True:
+            if not submitted:
+                ready.clear()
+                await ready.wait()
+                continue
+            future = submitted.popleft()
+            if future is None:
+                break
+            if isinstance(future, Exception):
+                raise future
+            results = await future
+            # The slot frees as soon as the batch is done, so the next batch
+            # is classified while the consumer handles this one
+            slots.release()
+            yield results
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        for future in submitted:
+            if isinstance(future, asyncio.Future):
+                future.cancel()
+
+
+async def classify_numbers(validator, numbers: Union[AsyncIterable[Any], Iterable[Any]],
+                           batch_size: int = DEFAULT_BATCH_SIZE,
+                           max_delay: Optional[float] = DEFAULT_MAX_DELAY,
+                           max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                           executor=None) -> AsyncIterator[RecognitionResult]:
+    """
+    Classify a stream of numbers off the event loop, one result per number.
+
+    Batching, ordering and backpressure are those of classify_batches.
+
+    Args:
+        validator: PolishMobileValidator used for classification
+        numbers: Async iterable (or plain iterable) of phone numbers
+        batch_size: Largest batch handed to batch_recognize
+        max_delay: Seconds after its first number that a partial batch is classified (None waits for a full batch)
+        max_in_flight: Batches being classified or awaiting the consumer before the source is paused
+        executor: concurrent.futures executor or ParallelValidatorPool (defaults to the loop's thread pool)
+
+    Yields:
+        RecognitionResult for each number, in source order
+    """
+    batches = classify_batches(validator, numbers, batch_size, max_delay, max_in_flight, executor)
+    try:
+        async for results in batches:
+            for result in results:
+                yield result
+    finally:
+        await batches.aclose()
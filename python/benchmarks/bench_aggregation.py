@@ -0,0 +1,111 @@
+"""
+Benchmark: operator counts from batch_validate results versus streaming aggregation
+
+Usage:
+    python benchmarks/bench_aggregation.py [--numbers 500000] [--chunk-size 10000]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from itertools import islice
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aggregation import OperatorAggregate, aggregate_numbers  # noqa: E402
+from polish_mobile_validator import PolishMobileValidator  # noqa: E402
+
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Mobileprefix_corrected.csv')
+
+
+def make_numbers(count: int, seed: int) -> list:
+    """Mostly valid numbers, some formatted, some with unknown prefixes."""
+    rng = random.Random(seed)
+    prefixes = ('50', '51', '53', '57', '60', '66', '69', '72', '79', '88', '21', '99')
+    numbers = []
+    for _ in range(count):
+        digits = f'{rng.choice(prefixes)}{rng.randrange(10 ** 7):07d}'
+        numbers.append(digits if rng.random() < 0.7 else f'+48 {digits[:3]} {digits[3:6]} {digits[6:]}')
+    return numbers
+
+
+def count_from_results(validator, numbers, chunk_size):
+    """The pattern aggregation replaces: materialize every result, then count."""
+    results = validator.batch_validate(numbers)
+    counts = {}
+    for result in results:
+        if result['success']:
+            counts[result['detailed_operator']] = counts.get(result['detailed_operator'], 0) + 1
+    return counts
+
+
+def scalar_aggregate(validator, numbers, chunk_size):
+    """Aggregation through recognize, the path used when NumPy is missing."""
+    aggregate = OperatorAggregate()
+    iterator = iter(numbers)
+    for chunk in iter(lambda: list(islice(iterator, chunk_size)), []):
+        for number in chunk:
+            aggregate._add_recognition(validator.recognize(number))
+    return aggregate
+
+
+def measure(run) -> tuple:
+    """Seconds and tracemalloc peak bytes of one run."""
+    gc.collect()
+    started = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure streaming aggregation.')
+    parser.add_argument('--numbers', type=int, default=500000, help='inputs (default: 500000)')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='numbers per batch (default: 10000)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    args = parser.parse_args()
+
+    validator = PolishMobileValidator(CSV_PATH)
+    numbers = make_numbers(args.numbers, args.seed)
+    size = args.chunk_size
+
+    variants = {
+        'batch_validate + count': lambda: count_from_results(validator, numbers, size),
+        'aggregate (recognize)': lambda: scalar_aggregate(validator, numbers, size),
+    }
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print('NumPy not installed; skipping batch_classify variants\n')
+    else:
+        variants.update({
+            'aggregate': lambda: aggregate_numbers(validator, numbers, chunk_size=size),
+            'aggregate, distinct exact': lambda: aggregate_numbers(validator, numbers, 'exact', chunk_size=size),
+            'aggregate, distinct hll': lambda: aggregate_numbers(validator, numbers, 'hll', chunk_size=size),
+        })
+
+    print(f'{"variant":<28} {"numbers/s":>12} {"peak MB":>9}')
+    for name, run in variants.items():
+        elapsed, peak = measure(run)
+        print(f'{name:<28} {args.numbers / elapsed:12,.0f} {peak / 1e6:9.1f}')
+
+    exact = aggregate_numbers(validator, numbers, 'exact', chunk_size=size).distinct_counts()
+    approximate = aggregate_numbers(validator, numbers, 'hll', chunk_size=size).distinct_counts()
+    errors = [abs(approximate[name] - count) / count for name, count in exact.items() if count >= 1000]
+    if errors:
+        print(f'\nHyperLogLog relative error over {len(errors)} operators with >= 1000 numbers: '
+              f'mean {sum(errors) / len(errors):.2%}, max {max(errors):.2%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark: event-loop latency while an async stream of numbers is classified
+
+Usage:
+    python benchmarks/bench_async.py [--numbers 1000000] [--batch-size 10000] [--workers 3]
+
+A heartbeat task sleeps for --tick seconds in a loop and records how late
+it wakes up; that lag is what every other coroutine on the loop would see.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from async_classifier import batch_numbers, classify_numbers  # noqa: E402
+from lookup_server import percentile  # noqa: E402
+from parallel import ParallelValidatorPool  # noqa: E402
+from polish_mobile_validator import PolishMobileValidator  # noqa: E402
+
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Mobileprefix_corrected.csv')
+
+
+def make_numbers(count: int, seed: int) -> list:
+    """Mostly valid numbers, some formatted, some with unknown prefixes."""
+    rng = random.Random(seed)
+    prefixes = ('50', '51', '53', '57', '60', '66', '69', '72', '79', '88', '21', '99')
+    numbers = []
+    for _ in range(count):
+        digits = f'{rng.choice(prefixes)}{rng.randrange(10 ** 7):07d}'
+        numbers.append(digits if rng.random() < 0.7 else f'+48 {digits[:3]} {digits[3:6]} {digits[6:]}')
+    return numbers
+
+
+async def source(numbers, burst: int):
+    """An async source that hands control back to the loop every burst numbers, like a socket reader."""
+    for start in range(0, len(numbers), burst):
+        for number in numbers[start:start + burst]:
+            yield number
+        await asyncio.sleep(0)
+
+
+async def heartbeat(tick: float, lags: list, stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + tick
+        await asyncio.sleep(tick)
+        lags.append(loop.time() - expected)
+
+
+async def inline_batches(validator, numbers, args) -> int:
+    """The pattern being replaced: batch_validate called on the loop for each batch."""
+    count = 0
+    async for batch in batch_numbers(source(numbers, args.burst), args.batch_size):
+        count += len(validator.batch_validate(batch))
+    return count
+
+
+async def executor_per_number(validator, numbers, args) -> int:
+    """run_in_executor around every number."""
+    loop = asyncio.get_running_loop()
+    count = 0
+    async for number in source(numbers, args.burst):
+        await loop.run_in_executor(None, validator.recognize, number)
+        count += 1
+    return count
+
+
+async def async_stream(validator, numbers, args, executor=None) -> int:
+    count = 0
+    async for _ in classify_numbers(validator, source(numbers, args.burst), args.batch_size,
+                                    executor=executor):
+        count += 1
+    return count
+
+
+async def measure(run, tick: float):
+    """Seconds, processed count and heartbeat lags of one run."""
+    lags: list = []
+    stop = asyncio.Event()
+    beat = asyncio.ensure_future(heartbeat(tick, lags, stop))
+    await asyncio.sleep(tick * 2)
+    lags.clear()
+    started = time.perf_counter()
+    count = await run()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await beat
+    return elapsed, count, sorted(lags)
+
+
+async def run_all(args) -> None:
+    validator = PolishMobileValidator(CSV_PATH)
+    numbers = make_numbers(args.numbers, args.seed)
+    sample = numbers[:args.per_number_sample]
+
+    variants = [
+        ('inline batch_validate', lambda: inline_batches(validator, numbers, args)),
+        (f'run_in_executor per number ({len(sample):,})', lambda: executor_per_number(validator, sample, args)),
+        ('classify_numbers, threads', lambda: async_stream(validator, numbers, args)),
+    ]
+    pool = ParallelValidatorPool(validator, workers=args.workers) if args.workers else None
+    if pool is not None:
+        variants.append((f'classify_numbers, {args.workers} processes',
+                         lambda: async_stream(validator, numbers, args, pool)))
+
+    print(f'{"variant":<38} {"numbers/s":>11} {"lag p50 ms":>11} {"lag p99 ms":>11} {"lag max ms":>11}')
+    try:
+        for name, run in variants:
+            elapsed, count, lags = await measure(run, args.tick)
+            print(f'{name:<38} {count / elapsed:11,.0f} {percentile(lags, 50) * 1000:11.2f} '
+                  f'{percentile(lags, 99) * 1000:11.2f} {(lags[-1] if lags else 0) * 1000:11.2f}')
+    finally:
+        if pool is not None:
+            pool.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure event-loop latency during async classification.')
+    parser.add_argument('--numbers', type=int, default=1000000, help='numbers streamed (default: 1000000)')
+    parser.add_argument('--batch-size', type=int, default=10000, help='numbers per batch (default: 10000)')
+    parser.add_argument('--burst', type=int, default=1000,
+                        help='numbers the source yields between loop iterations (default: 1000)')
+    parser.add_argument('--per-number-sample', type=int, default=50000,
+                        help='numbers for the run_in_executor-per-number variant (default: 50000)')
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                        help='processes for the pool variant, 0 skips it (default: CPU count - 1)')
+    parser.add_argument('--tick', type=float, default=0.001, help='heartbeat interval in seconds (default: 0.001)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    args = parser.parse_args()
+    asyncio.run(run_all(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: classifying a pandas or Arrow column versus Series.apply(recognize_operator)
+
+Usage:
+    python benchmarks/bench_dataframes.py [--rows 10000000] [--apply-rows 1000000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pyarrow as pa  # noqa: E402
+
+from dataframes import classify_arrow, classify_series  # noqa: E402
+from polish_mobile_validator import PolishMobileValidator  # noqa: E402
+
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Mobileprefix_corrected.csv')
+
+
+def make_numbers(rows: int, seed: int) -> tuple:
+    """Mostly valid numbers, as integers and as strings with 30% written as '+48 XXX XXX XXX'."""
+    rng = np.random.default_rng(seed)
+    prefixes = np.array([50, 51, 53, 57, 60, 66, 69, 72, 79, 88, 21, 99], dtype=np.int64)
+    numbers = rng.choice(prefixes, rows) * 10 ** 7 + rng.integers(0, 10 ** 7, rows)
+    text = numbers.astype('U9').astype(object)
+    formatted = np.flatnonzero(rng.random(rows) < 0.3)
+    text[formatted] = ['+48 ' + value[:3] + ' ' + value[3:6] + ' ' + value[6:] for value in text[formatted]]
+    return numbers, text
+
+
+def timed(run) -> tuple:
+    """Result and seconds of one run."""
+    gc.collect()
+    started = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure DataFrame and Arrow classification.')
+    parser.add_argument('--rows', type=int, default=10000000, help='rows for the column paths (default: 10000000)')
+    parser.add_argument('--apply-rows', type=int, default=1000000,
+                        help='rows for the .apply baseline, which keeps one dict per row (default: 1000000)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    args = parser.parse_args()
+
+    validator = PolishMobileValidator(CSV_PATH)
+    numbers, text = make_numbers(args.rows, args.seed)
+    arrow_series = pd.Series(text, dtype=pd.StringDtype('pyarrow'))
+    object_series = pd.Series(text, dtype=object)
+    int_series = pd.Series(numbers)
+    arrow_array = pa.array(arrow_series.array)
+    sample = object_series.iloc[:min(args.apply_rows, args.rows)]
+    print(f'{args.rows:,} rows ({len(sample):,} for .apply)\n')
+
+    _, apply_seconds = timed(lambda: sample.apply(validator.recognize_operator))
+    apply_rate = len(sample) / apply_seconds
+    variants = (
+        ('classify_series, Arrow strings', lambda: classify_series(validator, arrow_series)),
+        ('classify_series, object strings', lambda: classify_series(validator, object_series)),
+        ('classify_series, int64', lambda: classify_series(validator, int_series)),
+        ('classify_arrow, large_string', lambda: classify_arrow(validator, arrow_array)),
+    )
+    print(f'{"variant":<36} {"rows/s":>12} {"speedup":>8} {"10M rows":>9}')
+    print(f'{".apply(recognize_operator)":<36} {apply_rate:12,.0f} {1:8.1f}x {10 ** 7 / apply_rate:8.1f}s')
+    for name, run in variants:
+        result, seconds = timed(run)
+        rate = args.rows / seconds
+        print(f'{name:<36} {rate:12,.0f} {rate / apply_rate:8.1f}x {10 ** 7 / rate:8.1f}s')
+
+    frame = classify_series(validator, arrow_series)
+    print(f'\nOutput columns: {frame.memory_usage(deep=True, index=False).sum() / args.rows:.1f} bytes/row')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark: bulk export throughput per format versus formatting and writing row by row
+Usage:
+    python benchmarks/bench_exporter.py [--numbers 1000000] [--number-format international]
+
+Both paths start from the same BatchClassification. The baseline is what
+an export loop did before: resolve labels, call format_phone_number on each
+normalized number and write rows with csv.writer, json.dumps or
+pyarrow.Table.from_pylist. The bulk path is exporter.BulkExporter. Output
+goes to an in-memory buffer (a temporary file for Parquet), so the figures
+exclude disk speed.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np  # noqa: E402
+
+from exporter import EXPORT_COLUMNS, NUMBER_FORMATS, BulkExporter  # noqa: E402
+from polish_mobile_validator import PolishMobileValidator  # noqa: E402
+
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Mobileprefix_corrected.csv')
+
+
+def baseline_rows(validator, batch, number_format: str):
+    """Rows as lists of Python objects, formatted one number at a time."""
+    valid = batch.valid
+    operators = batch.operator_labels()[valid].tolist()
+    detailed = batch.detailed_operator_labels()[valid].tolist()
+    m2m = batch.is_m2m[valid].tolist()
+    normalized = batch.normalized[valid].tolist()
+    for number, operator, detailed_operator, is_m2m in zip(normalized, operators, detailed, m2m):
+        formatted = validator.format_phone_number(str(number), number_format)
+        if number_format == 'e164':
+            formatted = '+48' + formatted
+        yield formatted, operator, detailed_operator, is_m2m
+
+
+def baseline_csv(validator, batch, number_format: str, path: str) -> None:
+    """csv.writer over formatted rows into an in-memory text stream."""
+    output = io.TextIOWrapper(io.BytesIO(), encoding='utf-8', newline='')
+    writer = csv.writer(output, lineterminator='\n')
+    writer.writerow(EXPORT_COLUMNS)
+    for number, operator, detailed, is_m2m in baseline_rows(validator, batch, number_format):
+        writer.writerow((number, operator, detailed or '', 'true' if is_m2m else 'false'))
+    output.flush()
+
+
+def baseline_jsonl(validator, batch, number_format: str, path: str) -> None:
+    """One json.dumps per row into an in-memory text stream."""
+    output = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+    for row in baseline_rows(validator, batch, number_format):
+        output.write(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + '\n')
+    output.flush()
+
+
+def baseline_parquet(validator, batch, number_format: str, path: str) -> None:
+    """A table built from row dictionaries, written to path."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    rows = [dict(zip(EXPORT_COLUMNS, row)) for row in baseline_rows(validator, batch, number_format)]
+    pq.write_table(pa.Table.from_pylist(rows), path)
+
+
+def bulk(export_format: str):
+    """BulkExporter for a format, with the baseline's signature."""
+    def run(validator, batch, number_format: str, path: str) -> None:
+        output = path if export_format == 'parquet' else io.BytesIO()
+        with BulkExporter(output, export_format, number_format) as exporter:
+            exporter.write(batch)
+    return run
+
+
+def best_of(function, repeat: int, *args) -> float:
+    """Fastest of several runs, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure bulk export throughput per format.')
+    parser.add_argument('--numbers', type=int, default=1000000, help='numbers to classify (default: 1000000)')
+    parser.add_argument('--number-format', choices=tuple(NUMBER_FORMATS), default='international',
+                        help='format of the number column (default: international)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per variant, best is reported (default: 3)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    args = parser.parse_args()
+
+    validator = PolishMobileValidator(CSV_PATH)
+    rng = random.Random(args.seed)
+    prefixes = (50, 51, 53, 57, 60, 66, 69, 72, 79, 88, 21)
+    national = np.array([rng.choice(prefixes) * 10 ** 7 + rng.randrange(10 ** 7) for _ in range(args.numbers)])
+    batch = validator.batch_classify(national)
+    rows = int(np.count_nonzero(batch.valid))
+
+    variants = {
+        'csv': (baseline_csv, bulk('csv')),
+        'jsonl': (baseline_jsonl, bulk('jsonl')),
+    }
+    try:
+        import pyarrow.parquet  # noqa: F401
+        variants['parquet'] = (baseline_parquet, bulk('parquet'))
+    except ImportError:
+        print('pyarrow not installed, skipping Parquet')
+
+    print(f'{rows:,} valid numbers, {args.number_format} format\n')
+    print(f'{"format":<8} {"row by row rows/s":>18} {"bulk rows/s":>14} {"speedup":>8}')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'export.parquet')
+        for name, (baseline, fast) in variants.items():
+            slow = rows / best_of(baseline, args.repeat, validator, batch, args.number_format, path)
+            quick = rows / best_of(fast, args.repeat, validator, batch, args.number_format, path)
+            print(f'{name:<8} {slow:18,.0f} {quick:14,.0f} {quick / slow:7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
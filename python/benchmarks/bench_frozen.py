@@ -0,0 +1,80 @@
+"""
+Benchmark: start-up cost of the built-in frozen prefix tables versus CSV loading
+Usage:
+    python benchmarks/bench_frozen.py [--runs 20]
+
+Every run starts a fresh interpreter and times importing the validator,
+constructing it with its prefix data and the first detailed-operator
+lookup. Bytecode caches are warm, as in a deployed service; the first run
+of each variant is discarded. A memory-mapped snapshot is included for
+comparison. The first lookup also pays for paging in interpreter code on
+first use (int() parsing, for instance), which CSV loading has already
+done while compiling the index.
+"""
+
+import argparse
+import compileall
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PYTHON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, PYTHON_DIR)
+
+from snapshot import compile_snapshot  # noqa: E402
+
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Mobileprefix_corrected.csv')
+
+PROBE = '''
+import json, sys, time
+sys.path.insert(0, {python_dir!r})
+started = time.perf_counter()
+from polish_mobile_validator import PolishMobileValidator
+imported = time.perf_counter()
+{construct}
+constructed = time.perf_counter()
+operator = validator.recognize_operator('501234567')['detailed_operator']
+looked_up = time.perf_counter()
+assert operator, 'no detailed operator'
+print(json.dumps([imported - started, constructed - imported, looked_up - constructed]))
+'''
+
+
+def run_variant(construct: str, runs: int) -> list:
+    """Median import, construction and first-lookup times in seconds over fresh interpreters."""
+    code = PROBE.format(python_dir=os.path.abspath(PYTHON_DIR), construct=construct)
+    samples = []
+    for _ in range(runs + 1):
+        output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+        samples.append(json.loads(output))
+    return [statistics.median(column) for column in zip(*samples[1:])]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure start-up with built-in prefix tables.')
+    parser.add_argument('--runs', type=int, default=20, help='fresh interpreters per variant (default: 20)')
+    args = parser.parse_args()
+
+    # Measure with bytecode cached even where PYTHONDONTWRITEBYTECODE is set
+    compileall.compile_dir(PYTHON_DIR, maxlevels=0, quiet=1)
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = os.path.join(directory, 'prefixes.snap')
+        compile_snapshot(CSV_PATH, snapshot_path)
+        variants = {
+            'CSV (PolishMobileValidator(csv_path))': f'validator = PolishMobileValidator({CSV_PATH!r})',
+            'built-in (PolishMobileValidator())': 'validator = PolishMobileValidator()',
+            'snapshot (load_snapshot)': ('validator = PolishMobileValidator(builtin_prefixes=False)\n'
+                                         f'validator.load_snapshot({snapshot_path!r})'),
+        }
+        print(f'{"variant":<40} {"import ms":>10} {"load ms":>10} {"first lookup us":>16}')
+        for name, construct in variants.items():
+            imported, constructed, first = run_variant(construct, args.runs)
+            print(f'{name:<40} {imported * 1e3:10.2f} {constructed * 1e3:10.2f} {first * 1e6:16.1f}')
+
+
+if __name__ == '__main__':
+    main()
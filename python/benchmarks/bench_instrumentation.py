@@ -0,0 +1,78 @@
+"""
+Benchmark: cost of recognize_operator instrumentation when disabled and enabled
+
+Usage:
+    python benchmarks/bench_instrumentation.py [--numbers 200000] [--repeat 9]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from polish_mobile_validator import PolishMobileValidator  # noqa: E402
+
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Mobileprefix_corrected.csv')
+
+
+def make_numbers(count: int, seed: int) -> list:
+    """Mostly valid numbers, some formatted, some with unknown prefixes."""
+    rng = random.Random(seed)
+    prefixes = ('50', '51', '53', '57', '60', '66', '69', '72', '79', '88', '21', '99')
+    numbers = []
+    for _ in range(count):
+        digits = f'{rng.choice(prefixes)}{rng.randrange(10 ** 7):07d}'
+        numbers.append(digits if rng.random() < 0.7 else f'+48 {digits[:3]} {digits[3:6]} {digits[6:]}')
+    return numbers
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure instrumentation overhead.')
+    parser.add_argument('--numbers', type=int, default=200000, help='inputs per run (default: 200000)')
+    parser.add_argument('--repeat', type=int, default=9, help='interleaved runs per variant (default: 9)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    args = parser.parse_args()
+
+    numbers = make_numbers(args.numbers, args.seed)
+    plain = PolishMobileValidator(CSV_PATH)
+    instrumented = PolishMobileValidator(CSV_PATH)
+    instrumented.enable_instrumentation()
+
+    def without_check(numbers):
+        recognize, normalize = plain._recognize_normalized, plain.normalize_phone_number
+        return [recognize(number, normalize(number)) for number in numbers]
+
+    variants = {
+        'no check (internal path)': without_check,
+        'instrumentation disabled': lambda numbers: [plain.recognize_operator(n) for n in numbers],
+        'instrumentation enabled': lambda numbers: [instrumented.recognize_operator(n) for n in numbers],
+    }
+
+    # Interleave the variants so drift in machine load affects them equally
+    best = dict.fromkeys(variants, float('inf'))
+    for _ in range(args.repeat):
+        for name, run in variants.items():
+            started = time.perf_counter()
+            run(numbers)
+            best[name] = min(best[name], time.perf_counter() - started)
+
+    baseline = best['no check (internal path)']
+    print(f'{"variant":<28} {"numbers/s":>12} {"ns/call":>9} {"overhead":>9}')
+    for name, seconds in best.items():
+        print(f'{name:<28} {args.numbers / seconds:12,.0f} {seconds * 1e9 / args.numbers:9.0f} '
+              f'{seconds / baseline - 1:+9.1%}')
+
+    stats = instrumented.instrumentation_stats()
+    print(f'\nStage breakdown (instrumented, {stats["calls"]:,} calls):')
+    for stage, values in stats['stages'].items():
+        if values['calls']:
+            print(f'  {stage:<14} {values["mean_ns"]:8.0f} ns  x {values["calls"]:,}')
+    print(f'  probe histogram {stats["probe_histogram"]}')
+
+
+if __name__ == '__main__':
+    main()
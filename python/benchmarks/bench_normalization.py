@@ -0,0 +1,65 @@
+"""
+Benchmark: normalization engine versus the original re.sub implementation
+
+Usage:
+    python benchmarks/bench_normalization.py [--numbers 200000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from normalization import normalize, normalize_buffer, normalize_many, normalize_reference  # noqa: E402
+
+
+def messy_numbers(count: int, seed: int) -> list:
+    """Realistic inputs: clean, spaced, dashed, parenthesized, +48 and 0048 prefixed."""
+    rng = random.Random(seed)
+    styles = (
+        lambda n: n,
+        lambda n: f'+48{n}',
+        lambda n: f'+48 {n[:3]} {n[3:6]} {n[6:]}',
+        lambda n: f'0048 {n[:3]} {n[3:6]} {n[6:]}',
+        lambda n: f'({n[:3]}) {n[3:6]}-{n[6:]}',
+        lambda n: f'{n[:3]}-{n[3:6]}-{n[6:]}',
+    )
+    return [rng.choice(styles)(str(rng.randrange(2 * 10 ** 8, 9 * 10 ** 8))) for _ in range(count)]
+
+
+def best_of(statement, repeat: int) -> float:
+    """Best wall time of several runs."""
+    return min(timeit.repeat(statement, number=1, repeat=repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare normalization implementations.')
+    parser.add_argument('--numbers', type=int, default=200000, help='inputs per dataset (default: 200000)')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measurement (default: 5)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    args = parser.parse_args()
+
+    messy = messy_numbers(args.numbers, args.seed)
+    clean = [normalize_reference(number)[-9:] for number in messy]
+    buffer = '\n'.join(messy).encode('ascii') + b'\n'
+
+    rows = [
+        ('clean', 're.sub per call', best_of(lambda: [normalize_reference(n) for n in clean], args.repeat)),
+        ('clean', 'normalize per call', best_of(lambda: [normalize(n) for n in clean], args.repeat)),
+        ('messy', 're.sub per call', best_of(lambda: [normalize_reference(n) for n in messy], args.repeat)),
+        ('messy', 'normalize per call', best_of(lambda: [normalize(n) for n in messy], args.repeat)),
+        ('messy', 'normalize_many(list)', best_of(lambda: normalize_many(messy), args.repeat)),
+        ('messy', 'normalize_buffer(bytes)', best_of(lambda: normalize_buffer(buffer), args.repeat)),
+    ]
+
+    baselines = {dataset: seconds for dataset, name, seconds in rows if name == 're.sub per call'}
+    print(f'{"dataset":<8} {"implementation":<26} {"numbers/s":>12} {"speedup":>8}')
+    for dataset, name, seconds in rows:
+        print(f'{dataset:<8} {name:<26} {args.numbers / seconds:12,.0f} {baselines[dataset] / seconds:8.2f}')
+
+
+if __name__ == '__main__':
+    main()
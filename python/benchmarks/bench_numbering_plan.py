@@ -0,0 +1,113 @@
+"""
+Benchmark: mixed-country classification with one engine versus one validator per country
+
+Usage:
+    python benchmarks/bench_numbering_plan.py [--numbers 500000] [--foreign 0.3]
+
+The baseline sniffs each number's country code and hands it to a
+single-plan engine for that country, the way per-country validators are
+run today; the engine dispatches through its compiled country table.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from numbering_plan import NumberingPlan, NumberingPlanEngine  # noqa: E402
+from polish_mobile_validator import PolishMobileValidator  # noqa: E402
+
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Mobileprefix_corrected.csv')
+
+# Small synthetic plans for neighbouring countries
+FOREIGN_PLANS = (
+    ('420', 9, 'CZ', {'60': 'Operator CZ-1', '72': 'Operator CZ-2', '77': 'Operator CZ-3', '79': 'Operator CZ-3'}),
+    ('421', 9, 'SK', {'90': 'Operator SK-1', '91': 'Operator SK-2', '94': 'Operator SK-3'}),
+    ('49', (10, 11), 'DE', {'151': 'Operator DE-1', '160': 'Operator DE-1', '176': 'Operator DE-2',
+                            '157': 'Operator DE-3'}),
+    ('370', 8, 'LT', {'6': 'Operator LT-1'}),
+    ('380', 9, 'UA', {'50': 'Operator UA-1', '67': 'Operator UA-2', '93': 'Operator UA-3'}),
+)
+
+
+def make_numbers(count: int, foreign: float, seed: int) -> list:
+    """Polish numbers in the usual notations, with a share of foreign numbers in international form."""
+    rng = random.Random(seed)
+    polish = ('50', '51', '53', '57', '60', '66', '69', '72', '79', '88', '21', '99')
+    numbers = []
+    for _ in range(count):
+        if rng.random() < foreign:
+            country_code, lengths, _, prefixes = rng.choice(FOREIGN_PLANS)
+            length = rng.choice(lengths) if isinstance(lengths, tuple) else lengths
+            prefix = rng.choice(list(prefixes))
+            rest = ''.join(rng.choice('0123456789') for _ in range(length - len(prefix)))
+            numbers.append(f'+{country_code} {prefix}{rest}')
+        else:
+            digits = f'{rng.choice(polish)}{rng.randrange(10 ** 7):07d}'
+            numbers.append(digits if rng.random() < 0.7 else f'+48 {digits[:3]} {digits[3:6]} {digits[6:]}')
+    return numbers
+
+
+def sniffing(engines: dict, default, numbers) -> list:
+    """Per-country dispatch: try 1- to 3-digit country codes, then call that country's engine."""
+    results = []
+    for number in numbers:
+        engine = default
+        stripped = number.lstrip()
+        if stripped.startswith('+'):
+            digits = stripped[1:4].replace(' ', '')
+            for length in (1, 2, 3):
+                if digits[:length] in engines:
+                    engine = engines[digits[:length]]
+                    break
+        results.append(engine.recognize_operator(number))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure mixed-country numbering-plan dispatch.')
+    parser.add_argument('--numbers', type=int, default=500000, help='inputs (default: 500000)')
+    parser.add_argument('--foreign', type=float, default=0.3, help='share of foreign numbers (default: 0.3)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    args = parser.parse_args()
+
+    validator = PolishMobileValidator(CSV_PATH)
+    plans = [validator.numbering_plan()] + [
+        NumberingPlan(country_code, lengths, prefixes, region=region)
+        for country_code, lengths, region, prefixes in FOREIGN_PLANS
+    ]
+    started = time.perf_counter()
+    engine = NumberingPlanEngine(plans)
+    compile_time = time.perf_counter() - started
+    per_country = {plan.country_code: NumberingPlanEngine([plan, plans[0]]) for plan in plans[1:]}
+    poland = NumberingPlanEngine(plans[:1])
+    numbers = make_numbers(args.numbers, args.foreign, args.seed)
+    print(f'{len(plans)} plans compiled into {len(engine):,} ranges and {len(engine.operator_names) - 1} '
+          f'operator names in {compile_time * 1000:.1f} ms\n')
+
+    variants = {
+        'PolishMobileValidator (Polish only)': lambda: validator.batch_validate(numbers),
+        'sniff + per-country engine': lambda: sniffing(per_country, poland, numbers),
+        'engine.batch_validate': lambda: engine.batch_validate(numbers),
+    }
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print('NumPy not installed; skipping batch_classify\n')
+    else:
+        variants['engine.batch_classify'] = lambda: engine.batch_classify(numbers)
+
+    print(f'{"variant":<38} {"numbers/s":>12}')
+    for name, run in variants.items():
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        print(f'{name:<38} {args.numbers / elapsed:12,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: memory of the prefix database and of large batch results
+Usage:
+    python benchmarks/bench_operators.py [--numbers 1000000] [--project 10000000]
+
+Allocations are counted with tracemalloc. The database is measured with one
+name string per CSV row (how rows were stored before operator names were
+interned) and as loaded now. Batch results are measured per number on
+--numbers inputs and projected to --project numbers; the inputs themselves
+are allocated before tracing starts and are not counted.
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from polish_mobile_validator import PolishMobileValidator, iter_prefix_rows, read_prefix_csv  # noqa: E402
+
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Mobileprefix_corrected.csv')
+
+
+def traced(build):
+    """Run build() and return its result, the bytes it left allocated and the seconds it took."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, allocated, elapsed
+
+
+def per_row_names(csv_path: str) -> dict:
+    """Prefix database with a separate copy of the operator name for every row."""
+    return {prefix: (operator + ' ')[:-1] for prefix, operator in iter_prefix_rows(csv_path)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure database and batch-result memory.')
+    parser.add_argument('--numbers', type=int, default=1000000, help='numbers to classify (default: 1000000)')
+    parser.add_argument('--project', type=int, default=10000000, help='batch size to project to (default: 10000000)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    args = parser.parse_args()
+
+    # A warm-up read keeps one-time reader allocations out of the figures. Interned
+    # names are measured first so that the copies measured second do not count them
+    per_row_names(CSV_PATH)
+    print(f'{"prefix database":<40} {"bytes":>12}')
+    databases = []
+    for name, build in (('interned names', lambda: read_prefix_csv(CSV_PATH)),
+                        ('one name string per row', lambda: per_row_names(CSV_PATH))):
+        database, allocated, _ = traced(build)
+        databases.append(database)
+        print(f'{name:<40} {allocated:12,}')
+    validator = PolishMobileValidator(CSV_PATH)
+    _, allocated, _ = traced(validator.operator_registry)
+    print(f'{"operator registry":<40} {allocated:12,}')
+    print(f'{"compiled prefix index":<40} {validator.get_prefix_index().slots.itemsize * 10 ** 6:12,}\n')
+
+    rng = random.Random(args.seed)
+    prefixes = ('50', '51', '53', '57', '60', '66', '69', '72', '79', '88', '21', '99')
+    numbers = [f'{rng.choice(prefixes)}{rng.randrange(10 ** 7):07d}' for _ in range(args.numbers)]
+
+    variants = {
+        'batch_validate (dicts)': lambda: validator.batch_validate(numbers),
+        'batch_recognize (RecognitionResult)': lambda: validator.batch_recognize(numbers),
+        'batch_recognize_ids (registry IDs)': lambda: validator.batch_recognize_ids(numbers),
+    }
+    try:
+        import numpy
+    except ImportError:
+        print('NumPy not installed; skipping batch_classify\n')
+    else:
+        encoded = numpy.array(numbers, dtype='S9')
+        variants['batch_classify (NumPy codes)'] = lambda: validator.batch_classify(encoded)
+
+    print(f'{"variant":<40} {"bytes/number":>12} {"projected":>12} {"numbers/s":>12}')
+    for name, build in variants.items():
+        result, allocated, elapsed = traced(build)
+        del result
+        per_number = allocated / args.numbers
+        print(f'{name:<40} {per_number:12.1f} {per_number * args.project / 2 ** 20:10,.0f}MB '
+              f'{args.numbers / elapsed:12,.0f}')
+
+
+if __name__ == '__main__':
+    main()
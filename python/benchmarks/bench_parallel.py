@@ -0,0 +1,58 @@
+"""
+Benchmark: parallel batch_validate scaling from 1 to N worker processes
+
+Usage:
+    python benchmarks/bench_parallel.py [--numbers 1000000] [--max-workers 8] [--chunk-size 20000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from polish_mobile_validator import PolishMobileValidator  # noqa: E402
+from parallel import ParallelValidatorPool  # noqa: E402
+
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Mobileprefix_corrected.csv')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure parallel batch_validate scaling.')
+    parser.add_argument('--numbers', type=int, default=1000000, help='batch size (default: 1000000)')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1,
+                        help='largest worker count to measure (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=20000, help='numbers per task (default: 20000)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    numbers = [str(rng.randrange(2 * 10 ** 8, 9 * 10 ** 8)) for _ in range(args.numbers)]
+    validator = PolishMobileValidator(CSV_PATH)
+
+    started = time.perf_counter()
+    validator.batch_validate(numbers)
+    serial = time.perf_counter() - started
+    print(f'{"workers":>8} {"seconds":>9} {"numbers/s":>12} {"speedup":>8}')
+    print(f'{"serial":>8} {serial:9.3f} {args.numbers / serial:12,.0f} {1.0:8.2f}')
+
+    counts = {args.max_workers}
+    workers = 1
+    while workers < args.max_workers:
+        counts.add(workers)
+        workers *= 2
+
+    for workers in sorted(counts):
+        with ParallelValidatorPool(validator, workers=workers, chunk_size=args.chunk_size) as pool:
+            pool.batch_validate(numbers[:workers])  # warm up the pool before timing
+            started = time.perf_counter()
+            pool.batch_validate(numbers)
+            elapsed = time.perf_counter() - started
+        print(f'{workers:>8} {elapsed:9.3f} {args.numbers / elapsed:12,.0f} {serial / elapsed:8.2f}')
+
+
+if __name__ == '__main__':
+    main()
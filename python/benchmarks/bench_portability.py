@@ -0,0 +1,121 @@
+"""
+Benchmark: memory, lookup speed and delta refresh time of the number-portability overlay
+
+Usage:
+    python benchmarks/bench_portability.py [--ported 2000000] [--delta 20000] [--lookups 200000]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from polish_mobile_validator import PolishMobileValidator  # noqa: E402
+from portability import PortabilityOverlay  # noqa: E402
+
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Mobileprefix_corrected.csv')
+OPERATORS = ('P4 Sp. z o.o.', 'Orange Polska S.A.', 'T-Mobile Polska S.A.', 'Polkomtel Sp. z o.o.')
+PREFIXES = (50, 51, 53, 57, 60, 66, 69, 72, 79, 88)
+
+
+def make_rows(count: int, seed: int) -> list:
+    """Random mobile numbers with a current operator."""
+    rng = random.Random(seed)
+    return [(rng.choice(PREFIXES) * 10 ** 7 + rng.randrange(10 ** 7), rng.choice(OPERATORS)) for _ in range(count)]
+
+
+def traced(build):
+    """Run build and return its result with the bytes it keeps allocated."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained
+
+
+def best_of(repeat: int, run) -> float:
+    """Fastest of repeat runs, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure the number-portability overlay.')
+    parser.add_argument('--ported', type=int, default=2000000, help='ported numbers (default: 2000000)')
+    parser.add_argument('--delta', type=int, default=20000, help='changes per daily delta (default: 20000)')
+    parser.add_argument('--lookups', type=int, default=200000, help='numbers looked up per run (default: 200000)')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measurement, best kept (default: 5)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    args = parser.parse_args()
+
+    rows = make_rows(args.ported, args.seed)
+    started = time.perf_counter()
+    overlay, heap_bytes = traced(lambda: PortabilityOverlay.from_rows(rows))
+    build_s = time.perf_counter() - started
+    reference, dict_bytes = traced(lambda: dict(rows))
+    count = len(overlay)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'ported.port')
+        overlay.save(path)
+        file_bytes = os.path.getsize(path)
+        mapped, mapped_heap = traced(lambda: PortabilityOverlay.load(path))
+
+        print(f'{count:,} ported numbers (built in {build_s:.2f}s)')
+        print(f'{"representation":<24} {"bytes":>14} {"bytes/number":>13}')
+        for label, size in (('dict (table only)', dict_bytes), ('overlay in memory', heap_bytes),
+                            ('overlay file', file_bytes), ('overlay mapped (heap)', mapped_heap)):
+            print(f'{label:<24} {size:14,} {size / count:13.2f}')
+
+        rng = random.Random(args.seed + 1)
+        hits = [number for number, _ in rng.sample(rows, min(args.lookups, len(rows)))]
+        misses = [rng.choice(PREFIXES) * 10 ** 7 + rng.randrange(10 ** 7) for _ in range(args.lookups)]
+        print(f'\n{"lookup":<32} {"ns/lookup":>10}')
+        for label, run in (
+            ('dict.get (hits)', lambda: [reference.get(n) for n in hits]),
+            ('overlay mapped (hits)', lambda: [mapped.lookup(n) for n in hits]),
+            ('overlay mapped (misses)', lambda: [mapped.lookup(n) for n in misses]),
+        ):
+            print(f'{label:<32} {best_of(args.repeat, run) * 1e9 / len(hits):10.0f}')
+
+        if os.path.exists(CSV_PATH):
+            validator = PolishMobileValidator(CSV_PATH)
+            numbers = [str(n) for n in hits[:len(hits) // 2] + misses[:len(misses) // 2]]
+            plain = best_of(args.repeat, lambda: [validator.recognize_operator(n) for n in numbers])
+            validator.attach_portability(mapped)
+            ported = best_of(args.repeat, lambda: [validator.recognize_operator(n) for n in numbers])
+            print(f'{"recognize_operator, no overlay":<32} {plain * 1e9 / len(numbers):10.0f}')
+            print(f'{"recognize_operator, overlay":<32} {ported * 1e9 / len(numbers):10.0f}')
+            try:
+                import numpy
+            except ImportError:
+                numpy = None
+            if numpy is not None:
+                array = numpy.array(numbers, dtype='S9')
+                seconds = best_of(args.repeat, lambda: validator.batch_classify(array))
+                print(f'{"batch_classify, overlay":<32} {seconds * 1e9 / len(numbers):10.0f}')
+            validator.attach_portability(None)
+
+        delta = [(number, None) for number, _ in rng.sample(rows, args.delta // 2)]
+        delta += make_rows(args.delta - len(delta), args.seed + 2)
+        apply_s = best_of(args.repeat, lambda: mapped.apply_delta(delta))
+        save_s = best_of(args.repeat, lambda: mapped.apply_delta(delta).save(path + '.new'))
+        print(f'\nDaily delta of {len(delta):,} changes: apply {apply_s * 1000:.1f} ms, '
+              f'apply + save {save_s * 1000:.1f} ms')
+        mapped.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: memory and throughput of result dicts versus compact result objects
+
+Usage:
+    python benchmarks/bench_results.py [--numbers 500000]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from polish_mobile_validator import PolishMobileValidator  # noqa: E402
+
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Mobileprefix_corrected.csv')
+
+
+def measure(label: str, batch, numbers: list) -> None:
+    """Report throughput, retained bytes per result and full-collection time."""
+    gc.collect()
+    started = time.perf_counter()
+    results = batch(numbers)
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    results = None
+    results = batch(numbers)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    gc.collect()
+    collect_ms = (time.perf_counter() - started) * 1000
+    print(f'{label:<28} {len(numbers) / elapsed:12,.0f} {retained / len(results):10.1f} {collect_ms:10.1f}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare result dicts with compact result objects.')
+    parser.add_argument('--numbers', type=int, default=500000, help='batch size (default: 500000)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    numbers = [str(rng.randrange(10 ** 8, 10 ** 9)) for _ in range(args.numbers)]
+    validator = PolishMobileValidator(CSV_PATH)
+
+    print(f'{"method":<28} {"numbers/s":>12} {"bytes/res":>10} {"gc ms":>10}')
+    measure('batch_validate (dict)', validator.batch_validate, numbers)
+    measure('batch_recognize (slots)', validator.batch_recognize, numbers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: throughput of the mmap scanner on a synthetic log versus a line-by-line regex scan
+
+Usage:
+    python benchmarks/bench_scanner.py [--megabytes 50] [--density 0.2]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from polish_mobile_validator import PolishMobileValidator  # noqa: E402
+from scanner import find_candidates, scan_file  # noqa: E402
+
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Mobileprefix_corrected.csv')
+LINE_PATTERN = re.compile(r'(?<![\w+])(?:\+?48[ \-]?)?\d{3}[ \-]?\d{3}[ \-]?\d{3}(?!\w)')
+
+
+def write_log(path: str, megabytes: int, density: float, seed: int) -> int:
+    """Write a log with timestamps, ids and amounts; density is the share of lines with a phone number."""
+    rng = random.Random(seed)
+    formats = ('{}', '+48{}', '+48 {} {} {}', '{}-{}-{}', '({}) {}', '48{}')
+    target = megabytes * 1000000
+    written = 0
+    with open(path, 'w', encoding='utf-8') as file:
+        while written < target:
+            lines = []
+            for _ in range(10000):
+                line = (f'2024-05-{rng.randrange(1, 29):02d} {rng.randrange(24):02d}:{rng.randrange(60):02d}:'
+                        f'{rng.randrange(60):02d}.{rng.randrange(1000):03d} INFO order={rng.randrange(10 ** 8)} '
+                        f'amount={rng.randrange(10 ** 5)}.{rng.randrange(100):02d} PLN status=ok')
+                if rng.random() < density:
+                    digits = f'{rng.choice((50, 51, 53, 60, 66, 69, 72, 79, 88))}{rng.randrange(10 ** 7):07d}'
+                    form = rng.choice(formats)
+                    if form.count('{}') == 3:
+                        number = form.format(digits[:3], digits[3:6], digits[6:])
+                    elif form.startswith('('):
+                        number = form.format(digits[:2], digits[2:])
+                    else:
+                        number = form.format(digits)
+                    line += f' klient tel. {number} oddzwonić'
+                lines.append(line)
+            chunk = '\n'.join(lines) + '\n'
+            file.write(chunk)
+            written += len(chunk.encode('utf-8'))
+    return os.path.getsize(path)
+
+
+def line_regex_scan(validator, path: str) -> int:
+    """The usual approach: read lines, regex them, recognize each match."""
+    found = 0
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            for match in LINE_PATTERN.finditer(line):
+                if validator.recognize_operator(match.group())['success']:
+                    found += 1
+    return found
+
+
+def timed(run) -> tuple:
+    """Result and seconds of one run."""
+    started = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure free-text scanning throughput.')
+    parser.add_argument('--megabytes', type=int, default=50, help='size of the synthetic log (default: 50)')
+    parser.add_argument('--density', type=float, default=0.2, help='share of lines with a number (default: 0.2)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    args = parser.parse_args()
+
+    validator = PolishMobileValidator(CSV_PATH)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'synthetic.log')
+        size = write_log(path, args.megabytes, args.density, args.seed)
+        print(f'{size / 1e6:,.1f} MB log, {args.density:.0%} of lines with a number\n')
+
+        def candidates_only():
+            with open(path, 'rb') as file:
+                return sum(1 for _ in find_candidates(file.read()))
+
+        variants = (
+            ('line regex + recognize_operator', lambda: line_regex_scan(validator, path)),
+            ('scanner candidates (bytes)', candidates_only),
+            ('scan_file (mmap + classify)', lambda: sum(1 for _ in scan_file(validator, path))),
+        )
+        print(f'{"variant":<34} {"MB/s":>8} {"numbers":>10}')
+        for name, run in variants:
+            found, seconds = timed(run)
+            print(f'{name:<34} {size / 1e6 / seconds:8.1f} {found:10,}')
+        print('\nThe line regex does not accept the parenthesized forms, so it finds fewer numbers.')
+
+
+if __name__ == '__main__':
+    main()
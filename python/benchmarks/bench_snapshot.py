@@ -0,0 +1,92 @@
+"""
+Benchmark: cold start and resident memory, CSV loading versus mmap snapshot loading
+
+Every measurement runs in a fresh interpreter, so it reflects what a short-lived
+worker pays on startup.
+
+Usage:
+    python benchmarks/bench_snapshot.py [--runs 10]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PYTHON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, PYTHON_DIR)
+
+from snapshot import compile_snapshot  # noqa: E402
+
+
+CSV_PATH = os.path.join(PYTHON_DIR, '..', 'Mobileprefix_corrected.csv')
+
+CHILD = """
+import json, os, resource, sys, time
+started = time.perf_counter()
+from polish_mobile_validator import PolishMobileValidator
+validator = PolishMobileValidator()
+mode, path = sys.argv[1], sys.argv[2]
+if mode == 'csv':
+    validator.load_prefix_database(path)
+elif mode == 'snapshot':
+    validator.load_snapshot(path)
+elif mode == 'snapshot-unverified':
+    validator.load_snapshot(path, verify=False)
+validator.recognize_operator('500123456')
+elapsed = time.perf_counter() - started
+try:
+    with open('/proc/self/statm') as statm:
+        rss_mb = int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+except OSError:
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10)
+print(json.dumps({'load_ms': elapsed * 1000, 'rss_mb': rss_mb}))
+"""
+
+
+def measure(mode: str, path: str, runs: int) -> dict:
+    """Run the child script several times and summarize the samples."""
+    load_ms, wall_ms, rss_mb = [], [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, '-c', CHILD, mode, path],
+            cwd=PYTHON_DIR, check=True, capture_output=True, text=True
+        ).stdout
+        wall_ms.append((time.perf_counter() - started) * 1000)
+        sample = json.loads(output)
+        load_ms.append(sample['load_ms'])
+        rss_mb.append(sample['rss_mb'])
+    return {
+        'load_ms': statistics.median(load_ms),
+        'process_ms': statistics.median(wall_ms),
+        'rss_mb': statistics.median(rss_mb),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare CSV and snapshot cold starts.')
+    parser.add_argument('--runs', type=int, default=10, help='fresh processes per mode (default: 10)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = os.path.join(directory, 'prefixes.snap')
+        compile_snapshot(CSV_PATH, snapshot_path)
+        results = {
+            'none': measure('none', '', args.runs),
+            'csv': measure('csv', CSV_PATH, args.runs),
+            'snapshot': measure('snapshot', snapshot_path, args.runs),
+            'snapshot-unverified': measure('snapshot-unverified', snapshot_path, args.runs),
+        }
+
+    print(f'{"mode":<20} {"import+load ms":>15} {"process ms":>11} {"RSS MB":>8}')
+    for mode, result in results.items():
+        print(f'{mode:<20} {result["load_ms"]:15.2f} {result["process_ms"]:11.1f} {result["rss_mb"]:8.1f}')
+
+
+if __name__ == '__main__':
+    main()
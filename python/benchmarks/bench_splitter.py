@@ -0,0 +1,101 @@
+"""
+Benchmark: splitting a number list into per-operator files, per line versus the parallel splitter
+
+Usage:
+    python benchmarks/bench_splitter.py [--numbers 2000000] [--workers 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from polish_mobile_validator import PolishMobileValidator  # noqa: E402
+from splitter import partition_filename, partition_label, split_file  # noqa: E402
+
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Mobileprefix_corrected.csv')
+
+
+def write_numbers(path: str, count: int, seed: int) -> None:
+    """Mostly valid numbers, some formatted, some invalid."""
+    rng = random.Random(seed)
+    prefixes = ('50', '51', '53', '57', '60', '66', '69', '72', '79', '88', '21', '99')
+    with open(path, 'w', encoding='utf-8') as file:
+        for _ in range(count):
+            digits = f'{rng.choice(prefixes)}{rng.randrange(10 ** 7):07d}'
+            file.write((digits if rng.random() < 0.7 else f'+48 {digits[:3]} {digits[3:6]} {digits[6:]}') + '\n')
+
+
+def split_per_line(validator, path: str, output_dir: str) -> int:
+    """The approach the splitter replaces: recognize_operator per line, append to open files."""
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = {}
+    rows = 0
+    try:
+        with open(path, encoding='utf-8') as source:
+            for line in source:
+                number = line.strip()
+                if not number:
+                    continue
+                label = partition_label(validator.recognize_operator(number))
+                if label not in outputs:
+                    outputs[label] = open(os.path.join(output_dir, partition_filename(label) + '.txt'), 'w',
+                                          encoding='utf-8')
+                outputs[label].write(line)
+                rows += 1
+    finally:
+        for output in outputs.values():
+            output.close()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure the partition-by-operator splitter.')
+    parser.add_argument('--numbers', type=int, default=2000000, help='input lines (default: 2000000)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='worker processes for the parallel runs (default: CPU count)')
+    parser.add_argument('--chunk-bytes', type=int, default=1 << 23, help='bytes per chunk (default: 8 MiB)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    args = parser.parse_args()
+
+    validator = PolishMobileValidator(CSV_PATH)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'numbers.txt')
+        write_numbers(path, args.numbers, args.seed)
+        size = os.path.getsize(path)
+        print(f'{args.numbers:,} numbers, {size / 1e6:,.1f} MB, {os.cpu_count()} CPUs\n')
+
+        variants = [
+            ('recognize_operator per line', lambda out: split_per_line(validator, path, out)),
+            ('split_file, 1 worker', lambda out: split_file(validator, path, out, workers=1,
+                                                            chunk_bytes=args.chunk_bytes).total_rows),
+        ]
+        if args.workers > 1:
+            for preserve_order in (False, True):
+                variants.append((
+                    f'split_file, {args.workers} workers{", ordered" if preserve_order else ""}',
+                    lambda out, ordered=preserve_order: split_file(
+                        validator, path, out, workers=args.workers, chunk_bytes=args.chunk_bytes,
+                        preserve_order=ordered
+                    ).total_rows,
+                ))
+
+        print(f'{"variant":<34} {"rows/s":>12} {"MB/s":>8}')
+        for number, (name, run) in enumerate(variants):
+            started = time.perf_counter()
+            rows = run(os.path.join(directory, f'out-{number}'))
+            elapsed = time.perf_counter() - started
+            print(f'{name:<34} {rows / elapsed:12,.0f} {size / 1e6 / elapsed:8.1f}')
+
+        report = split_file(validator, path, os.path.join(directory, 'report'), workers=args.workers,
+                            chunk_bytes=args.chunk_bytes)
+        print('\n' + report.summary().replace(directory + os.sep, ''))
+
+
+if __name__ == '__main__':
+    main()
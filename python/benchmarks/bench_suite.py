@@ -0,0 +1,390 @@
+"""
+Benchmark suite for the public PolishMobileValidator API
+Seeded synthetic datasets, throughput, latency percentiles, tracemalloc peaks and CSV load time,
+written to JSON and comparable against a saved baseline
+
+Usage:
+    python benchmarks/bench_suite.py -o baseline.json
+    python benchmarks/bench_suite.py --sizes 1k,100k,1M --methods recognize_operator,batch_validate
+    python benchmarks/bench_suite.py -o current.json --compare baseline.json
+    python benchmarks/bench_suite.py --current current.json --compare baseline.json   # no new run
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from polish_mobile_validator import PolishMobileValidator  # noqa: E402
+
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Mobileprefix_corrected.csv')
+SCHEMA_VERSION = 1
+DATASETS = ('clean', 'formatted', 'plus48', 'invalid', 'skewed')
+DEFAULT_SIZES = '1k,10k,100k'
+SIZE_SUFFIXES = {'k': 10 ** 3, 'm': 10 ** 6}
+SKEWED_POOL = 1000
+
+
+class Case(NamedTuple):
+    """One benchmarked method: scalar cases run per input, batch cases once per dataset."""
+
+    name: str
+    kind: str
+    build: Callable[[PolishMobileValidator], Callable]
+    prepare: Optional[Callable[[List[str]], list]] = None
+
+
+def _normalized(numbers: List[str]) -> List[str]:
+    return list(map(PolishMobileValidator().normalize_phone_number, numbers))
+
+
+def _national(numbers: List[str]) -> List[str]:
+    """9-digit normalized numbers, the documented input of find_detailed_operator."""
+    return [number for number in _normalized(numbers) if len(number) == 9 and number.isdigit()]
+
+
+def _cached_recognize(validator: PolishMobileValidator) -> Callable:
+    validator.enable_cache()
+    return validator.recognize_operator
+
+
+def _batch_classify(validator: PolishMobileValidator) -> Callable:
+    import numpy  # noqa: F401  (optional; ImportError skips the case)
+    return validator.batch_classify
+
+
+def _fixed_width(numbers: List[str]):
+    import numpy
+    return numpy.array(numbers, dtype='S')
+
+
+CASES = (
+    Case('normalize_phone_number', 'scalar', lambda v: v.normalize_phone_number),
+    Case('validate_phone_number', 'scalar', lambda v: v.validate_phone_number),
+    Case('recognize_operator', 'scalar', lambda v: v.recognize_operator),
+    Case('recognize_operator[cache]', 'scalar', _cached_recognize),
+    Case('recognize', 'scalar', lambda v: v.recognize),
+    Case('is_m2m_number', 'scalar', lambda v: v.is_m2m_number),
+    Case('format_phone_number', 'scalar', lambda v: v.format_phone_number),
+    Case('find_detailed_operator', 'scalar', lambda v: v.find_detailed_operator, _national),
+    Case('find_detailed_operator_reference', 'scalar', lambda v: v.find_detailed_operator_reference, _national),
+    Case('get_operator_by_prefix', 'scalar', lambda v: v.get_operator_by_prefix,
+         lambda numbers: [number[:2] for number in _normalized(numbers)]),
+    Case('normalize_phone_numbers', 'batch', lambda v: v.normalize_phone_numbers),
+    Case('batch_validate', 'batch', lambda v: v.batch_validate),
+    Case('batch_recognize', 'batch', lambda v: v.batch_recognize),
+    Case('batch_classify', 'batch', _batch_classify, _fixed_width),
+)
+PARALLEL_CASE = Case('parallel_batch_validate', 'batch', lambda v: v.parallel_batch_validate)
+
+
+def parse_size(text: str) -> int:
+    """Parse sizes such as 1000, 10k or 1M."""
+    text = text.strip().lower()
+    if text[-1:] in SIZE_SUFFIXES:
+        return int(float(text[:-1]) * SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+
+def make_dataset(kind: str, size: int, seed: int, prefixes: List[str]) -> List[str]:
+    """
+    Build a reproducible dataset.
+
+    Args:
+        kind: One of DATASETS
+        size: Number of inputs
+        seed: Random seed; the same seed, kind and size always give the same list
+        prefixes: Database prefixes used to build realistic valid numbers
+
+    Returns:
+        List of phone number strings
+    """
+    rng = random.Random(f'{seed}:{kind}:{size}')
+
+    def national() -> str:
+        prefix = rng.choice(prefixes)
+        return prefix + str(rng.randrange(10 ** (9 - len(prefix)))).zfill(9 - len(prefix))
+
+    if kind == 'clean':
+        return [national() for _ in range(size)]
+    if kind == 'formatted':
+        styles = (
+            lambda n: f'{n[:3]} {n[3:6]} {n[6:]}',
+            lambda n: f'{n[:3]}-{n[3:6]}-{n[6:]}',
+            lambda n: f'({n[:3]}) {n[3:6]}-{n[6:]}',
+            lambda n: f'{n[:2]} {n[2:5]} {n[5:7]} {n[7:]}',
+        )
+        return [rng.choice(styles)(national()) for _ in range(size)]
+    if kind == 'plus48':
+        styles = (lambda n: f'+48{n}', lambda n: f'+48 {n[:3]} {n[3:6]} {n[6:]}', lambda n: f'48{n}')
+        return [rng.choice(styles)(national()) for _ in range(size)]
+    if kind == 'invalid':
+        styles = (
+            lambda n: '99' + n[2:],
+            lambda n: n[:rng.randrange(3, 9)],
+            lambda n: n + str(rng.randrange(10)),
+            lambda n: f'{n[:3]}abc{n[3:]}',
+            lambda n: '',
+        )
+        return [rng.choice(styles)(national()) for _ in range(size)]
+    if kind == 'skewed':
+        pool = [national() for _ in range(min(size, SKEWED_POOL))]
+        weights = [1 / rank for rank in range(1, len(pool) + 1)]
+        return rng.choices(pool, weights, k=size)
+    raise ValueError(f'Unknown dataset: {kind}')
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50, p90 and p99 of samples (nearest rank)."""
+    samples = sorted(samples)
+    last = len(samples) - 1
+    return {f'p{p}': samples[min(last, int(round(p / 100 * last)))] for p in (50, 90, 99)}
+
+
+def measure_peak(run: Callable[[], object]) -> int:
+    """Peak traced allocation of one run, in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+
+def bench_scalar(function: Callable, inputs: list, repeat: int, latency_samples: int) -> Dict[str, float]:
+    """Throughput over the whole list plus per-call latency of a sample."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        [function(item) for item in inputs]
+        best = min(best, time.perf_counter() - started)
+
+    clock = time.perf_counter_ns
+    latencies = []
+    append = latencies.append
+    for item in inputs[:latency_samples]:
+        started = clock()
+        function(item)
+        append(clock() - started)
+
+    result = {'ops_per_s': len(inputs) / best, 'ns_per_op': best * 1e9 / len(inputs), 'latency_unit': 'call'}
+    result.update({f'{key}_ns': value for key, value in percentiles(latencies).items()})
+    result['peak_bytes'] = measure_peak(lambda: [function(item) for item in inputs])
+    return result
+
+
+def bench_batch(function: Callable, inputs: list, repeat: int) -> Dict[str, float]:
+    """Throughput and per-batch latency over repeated whole-list calls."""
+    timings = []
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter_ns()
+        function(inputs)
+        timings.append(time.perf_counter_ns() - started)
+    best = min(timings) / 1e9
+    result = {'ops_per_s': len(inputs) / best, 'ns_per_op': best * 1e9 / len(inputs), 'latency_unit': 'batch'}
+    result.update({f'{key}_ns': value for key, value in percentiles(timings).items()})
+    result['peak_bytes'] = measure_peak(lambda: function(inputs))
+    return result
+
+
+LOADERS = ('load_prefix_database', 'load_snapshot')
+
+
+def bench_loading(names: List[str], repeat: int) -> Dict[str, Dict[str, float]]:
+    """Time load_prefix_database and load_snapshot on the bundled CSV."""
+    from snapshot import compile_snapshot
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = os.path.join(directory, 'prefixes.snap')
+        compile_snapshot(CSV_PATH, snapshot_path)
+        loaders = {
+            'load_prefix_database': lambda v: v.load_prefix_database(CSV_PATH),
+            'load_snapshot': lambda v: v.load_snapshot(snapshot_path),
+        }
+        for name in names:
+            load = loaders[name]
+            timings = []
+            for _ in range(repeat):
+                validator = PolishMobileValidator()
+                started = time.perf_counter_ns()
+                load(validator)
+                timings.append(time.perf_counter_ns() - started)
+            result = {'seconds': min(timings) / 1e9, 'latency_unit': 'load'}
+            result.update({f'{key}_ns': value for key, value in percentiles(timings).items()})
+            result['peak_bytes'] = measure_peak(lambda: load(PolishMobileValidator()))
+            results[name] = result
+    return results
+
+
+def environment(args: argparse.Namespace) -> Dict[str, object]:
+    """Describe the machine and revision the numbers came from."""
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                  cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': numpy_version,
+        'revision': revision,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'seed': args.seed,
+        'repeat': args.repeat,
+    }
+
+
+def run_suite(args: argparse.Namespace) -> Dict[str, object]:
+    """Run the selected cases and return the JSON document."""
+    validator = PolishMobileValidator()
+    validator.load_prefix_database(CSV_PATH)
+    prefixes = sorted(validator.prefix_database)
+
+    cases = CASES + ((PARALLEL_CASE,) if args.parallel else ())
+    if args.methods:
+        wanted = set(args.methods.split(','))
+        cases = tuple(case for case in cases if case.name in wanted)
+    datasets = args.datasets.split(',') if args.datasets else DATASETS
+    sizes = [parse_size(size) for size in args.sizes.split(',')]
+
+    results: Dict[str, Dict[str, object]] = {}
+    for size in sizes:
+        for dataset in datasets:
+            numbers = make_dataset(dataset, size, args.seed, prefixes)
+            for case in cases:
+                subject = PolishMobileValidator()
+                subject.load_prefix_database(CSV_PATH)
+                try:
+                    function = case.build(subject)
+                except ImportError as e:
+                    print(f'skip {case.name}: {e}', file=sys.stderr)
+                    continue
+                inputs = case.prepare(numbers) if case.prepare else numbers
+                if not len(inputs):
+                    continue
+                if case.kind == 'scalar':
+                    result = bench_scalar(function, inputs, args.repeat, args.latency_samples)
+                else:
+                    result = bench_batch(function, inputs, args.repeat)
+                result.update({'method': case.name, 'dataset': dataset, 'size': size})
+                results[f'{case.name}|{dataset}|{size}'] = result
+                print(f'{case.name:<34} {dataset:<10} {size:>10,} {result["ops_per_s"]:>14,.0f}/s '
+                      f'p99 {result["p99_ns"] / 1000:>10.1f} us  peak {result["peak_bytes"] / 1024:>10,.0f} KiB',
+                      file=sys.stderr)
+
+    loaders = [name for name in LOADERS if not args.methods or name in args.methods.split(',')]
+    if loaders:
+        for name, result in bench_loading(loaders, args.load_repeat).items():
+            results[name] = dict(result, method=name)
+            print(f'{name:<34} {result["seconds"] * 1000:.2f} ms', file=sys.stderr)
+
+    return {'schema': SCHEMA_VERSION, 'environment': environment(args), 'results': results}
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object], threshold: float,
+            memory_threshold: float) -> List[str]:
+    """
+    Compare two result documents.
+
+    Args:
+        current: Document from the run under test
+        baseline: Saved baseline document
+        threshold: Allowed relative throughput loss (0.1 = 10 %)
+        memory_threshold: Allowed relative growth of peak memory
+
+    Returns:
+        Descriptions of the regressions found
+    """
+    regressions = []
+    print(f'{"benchmark":<50} {"baseline":>14} {"current":>14} {"change":>8}')
+    for key, old in sorted(baseline['results'].items()):
+        new = current['results'].get(key)
+        if new is None:
+            continue
+        if 'ops_per_s' in old:
+            label, before, after, higher_is_better = 'ops/s', old['ops_per_s'], new['ops_per_s'], True
+        else:
+            label, before, after, higher_is_better = 'seconds', old['seconds'], new['seconds'], False
+        change = after / before - 1 if before else 0.0
+        slower = -change if higher_is_better else change
+        flag = ''
+        if slower > threshold:
+            flag = '  REGRESSION'
+            regressions.append(f'{key}: {label} {before:,.6g} -> {after:,.6g} ({change:+.1%})')
+        memory_growth = new['peak_bytes'] / old['peak_bytes'] - 1 if old['peak_bytes'] else 0.0
+        if memory_growth > memory_threshold:
+            flag += '  MEMORY'
+            regressions.append(f'{key}: peak {old["peak_bytes"]:,} -> {new["peak_bytes"]:,} bytes '
+                               f'({memory_growth:+.1%})')
+        print(f'{key:<50} {before:>14,.6g} {after:>14,.6g} {change:>+8.1%}{flag}')
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the PolishMobileValidator public API.')
+    parser.add_argument('-o', '--output', help='write results JSON to this file')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f'comma-separated input counts, 1k to 10M '
+                                                               f'(default: {DEFAULT_SIZES})')
+    parser.add_argument('--datasets', help=f'comma-separated subset of {",".join(DATASETS)}')
+    parser.add_argument('--methods', help='comma-separated subset of method names')
+    parser.add_argument('--parallel', action='store_true', help='include parallel_batch_validate')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per measurement (default: 3)')
+    parser.add_argument('--load-repeat', type=int, default=20, help='CSV/snapshot loads timed (default: 20)')
+    parser.add_argument('--latency-samples', type=int, default=100000,
+                        help='per-call timings taken for latency percentiles (default: 100000)')
+    parser.add_argument('--seed', type=int, default=1, help='dataset seed (default: 1)')
+    parser.add_argument('--compare', metavar='BASELINE', help='flag regressions against a saved results file')
+    parser.add_argument('--current', help='compare this saved results file instead of running the suite')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='relative slowdown reported as a regression (default: 0.10)')
+    parser.add_argument('--memory-threshold', type=float, default=0.20,
+                        help='relative peak memory growth reported as a regression (default: 0.20)')
+    args = parser.parse_args()
+
+    if args.current:
+        with open(args.current, encoding='utf-8') as file:
+            document = json.load(file)
+    else:
+        document = run_suite(args)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as file:
+                json.dump(document, file, indent=2, sort_keys=True)
+            print(f'Wrote {len(document["results"])} results to {args.output}', file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare(document, baseline, args.threshold, args.memory_threshold)
+        if regressions:
+            print(f'\n{len(regressions)} regression(s):')
+            for regression in regressions:
+                print(f'  {regression}')
+            return 1
+        print('\nNo regressions.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Benchmark: thread scaling of a shared CompiledValidator versus one validator per thread
+Usage:
+    python benchmarks/bench_threads.py [--numbers 400000] [--threads 1,2,4,8]
+    python3.13t benchmarks/bench_threads.py      # free-threaded build
+
+The baseline is what callers did before: every thread builds its own
+PolishMobileValidator from the CSV and validates its share of the input.
+The shared variant freezes one validator and runs ThreadValidatorPool over
+it. Under the GIL both stay flat however many threads run; on a
+free-threaded build the shared validator scales with cores, because its
+lookups take no locks and write no shared state.
+"""
+
+import argparse
+import os
+import platform
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from compiled_validator import ThreadValidatorPool  # noqa: E402
+from polish_mobile_validator import PolishMobileValidator  # noqa: E402
+
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Mobileprefix_corrected.csv')
+
+
+def make_numbers(count: int, seed: int) -> list:
+    """Polish numbers in the usual notations."""
+    rng = random.Random(seed)
+    prefixes = ('50', '51', '53', '57', '60', '66', '69', '72', '79', '88', '21', '99')
+    numbers = []
+    for _ in range(count):
+        digits = f'{rng.choice(prefixes)}{rng.randrange(10 ** 7):07d}'
+        numbers.append(digits if rng.random() < 0.7 else f'+48 {digits[:3]} {digits[3:6]} {digits[6:]}')
+    return numbers
+
+
+def per_thread_validators(numbers: list, threads: int) -> float:
+    """Each thread loads the CSV into its own validator and validates its share; returns seconds."""
+    share = -(-len(numbers) // threads)
+    start = threading.Barrier(threads + 1)
+
+    def work(part):
+        start.wait()
+        PolishMobileValidator(CSV_PATH).batch_validate(part)
+
+    workers = [threading.Thread(target=work, args=(numbers[i:i + share],)) for i in range(0, len(numbers), share)]
+    for worker in workers:
+        worker.start()
+    started = time.perf_counter()
+    start.wait()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - started
+
+
+def shared_pool(pool: ThreadValidatorPool, numbers: list) -> float:
+    """Validate through the pool's shared CompiledValidator; returns seconds."""
+    started = time.perf_counter()
+    pool.batch_validate(numbers)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure thread scaling of validation.')
+    parser.add_argument('--numbers', type=int, default=400000, help='numbers per run (default: 400000)')
+    parser.add_argument('--threads', default='1,2,4,8', help='comma-separated thread counts (default: 1,2,4,8)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    args = parser.parse_args()
+    thread_counts = [int(count) for count in args.threads.split(',')]
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f'Python {platform.python_version()} ({"GIL enabled" if gil else "free-threaded, GIL disabled"}), '
+          f'{os.cpu_count()} CPUs, {args.numbers:,} numbers\n')
+
+    numbers = make_numbers(args.numbers, args.seed)
+    compiled = PolishMobileValidator().freeze()
+    print(f'{"threads":>7} {"per-thread validators/s":>24} {"scaling":>8} {"shared compiled/s":>18} {"scaling":>8}')
+    baseline = shared = None
+    for threads in thread_counts:
+        own = args.numbers / per_thread_validators(numbers, threads)
+        chunk_size = max(1000, args.numbers // (threads * 8))
+        with ThreadValidatorPool(compiled, workers=threads, chunk_size=chunk_size) as pool:
+            pooled = args.numbers / shared_pool(pool, numbers)
+        baseline = baseline or own
+        shared = shared or pooled
+        print(f'{threads:>7} {own:24,.0f} {own / baseline:7.2f}x {pooled:18,.0f} {pooled / shared:7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+"""
+Load generator for lookup_server.py
+Drives pipelined keep-alive HTTP or Unix socket connections and reports QPS and latency
+
+Usage:
+    python benchmarks/load_generator.py                       # starts a local server itself
+    python benchmarks/load_generator.py --http 127.0.0.1:8080 --connections 32 --pipeline 16
+    python benchmarks/load_generator.py --unix /tmp/polish-mobile.sock --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from lookup_server import percentile  # noqa: E402
+
+
+SERVER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lookup_server.py')
+
+
+def make_numbers(count: int, seed: int = 0) -> list:
+    """Mix of clean, formatted and invalid numbers."""
+    rng = random.Random(seed)
+    numbers = []
+    for _ in range(count):
+        digits = f'{rng.choice((50, 51, 53, 60, 69, 72, 79, 88, 21, 99))}{rng.randrange(10 ** 7):07d}'
+        numbers.append(rng.choice((digits, f'+48 {digits[:3]} {digits[3:6]} {digits[6:]}', f'48{digits}')))
+    return numbers
+
+
+async def read_http_response(reader: asyncio.StreamReader) -> bytes:
+    """Read one HTTP response body."""
+    await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        if line[:15].lower() == b'content-length:':
+            length = int(line[15:])
+    return await reader.readexactly(length)
+
+
+async def run_connection(open_connection, protocol: str, numbers: list, pipeline: int,
+                         deadline: float, latencies: list) -> None:
+    """Keep `pipeline` requests in flight on one connection until the deadline."""
+    reader, writer = await open_connection()
+    rng = random.Random(id(writer))
+    try:
+        while time.perf_counter() < deadline:
+            batch = [rng.choice(numbers) for _ in range(pipeline)]
+            if protocol == 'http':
+                payload = b''.join(
+                    b'GET /recognize?number=%s HTTP/1.1\r\nHost: load\r\n\r\n' % number.replace(' ', '%20').replace(
+                        '+', '%2B').encode('ascii') for number in batch
+                )
+            else:
+                payload = ''.join(number + '\n' for number in batch).encode('ascii')
+            started = time.perf_counter()
+            writer.write(payload)
+            for _ in batch:
+                if protocol == 'http':
+                    await read_http_response(reader)
+                else:
+                    await reader.readline()
+                latencies.append(time.perf_counter() - started)
+    finally:
+        writer.close()
+
+
+async def fetch_server_stats(open_connection, protocol: str) -> dict:
+    """Ask the server for its own QPS and latency figures."""
+    reader, writer = await open_connection()
+    try:
+        if protocol == 'http':
+            writer.write(b'GET /stats HTTP/1.1\r\nConnection: close\r\n\r\n')
+            return json.loads(await read_http_response(reader))
+        writer.write(b'STATS\n')
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+
+
+async def generate_load(args: argparse.Namespace, host: str, port: int) -> None:
+    if args.unix:
+        protocol = 'unix'
+
+        def open_connection():
+            return asyncio.open_unix_connection(args.unix)
+    else:
+        protocol = 'http'
+
+        def open_connection():
+            return asyncio.open_connection(host, port)
+
+    numbers = make_numbers(10000, args.seed)
+    latencies: list = []
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*(
+        run_connection(open_connection, protocol, numbers, args.pipeline, deadline, latencies)
+        for _ in range(args.connections)
+    ))
+    elapsed = time.perf_counter() - started
+    server = await fetch_server_stats(open_connection, protocol)
+
+    latencies.sort()
+    print(f'Protocol:            {protocol}')
+    print(f'Connections:         {args.connections} x pipeline {args.pipeline}')
+    print(f'Requests:            {len(latencies):,} in {elapsed:.1f} s')
+    print(f'Client QPS:          {len(latencies) / elapsed:,.0f}')
+    print(f'Client p50 / p99:    {percentile(latencies, 50) * 1000:.2f} / {percentile(latencies, 99) * 1000:.2f} ms')
+    print(f'Server p50 / p99:    {server["p50_ms"]:.2f} / {server["p99_ms"]:.2f} ms')
+    print(f'Server mean batch:   {server["mean_batch_size"]:.1f}')
+
+
+def wait_for_server(args: argparse.Namespace, host: str, port: int, process: subprocess.Popen) -> None:
+    """Poll until the spawned server accepts connections."""
+    for _ in range(200):
+        if process.poll() is not None:
+            raise RuntimeError('lookup server exited during startup')
+        try:
+            if args.unix:
+                with socket.socket(socket.AF_UNIX) as probe:
+                    probe.connect(args.unix)
+            else:
+                socket.create_connection((host, port), timeout=0.1).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError('lookup server did not start')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Generate load against lookup_server.py.')
+    parser.add_argument('--http', help='target HTTP server host:port (default: start one locally)')
+    parser.add_argument('--unix', help='target Unix socket path')
+    parser.add_argument('--spawn', action='store_true', help='start a local server even when a target is given')
+    parser.add_argument('--connections', type=int, default=16)
+    parser.add_argument('--pipeline', type=int, default=8, help='requests in flight per connection')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds of load')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--batch-size', type=int, default=256, help='server micro-batch size when spawning')
+    args = parser.parse_args()
+
+    process = None
+    host, port = '127.0.0.1', 0
+    if args.http:
+        host, _, port_text = args.http.rpartition(':')
+        port = int(port_text)
+    if args.spawn or not (args.http or args.unix):
+        command = [sys.executable, SERVER_PATH, '--batch-size', str(args.batch_size)]
+        if args.unix:
+            command += ['--unix', args.unix]
+        else:
+            if not port:
+                with socket.socket() as probe:
+                    probe.bind((host, 0))
+                    port = probe.getsockname()[1]
+            command += ['--http', f'{host}:{port}']
+        process = subprocess.Popen(command)
+        wait_for_server(args, host, port, process)
+
+    try:
+        asyncio.run(generate_load(args, host, port))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,280 @@
+"""
+Immutable compiled validators for multi-threaded use
+A frozen snapshot of a PolishMobileValidator that any number of threads can share without locks
+
+Usage:
+    compiled = PolishMobileValidator().freeze()
+    compiled.recognize_operator('501234567')       # safe from any thread
+    with ThreadValidatorPool(compiled, workers=8) as pool:
+        results = pool.batch_validate(numbers)
+
+A PolishMobileValidator can be reconfigured while it is used (operator
+prefixes, caches, instrumentation, reloads), so sharing one between threads
+means reasoning about all of that state. freeze() copies the configuration
+into read-only tables and keeps the current PrefixTable and portability
+overlay, which are never modified after publication. Lookups only read
+these objects: there are no locks, caches or counters on the lookup path,
+so on a free-threaded (no-GIL) build threads classify in parallel. Reload
+or reconfigure the validator and call freeze() again to pick up changes.
+"""
+
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from normalization import normalize
+from results import RecognitionResult, RecognitionStatus
+
+
+LENGTH_MESSAGE = 'Polish mobile numbers must have exactly 9 digits'
+M2M_MESSAGE = 'Machine to Machine (M2M) connection'
+
+
+class CompiledValidator:
+    """
+    Read-only validator sharing one compiled prefix table between threads.
+
+    Answers recognize_operator, recognize, batch_validate, batch_recognize,
+    find_detailed_operator and find_current_operator exactly like the
+    validator it was frozen from (without result cache, instrumentation or
+    strict mode). Attributes cannot be reassigned.
+    """
+
+    __slots__ = ('table', 'valid_prefixes', 'operator_prefixes', 'prefix_database', '_index', '_overlay',
+                 '_prefixes', '_invalid_message')
+
+    def __init__(self, validator):
+        """
+        Freeze a validator's current configuration and prefix table.
+
+        Args:
+            validator: PolishMobileValidator to snapshot
+        """
+        index = validator.get_prefix_index()
+        table = validator.prefix_table
+        overlay = validator.get_portability_overlay()
+        if overlay is not None:
+            # Build the overlay's lazy bucket directory now, so lookups only read
+            overlay.lookup_id(0)
+
+        valid_prefixes = tuple(validator.valid_prefixes)
+        operator_prefixes = {operator: tuple(prefixes) for operator, prefixes in validator.operator_prefixes.items()}
+        prefixes: Dict[str, Tuple[str, str, bool, str]] = {}
+        for prefix in valid_prefixes:
+            operator = next((name for name, members in operator_prefixes.items() if prefix in members), 'Unknown')
+            is_m2m = prefix == '21' or prefix == '69'
+            prefixes[prefix] = (prefix, operator, is_m2m, M2M_MESSAGE if is_m2m else f'Operator: {operator}')
+
+        assign = object.__setattr__
+        assign(self, 'table', table)
+        assign(self, 'valid_prefixes', valid_prefixes)
+        assign(self, 'operator_prefixes', MappingProxyType(operator_prefixes))
+        assign(self, 'prefix_database', MappingProxyType(dict(table.prefix_database)))
+        assign(self, '_index', index)
+        assign(self, '_overlay', overlay)
+        assign(self, '_prefixes', prefixes)
+        assign(self, '_invalid_message', f'. Valid prefixes are: {", ".join(valid_prefixes)}')
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f'{type(self).__name__} is immutable; freeze the validator again instead')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __reduce__(self):
+        raise TypeError(f'{type(self).__name__} is shared between threads, not pickled; '
+                        'use parallel.ParallelValidatorPool for processes')
+
+    def find_detailed_operator(self, normalized: str) -> Optional[str]:
+        """
+        Find the detailed operator of a number from the prefix table alone.
+
+        Args:
+            normalized: Normalized 9-digit phone number
+
+        Returns:
+            Operator name of the longest matching prefix, or None
+        """
+        index = self._index
+        if index is None:
+            return None
+        if normalized.isascii():
+            return index.lookup(int(normalized))
+        database = self.prefix_database
+        for i in range(len(normalized), 1, -1):
+            if normalized[:i] in database:
+                return database[normalized[:i]]
+        return None
+
+    def find_current_operator(self, normalized: str) -> Optional[str]:
+        """
+        Find the operator currently serving a number: the portability overlay first, then the prefix table.
+
+        Args:
+            normalized: Normalized 9-digit phone number
+
+        Returns:
+            Operator name, or None
+        """
+        overlay = self._overlay
+        if overlay is not None:
+            operator = overlay.lookup(int(normalized))
+            if operator is not None:
+                return operator
+        return self.find_detailed_operator(normalized)
+
+    def recognize_operator(self, phone_number: str) -> Dict[str, Any]:
+        """
+        Recognize the operator of a phone number.
+
+        Args:
+            phone_number: Phone number to check
+
+        Returns:
+            Dictionary equal to PolishMobileValidator.recognize_operator's
+        """
+        normalized = normalize(phone_number)
+        if len(normalized) != 9:
+            return {'success': False, 'message': LENGTH_MESSAGE, 'phone_number': phone_number}
+        entry = self._prefixes.get(normalized[:2])
+        if entry is None:
+            return {'success': False, 'message': f'Invalid prefix: {normalized[:2]}{self._invalid_message}',
+                    'phone_number': phone_number}
+        prefix, operator, is_m2m, message = entry
+        return {
+            'success': True,
+            'phone_number': phone_number,
+            'normalized': normalized,
+            'prefix': prefix,
+            'operator': operator,
+            'detailed_operator': self.find_current_operator(normalized),
+            'is_m2m': is_m2m,
+            'message': message
+        }
+
+    def recognize(self, phone_number: str) -> RecognitionResult:
+        """
+        Recognize the operator, returning a compact result object.
+
+        Args:
+            phone_number: Phone number to check
+
+        Returns:
+            RecognitionResult equal to PolishMobileValidator.recognize's
+        """
+        normalized = normalize(phone_number)
+        if len(normalized) != 9:
+            return RecognitionResult(phone_number, normalized, RecognitionStatus.INVALID_LENGTH)
+        entry = self._prefixes.get(normalized[:2])
+        if entry is None:
+            return RecognitionResult(phone_number, normalized, RecognitionStatus.INVALID_PREFIX,
+                                     valid_prefixes=self.valid_prefixes)
+        return RecognitionResult(phone_number, normalized, RecognitionStatus.VALID, entry[1],
+                                 self.find_current_operator(normalized), entry[2])
+
+    def batch_validate(self, phone_numbers: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Recognize the operators of several phone numbers.
+
+        Args:
+            phone_numbers: Phone numbers
+
+        Returns:
+            List of recognize_operator results, in input order
+        """
+        return list(map(self.recognize_operator, phone_numbers))
+
+    def batch_recognize(self, phone_numbers: Sequence[str]) -> List[RecognitionResult]:
+        """
+        Recognize several phone numbers into compact result objects.
+
+        Args:
+            phone_numbers: Phone numbers
+
+        Returns:
+            List of RecognitionResult objects, in input order
+        """
+        return list(map(self.recognize, phone_numbers))
+
+
+class ThreadValidatorPool:
+    """
+    Thread pool classifying batches with one shared CompiledValidator.
+
+    The threads need no per-thread copy of the database and take no locks.
+    Under the GIL, lookups still run one at a time, so the pool mainly helps
+    on free-threaded builds or when callers overlap classification with I/O;
+    use parallel.ParallelValidatorPool for CPU scaling on standard builds.
+    Use as a context manager, or call close().
+    """
+
+    def __init__(self, validator, workers: Optional[int] = None, chunk_size: int = 10000):
+        """
+        Start the thread pool.
+
+        Args:
+            validator: CompiledValidator, or a PolishMobileValidator to freeze
+            workers: Number of threads (defaults to the CPU count)
+            chunk_size: Numbers classified per task
+        """
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be at least 1')
+        self.validator = validator if isinstance(validator, CompiledValidator) else CompiledValidator(validator)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='validator')
+
+    def _map(self, function: Callable[[Sequence[str]], List[Any]], phone_numbers: Sequence[str]) -> List[Any]:
+        chunks = [phone_numbers[i:i + self.chunk_size] for i in range(0, len(phone_numbers), self.chunk_size)]
+        results: List[Any] = []
+        for chunk_results in self._executor.map(function, chunks):
+            results.extend(chunk_results)
+        return results
+
+    def batch_validate(self, phone_numbers: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Validate numbers on the pool's threads.
+
+        Args:
+            phone_numbers: Sequence of phone numbers
+
+        Returns:
+            List of validation results, in input order
+        """
+        return self._map(self.validator.batch_validate, phone_numbers)
+
+    def batch_recognize(self, phone_numbers: Sequence[str]) -> List[RecognitionResult]:
+        """
+        Recognize numbers on the pool's threads into compact result objects.
+
+        Args:
+            phone_numbers: Sequence of phone numbers
+
+        Returns:
+            List of RecognitionResult objects, in input order
+        """
+        return self._map(self.validator.batch_recognize, phone_numbers)
+
+    def submit(self, function: Callable[..., Any], *args: Any) -> Future:
+        """
+        Run function(validator, *args) on a pool thread with the shared validator.
+
+        Args:
+            function: Callable taking the CompiledValidator first
+            *args: Further arguments
+
+        Returns:
+            Future for the function's result
+        """
+        return self._executor.submit(function, self.validator, *args)
+
+    def close(self) -> None:
+        """Wait for running tasks and stop the threads."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> 'ThreadValidatorPool':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,299 @@
+"""
+pandas and PyArrow integration for Polish mobile numbers
+Adds classification columns to Series and Arrow arrays by working on their buffers instead of row objects
+
+Usage:
+    from dataframes import classify_series, classify_arrow
+    frame = frame.join(classify_series(validator, frame['phone']))
+    table = classify_arrow(validator, table.column('phone'))
+
+Columns:
+    normalized          9-digit national number as a string, null when invalid
+    operator            main operator, categorical (pandas) or dictionary-encoded (Arrow)
+    detailed_operator   network from the prefix database, encoded like operator
+    is_m2m              M2M flag, null when invalid
+
+Accepted inputs are Arrow string, large_string, integer and dictionary
+arrays (chunked or not) and pandas Series of any string, integer, float or
+categorical dtype. String buffers are copied into fixed-width records and
+parsed by the same NumPy code as batch_classify, so results match it row for
+row. pandas and pyarrow are optional extras ("pip install pandas pyarrow");
+classify_series also works without pyarrow, but object columns then go
+through one normalize call per row.
+"""
+
+from typing import List, Tuple
+
+# Imported on first use so that importing the module does not pay for the extras
+np = None
+pa = None
+pd = None
+
+from normalization import normalize
+from vectorized import normalize_fixed_width, normalize_int_array, require_numpy
+
+
+OUTPUT_COLUMNS = ('normalized', 'operator', 'detailed_operator', 'is_m2m')
+ROWS_PER_PASS = 1 << 16
+MAX_RECORD_WIDTH = 64
+
+
+def require_pyarrow() -> None:
+    """Import PyArrow, raising an ImportError that explains how to enable Arrow support."""
+    global pa
+    require_numpy()
+    _load_numpy()
+    if pa is None:
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError(
+                'PyArrow is required for Arrow classification; install it with "pip install pyarrow"'
+            ) from None
+        pa = pyarrow
+
+
+def require_pandas() -> None:
+    """Import pandas, raising an ImportError that explains how to enable DataFrame support."""
+    global pd
+    require_numpy()
+    _load_numpy()
+    if pd is None:
+        try:
+            import pandas
+        except ImportError:
+            raise ImportError(
+                'pandas is required for Series classification; install it with "pip install pandas"'
+            ) from None
+        pd = pandas
+
+
+def _load_numpy() -> None:
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+
+
+def _has_pyarrow() -> bool:
+    try:
+        require_pyarrow()
+    except ImportError:
+        return False
+    return True
+
+
+def _string_records(offsets, data, width: int) -> 'np.ndarray':
+    """Copy variable-length strings into a zero-padded (rows, width) uint8 matrix, truncating longer ones."""
+    lengths = np.diff(offsets)
+    clipped = np.minimum(lengths, width)
+    records = np.zeros((len(lengths), width), dtype=np.uint8)
+    starts = np.cumsum(clipped) - clipped
+    copied = np.arange(int(clipped.sum()))
+    target = copied + np.repeat(np.arange(len(lengths)) * width - starts, clipped)
+    if np.array_equal(clipped, lengths):
+        source = data[offsets[0]:offsets[-1]]
+    else:
+        source = data[copied + np.repeat(offsets[:-1] - starts, clipped)]
+    records.reshape(-1)[target] = source
+    return records
+
+
+def _arrow_string_numbers(array) -> 'np.ndarray':
+    """National numbers parsed from the offsets and data buffers of an Arrow string array."""
+    if not pa.types.is_string(array.type) and not pa.types.is_large_string(array.type):
+        array = array.cast(pa.large_string())
+    _, offsets_buffer, data_buffer = array.buffers()
+    offset_type = np.int32 if pa.types.is_string(array.type) else np.int64
+    offsets = np.frombuffer(offsets_buffer, dtype=offset_type, count=len(array) + 1,
+                            offset=array.offset * np.dtype(offset_type).itemsize).astype(np.int64)
+    data = np.frombuffer(data_buffer, dtype=np.uint8) if data_buffer is not None else np.zeros(0, dtype=np.uint8)
+
+    national = np.empty(len(array), dtype=np.int64)
+    for start in range(0, len(array), ROWS_PER_PASS):
+        window = offsets[start:start + ROWS_PER_PASS + 1]
+        lengths = np.diff(window)
+        width = max(1, min(int(lengths.max(initial=0)), MAX_RECORD_WIDTH))
+        records = _string_records(window, data, width)
+        national[start:start + len(lengths)] = normalize_fixed_width(records)
+        # Overlong values (free text, say) and non-ASCII ones, which may hold
+        # Unicode digits, keep exact normalize semantics
+        exact = (lengths > MAX_RECORD_WIDTH) | (records >= 0x80).any(axis=1)
+        for row in (np.flatnonzero(exact) + start).tolist():
+            normalized = normalize(array[row].as_py())
+            national[row] = int(normalized) if len(normalized) == 9 and normalized.isascii() else -1
+    if array.null_count:
+        national[np.asarray(array.is_null())] = -1
+    return national
+
+
+def _arrow_numbers(array) -> 'np.ndarray':
+    """National numbers of one Arrow array, -1 where invalid or null."""
+    if pa.types.is_dictionary(array.type):
+        national = _arrow_numbers(array.dictionary)
+        indices = array.indices.fill_null(-1).to_numpy().astype(np.int64)
+        return np.where(indices >= 0, national[indices], -1)
+    if pa.types.is_integer(array.type):
+        return normalize_int_array(array.fill_null(-1).to_numpy())
+    if pa.types.is_floating(array.type):
+        values = array.fill_null(np.nan).to_numpy()
+        return _float_numbers(values)
+    if pa.types.is_null(array.type):
+        return np.full(len(array), -1, dtype=np.int64)
+    return _arrow_string_numbers(array)
+
+
+def _float_numbers(values) -> 'np.ndarray':
+    """National numbers from a float column, as read_csv produces for numbers with gaps."""
+    whole = np.isfinite(values) & (values == np.round(values))
+    return np.where(whole, normalize_int_array(np.where(whole, values, -1).astype(np.int64)), -1)
+
+
+def arrow_national_numbers(values) -> 'np.ndarray':
+    """
+    Parse an Arrow array into national numbers without building Python objects.
+
+    Args:
+        values: pyarrow Array or ChunkedArray of strings, integers or a dictionary of either
+
+    Returns:
+        int64 array of national numbers, -1 where the value is not a 9-digit number
+    """
+    require_pyarrow()
+    if isinstance(values, pa.ChunkedArray):
+        chunks = [_arrow_numbers(chunk) for chunk in values.chunks]
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int64)
+    return _arrow_numbers(values)
+
+
+def series_national_numbers(series) -> 'np.ndarray':
+    """
+    Parse a pandas Series into national numbers, reading its buffers where the dtype allows.
+
+    Args:
+        series: Series of strings, integers, floats or categories
+
+    Returns:
+        int64 array of national numbers, -1 where the value is not a 9-digit number
+    """
+    require_pandas()
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        national = series_national_numbers(pd.Series(series.cat.categories))
+        codes = series.cat.codes.to_numpy().astype(np.int64)
+        return np.where(codes >= 0, national[codes] if len(national) else -1, -1)
+    if pd.api.types.is_bool_dtype(dtype):
+        return np.full(len(series), -1, dtype=np.int64)
+    if pd.api.types.is_integer_dtype(dtype):
+        return normalize_int_array(series.to_numpy(dtype=np.int64, na_value=-1))
+    if pd.api.types.is_float_dtype(dtype):
+        return _float_numbers(series.to_numpy(dtype=np.float64, na_value=np.nan))
+    if hasattr(series.array, '__arrow_array__') and _has_pyarrow():
+        return arrow_national_numbers(pa.array(series.array))
+    if _has_pyarrow():
+        try:
+            return arrow_national_numbers(pa.array(series.to_numpy(dtype=object), type=pa.large_string(),
+                                                   from_pandas=True))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass  # mixed object columns fall through to normalize
+    national = np.full(len(series), -1, dtype=np.int64)
+    for row, value in enumerate(series.to_numpy(dtype=object)):
+        if isinstance(value, str) or (isinstance(value, (int, float)) and value == value):
+            normalized = normalize(value if isinstance(value, str) else str(int(value)))
+            if len(normalized) == 9 and normalized.isascii():
+                national[row] = int(normalized)
+    return national
+
+
+def _encoded(codes, names, present) -> Tuple['np.ndarray', List[str]]:
+    """Dictionary indices (-1 for missing) into de-duplicated names."""
+    unique = list(dict.fromkeys(name for name in names if name is not None))
+    remap = np.array([unique.index(name) if name is not None else -1 for name in names], dtype=np.int64)
+    return np.where(present, remap[codes], -1), unique
+
+
+def _classification(validator, national) -> Tuple['np.ndarray', 'np.ndarray', tuple, tuple]:
+    """Classify national numbers and encode both operator columns."""
+    batch = validator.batch_classify(national)
+    operators = _encoded(batch.operator, batch.operator_names, batch.valid)
+    detailed = _encoded(batch.detailed_operator, batch.detailed_operator_names, batch.valid)
+    return batch.valid, np.where(batch.valid, batch.is_m2m, False), operators, detailed
+
+
+def _normalized_strings(national, valid):
+    """An Arrow string array of 9-digit numbers built directly from its buffers."""
+    # Nine digits fit in uint32, which divides about twice as fast as int64
+    numbers = national[valid].astype(np.uint32)
+    columns = np.empty((9, len(numbers)), dtype=np.uint8)
+    for column in range(8, -1, -1):
+        quotient = numbers // 10
+        columns[column] = numbers - quotient * 10
+        numbers = quotient
+    columns += ord('0')
+    digits = np.ascontiguousarray(columns.T)
+    string_type, offset_type = (pa.string(), np.int32) if digits.size < 2 ** 31 else (pa.large_string(), np.int64)
+    offsets = np.zeros(len(valid) + 1, dtype=offset_type)
+    np.cumsum(valid * 9, out=offsets[1:])
+    bitmap = np.packbits(valid, bitorder='little')
+    return pa.Array.from_buffers(string_type, len(valid),
+                                 [pa.py_buffer(bitmap), pa.py_buffer(offsets), pa.py_buffer(digits)],
+                                 null_count=int(len(valid) - np.count_nonzero(valid)))
+
+
+def _dictionary_array(indices, names):
+    index_type = pa.int8() if len(names) < 2 ** 7 else pa.int16() if len(names) < 2 ** 15 else pa.int32()
+    return pa.DictionaryArray.from_arrays(pa.array(indices, type=index_type, mask=indices < 0),
+                                          pa.array(names, type=pa.string()))
+
+
+def classify_arrow(validator, values):
+    """
+    Classify an Arrow column into normalized, operator, detailed_operator and is_m2m columns.
+
+    Args:
+        validator: PolishMobileValidator used for classification
+        values: pyarrow Array or ChunkedArray of strings, integers or a dictionary of either
+
+    Returns:
+        pyarrow Table with OUTPUT_COLUMNS, one row per value
+    """
+    require_pyarrow()
+    national = arrow_national_numbers(values)
+    valid, is_m2m, operators, detailed = _classification(validator, national)
+    return pa.Table.from_arrays([
+        _normalized_strings(national, valid),
+        _dictionary_array(*operators),
+        _dictionary_array(*detailed),
+        pa.array(is_m2m, type=pa.bool_(), mask=~valid),
+    ], names=list(OUTPUT_COLUMNS))
+
+
+def classify_series(validator, series, prefix: str = ''):
+    """
+    Classify a pandas Series into normalized, operator, detailed_operator and is_m2m columns.
+
+    Operator columns are categoricals, is_m2m is a nullable boolean and
+    normalized is a string column (Arrow-backed when pyarrow is installed).
+
+    Args:
+        validator: PolishMobileValidator used for classification
+        series: Series of phone numbers as strings, integers, floats or categories
+        prefix: Prefix for the output column names
+
+    Returns:
+        DataFrame with OUTPUT_COLUMNS, aligned to the series index
+    """
+    require_pandas()
+    national = series_national_numbers(series)
+    valid, is_m2m, operators, detailed = _classification(validator, national)
+    if _has_pyarrow():
+        normalized = pd.arrays.ArrowStringArray(_normalized_strings(national, valid))
+    else:
+        normalized = pd.array(np.where(valid, national.astype('U9'), None), dtype='string')
+    columns = {
+        'normalized': normalized,
+        'operator': pd.Categorical.from_codes(*operators),
+        'detailed_operator': pd.Categorical.from_codes(*detailed),
+        'is_m2m': pd.arrays.BooleanArray(is_m2m, ~valid),
+    }
+    return pd.DataFrame({prefix + name: column for name, column in columns.items()}, index=series.index)
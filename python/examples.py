@@ -3,7 +3,6 @@ Example Usage of Polish Mobile Validator (Python)
 This file demonstrates the main features of the validator
 """
 
-import os
 from polish_mobile_validator import PolishMobileValidator
 
 
@@ -18,13 +17,9 @@ def main():
     print_separator()
     print()
 
-    # Initialize validator
+    # Initialize validator; the built-in prefix tables provide detailed operators without a CSV
     validator = PolishMobileValidator()
 
-    # Load CSV database for detailed information
-    csv_path = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
-    validator_with_db = PolishMobileValidator(csv_path)
-
     # Test phone numbers
     test_numbers = [
         {'number': '501234567', 'description': 'Orange number'},
@@ -104,12 +99,12 @@ def main():
     # Example 6: Database-Enhanced Recognition
     print('\n')
     print_separator()
-    print('EXAMPLE 6: Detailed Operator Recognition (with CSV database)')
+    print('EXAMPLE 6: Detailed Operator Recognition (built-in prefix database)')
     print_separator('-')
     detailed_test = ['500123456', '572123456', '660123456']
     print('\nRecognizing with detailed database information...')
     for number in detailed_test:
-        result = validator_with_db.recognize_operator(number)
+        result = validator.recognize_operator(number)
         if result['success']:
             print(f"\n  {number}:")
             print(f"    Main Operator: {result['operator']}")
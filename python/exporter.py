@@ -0,0 +1,534 @@
+"""
+Bulk formatting and export for classified Polish mobile numbers
+Writes E.164, international or spaced numbers with their operators to CSV, JSONL or Parquet
+
+Usage:
+    from exporter import BulkExporter, format_numbers
+    format_numbers(national, 'international')          # array([b'+48 501 234 567', ...])
+    with BulkExporter('numbers.jsonl', 'jsonl') as exporter:
+        exporter.write(validator.batch_classify(national))
+
+    python exporter.py numbers.txt -o numbers.csv --number-format international
+    python exporter.py numbers.txt -o numbers.parquet
+
+Columns:
+    number              valid number in the chosen format (e164, international, spaced, standard)
+    operator            main operator
+    detailed_operator   canonical network name (see operators), empty (CSV) or null when unmatched
+    is_m2m              M2M flag
+
+format_phone_number normalizes and slices one string per call. Here the
+digits of a whole batch of national numbers are written into a byte matrix
+with NumPy, and everything after the number is rendered once per distinct
+(operator, detailed operator, M2M) combination and copied into place, so
+CSV and JSONL rows are assembled as bytes without a Python string per
+field. Inputs are BatchClassification (from batch_classify, which accepts
+pre-normalized integer numbers) or RecognitionBatch (from
+batch_recognize_ids); only valid numbers are exported. NumPy is required,
+pyarrow only for Parquet ("pip install pyarrow").
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+import time
+from itertools import islice
+from typing import Any, BinaryIO, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+# Imported on first use so that importing the module does not pay for the extras
+np = None
+pa = None
+pq = None
+
+from operators import canonical_operator_name
+from results import RecognitionBatch, RecognitionStatus
+from vectorized import BatchClassification, as_national_numbers, require_numpy
+
+
+EXPORT_COLUMNS = ('number', 'operator', 'detailed_operator', 'is_m2m')
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+# '#' marks a digit of the national number
+NUMBER_FORMATS = {
+    'e164': '+48#########',
+    'international': '+48 ### ### ###',
+    'spaced': '### ### ###',
+    'standard': '#########',
+}
+ROWS_PER_PASS = 1 << 16
+NATIONAL_MIN = 10 ** 8
+NATIONAL_LIMIT = 10 ** 9
+
+
+class ExportColumns(NamedTuple):
+    """Valid rows of a classified batch, with operators as codes into name tables."""
+
+    national: 'np.ndarray'
+    operator: 'np.ndarray'
+    operator_names: Tuple[str, ...]
+    detailed_operator: 'np.ndarray'
+    detailed_operator_names: Tuple[Optional[str], ...]
+    is_m2m: 'np.ndarray'
+
+
+def require_parquet() -> None:
+    """Import PyArrow and its Parquet module, raising an ImportError that explains how to enable them."""
+    global pa, pq
+    if pq is None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError(
+                'PyArrow is required for Parquet export; install it with "pip install pyarrow"'
+            ) from None
+        pa, pq = pyarrow, pyarrow.parquet
+
+
+def _load_numpy() -> None:
+    global np
+    require_numpy()
+    if np is None:
+        import numpy
+        np = numpy
+
+
+def _template(number_format: str) -> Tuple[bytes, List[int]]:
+    """Template bytes of a number format and the columns its nine digits go to."""
+    try:
+        template = NUMBER_FORMATS[number_format]
+    except KeyError:
+        raise ValueError(f'Unknown number format: {number_format!r}; '
+                         f'expected one of {", ".join(NUMBER_FORMATS)}') from None
+    return template.encode('ascii'), [column for column, char in enumerate(template) if char == '#']
+
+
+def _write_digits(target, national, positions: List[int]) -> None:
+    """Write the ASCII digits of 9-digit numbers into the given columns of a uint8 matrix."""
+    # Nine digits fit in uint32, which divides about twice as fast as int64
+    numbers = national.astype(np.uint32)
+    for column in reversed(positions):
+        quotient = numbers // 10
+        target[:, column] = numbers - quotient * 10 + ord('0')
+        numbers = quotient
+
+
+def format_numbers(numbers, number_format: str = 'e164') -> 'np.ndarray':
+    """
+    Format a batch of pre-normalized numbers without one Python string per number.
+
+    Args:
+        numbers: National numbers as an integer array, or 9-digit strings or bytes
+            (a list, or a 'U' or 'S' array); 48-prefixed numbers are accepted too
+        number_format: One of NUMBER_FORMATS
+
+    Returns:
+        Fixed-width bytes array (dtype 'S'), b'' where a value is not a 9-digit number
+    """
+    _load_numpy()
+    template, positions = _template(number_format)
+    array = np.asarray(numbers)
+    if array.dtype.kind == 'U':
+        # Narrow code points to bytes; non-ASCII characters become skipped non-digits, as in batch_classify
+        points = array.reshape(-1, 1).view(np.uint32)
+        array = np.where(points < 128, points, ord('?')).astype(np.uint8).view(f'S{points.shape[1]}').reshape(-1)
+    national = as_national_numbers(array.reshape(-1))
+    valid = (national >= NATIONAL_MIN) & (national < NATIONAL_LIMIT)
+
+    matrix = np.empty((len(national), len(template)), dtype=np.uint8)
+    matrix[:] = np.frombuffer(template, dtype=np.uint8)
+    _write_digits(matrix, np.where(valid, national, 0), positions)
+    # Trailing NUL bytes are dropped by the 'S' dtype, leaving b''
+    matrix[~valid] = 0
+    return matrix.reshape(-1).view(f'S{len(template)}')
+
+
+def export_columns(results: Union[BatchClassification, RecognitionBatch]) -> ExportColumns:
+    """
+    Select the valid rows of classified results as exportable columns.
+
+    Args:
+        results: BatchClassification from batch_classify, or RecognitionBatch from batch_recognize_ids
+
+    Returns:
+        ExportColumns with one entry per valid number, in input order
+    """
+    _load_numpy()
+    if isinstance(results, BatchClassification):
+        valid = results.valid
+        detailed, detailed_names = _canonical_codes(results.detailed_operator[valid],
+                                                    results.detailed_operator_names)
+        return ExportColumns(results.normalized[valid], results.operator[valid], results.operator_names,
+                             detailed, detailed_names, results.is_m2m[valid])
+    if isinstance(results, RecognitionBatch):
+        valid = np.frombuffer(results.status, dtype=np.uint8) == RecognitionStatus.VALID
+        national = np.frombuffer(results.normalized, dtype=np.int64).copy()
+        # Valid numbers kept as strings (non-ASCII digits) still parse as integers
+        for position in np.flatnonzero(valid & (national < 0)):
+            national[position] = int(results.normalized_number(int(position)))
+        national = national[valid]
+        m2m = np.array([int(prefix) for prefix in results.m2m_prefixes], dtype=np.int64)
+        return ExportColumns(national, np.frombuffer(results.operator, dtype=np.uint8)[valid],
+                             results.operator_names,
+                             np.frombuffer(results.operator_id, dtype=np.uint16)[valid],
+                             results.registry.names, np.isin(national // 10 ** 7, m2m))
+    raise TypeError(f'Cannot export {type(results).__name__}; '
+                    'classify with batch_classify or batch_recognize_ids first')
+
+
+def _canonical_codes(codes, names: Sequence[Optional[str]]) -> Tuple['np.ndarray', Tuple[Optional[str], ...]]:
+    """
+    Re-key detailed operator codes to canonical operator names.
+
+    RecognitionBatch reports the registry's canonical names, so raw spellings
+    from the prefix CSV are canonicalized the same way and spellings that
+    collapse to one name share a code.
+    """
+    canonical = [canonical_operator_name(name) if name is not None else None for name in names]
+    unique = list(dict.fromkeys(canonical))
+    remap = np.array([unique.index(name) for name in canonical], dtype=np.uint16)
+    return remap[codes], tuple(unique)
+
+
+class _RowLayout(NamedTuple):
+    """How rows are assembled: constant head, formatted number, then a per-combination tail."""
+
+    head: bytes
+    template: bytes
+    positions: List[int]
+    render_tail: Any
+
+
+def _csv_tail(operator: str, detailed: Optional[str], is_m2m: bool) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerow(['', operator, detailed or '', 'true' if is_m2m else 'false'])
+    return buffer.getvalue().encode('utf-8')
+
+
+def _jsonl_tail(operator: str, detailed: Optional[str], is_m2m: bool) -> bytes:
+    fields = json.dumps({'operator': operator, 'detailed_operator': detailed, 'is_m2m': is_m2m},
+                        ensure_ascii=False, separators=(',', ':'))
+    return ('",' + fields[1:] + '\n').encode('utf-8')
+
+
+def _layout(export_format: str, number_format: str) -> _RowLayout:
+    template, positions = _template(number_format)
+    if export_format == 'csv':
+        return _RowLayout(b'', template, positions, _csv_tail)
+    return _RowLayout(b'{"number":"', template, positions, _jsonl_tail)
+
+
+def _tail_table(columns: ExportColumns, render_tail) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+    """
+    Render the row tail of every combination present in the batch.
+
+    Returns:
+        Combination key per row, padded tail matrix indexed by key and tail lengths by key
+    """
+    detailed_count = len(columns.detailed_operator_names)
+    keys = (columns.operator.astype(np.int64) * detailed_count + columns.detailed_operator) * 2 + columns.is_m2m
+    total = len(columns.operator_names) * detailed_count * 2
+    present = np.flatnonzero(np.bincount(keys, minlength=total))
+    tails = {}
+    for key in present.tolist():
+        combination, is_m2m = divmod(key, 2)
+        operator, detailed = divmod(combination, detailed_count)
+        tails[key] = render_tail(columns.operator_names[operator], columns.detailed_operator_names[detailed],
+                                 bool(is_m2m))
+    width = max(map(len, tails.values()), default=0)
+    matrix = np.zeros((total, width), dtype=np.uint8)
+    lengths = np.zeros(total, dtype=np.int64)
+    for key, tail in tails.items():
+        matrix[key, :len(tail)] = np.frombuffer(tail, dtype=np.uint8)
+        lengths[key] = len(tail)
+    return keys, matrix, lengths
+
+
+def _write_rows(output: BinaryIO, columns: ExportColumns, layout: _RowLayout) -> None:
+    """Assemble rows as one uint8 matrix per pass and write the bytes of each row up to its length."""
+    keys, tails, tail_lengths = _tail_table(columns, layout.render_tail)
+    number_start = len(layout.head)
+    tail_start = number_start + len(layout.template)
+    width = tail_start + tails.shape[1]
+    positions = [number_start + position for position in layout.positions]
+    prefix = np.frombuffer(layout.head + layout.template, dtype=np.uint8)
+    offsets = np.arange(width)
+
+    for start in range(0, len(keys), ROWS_PER_PASS):
+        stop = start + ROWS_PER_PASS
+        key = keys[start:stop]
+        rows = np.empty((len(key), width), dtype=np.uint8)
+        rows[:, :tail_start] = prefix
+        _write_digits(rows, columns.national[start:stop], positions)
+        rows[:, tail_start:] = tails[key]
+        # Boolean selection flattens row by row, dropping each row's padding
+        output.write(rows[offsets < (tail_start + tail_lengths[key])[:, None]].data)
+
+
+def arrow_schema():
+    """
+    Arrow schema of exported tables, the same for every batch.
+
+    Returns:
+        pyarrow Schema with EXPORT_COLUMNS
+    """
+    require_parquet()
+    operator_type = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([('number', pa.string()), ('operator', operator_type),
+                      ('detailed_operator', operator_type), ('is_m2m', pa.bool_())])
+
+
+def to_arrow(results: Union[BatchClassification, RecognitionBatch], number_format: str = 'e164'):
+    """
+    Build an Arrow table of the valid numbers with EXPORT_COLUMNS.
+
+    The number column is built from the formatted byte matrix and the
+    operator columns are dictionary-encoded, so no per-row objects are made.
+
+    Args:
+        results: BatchClassification or RecognitionBatch
+        number_format: One of NUMBER_FORMATS
+
+    Returns:
+        pyarrow Table with arrow_schema()
+    """
+    require_parquet()
+    columns = export_columns(results)
+    template, positions = _template(number_format)
+    width = len(template)
+    # Chunks keep the 32-bit string offsets of huge batches in range
+    chunk_rows = (2 ** 31 - 1) // width
+    numbers = []
+    for start in range(0, len(columns.national), chunk_rows):
+        national = columns.national[start:start + chunk_rows]
+        matrix = np.empty((len(national), width), dtype=np.uint8)
+        matrix[:] = np.frombuffer(template, dtype=np.uint8)
+        _write_digits(matrix, national, positions)
+        offsets = np.arange(len(national) + 1, dtype=np.int32) * width
+        numbers.append(pa.Array.from_buffers(pa.string(), len(national),
+                                             [None, pa.py_buffer(offsets), pa.py_buffer(matrix)]))
+    return pa.Table.from_arrays([
+        pa.chunked_array(numbers, type=pa.string()),
+        _dictionary_array(columns.operator, columns.operator_names),
+        _dictionary_array(columns.detailed_operator, columns.detailed_operator_names),
+        pa.array(columns.is_m2m, type=pa.bool_()),
+    ], schema=arrow_schema())
+
+
+def _dictionary_array(codes, names: Sequence[Optional[str]]):
+    """Dictionary-encode codes into names; codes of None names become nulls."""
+    missing = np.array([name is None for name in names], dtype=bool)
+    return pa.DictionaryArray.from_arrays(pa.array(codes.astype(np.int32), type=pa.int32(), mask=missing[codes]),
+                                          pa.array([name or '' for name in names], type=pa.string()))
+
+
+class BulkExporter:
+    """
+    Streaming writer of classified batches to CSV, JSONL or Parquet.
+
+    Each write() appends the valid numbers of one batch; the CSV header is
+    written before the first batch. Use as a context manager, or call close().
+    """
+
+    def __init__(self, output: Union[str, BinaryIO], export_format: Optional[str] = None,
+                 number_format: str = 'e164', header: bool = True):
+        """
+        Args:
+            output: Path, or binary file object (left open on close)
+            export_format: One of EXPORT_FORMATS; defaults to the path's extension, else 'csv'
+            number_format: One of NUMBER_FORMATS
+            header: Whether to start CSV output with a header row
+        """
+        export_format = export_format or infer_format(output)
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f'Unknown export format: {export_format!r}; expected one of {", ".join(EXPORT_FORMATS)}')
+        _template(number_format)
+        _load_numpy()
+        if export_format == 'parquet':
+            require_parquet()
+        self.export_format = export_format
+        self.number_format = number_format
+        self.rows = 0
+        self._closed = False
+        self._owns_output = isinstance(output, (str, os.PathLike))
+        self._output = output
+        self._parquet_writer = None
+        if export_format == 'parquet':
+            self._parquet_writer = pq.ParquetWriter(output, arrow_schema())
+        else:
+            self._layout = _layout(export_format, number_format)
+            if self._owns_output:
+                self._output = open(output, 'wb')
+            if header and export_format == 'csv':
+                self._output.write((','.join(EXPORT_COLUMNS) + '\n').encode('ascii'))
+
+    def write(self, results: Union[BatchClassification, RecognitionBatch]) -> int:
+        """
+        Append the valid numbers of a classified batch.
+
+        Args:
+            results: BatchClassification or RecognitionBatch
+
+        Returns:
+            Number of rows written
+        """
+        if self.export_format == 'parquet':
+            table = to_arrow(results, self.number_format)
+            self._parquet_writer.write_table(table)
+            rows = table.num_rows
+        else:
+            columns = export_columns(results)
+            _write_rows(self._output, columns, self._layout)
+            rows = len(columns.national)
+        self.rows += rows
+        return rows
+
+    def close(self) -> None:
+        """Finish the output; Parquet files are only complete after this."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        elif self._owns_output:
+            self._output.close()
+        else:
+            self._output.flush()
+
+    def __enter__(self) -> 'BulkExporter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def export(results: Union[BatchClassification, RecognitionBatch], output: Union[str, BinaryIO],
+           export_format: Optional[str] = None, number_format: str = 'e164', header: bool = True) -> int:
+    """
+    Export one classified batch.
+
+    Args:
+        results: BatchClassification or RecognitionBatch
+        output: Path, or binary file object
+        export_format: One of EXPORT_FORMATS; defaults to the path's extension, else 'csv'
+        number_format: One of NUMBER_FORMATS
+        header: Whether to start CSV output with a header row
+
+    Returns:
+        Number of rows written
+    """
+    with BulkExporter(output, export_format, number_format, header) as exporter:
+        return exporter.write(results)
+
+
+def infer_format(output: Union[str, BinaryIO]) -> str:
+    """
+    Pick the export format from an output path's extension.
+
+    Args:
+        output: Path or file object
+
+    Returns:
+        'jsonl' for .jsonl/.ndjson, 'parquet' for .parquet/.pq, otherwise 'csv'
+    """
+    if not isinstance(output, (str, os.PathLike)):
+        return 'csv'
+    extension = os.path.splitext(os.fspath(output))[1].lower()
+    return {'.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet', '.pq': 'parquet'}.get(extension, 'csv')
+
+
+def read_records(source: BinaryIO, rows: int):
+    """
+    Read one number per line into fixed-width byte arrays for batch_classify.
+
+    Args:
+        source: Binary input stream
+        rows: Lines per array
+
+    Yields:
+        Arrays of dtype 'S' holding up to ``rows`` lines each
+
+    Raises:
+        ValueError: If rows is less than 1
+    """
+    if rows < 1:
+        raise ValueError(f'rows must be at least 1, got {rows}')
+    _load_numpy()
+    while True:
+        lines = list(islice(source, rows))
+        if not lines:
+            return
+        yield np.array(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    import argparse  # only the command line needs it
+
+    from polish_mobile_validator import PolishMobileValidator
+
+    parser = argparse.ArgumentParser(description='Classify numbers and export the valid ones in bulk.')
+    parser.add_argument('input', help='file with one number per line, or - for stdin')
+    parser.add_argument('-o', '--output', default='-', help='output file (default: stdout)')
+    parser.add_argument('--output-format', choices=EXPORT_FORMATS,
+                        help='export format (default: from the output extension, else csv)')
+    parser.add_argument('--number-format', choices=tuple(NUMBER_FORMATS), default='e164',
+                        help='format of the number column (default: e164)')
+    parser.add_argument('--no-header', action='store_true', help='do not write a CSV header row')
+    parser.add_argument('--database', help='prefix database CSV for detailed_operator (default: built-in tables)')
+    parser.add_argument('--no-database', action='store_true', help='run without a prefix database, CSV or built-in')
+    parser.add_argument('--chunk-size', type=int, default=ROWS_PER_PASS * 4,
+                        help=f'numbers classified per batch (default: {ROWS_PER_PASS * 4})')
+    parser.add_argument('-q', '--quiet', action='store_true', help='do not print the throughput summary')
+    args = parser.parse_args(argv)
+
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be at least 1')
+    export_format = args.output_format or infer_format(args.output)
+    if export_format == 'parquet' and args.output == '-':
+        print('Error: Parquet output needs an output file', file=sys.stderr)
+        return 2
+
+    if args.database and not os.path.exists(args.database):
+        print(f'Error: prefix database not found: {args.database}', file=sys.stderr)
+        return 2
+    validator = PolishMobileValidator(builtin_prefixes=not args.no_database and not args.database)
+    if args.database and not args.no_database:
+        validator.load_prefix_database(args.database)
+
+    started = time.perf_counter()
+    try:
+        source = sys.stdin.buffer if args.input == '-' else open(args.input, 'rb')
+    except OSError as error:
+        print(f'Error: {error}', file=sys.stderr)
+        return 2
+    output = sys.stdout.buffer if args.output == '-' else args.output
+    try:
+        with BulkExporter(output, export_format, args.number_format, header=not args.no_header) as exporter:
+            for records in read_records(source, args.chunk_size):
+                exporter.write(validator.batch_classify(records))
+    except (ImportError, OSError) as error:
+        print(f'Error: {error}', file=sys.stderr)
+        return 2
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+
+    if not args.quiet:
+        elapsed = time.perf_counter() - started or 1e-9
+        print(f'Exported {exporter.rows:,} numbers as {export_format} in {elapsed:.2f}s '
+              f'({exporter.rows / elapsed:,.0f} rows/s)', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Prefix CSV file watcher
+Polls a prefix CSV and hot-reloads the validator when the file changes
+"""
+
+import os
+import threading
+from typing import Callable, Optional, Tuple
+
+
+class PrefixFileWatcher:
+    """
+    Background thread that calls reload_prefix_database when a CSV changes.
+
+    Changes are detected by polling the file's modification time and size,
+    which needs no platform-specific notification API. A change is only
+    reloaded once the file has looked the same for two consecutive polls, so
+    a file that is still being written is not read half-way. Failed reloads
+    leave the current prefix table in place.
+    """
+
+    def __init__(self, validator, csv_path: str, interval: float = 1.0, encoding: Optional[str] = None,
+                 on_reload: Optional[Callable] = None, on_error: Optional[Callable[[Exception], None]] = None):
+        """
+        Args:
+            validator: PolishMobileValidator to reload
+            csv_path: Path to the CSV file
+            interval: Seconds between polls
+            encoding: Text encoding of the file (detected when omitted)
+            on_reload: Called with each newly published PrefixTable
+            on_error: Called with the exception when a reload fails
+        """
+        self.validator = validator
+        self.csv_path = csv_path
+        self.interval = interval
+        self.encoding = encoding
+        self.on_reload = on_reload
+        self.on_error = on_error
+        self.reloads = 0
+        self.errors = 0
+        self._loaded = self._signature()
+        self._pending: Optional[Tuple[int, int]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.csv_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def check(self):
+        """
+        Poll the file once, reloading it if it changed and has settled.
+
+        Returns:
+            The newly published PrefixTable, or None when nothing was published
+        """
+        signature = self._signature()
+        if signature is None or signature == self._loaded:
+            self._pending = None
+            return None
+        if signature != self._pending:
+            self._pending = signature
+            return None
+
+        self._loaded = signature
+        self._pending = None
+        previous = self.validator.prefix_table
+        try:
+            table = self.validator.reload_prefix_database(self.csv_path, self.encoding)
+        except Exception as e:
+            self.errors += 1
+            if self.on_error is not None:
+                self.on_error(e)
+            return None
+        if table is previous:
+            return None
+        self.reloads += 1
+        if self.on_reload is not None:
+            self.on_reload(table)
+        return table
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self) -> 'PrefixFileWatcher':
+        """Start polling in a daemon thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='prefix-file-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop polling and wait for the thread to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'PrefixFileWatcher':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
@@ -0,0 +1,248 @@
+"""
+Frozen prefix modules
+Generates an importable Python module holding the compiled prefix tables, so validators need no CSV at runtime
+
+Usage:
+    python frozen_prefixes.py build ../Mobileprefix_corrected.csv prefix_data.py
+    python frozen_prefixes.py check ../Mobileprefix_corrected.csv prefix_data.py
+
+The generated module stores operator names, the source prefixes and the
+PrefixIndex slot table as tuple constants. The slot table is written as
+runs of equal operator IDs (a few hundred pairs instead of 10**DEPTH
+slots), which fill the table without sorting or expanding prefixes.
+Python caches the module as bytecode, so loading it unmarshals constants
+instead of parsing CSV text. SOURCE_SHA256 records the CSV the module was
+built from; ``check`` exits with status 1 when the module is stale.
+PolishMobileValidator() loads ``prefix_data`` when no csv_path is given.
+"""
+
+import importlib
+import os
+import sys
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from prefix_index import PrefixIndex
+from prefix_table import PrefixTable
+
+
+FORMAT_VERSION = 1
+DEFAULT_MODULE = 'prefix_data'
+
+
+class FrozenModuleError(ValueError):
+    """Raised when a frozen prefix module is from another format or index depth."""
+
+
+def _slot_runs(slots) -> Tuple[Tuple[int, int], ...]:
+    """(first slot, operator ID) for every run of equal slots."""
+    runs = []
+    previous = None
+    for slot, op_id in enumerate(slots):
+        if op_id != previous:
+            runs.append((slot, op_id))
+            previous = op_id
+    return tuple(runs)
+
+
+def render_module(prefix_database: Dict[str, str], source_name: str = '', source_sha256: str = '') -> str:
+    """
+    Render a prefix database as the source of a frozen prefix module.
+
+    Args:
+        prefix_database: Mapping of national prefixes to operator names
+        source_name: File name of the source CSV, recorded in the module
+        source_sha256: Hex SHA-256 of the source CSV, recorded in the module
+
+    Returns:
+        Python source text
+    """
+    index = PrefixIndex(prefix_database)
+    metadata = index.export_metadata()
+    # Names only used by prefixes the index skips follow the indexed ones
+    operators = list(index.operators)
+    ids = {name: op_id for op_id, name in enumerate(operators) if op_id}
+    prefixes = []
+    for prefix, operator in prefix_database.items():
+        if operator not in ids:
+            ids[operator] = len(operators)
+            operators.append(operator)
+        prefixes.append((prefix, ids[operator]))
+    long_prefixes = tuple((length, tuple(sorted(entries.items())))
+                          for length, entries in sorted(metadata['long_prefixes'].items()))
+
+    def constant(name: str, items: tuple) -> List[str]:
+        return [f'{name} = ('] + [f'    {item!r},' for item in items] + [')', '']
+
+    lines = [
+        '"""',
+        f'Frozen prefix tables generated from {source_name or "a prefix database"}',
+        'Do not edit; regenerate with: python frozen_prefixes.py build <csv> <module>',
+        '"""',
+        '',
+        f'FORMAT_VERSION = {FORMAT_VERSION}',
+        f'DEPTH = {PrefixIndex.DEPTH}',
+        f'SOURCE_NAME = {source_name!r}',
+        f'SOURCE_SHA256 = {source_sha256!r}',
+        f'INDEXED_OPERATORS = {len(index.operators)}',
+        '',
+    ]
+    lines += constant('OPERATORS', tuple(operators))
+    lines += constant('PREFIXES', tuple(prefixes))
+    lines += constant('SLOT_RUNS', _slot_runs(index.slots))
+    lines += constant('OVERFLOW_BASE', tuple(sorted(metadata['overflow_base'].items())))
+    lines += constant('LONG_PREFIXES', long_prefixes)
+    return '\n'.join(lines)
+
+
+def _hash_file(path: str) -> str:
+    """Hex SHA-256 digest of a file."""
+    import hashlib  # only needed when building or checking; keeps frozen loading lean
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_module(csv_path: str, module_path: str, encoding: Optional[str] = None) -> int:
+    """
+    Generate a frozen prefix module from a prefix CSV.
+
+    Args:
+        csv_path: Path to the prefix CSV
+        module_path: Path of the .py file to write
+        encoding: Text encoding of the CSV (detected when omitted)
+
+    Returns:
+        Number of prefixes written
+    """
+    from polish_mobile_validator import read_prefix_csv
+
+    prefix_database = read_prefix_csv(csv_path, encoding)
+    source = render_module(prefix_database, os.path.basename(csv_path), _hash_file(csv_path))
+    with open(module_path, 'w', encoding='utf-8', newline='\n') as file:
+        file.write(source)
+    return len(prefix_database)
+
+
+def is_current(csv_path: str, module) -> bool:
+    """
+    Check whether a frozen module was built from the current contents of a CSV.
+
+    Args:
+        csv_path: Path to the prefix CSV
+        module: Imported frozen prefix module
+
+    Returns:
+        True when the recorded SOURCE_SHA256 matches the file
+    """
+    return module.SOURCE_SHA256 == _hash_file(csv_path)
+
+
+def frozen_index(module) -> PrefixIndex:
+    """
+    Rebuild the PrefixIndex stored in a frozen module.
+
+    Args:
+        module: Imported frozen prefix module
+
+    Returns:
+        PrefixIndex equal to one compiled from the module's prefixes
+
+    Raises:
+        FrozenModuleError: If the module has another format version or index depth
+    """
+    if module.FORMAT_VERSION != FORMAT_VERSION:
+        raise FrozenModuleError(f'Unsupported frozen module version {module.FORMAT_VERSION} '
+                                f'(expected {FORMAT_VERSION})')
+    if module.DEPTH != PrefixIndex.DEPTH:
+        raise FrozenModuleError(f'Frozen module index depth {module.DEPTH} does not match {PrefixIndex.DEPTH}')
+
+    size = 10 ** PrefixIndex.DEPTH
+    slots = array('H', bytes(PrefixIndex.SLOTS_NBYTES))
+    runs = module.SLOT_RUNS
+    for position, (start, op_id) in enumerate(runs):
+        if op_id:
+            end = runs[position + 1][0] if position + 1 < len(runs) else size
+            slots[start:end] = array('H', [op_id]) * (end - start)
+    metadata = {
+        'size': len(module.PREFIXES),
+        'operators': tuple(sys.intern(name) if name else name
+                           for name in module.OPERATORS[:module.INDEXED_OPERATORS]),
+        'overflow_base': module.OVERFLOW_BASE,
+        'long_prefixes': dict(module.LONG_PREFIXES),
+    }
+    return PrefixIndex.from_buffer(slots, metadata)
+
+
+def load_frozen_table(module_name: str = DEFAULT_MODULE, version: int = 1) -> PrefixTable:
+    """
+    Import a frozen prefix module as a prefix table.
+
+    Args:
+        module_name: Importable name of the generated module
+        version: Version number of the new table
+
+    Returns:
+        PrefixTable with the module's prefix database and index
+
+    Raises:
+        ImportError: If the module cannot be imported
+        FrozenModuleError: If the module has another format version or index depth
+    """
+    module = importlib.import_module(module_name)
+    index = frozen_index(module)
+    operators = index.operators + tuple(sys.intern(name) for name in module.OPERATORS[module.INDEXED_OPERATORS:])
+    prefix_database = {prefix: operators[op_id] for prefix, op_id in module.PREFIXES}
+    return PrefixTable(prefix_database, index, version, getattr(module, '__file__', None), prefix_database.items)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    import argparse  # only the command line needs it; keeps frozen loading lean
+
+    parser = argparse.ArgumentParser(description='Build or check frozen prefix modules.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build_parser = commands.add_parser('build', help='generate a frozen module from a prefix CSV')
+    build_parser.add_argument('csv_path', help='prefix CSV, e.g. ../Mobileprefix_corrected.csv')
+    build_parser.add_argument('module_path', help='.py file to write, e.g. prefix_data.py')
+    build_parser.add_argument('--encoding', help='CSV text encoding (detected when omitted)')
+    check_parser = commands.add_parser('check', help='check that a frozen module matches its CSV')
+    check_parser.add_argument('csv_path', help='prefix CSV the module should be built from')
+    check_parser.add_argument('module_path', help='frozen module to check')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        count = build_module(args.csv_path, args.module_path, args.encoding)
+        print(f'Wrote {count} prefixes to {args.module_path}')
+        return 0
+
+    import importlib.util
+
+    try:
+        spec = importlib.util.spec_from_file_location('_frozen_check', args.module_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        current = is_current(args.csv_path, module)
+    except (OSError, AttributeError, SyntaxError) as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 2
+    if not current:
+        print(f'{args.module_path} is stale; rebuild it from {args.csv_path}')
+        return 1
+    print(f'{args.module_path} matches {args.csv_path}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Opt-in instrumentation for operator recognition
+Per-stage timers, prefix-probe histogram and slow-input sampling
+"""
+
+import heapq
+import threading
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+
+STAGES = ('normalize', 'cache', 'validate', 'prefix_match', 'build_result')
+
+
+class SlowSample(NamedTuple):
+    """One recognize_operator call that exceeded the slow threshold."""
+
+    phone_number: Any
+    normalized: str
+    elapsed_ns: int
+    stages: Dict[str, int]
+
+
+class Instrumentation:
+    """
+    Collects timings and counters for recognize_operator.
+
+    Stage times are cumulative nanoseconds from time.perf_counter_ns. Calls
+    slower than slow_threshold_ns are passed to slow_hook as SlowSample
+    objects, and the slowest calls seen are kept for stats().
+    """
+
+    def __init__(self, slow_hook: Optional[Callable[[SlowSample], None]] = None,
+                 slow_threshold_ns: int = 100000, keep_slowest: int = 10):
+        """
+        Create an empty collector.
+
+        Args:
+            slow_hook: Called with a SlowSample for every call slower than slow_threshold_ns
+            slow_threshold_ns: Threshold for slow_hook, in nanoseconds
+            keep_slowest: Number of slowest calls kept for stats()
+        """
+        self.slow_hook = slow_hook
+        self.slow_threshold_ns = slow_threshold_ns
+        self.keep_slowest = keep_slowest
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero every timer, counter and sample."""
+        with self._lock:
+            self.calls = 0
+            self.total_ns = 0
+            self.stage_ns = dict.fromkeys(STAGES, 0)
+            self.stage_calls = dict.fromkeys(STAGES, 0)
+            self.probe_histogram: Dict[int, int] = {}
+            self.cache_hits = 0
+            self._slowest: List[Tuple[int, int, SlowSample]] = []
+            self._sequence = 0
+
+    def record(self, phone_number: Any, normalized: str, stages: Dict[str, int],
+               elapsed_ns: int, probes: Optional[int] = None, cache_hit: bool = False) -> None:
+        """
+        Record one recognize_operator call.
+
+        Args:
+            phone_number: Input as given by the caller
+            normalized: Normalized number
+            stages: Nanoseconds spent per stage, for the stages that ran
+            elapsed_ns: Total nanoseconds of the call
+            probes: Prefix table probes needed by the longest-match lookup, if it ran
+            cache_hit: Whether the result came from the result cache
+        """
+        sample = None
+        with self._lock:
+            self.calls += 1
+            self.total_ns += elapsed_ns
+            for stage, nanoseconds in stages.items():
+                self.stage_ns[stage] += nanoseconds
+                self.stage_calls[stage] += 1
+            if probes is not None:
+                self.probe_histogram[probes] = self.probe_histogram.get(probes, 0) + 1
+            if cache_hit:
+                self.cache_hits += 1
+
+            slowest = self._slowest
+            if len(slowest) < self.keep_slowest or elapsed_ns > slowest[0][0]:
+                sample = SlowSample(phone_number, normalized, elapsed_ns, stages)
+                self._sequence += 1
+                entry = (elapsed_ns, self._sequence, sample)
+                if len(slowest) < self.keep_slowest:
+                    heapq.heappush(slowest, entry)
+                elif self.keep_slowest:
+                    heapq.heapreplace(slowest, entry)
+
+        if self.slow_hook is not None and elapsed_ns >= self.slow_threshold_ns:
+            self.slow_hook(sample or SlowSample(phone_number, normalized, elapsed_ns, stages))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Export a snapshot of the collected data.
+
+        Returns:
+            Dictionary with call and cache-hit counts, total and per-stage time
+            (calls, total_ns, mean_ns), the probe histogram, and the slowest
+            calls as dictionaries, slowest first
+        """
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'cache_hits': self.cache_hits,
+                'total_ns': self.total_ns,
+                'mean_ns': self.total_ns / self.calls if self.calls else 0.0,
+                'stages': {
+                    stage: {
+                        'calls': self.stage_calls[stage],
+                        'total_ns': self.stage_ns[stage],
+                        'mean_ns': self.stage_ns[stage] / self.stage_calls[stage] if self.stage_calls[stage] else 0.0,
+                    }
+                    for stage in STAGES
+                },
+                'probe_histogram': dict(sorted(self.probe_histogram.items())),
+                'slowest': [sample._asdict() for _, _, sample in sorted(self._slowest, reverse=True)],
+            }
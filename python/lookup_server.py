@@ -0,0 +1,482 @@
+"""
+asyncio lookup server for Polish mobile numbers
+Serves operator recognition over HTTP/JSON and a line-oriented Unix socket protocol,
+coalescing concurrent requests into micro-batches
+
+Usage:
+    python lookup_server.py --http 127.0.0.1:8080
+    python lookup_server.py --http 0.0.0.0:8080 --unix /tmp/polish-mobile.sock --batch-size 512
+
+HTTP endpoints (HTTP/1.1 keep-alive and pipelining are supported):
+    GET  /recognize?number=501234567     -> recognize_operator result
+    POST /recognize {"number": "..."}    -> recognize_operator result
+    POST /recognize {"numbers": [...]}   -> {"results": [...]}
+    GET  /stats                          -> QPS, latency percentiles and batching counters
+    GET  /health                         -> {"status": "ok"}
+
+Unix socket protocol: one number per line, one JSON result per line in the
+same order; the line STATS returns the stats object.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from polish_mobile_validator import PolishMobileValidator
+
+
+MAX_HEADER_LINES = 100
+MAX_BODY_BYTES = 1 << 20
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                413: 'Payload Too Large', 500: 'Internal Server Error', 501: 'Not Implemented'}
+
+
+class LatencyStats:
+    """Request counters with a bounded window of recent latencies."""
+
+    def __init__(self, window: int = 100000):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.batches = 0
+        self._latencies: deque = deque(maxlen=window)
+
+    def record_batch(self, latencies: List[float]) -> None:
+        """Record the latencies of one processed batch."""
+        self.batches += 1
+        self.requests += len(latencies)
+        self._latencies.extend(latencies)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Summarize the counters.
+
+        Returns:
+            Dictionary with request and batch counts, QPS, and p50/p99 latency in milliseconds
+        """
+        elapsed = time.perf_counter() - self.started
+        samples = sorted(self._latencies)
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+            'uptime_s': elapsed,
+            'qps': self.requests / elapsed if elapsed else 0.0,
+            'p50_ms': percentile(samples, 50) * 1000,
+            'p99_ms': percentile(samples, 99) * 1000,
+        }
+
+
+def percentile(samples: List[float], percent: float) -> float:
+    """
+    Nearest-rank percentile of sorted samples.
+
+    Args:
+        samples: Sorted samples
+        percent: Percentile between 0 and 100
+
+    Returns:
+        The percentile, or 0.0 for no samples
+    """
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(round(percent / 100 * (len(samples) - 1))))]
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent lookups into batches for batch_recognize.
+
+    Requests wait in a bounded queue; when it is full, submitters wait, which
+    stops connection handlers from reading further requests.
+    """
+
+    def __init__(self, validator: PolishMobileValidator, max_batch_size: int = 256,
+                 max_delay: float = 0.0005, max_queue: int = 10000):
+        """
+        Args:
+            validator: Validator used for recognition
+            max_batch_size: Largest batch handed to batch_recognize
+            max_delay: Seconds to wait for more requests before running a partial batch
+            max_queue: Pending lookups allowed before submitters wait
+        """
+        self.validator = validator
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+        self.stats = LatencyStats()
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Future] = None
+
+    def start(self) -> None:
+        """Start the batching task on the running event loop."""
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Stop the batching task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of lookups waiting to be batched."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def recognize(self, phone_number: Any) -> Dict[str, Any]:
+        """
+        Recognize one number as part of the next batch.
+
+        Args:
+            phone_number: Phone number to check
+
+        Returns:
+            recognize_operator result
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((phone_number, future, time.perf_counter()))
+        return await future
+
+    async def recognize_many(self, phone_numbers: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Recognize several numbers, in order.
+
+        Args:
+            phone_numbers: Phone numbers to check
+
+        Returns:
+            recognize_operator results
+        """
+        return list(await asyncio.gather(*(self.recognize(number) for number in phone_numbers)))
+
+    def _drain(self, batch: List[Tuple[Any, asyncio.Future, float]]) -> None:
+        """Move queued lookups into the batch without waiting."""
+        queue = self._queue
+        while len(batch) < self.max_batch_size and not queue.empty():
+            batch.append(queue.get_nowait())
+
+    async def _run(self) -> None:
+        """Collect and process batches until cancelled."""
+        while True:
+            batch = [await self._queue.get()]
+            self._drain(batch)
+            if len(batch) < self.max_batch_size and self.max_delay > 0:
+                await asyncio.sleep(self.max_delay)
+                self._drain(batch)
+
+            try:
+                results = [result.to_dict() for result in
+                           self.validator.batch_recognize([number for number, _, _ in batch])]
+            except Exception as error:
+                # Fail this batch's lookups, not the task every later lookup waits on
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            finished = time.perf_counter()
+            latencies = []
+            for (_, future, started), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+                latencies.append(finished - started)
+            self.stats.record_batch(latencies)
+
+
+class LookupServer:
+    """HTTP/JSON and Unix socket front end for a MicroBatcher."""
+
+    def __init__(self, validator: PolishMobileValidator, max_batch_size: int = 256,
+                 max_delay: float = 0.0005, max_queue: int = 10000, pipeline_depth: int = 128):
+        """
+        Args:
+            validator: Validator used for recognition
+            max_batch_size: Largest batch handed to batch_recognize
+            max_delay: Seconds to wait for more requests before running a partial batch
+            max_queue: Pending lookups allowed before connections stop reading
+            pipeline_depth: Requests in flight per connection before it stops reading
+        """
+        self.batcher = MicroBatcher(validator, max_batch_size, max_delay, max_queue)
+        self.pipeline_depth = pipeline_depth
+        self.http_port: Optional[int] = None
+        self._servers: List[asyncio.AbstractServer] = []
+        self._connections: set = set()
+
+    async def start(self, http_host: Optional[str] = None, http_port: Optional[int] = None,
+                    unix_path: Optional[str] = None) -> None:
+        """
+        Start listening.
+
+        Args:
+            http_host: Host for the HTTP listener
+            http_port: Port for the HTTP listener (0 picks a free port, see http_port)
+            unix_path: Path for the Unix socket listener
+        """
+        self.batcher.start()
+        if http_port is not None:
+            server = await asyncio.start_server(self._handle_http, http_host or '127.0.0.1', http_port)
+            self.http_port = server.sockets[0].getsockname()[1]
+            self._servers.append(server)
+        if unix_path is not None:
+            if os.path.exists(unix_path):
+                os.unlink(unix_path)
+            self._servers.append(await asyncio.start_unix_server(self._handle_unix, unix_path))
+
+    async def close(self) -> None:
+        """Stop listening and stop the batcher."""
+        for server in self._servers:
+            server.close()
+        for connection in list(self._connections):
+            connection.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers = []
+        await self.batcher.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        """Server statistics, including the current queue depth."""
+        stats = self.batcher.stats.snapshot()
+        stats['queue_depth'] = self.batcher.queue_depth
+        return stats
+
+    async def _pipeline(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, read_request) -> None:
+        """
+        Read requests and write their responses in order.
+
+        read_request returns (awaitable response bytes, keep_alive), or None at
+        end of stream. Responses are written by a separate task, so several
+        requests can be in flight on one connection.
+        """
+        responses: asyncio.Queue = asyncio.Queue(maxsize=self.pipeline_depth)
+
+        async def write_responses() -> None:
+            while True:
+                item = await responses.get()
+                if item is None:
+                    return
+                response, keep_alive = item
+                writer.write(await response)
+                await writer.drain()
+                if not keep_alive:
+                    return
+
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        writer_task = asyncio.ensure_future(write_responses())
+        try:
+            while not writer_task.done():
+                request = await read_request(reader)
+                if request is None:
+                    break
+                await responses.put((asyncio.ensure_future(request[0]), request[1]))
+                if not request[1]:
+                    break
+            if not writer_task.done():
+                await responses.put(None)
+            await writer_task
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass  # ValueError: a line longer than the reader's limit
+        finally:
+            writer_task.cancel()
+            writer.close()
+            self._connections.discard(connection)
+
+    async def _handle_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await self._pipeline(reader, writer, self._read_http_request)
+
+    async def _handle_unix(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await self._pipeline(reader, writer, self._read_line_request)
+
+    async def _read_line_request(self, reader: asyncio.StreamReader):
+        """Read one line of the Unix socket protocol."""
+        line = await reader.readline()
+        if not line:
+            return None
+        value = line.decode('utf-8', errors='replace').strip()
+        return self._line_response(value), True
+
+    async def _line_response(self, value: str) -> bytes:
+        if value == 'STATS':
+            payload = self.stats()
+        else:
+            try:
+                payload = await self.batcher.recognize(value)
+            except Exception:
+                payload = {'error': 'Lookup failed'}
+        return json.dumps(payload, ensure_ascii=False).encode('utf-8') + b'\n'
+
+    async def _read_http_request(self, reader: asyncio.StreamReader):
+        """Read one HTTP/1.x request."""
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, target, version = request_line.decode('latin-1').split()
+        except ValueError:
+            return self._http_error(400, 'Malformed request line', 'HTTP/1.1'), False
+
+        headers: Dict[str, str] = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        else:
+            return self._http_error(400, 'Too many headers', version), False
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+        # The body is not read in these cases, so the connection cannot be reused
+        if headers.get('transfer-encoding', 'identity').lower() != 'identity':
+            return self._http_error(501, 'Transfer-Encoding is not supported; send Content-Length', version), False
+        length_header = headers.get('content-length', '0') or '0'
+        if not (length_header.isascii() and length_header.isdigit()):
+            return self._http_error(400, 'Invalid Content-Length', version), False
+        length = int(length_header)
+        if length > MAX_BODY_BYTES:
+            return self._http_error(413, 'Request body too large', version), False
+        body = await reader.readexactly(length) if length else b''
+        return self._http_response(method, target, body, version, keep_alive), keep_alive
+
+    async def _http_error(self, status: int, message: str, version: str) -> bytes:
+        return _encode_http(status, {'error': message}, version, False)
+
+    async def _http_response(self, method: str, target: str, body: bytes, version: str,
+                             keep_alive: bool) -> bytes:
+        try:
+            status, payload = await self._route(method, urlsplit(target), body)
+        except Exception:
+            status, payload = 500, {'error': 'Lookup failed'}
+        return _encode_http(status, payload, version, keep_alive)
+
+    async def _route(self, method: str, url, body: bytes) -> Tuple[int, Any]:
+        status, payload = 200, None
+        if url.path == '/recognize':
+            if method == 'GET':
+                numbers = parse_qs(url.query).get('number')
+                if numbers:
+                    payload = await self.batcher.recognize(numbers[0])
+                else:
+                    status, payload = 400, {'error': 'Missing number parameter'}
+            elif method == 'POST':
+                status, payload = await self._recognize_json(body)
+            else:
+                status, payload = 405, {'error': 'Use GET or POST'}
+        elif url.path == '/stats':
+            payload = self.stats()
+        elif url.path == '/health':
+            payload = {'status': 'ok'}
+        else:
+            status, payload = 404, {'error': f'Unknown path: {url.path}'}
+        return status, payload
+
+    async def _recognize_json(self, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        try:
+            request = json.loads(body or b'{}')
+        except ValueError:
+            return 400, {'error': 'Body must be JSON'}
+        if not isinstance(request, dict):
+            return 400, {'error': 'Body must be a JSON object'}
+        if isinstance(request.get('numbers'), list):
+            return 200, {'results': await self.batcher.recognize_many(request['numbers'])}
+        if 'number' in request:
+            return 200, await self.batcher.recognize(request['number'])
+        return 400, {'error': 'Expected "number" or "numbers"'}
+
+
+def _encode_http(status: int, payload: Any, version: str, keep_alive: bool) -> bytes:
+    """Serialize a JSON HTTP response."""
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    head = (
+        f'{version if version in ("HTTP/1.0", "HTTP/1.1") else "HTTP/1.1"} {status} {HTTP_REASONS[status]}\r\n'
+        f'Content-Type: application/json; charset=utf-8\r\n'
+        f'Content-Length: {len(body)}\r\n'
+        f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'
+    )
+    return head.encode('latin-1') + body
+
+
+def _parse_address(value: str) -> Tuple[str, int]:
+    host, _, port = value.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    validator = PolishMobileValidator(builtin_prefixes=not args.no_database and not args.database)
+    if args.database and not args.no_database:
+        validator.load_prefix_database(args.database)
+    if args.portability:
+        validator.load_portability(args.portability)
+
+    server = LookupServer(validator, args.batch_size, args.max_delay_ms / 1000,
+                          args.queue_size, args.pipeline_depth)
+    host, port = _parse_address(args.http) if args.http else (None, None)
+    await server.start(host, port, args.unix)
+    if args.http:
+        print(f'HTTP listening on {host}:{server.http_port}', file=sys.stderr)
+    if args.unix:
+        print(f'Unix socket listening on {args.unix}', file=sys.stderr)
+    try:
+        while True:
+            await asyncio.sleep(args.stats_interval or 3600)
+            if args.stats_interval:
+                stats = server.stats()
+                print(f'{stats["qps"]:,.0f} req/s  p50 {stats["p50_ms"]:.2f} ms  p99 {stats["p99_ms"]:.2f} ms  '
+                      f'batch {stats["mean_batch_size"]:.1f}  queue {stats["queue_depth"]}', file=sys.stderr)
+    finally:
+        await server.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description='Serve Polish mobile operator lookups over HTTP and Unix sockets.')
+    parser.add_argument('--http', help='HTTP listen address as host:port (e.g. 127.0.0.1:8080)')
+    parser.add_argument('--unix', help='Unix socket path')
+    parser.add_argument('--database', help='prefix database CSV (default: built-in tables)')
+    parser.add_argument('--no-database', action='store_true', help='run without a prefix database, CSV or built-in')
+    parser.add_argument('--portability', help='number-portability overlay consulted before the prefix lookup')
+    parser.add_argument('--batch-size', type=int, default=256, help='largest micro-batch (default: 256)')
+    parser.add_argument('--max-delay-ms', type=float, default=0.5,
+                        help='wait for more requests before a partial batch (default: 0.5)')
+    parser.add_argument('--queue-size', type=int, default=10000,
+                        help='pending lookups before connections stop reading (default: 10000)')
+    parser.add_argument('--pipeline-depth', type=int, default=128,
+                        help='in-flight requests per connection (default: 128)')
+    parser.add_argument('--stats-interval', type=float, default=0,
+                        help='print QPS and latency every N seconds (default: off)')
+    args = parser.parse_args(argv)
+    if not args.http and not args.unix:
+        parser.error('at least one of --http or --unix is required')
+    if args.database and not os.path.exists(args.database):
+        print(f'Error: prefix database not found: {args.database}', file=sys.stderr)
+        return 2
+
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Phone number normalization engine
+Single-pass digit extraction with an early exit for numbers that are already clean
+"""
+
+import re
+from typing import Iterable, List, Optional, Union
+
+
+COUNTRY_CODE = '48'
+NATIONAL_LENGTH = 9
+
+# Every byte except the ASCII digits, for bytes.translate(None, delete)
+_NON_DIGIT_BYTES = bytes(byte for byte in range(256) if not 0x30 <= byte <= 0x39)
+# Same, but newlines survive so a whole buffer can be cleaned in one pass and then split
+_NON_DIGIT_BYTES_EXCEPT_NEWLINE = bytes(byte for byte in _NON_DIGIT_BYTES if byte != 0x0A)
+_NON_DIGITS = re.compile(r'\D')
+
+
+def normalize(phone_number: Optional[str]) -> str:
+    """
+    Normalize a phone number to its national digits.
+
+    Clean 9-digit ASCII strings are returned as is. Other ASCII input is
+    stripped of non-digits with a single bytes.translate pass; non-ASCII
+    input falls back to a regular expression so Unicode digits behave as
+    before.
+
+    Args:
+        phone_number: Phone number to normalize
+
+    Returns:
+        Normalized phone number (9 digits for valid numbers)
+    """
+    if not phone_number:
+        return ''
+    if type(phone_number) is not str:
+        phone_number = str(phone_number)
+
+    if phone_number.isascii():
+        if len(phone_number) == NATIONAL_LENGTH and phone_number.isdigit():
+            return phone_number
+        digits = phone_number.encode('ascii').translate(None, _NON_DIGIT_BYTES).decode('ascii')
+    else:
+        digits = _NON_DIGITS.sub('', phone_number)
+
+    if len(digits) > NATIONAL_LENGTH and digits.startswith(COUNTRY_CODE):
+        return digits[2:]
+    return digits
+
+
+def normalize_reference(phone_number: Optional[str]) -> str:
+    """
+    Normalize a phone number with the original regular expression implementation.
+
+    Reference implementation for normalize.
+
+    Args:
+        phone_number: Phone number to normalize
+
+    Returns:
+        Normalized phone number
+    """
+    if not phone_number:
+        return ''
+
+    normalized = re.sub(r'\D', '', str(phone_number))
+
+    if normalized.startswith('48') and len(normalized) > 9:
+        normalized = normalized[2:]
+
+    return normalized
+
+
+def normalize_many(phone_numbers: Union[Iterable[str], bytes, bytearray, memoryview]) -> List[str]:
+    """
+    Normalize many phone numbers in one call.
+
+    Args:
+        phone_numbers: Iterable of phone numbers, or a bytes buffer of newline-separated numbers
+
+    Returns:
+        List of normalized phone numbers, in input order
+    """
+    if isinstance(phone_numbers, (bytes, bytearray, memoryview)):
+        return normalize_buffer(phone_numbers)
+    return list(map(normalize, phone_numbers))
+
+
+def normalize_buffer(data: Union[bytes, bytearray, memoryview]) -> List[str]:
+    """
+    Normalize a bytes buffer of newline-separated numbers.
+
+    The whole buffer is cleaned with one bytes.translate call and split on
+    newlines afterwards, so no per-line regular expression runs. Only ASCII
+    digits are kept. Blank lines produce empty strings; a trailing newline
+    does not add an extra entry.
+
+    Args:
+        data: Buffer of numbers separated by LF or CRLF
+
+    Returns:
+        List of normalized phone numbers, one per line
+    """
+    data = bytes(data)
+    if not data:
+        return []
+    lines = data.translate(None, _NON_DIGIT_BYTES_EXCEPT_NEWLINE).split(b'\n')
+    if data.endswith(b'\n'):
+        lines.pop()
+
+    results = []
+    append = results.append
+    for digits in lines:
+        if len(digits) > NATIONAL_LENGTH and digits.startswith(b'48'):
+            digits = digits[2:]
+        append(digits.decode('ascii'))
+    return results
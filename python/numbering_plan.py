@@ -0,0 +1,532 @@
+"""
+Multi-country numbering plans
+Dispatches E.164 numbers to per-country mobile numbering plans through one compiled table
+
+Usage:
+    from numbering_plan import NumberingPlan, NumberingPlanEngine
+    poland = PolishMobileValidator('Mobileprefix_corrected.csv').numbering_plan()
+    czechia = NumberingPlan.from_csv('cz-prefixes.csv', '420', 9, region='CZ')
+    engine = NumberingPlanEngine([poland, czechia])
+    engine.recognize_operator('+420 601 123 456')
+    engine.batch_classify(numbers)
+
+Other plans are read from CSV files in the layout of Mobileprefix_corrected.csv
+(a "Prefix;Operator Name" header, then rows such as "+420601;Operator"). A
+number starting with + or 00 is read as country code and national number; a
+number of the default plan's national length without either is national, and
+other digit strings are taken to start with a country code, as 48501234567
+always was.
+
+Country codes are prefix-free, so a 1000-slot table indexed by the first
+three digits of the E.164 number names the plan. Prefixes of every plan are
+compiled into one sorted table of E.164 ranges whose entries share a single
+operator name table, so one binary search classifies a number of any country
+and the NumPy batch path handles mixed-country input in one set of passes.
+"""
+
+import re
+import sys
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+# Imported on first use so that importing the module does not pay for NumPy
+np = None
+
+from polish_mobile_validator import read_prefix_csv
+from vectorized import require_numpy
+
+
+KEY_DIGITS = 15  # longest E.164 number
+COUNTRY_DIGITS = 3
+UNKNOWN_OPERATOR = 'Unknown'
+
+# Every byte except the ASCII digits, for bytes.translate(None, delete)
+_NON_DIGIT_BYTES = bytes(byte for byte in range(256) if not 0x30 <= byte <= 0x39)
+_NON_DIGITS = re.compile(r'\D')
+# Factor that pads an E.164 number of n digits to KEY_DIGITS digits
+_SCALE = tuple(10 ** (KEY_DIGITS - length) for length in range(KEY_DIGITS + 1))
+_FIRST_DIGIT = re.compile(r'\d')
+
+
+class NumberingPlan:
+    """
+    Mobile numbering plan of one country.
+
+    A number is valid when its national part has one of national_lengths
+    digits and starts with one of valid_prefixes. The main operator comes
+    from operator_prefixes (the first listed operator wins) and the detailed
+    operator from the longest matching prefix_database entry; without
+    operator_prefixes the detailed operator is the main one as well.
+    """
+
+    def __init__(self, country_code: str, national_lengths: Union[int, Iterable[int]],
+                 prefix_database: Optional[Dict[str, str]] = None,
+                 operator_prefixes: Optional[Dict[str, List[str]]] = None,
+                 valid_prefixes: Optional[Iterable[str]] = None,
+                 m2m_prefixes: Iterable[str] = (), region: Optional[str] = None):
+        """
+        Args:
+            country_code: Country calling code without '+', e.g. '48'
+            national_lengths: Allowed national number length, or several of them
+            prefix_database: Mapping of national prefixes to detailed operator names
+            operator_prefixes: Mapping of main operator names to national prefixes
+            valid_prefixes: National prefixes of mobile numbers (defaults to every
+                prefix of operator_prefixes, or of prefix_database without it)
+            m2m_prefixes: National prefixes reserved for M2M connections
+            region: Short name used in messages, e.g. 'PL' (defaults to the country code)
+        """
+        if not (country_code.isascii() and country_code.isdigit() and 1 <= len(country_code) <= COUNTRY_DIGITS):
+            raise ValueError(f'Country code must be 1 to {COUNTRY_DIGITS} digits: {country_code!r}')
+        lengths = (national_lengths,) if isinstance(national_lengths, int) else tuple(national_lengths)
+        if not lengths or not all(1 <= length <= KEY_DIGITS - len(country_code) for length in lengths):
+            raise ValueError(f'National lengths must be 1 to {KEY_DIGITS - len(country_code)} digits for '
+                             f'+{country_code}')
+        self.country_code = country_code
+        self.national_lengths: Tuple[int, ...] = tuple(sorted(set(lengths)))
+        self.prefix_database = dict(prefix_database or {})
+        self.operator_prefixes = (
+            {operator: list(prefixes) for operator, prefixes in operator_prefixes.items()}
+            if operator_prefixes is not None else None
+        )
+        if valid_prefixes is None:
+            if self.operator_prefixes is not None:
+                valid_prefixes = [prefix for prefixes in self.operator_prefixes.values() for prefix in prefixes]
+            else:
+                valid_prefixes = self.prefix_database
+        self.valid_prefixes = sorted(set(valid_prefixes))
+        self.m2m_prefixes = tuple(m2m_prefixes)
+        self.region = region or country_code
+
+    @classmethod
+    def from_csv(cls, csv_path: str, country_code: str, national_lengths: Union[int, Iterable[int]],
+                 encoding: Optional[str] = None, **options: Any) -> 'NumberingPlan':
+        """
+        Load a plan from a prefix CSV in the layout of Mobileprefix_corrected.csv.
+
+        Args:
+            csv_path: Path to the CSV file
+            country_code: Country calling code written before the prefixes, without '+'
+            national_lengths: Allowed national number length, or several of them
+            encoding: Text encoding of the file (detected when omitted)
+            **options: operator_prefixes, valid_prefixes, m2m_prefixes or region
+
+        Returns:
+            NumberingPlan with the file as its prefix database
+        """
+        return cls(country_code, national_lengths, read_prefix_csv(csv_path, encoding, country_code), **options)
+
+    def _prefix_maps(self) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, bool], Dict[str, str]]:
+        """National prefixes of the valid, main operator, M2M and detailed operator lookups."""
+        usable = [prefix for prefix in self.prefix_database if _usable(prefix, self)]
+        detailed = {prefix: self.prefix_database[prefix] for prefix in usable}
+        if self.operator_prefixes is None:
+            main = detailed
+        else:
+            main = {}
+            for operator in reversed(list(self.operator_prefixes)):
+                for prefix in self.operator_prefixes[operator]:
+                    if _usable(prefix, self):
+                        main[prefix] = operator
+        valid = {prefix: prefix for prefix in self.valid_prefixes if _usable(prefix, self)}
+        m2m = {prefix: True for prefix in self.m2m_prefixes if _usable(prefix, self)}
+        return valid, main, m2m, detailed
+
+    def __repr__(self) -> str:
+        return (f'{type(self).__name__}(+{self.country_code} {self.region}, lengths {self.national_lengths}, '
+                f'{len(self.prefix_database)} prefixes)')
+
+
+def _usable(prefix: str, plan: NumberingPlan) -> bool:
+    """Prefixes that fit the plan's longest national number; '' covers the whole country."""
+    return len(prefix) <= plan.national_lengths[-1] and prefix.isascii() and (prefix.isdigit() or not prefix)
+
+
+class PlanClassification(NamedTuple):
+    """
+    Parallel result arrays for a batch classified across numbering plans.
+
+    ``country`` codes index into ``country_codes`` and operator codes into
+    the shared ``operator_names``; code 0 is None in both (no plan matched,
+    or the number is invalid). ``national`` and ``e164`` hold the digits as
+    integers, -1 where the number is invalid.
+    """
+
+    valid: 'np.ndarray'
+    country: 'np.ndarray'
+    national: 'np.ndarray'
+    e164: 'np.ndarray'
+    operator: 'np.ndarray'
+    detailed_operator: 'np.ndarray'
+    is_m2m: 'np.ndarray'
+    country_codes: Tuple[Optional[str], ...]
+    operator_names: Tuple[Optional[str], ...]
+
+    def country_labels(self) -> 'np.ndarray':
+        """Resolve country codes to an object array of calling codes (None when unmatched)."""
+        return np.asarray(self.country_codes, dtype=object)[self.country]
+
+    def operator_labels(self) -> 'np.ndarray':
+        """Resolve main operator codes to an object array of names (None when invalid)."""
+        return np.asarray(self.operator_names, dtype=object)[self.operator]
+
+    def detailed_operator_labels(self) -> 'np.ndarray':
+        """Resolve detailed operator codes to an object array of names (None when unmatched)."""
+        return np.asarray(self.operator_names, dtype=object)[self.detailed_operator]
+
+
+class NumberingPlanEngine:
+    """
+    Classifies numbers of several countries through one compiled plan table.
+
+    Country dispatch is a single array access on the first three E.164
+    digits. Classification is a binary search in one sorted array of E.164
+    range starts shared by all plans; each range points at an entry holding
+    the matched valid prefix, main and detailed operator IDs and the M2M
+    flag, and all entries share one operator name table.
+    """
+
+    def __init__(self, plans: Sequence[NumberingPlan], default_country: Optional[str] = None):
+        """
+        Compile the plans.
+
+        Args:
+            plans: Numbering plans; their country codes must not be prefixes of each other
+            default_country: Plan used for national numbers written without a country code
+                (defaults to the first plan)
+        """
+        self.plans: Tuple[NumberingPlan, ...] = tuple(plans)
+        if not self.plans:
+            raise ValueError('At least one numbering plan is required')
+        self.country_codes: Tuple[Optional[str], ...] = (None,) + tuple(plan.country_code for plan in self.plans)
+        if default_country is None:
+            default_country = self.plans[0].country_code
+        if default_country not in self.country_codes[1:]:
+            raise ValueError(f'No plan for default country +{default_country}')
+        self.default_plan = self.plans[self.country_codes.index(default_country) - 1]
+
+        # Country dispatch: slot = first three digits, value = plan code
+        self._countries = array('H', bytes(2 * 10 ** COUNTRY_DIGITS))
+        for code, plan in enumerate(self.plans, 1):
+            span = 10 ** (COUNTRY_DIGITS - len(plan.country_code))
+            start = int(plan.country_code) * span
+            clash = next((slot for slot in self._countries[start:start + span] if slot), 0)
+            if clash:
+                raise ValueError(f'Country codes +{plan.country_code} and +{self.country_codes[clash]} overlap')
+            self._countries[start:start + span] = array('H', [code]) * span
+
+        self._compile()
+        self._numpy_tables = None
+
+    def _compile(self) -> None:
+        """Flatten the prefixes of all plans into one table of E.164 ranges."""
+        names: Dict[str, int] = {}
+        entries: Dict[Tuple[str, int, int, bool], int] = {}
+        self._entry_prefixes: List[Optional[str]] = [None]
+        self._entry_operators = array('H', [0])
+        self._entry_detailed = array('H', [0])
+        self._entry_m2m = array('B', [0])
+        self._starts = array('q', [0])
+        self._entry_ids = array('H', [0])
+
+        def name_id(name: str) -> int:
+            return names.setdefault(sys.intern(name), len(names) + 1)
+
+        # Ranges are appended in E.164 order, so plans go by where their country starts
+        for plan in sorted(self.plans, key=lambda plan: plan.country_code.ljust(KEY_DIGITS, '0')):
+            maps = plan._prefix_maps()
+            width = KEY_DIGITS - len(plan.country_code)
+            base = int(plan.country_code) * 10 ** width
+            # Every prefix range starts and ends on one of these points, so
+            # the set of prefixes covering a number is constant between them
+            points = {base, base + 10 ** width}
+            for prefixes in maps:
+                for prefix in prefixes:
+                    start = base + (int(prefix) * 10 ** (width - len(prefix)) if prefix else 0)
+                    points.update((start, start + 10 ** (width - len(prefix))))
+            longest = max(len(prefix) for prefixes in maps for prefix in prefixes) if any(maps) else 0
+
+            bounds = sorted(points)
+            for start, end in zip(bounds, bounds[1:]):
+                digits = str(start - base).zfill(width)
+                valid, main, m2m, detailed = (
+                    _longest_match(prefixes, digits, longest) for prefixes in maps
+                )
+                entry_id = 0
+                if valid is not None:
+                    key = (valid, name_id(main or UNKNOWN_OPERATOR), name_id(detailed) if detailed else 0,
+                           bool(m2m))
+                    entry_id = entries.get(key, 0)
+                    if not entry_id:
+                        entry_id = entries[key] = len(self._entry_prefixes)
+                        if entry_id > 0xFFFF:
+                            raise ValueError('Too many distinct plan entries for a 16-bit table')
+                        self._entry_prefixes.append(sys.intern(valid))
+                        self._entry_operators.append(key[1])
+                        self._entry_detailed.append(key[2])
+                        self._entry_m2m.append(key[3])
+                if self._entry_ids[-1] == entry_id:
+                    continue
+                if self._starts[-1] == start:
+                    self._entry_ids[-1] = entry_id
+                else:
+                    self._starts.append(start)
+                    self._entry_ids.append(entry_id)
+            if self._entry_ids[-1]:
+                self._starts.append(base + 10 ** width)
+                self._entry_ids.append(0)
+
+        self.operator_names: Tuple[Optional[str], ...] = (None,) + tuple(names)
+        # What recognize_operator reports for each entry: prefix, operator, detailed operator, M2M, message
+        self._entry_results: List[Optional[Tuple[str, str, Optional[str], bool, str]]] = [None]
+        for entry in range(1, len(self._entry_prefixes)):
+            operator = self.operator_names[self._entry_operators[entry]]
+            is_m2m = bool(self._entry_m2m[entry])
+            self._entry_results.append((
+                self._entry_prefixes[entry], operator, self.operator_names[self._entry_detailed[entry]], is_m2m,
+                'Machine to Machine (M2M) connection' if is_m2m else f'Operator: {operator}',
+            ))
+
+    def __len__(self) -> int:
+        """Number of ranges in the compiled plan table."""
+        return len(self._starts)
+
+    def to_e164(self, phone_number: Any) -> Optional[str]:
+        """
+        Digits of a number in international form, without the '+'.
+
+        Args:
+            phone_number: Phone number in national or international notation
+
+        Returns:
+            E.164 digits, or None when the input has no ASCII digits
+        """
+        if phone_number is None:
+            return None
+        if type(phone_number) is not str:
+            phone_number = str(phone_number)
+        if phone_number.isascii():
+            digits = phone_number.encode('ascii').translate(None, _NON_DIGIT_BYTES).decode('ascii')
+        else:
+            digits = _NON_DIGITS.sub('', phone_number)
+            if not digits.isascii():
+                return None
+        if not digits:
+            return None
+        if '+' in phone_number and '+' in phone_number[:_FIRST_DIGIT.search(phone_number).start()]:
+            return digits
+        if digits.startswith('00'):
+            return digits[2:]
+        if len(digits) in self.default_plan.national_lengths:
+            return self.default_plan.country_code + digits
+        return digits
+
+    def recognize_operator(self, phone_number: Any) -> Dict[str, Any]:
+        """
+        Recognize the country and operator of a number.
+
+        Args:
+            phone_number: Phone number in national or international notation
+
+        Returns:
+            Dictionary like PolishMobileValidator.recognize_operator, with country_code,
+            region and e164 added; normalized holds the national digits
+        """
+        e164 = self.to_e164(phone_number)
+        if not e164 or len(e164) > KEY_DIGITS:
+            return {'success': False, 'message': f'Phone numbers must have 1 to {KEY_DIGITS} digits',
+                    'phone_number': phone_number}
+        head = e164[:COUNTRY_DIGITS]
+        code = self._countries[int(head) * 10 ** (COUNTRY_DIGITS - len(head))]
+        if not code:
+            return {'success': False, 'message': 'Unknown country code', 'phone_number': phone_number}
+
+        plan = self.plans[code - 1]
+        national = e164[len(plan.country_code):]
+        if len(national) not in plan.national_lengths:
+            lengths = ' or '.join(str(length) for length in plan.national_lengths)
+            return {'success': False, 'message': f'{plan.region} mobile numbers must have {lengths} national digits',
+                    'phone_number': phone_number}
+        entry = self._entry_ids[bisect_right(self._starts, int(e164) * _SCALE[len(e164)]) - 1]
+        if not entry:
+            return {'success': False, 'message': f'Invalid {plan.region} mobile prefix: {national[:2]}',
+                    'phone_number': phone_number}
+
+        prefix, operator, detailed_operator, is_m2m, message = self._entry_results[entry]
+        return {
+            'success': True,
+            'phone_number': phone_number,
+            'country_code': plan.country_code,
+            'region': plan.region,
+            'e164': '+' + e164,
+            'normalized': national,
+            'prefix': prefix,
+            'operator': operator,
+            'detailed_operator': detailed_operator,
+            'is_m2m': is_m2m,
+            'message': message,
+        }
+
+    def batch_validate(self, phone_numbers: Iterable[Any]) -> List[Dict[str, Any]]:
+        """
+        Recognize many numbers of any country.
+
+        Args:
+            phone_numbers: Phone numbers in national or international notation
+
+        Returns:
+            recognize_operator results, in input order
+        """
+        return [self.recognize_operator(number) for number in phone_numbers]
+
+    def batch_classify(self, phone_numbers) -> PlanClassification:
+        """
+        Classify a batch of numbers of any country with NumPy.
+
+        Requires NumPy. Accepts a sequence of numbers as strings or integers,
+        a fixed-width bytes array (dtype 'S'), or an integer array of E.164
+        digits (national numbers of the default plan are also accepted).
+
+        Args:
+            phone_numbers: Numbers to classify
+
+        Returns:
+            PlanClassification with validity mask, country, operator codes and M2M flags
+        """
+        require_numpy()
+        _load_numpy()
+        values = phone_numbers if isinstance(phone_numbers, np.ndarray) else None
+        if values is None:
+            try:
+                values = np.array(phone_numbers, dtype='S')
+            except UnicodeEncodeError:
+                values = np.array([self._ascii_form(number) for number in phone_numbers], dtype='S')
+        values = values.reshape(-1)
+
+        if values.dtype.kind == 'S':
+            width = values.dtype.itemsize
+            records = np.ascontiguousarray(values).view(np.uint8).reshape(-1, width)
+            value, length, national_form = self._parse_records(records)
+        elif values.dtype.kind in 'iu' or values.size == 0:
+            value = values.astype(np.int64)
+            length = np.where(value > 0, np.searchsorted(_POWERS, value, side='right'), 0)
+            national_form = np.isin(length, self.default_plan.national_lengths)
+        else:
+            raise TypeError(f'Unsupported input dtype for plan classification: {values.dtype}')
+        return self._classify_numbers(value, length, national_form)
+
+    def _ascii_form(self, phone_number: Any) -> str:
+        """Stand-in for inputs NumPy cannot encode: the E.164 form, or '' when there is none."""
+        if isinstance(phone_number, str) and not phone_number.isascii():
+            e164 = self.to_e164(phone_number)
+            return '+' + e164 if e164 else ''
+        return phone_number if isinstance(phone_number, str) else str(phone_number)
+
+    def _parse_records(self, records) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+        """
+        Read fixed-width records as in to_e164.
+
+        Returns:
+            (value of the digits after any 00 prefix, their count, mask of national-form numbers)
+        """
+        rows, width = records.shape
+        is_digit = (records >= 0x30) & (records <= 0x39)
+        count = is_digit.sum(axis=1)
+        first = np.where(count > 0, np.argmax(is_digit, axis=1), width)
+        plus = ((records == 0x2B) & (np.arange(width) < first[:, None])).any(axis=1)
+
+        # Digits moved to the front of each row, so column j holds the j-th digit
+        digits = np.zeros((rows, max(width, 2)), dtype=np.uint8)
+        row_index, column = np.nonzero(is_digit)
+        digits[row_index, np.cumsum(is_digit, axis=1)[row_index, column] - 1] = records[row_index, column] - 0x30
+
+        zeros = ~plus & (count >= 2) & (digits[:, 0] == 0) & (digits[:, 1] == 0)
+        skip = np.where(zeros, 2, 0)
+        length = count - skip
+        national_form = ~plus & ~zeros & np.isin(length, self.default_plan.national_lengths)
+
+        value = np.zeros(rows, dtype=np.int64)
+        all_rows = np.arange(rows)
+        last = digits.shape[1] - 1
+        for position in range(min(KEY_DIGITS, last + 1)):
+            inside = position < length
+            if not inside.any():
+                break
+            digit = digits[all_rows, np.minimum(skip + position, last)]
+            value = np.where(inside, value * 10 + digit, value)
+        return value, length, national_form
+
+    def _classify_numbers(self, value, length, national_form) -> PlanClassification:
+        default = self.default_plan
+        cc_value = int(default.country_code)
+        cc_digits = len(default.country_code)
+
+        in_range = (length >= 1) & (length <= KEY_DIGITS)
+        national_form &= in_range
+        safe_length = np.where(in_range, length, 0)
+        e164 = np.where(national_form, cc_value * _POWERS[np.minimum(safe_length, KEY_DIGITS - cc_digits)] + value,
+                        value)
+        e164_length = np.where(national_form, safe_length + cc_digits, safe_length)
+        in_range &= (e164_length >= 1) & (e164_length <= KEY_DIGITS)
+        key = np.where(in_range, e164 * _POWERS[KEY_DIGITS - np.where(in_range, e164_length, KEY_DIGITS)], 0)
+
+        tables = self._tables()
+        country = np.where(in_range, tables['countries'][key // 10 ** (KEY_DIGITS - COUNTRY_DIGITS)], 0)
+        cc_length = tables['country_digits'][country]
+        national_length = np.where(country > 0, e164_length - cc_length, 0)
+        valid = (country > 0) & tables['lengths'][country, np.clip(national_length, 0, KEY_DIGITS)]
+
+        entry = tables['entry_ids'][np.searchsorted(tables['starts'], key, side='right') - 1]
+        valid &= entry > 0
+        entry = np.where(valid, entry, 0)
+        national = np.where(valid, e164 % _POWERS[np.clip(national_length, 0, KEY_DIGITS)], -1)
+        return PlanClassification(
+            valid=valid,
+            country=np.where(valid, country, 0).astype(np.uint16),
+            national=national,
+            e164=np.where(valid, e164, -1),
+            operator=tables['operators'][entry],
+            detailed_operator=tables['detailed'][entry],
+            is_m2m=tables['m2m'][entry].astype(bool),
+            country_codes=self.country_codes,
+            operator_names=self.operator_names,
+        )
+
+    def _tables(self) -> Dict[str, 'np.ndarray']:
+        """NumPy views of the compiled tables, built on first use."""
+        if self._numpy_tables is None:
+            lengths = np.zeros((len(self.country_codes), KEY_DIGITS + 1), dtype=bool)
+            for code, plan in enumerate(self.plans, 1):
+                lengths[code, list(plan.national_lengths)] = True
+            self._numpy_tables = {
+                'countries': np.frombuffer(self._countries, dtype=np.uint16),
+                'country_digits': np.array([0] + [len(plan.country_code) for plan in self.plans], dtype=np.int64),
+                'lengths': lengths,
+                'starts': np.frombuffer(self._starts, dtype=np.int64),
+                'entry_ids': np.frombuffer(self._entry_ids, dtype=np.uint16),
+                'operators': np.frombuffer(self._entry_operators, dtype=np.uint16),
+                'detailed': np.frombuffer(self._entry_detailed, dtype=np.uint16),
+                'm2m': np.frombuffer(self._entry_m2m, dtype=np.uint8),
+            }
+        return self._numpy_tables
+
+
+def _longest_match(prefixes: Dict[str, Any], digits: str, longest: int) -> Any:
+    """Value of the longest key of prefixes that digits starts with."""
+    for length in range(min(longest, len(digits)), -1, -1):
+        value = prefixes.get(digits[:length])
+        if value is not None:
+            return value
+    return None
+
+
+def _load_numpy() -> None:
+    global np, _POWERS
+    if np is None:
+        import numpy
+        np = numpy
+    if _POWERS is None:
+        _POWERS = np.array([10 ** exponent for exponent in range(KEY_DIGITS + 3)], dtype=np.int64)
+
+
+_POWERS = None
@@ -0,0 +1,247 @@
+"""
+Operator registry for Polish mobile prefixes
+Assigns each canonical operator a small integer ID that tables and batch results carry instead of names
+
+Usage:
+    registry = validator.operator_registry()
+    op_id = registry.id_of('P4 Sp. z o.o. (Sieć komórkowa Play)')
+    registry[op_id]            # OperatorInfo(id=..., name=..., brand='Play', is_m2m=False, aliases=...)
+    registry.name(op_id)       # names are only resolved when asked for
+
+Raw names from the UKE CSV come in several spellings of the same operator:
+non-breaking spaces, 'Sp. Z o.o.' next to 'Sp. z o.o.', and Polish letters
+that were lost to '?' when the file was re-encoded. canonical_operator_name
+folds these into one correctly decoded name, and every spelling resolves to
+the ID of that name. IDs are assigned in order of canonical name, so they do
+not depend on row order in the CSV; ID 0 means "no operator".
+"""
+
+import re
+import sys
+import threading
+import unicodedata
+from array import array
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+
+NO_OPERATOR = 0
+
+# Prefixes reserved for machine-to-machine connections
+M2M_PREFIXES = ('21', '69')
+
+# Words whose Polish letters were replaced by '?' in the published CSV
+_REPAIRS = {
+    'Spó?ka': 'Spółka',
+    'SPÓ?KA': 'SPÓŁKA',
+    'Sie?': 'Sieć',
+    'Mi?osz': 'Miłosz',
+    'Pawe?': 'Paweł',
+    '?ódzka': 'Łódzka',
+    'PRZEDSI?BIORSTWO': 'PRZEDSIĘBIORSTWO',
+    '??CZY': 'ŁĄCZY',
+}
+_REPAIR_PATTERN = re.compile('|'.join(re.escape(word) for word in sorted(_REPAIRS, key=len, reverse=True)))
+_LIMITED_COMPANY = re.compile(r'\b[Ss]p\.? [Zz] o\. ?o\.')
+_NETWORK_BRAND = re.compile(r'\s*\(Sieć komórkowa (.+)\)$')
+_LEGAL_FORM = re.compile(
+    r'(?:,?\s+(?:Sp\. z o\.o\.|S\.A\.|SA|S\.P\.A\.|B\.V\.|GmbH|OU|LTD|Limited|LIMITED|'
+    r'Spółka (?:Jawna|akcyjna|komandytowa)|SPÓŁKA AKCYJNA|i Wspólnicy Sp\.k\.))+$'
+)
+# Brand of the network operators whose company name differs from it
+_COMPANY_BRANDS = {
+    'P4': 'Play',
+    'Polkomtel': 'Plus',
+    'Orange Polska': 'Orange',
+    'T-MOBILE POLSKA': 'T-Mobile',
+}
+
+
+def canonical_operator_name(name: str) -> str:
+    """
+    Fold a raw operator name from the prefix CSV into its canonical spelling.
+
+    Args:
+        name: Operator name as read from the CSV
+
+    Returns:
+        Name with NFC composition, single ASCII spaces, repaired Polish
+        letters and 'Sp. z o.o.' as the spelling of the limited company form
+    """
+    name = ' '.join(unicodedata.normalize('NFC', name).split())
+    name = _REPAIR_PATTERN.sub(lambda match: _REPAIRS[match.group()], name)
+    return _LIMITED_COMPANY.sub('Sp. z o.o.', name)
+
+
+def operator_brand(name: str) -> str:
+    """
+    Short brand of an operator, such as Play, Orange, T-Mobile or Plus.
+
+    Args:
+        name: Canonical operator name
+
+    Returns:
+        The network named in a '(Sieć komórkowa ...)' suffix, otherwise the
+        company name without its legal form
+    """
+    match = _NETWORK_BRAND.search(name)
+    if match:
+        return match.group(1)
+    company = _LEGAL_FORM.sub('', name) or name
+    return _COMPANY_BRANDS.get(company, company)
+
+
+class OperatorInfo(NamedTuple):
+    """A registered operator."""
+
+    id: int
+    name: str
+    brand: str
+    is_m2m: bool
+    aliases: Tuple[str, ...]
+
+
+class OperatorRegistry:
+    """
+    Canonical operators of a prefix database, numbered with small integer IDs.
+
+    Every raw spelling of a name maps to the ID of its canonical operator.
+    Names first seen after construction (for example operators that only
+    appear in a portability overlay) can be added with intern; they receive
+    new IDs after the existing ones, so IDs already handed out stay valid.
+    """
+
+    def __init__(self, prefix_database: Mapping[str, str], m2m_prefixes: Iterable[str] = M2M_PREFIXES):
+        """
+        Register the operators of a prefix database.
+
+        Args:
+            prefix_database: Mapping of national prefixes to operator names
+            m2m_prefixes: Prefixes reserved for M2M connections; an operator is
+                flagged M2M when all of its prefixes fall inside them
+        """
+        m2m_prefixes = tuple(m2m_prefixes)
+        aliases: Dict[str, List[str]] = {}
+        m2m: Dict[str, bool] = {}
+        for prefix, raw in prefix_database.items():
+            name = canonical_operator_name(raw)
+            spellings = aliases.setdefault(name, [])
+            if raw not in spellings:
+                spellings.append(raw)
+            m2m[name] = m2m.get(name, True) and prefix.startswith(m2m_prefixes)
+
+        self._lock = threading.Lock()
+        self._operators: List[Optional[OperatorInfo]] = [None]
+        self._ids: Dict[str, int] = {}
+        for name in sorted(aliases, key=lambda name: (name.casefold(), name)):
+            self._register(name, m2m[name], aliases[name])
+
+    def _register(self, name: str, is_m2m: bool, aliases: Sequence[str]) -> int:
+        op_id = len(self._operators)
+        if op_id > 0xFFFF:
+            raise ValueError('Too many distinct operators for 16-bit IDs')
+        spellings = tuple(sys.intern(alias) for alias in aliases if alias != name)
+        self._operators.append(OperatorInfo(op_id, sys.intern(name), operator_brand(name), is_m2m, spellings))
+        self._ids[name] = op_id
+        for alias in spellings:
+            self._ids[alias] = op_id
+        return op_id
+
+    def __len__(self) -> int:
+        """Number of registered operators."""
+        return len(self._operators) - 1
+
+    def __iter__(self) -> Iterator[OperatorInfo]:
+        """Registered operators in ID order."""
+        return iter(self._operators[1:])
+
+    def __getitem__(self, op_id: int) -> OperatorInfo:
+        """
+        Look up an operator by ID.
+
+        Raises:
+            KeyError: For NO_OPERATOR and unassigned IDs
+        """
+        if op_id <= NO_OPERATOR or op_id >= len(self._operators):
+            raise KeyError(op_id)
+        return self._operators[op_id]
+
+    def __contains__(self, name: object) -> bool:
+        """Whether a raw or canonical name is registered."""
+        return name in self._ids
+
+    def id_of(self, name: Optional[str]) -> int:
+        """
+        Get the ID of an operator name.
+
+        Args:
+            name: Raw or canonical operator name, or None
+
+        Returns:
+            Operator ID; NO_OPERATOR for None
+
+        Raises:
+            KeyError: If the name is not registered
+        """
+        if name is None:
+            return NO_OPERATOR
+        op_id = self._ids.get(name)
+        if op_id is None:
+            op_id = self._ids.get(canonical_operator_name(name))
+            if op_id is None:
+                raise KeyError(name)
+        return op_id
+
+    def intern(self, name: Optional[str]) -> int:
+        """
+        Get the ID of an operator name, registering the operator if it is new.
+
+        Args:
+            name: Raw or canonical operator name, or None
+
+        Returns:
+            Operator ID; NO_OPERATOR for None
+        """
+        if name is None:
+            return NO_OPERATOR
+        op_id = self._ids.get(name)
+        if op_id is not None:
+            return op_id
+        with self._lock:
+            canonical = canonical_operator_name(name)
+            op_id = self._ids.get(canonical)
+            if op_id is None:
+                return self._register(canonical, False, [name])
+            self._ids[name] = op_id
+            return op_id
+
+    def name(self, op_id: int) -> Optional[str]:
+        """
+        Resolve an ID to its canonical operator name.
+
+        Args:
+            op_id: Operator ID
+
+        Returns:
+            Canonical name, or None for NO_OPERATOR
+        """
+        return self._operators[op_id].name if op_id else None
+
+    @property
+    def names(self) -> Tuple[Optional[str], ...]:
+        """Canonical names indexed by ID, with None at NO_OPERATOR."""
+        return (None,) + tuple(info.name for info in self._operators[1:])
+
+    def translate(self, names: Sequence[Optional[str]]) -> array:
+        """
+        Map a table of operator names to registry IDs.
+
+        Used to re-key tables that number operators by position, such as
+        PrefixIndex.operators or BatchClassification.detailed_operator_names.
+
+        Args:
+            names: Operator names by position (None for no operator)
+
+        Returns:
+            array('H') with the registry ID of each position
+        """
+        return array('H', [self.intern(name) for name in names])
@@ -0,0 +1,137 @@
+"""
+Multi-process batch validation for Polish mobile numbers
+Spreads batch_validate across a process pool that shares one compiled prefix index
+"""
+
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from prefix_index import PrefixIndex
+
+
+_worker_validator = None
+_worker_memory = None
+
+
+def _init_worker(memory_name: Optional[str], metadata: Optional[Dict[str, Any]],
+                 operator_prefixes: Dict[str, List[str]], valid_prefixes: List[str],
+                 portability: Any = None) -> None:
+    """Build the per-process validator, attaching to the shared prefix index and portability overlay."""
+    global _worker_validator, _worker_memory
+    from polish_mobile_validator import PolishMobileValidator
+
+    validator = PolishMobileValidator(builtin_prefixes=False)
+    validator.operator_prefixes = operator_prefixes
+    validator.valid_prefixes = valid_prefixes
+    if memory_name is not None:
+        _worker_memory = shared_memory.SharedMemory(name=memory_name)
+        validator.attach_prefix_index(PrefixIndex.from_buffer(_worker_memory.buf, metadata))
+    if isinstance(portability, str):
+        validator.load_portability(portability, verify=False)
+    elif portability is not None:
+        validator.attach_portability(portability)
+    _worker_validator = validator
+
+
+def _validate_chunk(chunk: Sequence[str]) -> List[Dict[str, Any]]:
+    """Validate one chunk inside a worker process."""
+    return _worker_validator.batch_validate(chunk)
+
+
+def _run_in_worker(function: Callable[..., Any], args: tuple) -> Any:
+    """Call function with the worker's validator inside a worker process."""
+    return function(_worker_validator, *args)
+
+
+class ParallelValidatorPool:
+    """
+    Process pool that validates batches with a shared, zero-copy prefix index.
+
+    The compiled slot table is copied once into a shared memory block that
+    every worker maps; only the small operator-name and overflow tables are
+    sent to workers at startup. A portability overlay loaded from a file is
+    mapped by each worker from the same file; an in-memory one is pickled.
+    Use as a context manager, or call close().
+    """
+
+    def __init__(self, validator, workers: Optional[int] = None, chunk_size: int = 10000):
+        """
+        Start the worker pool.
+
+        Args:
+            validator: PolishMobileValidator whose configuration and database are shared
+            workers: Number of worker processes (defaults to the CPU count)
+            chunk_size: Numbers sent to a worker per task
+        """
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be at least 1')
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._memory = None
+
+        metadata = None
+        index = validator.get_prefix_index()
+        if index is not None:
+            self._memory = shared_memory.SharedMemory(create=True, size=PrefixIndex.SLOTS_NBYTES)
+            self._memory.buf[:PrefixIndex.SLOTS_NBYTES] = memoryview(index.slots).cast('B')
+            metadata = index.export_metadata()
+        overlay = validator.get_portability_overlay()
+        if overlay is not None and overlay.path:
+            overlay = overlay.path
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(
+                self._memory.name if self._memory else None,
+                metadata,
+                validator.get_operator_prefixes(),
+                validator.get_valid_prefixes(),
+                overlay,
+            ),
+        )
+
+    def batch_validate(self, phone_numbers: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Validate numbers in parallel.
+
+        Args:
+            phone_numbers: Sequence of phone numbers
+
+        Returns:
+            List of validation results, in input order
+        """
+        chunks = [phone_numbers[i:i + self.chunk_size] for i in range(0, len(phone_numbers), self.chunk_size)]
+        results: List[Dict[str, Any]] = []
+        for chunk_results in self._executor.map(_validate_chunk, chunks):
+            results.extend(chunk_results)
+        return results
+
+    def submit(self, function: Callable[..., Any], *args: Any) -> Future:
+        """
+        Run function(validator, *args) in a worker, with that worker's validator.
+
+        Args:
+            function: Module-level function, so it can be pickled
+            *args: Further picklable arguments
+
+        Returns:
+            Future for the function's result
+        """
+        return self._executor.submit(_run_in_worker, function, args)
+
+    def close(self) -> None:
+        """Shut down the workers and release the shared memory block."""
+        self._executor.shutdown(wait=True)
+        if self._memory is not None:
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
+
+    def __enter__(self) -> 'ParallelValidatorPool':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -4,9 +4,93 @@ Based on Poland Mobile Operator Prefixes database
 Updated: January 24, 2022
 """
 
-import re
 import csv
-from typing import Dict, List, Optional, Tuple
+import io
+import sys
+import threading
+import time
+from array import array
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from instrumentation import Instrumentation, SlowSample
+from normalization import normalize, normalize_many
+from prefix_index import PrefixIndex
+from prefix_table import PrefixTable
+from result_cache import LRUCache
+from results import RecognitionBatch, RecognitionResult, RecognitionStatus
+from vectorized import BatchClassification, classify
+
+
+UNALLOCATED_MESSAGE = 'Number is in a block not allocated to any operator'
+M2M_MESSAGE = 'Machine to Machine (M2M) connection'
+
+# One shared 'Operator: ...' string per main operator instead of one per result
+_OPERATOR_MESSAGES: Dict[str, str] = {}
+
+# UKE publishes the prefix lists in Windows-1250; UTF-8 files are accepted as well
+CSV_FALLBACK_ENCODING = 'cp1250'
+
+
+def decode_prefix_csv(data: bytes, encoding: Optional[str] = None) -> str:
+    """
+    Decode raw prefix CSV bytes.
+
+    Args:
+        data: Raw file contents
+        encoding: Explicit encoding; when omitted UTF-8 is tried first, then Windows-1250
+
+    Returns:
+        Decoded text
+    """
+    if encoding:
+        return data.decode(encoding)
+    try:
+        return data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return data.decode(CSV_FALLBACK_ENCODING)
+
+
+def iter_prefix_rows(csv_path: str, encoding: Optional[str] = None,
+                     country_code: str = '48') -> Iterator[Tuple[str, str]]:
+    """
+    Read (prefix, operator) rows from a prefix CSV, in file order and including duplicates.
+
+    Args:
+        csv_path: Path to the CSV file
+        encoding: Text encoding of the file (detected when omitted)
+        country_code: Country code written before the prefixes, as in +48
+
+    Yields:
+        National prefix (without the country code) and operator name of each usable row
+    """
+    international = '+' + country_code
+    with open(csv_path, 'rb') as file:
+        text = decode_prefix_csv(file.read(), encoding)
+    reader = csv.reader(io.StringIO(text, newline=''), delimiter=';')
+    next(reader, None)  # Skip header
+
+    for row in reader:
+        if len(row) >= 2:
+            prefix = row[0].replace(international, '').strip()
+            operator = row[1].strip()
+            if prefix and operator:
+                # Hundreds of rows share a few dozen names; keep one string per name
+                yield prefix, sys.intern(operator)
+
+
+def read_prefix_csv(csv_path: str, encoding: Optional[str] = None, country_code: str = '48') -> Dict[str, str]:
+    """
+    Parse a prefix CSV into a new dictionary.
+
+    Args:
+        csv_path: Path to the CSV file
+        encoding: Text encoding of the file (detected when omitted)
+        country_code: Country code written before the prefixes, as in +48
+
+    Returns:
+        Mapping of national prefixes (without the country code) to operator names; later rows win
+    """
+    return dict(iter_prefix_rows(csv_path, encoding, country_code))
 
 
 class PolishMobileValidator:
@@ -14,14 +98,26 @@ class PolishMobileValidator:
     A comprehensive validator and operator recognition framework for Polish mobile numbers.
     """
 
-    def __init__(self, csv_path: Optional[str] = None):
+    def __init__(self, csv_path: Optional[str] = None, builtin_prefixes: bool = True):
         """
         Initialize the validator with optional CSV database.
+
+        Without a csv_path the prefix tables built into the generated
+        prefix_data module are used, so detailed operators are available
+        without reading any file.
         
         Args:
             csv_path: Optional path to CSV file containing prefix database
+            builtin_prefixes: Use the built-in prefix tables when no csv_path is given;
+                pass False to start with an empty prefix database
         """
-        self.prefix_database: Dict[str, str] = {}
+        self._result_cache: Optional[LRUCache] = None
+        self._publish_lock = threading.Lock()
+        self._prefix_table = PrefixTable({}, None, 0)
+        self._builtin_table: Optional[PrefixTable] = None
+        self._allocation_stats = {'batches': 0, 'checked': 0, 'rejected_unallocated': 0, 'last_batch': None}
+        self._instrumentation: Optional[Instrumentation] = None
+        self._portability = None
         # Updated based on dominant operator for each prefix in Mobileprefix_corrected.csv
         self.operator_prefixes = {
             'Play': ['53', '79'],
@@ -35,27 +131,512 @@ class PolishMobileValidator:
         
         if csv_path:
             self.load_prefix_database(csv_path)
+        elif builtin_prefixes:
+            try:
+                self.load_frozen_prefixes()
+            except ImportError:
+                pass
+
+    @property
+    def prefix_database(self) -> Dict[str, str]:
+        """Mapping of national prefixes to operator names from the current prefix table."""
+        return self._prefix_table.prefix_database
+
+    @prefix_database.setter
+    def prefix_database(self, prefix_database: Dict[str, str]) -> None:
+        with self._publish_lock:
+            self._publish(PrefixTable(prefix_database, None, self._prefix_table.version + 1))
+
+    def _loaded_prefix_database(self) -> Dict[str, str]:
+        """Current prefix database, or an empty one while the built-in tables (a default to replace) are in use."""
+        table = self._prefix_table
+        return {} if table is self._builtin_table else table.prefix_database
+
+    def _publish(self, table: PrefixTable) -> PrefixTable:
+        """
+        Make a table current with one reference assignment.
 
-    def load_prefix_database(self, csv_path: str) -> None:
+        Callers hold _publish_lock. Readers load _prefix_table once per lookup
+        and never lock, so they see the old table or the new one, never a mix.
+        """
+        self._prefix_table = table
+        self.clear_cache()
+        return table
+
+    def load_prefix_database(self, csv_path: str, encoding: Optional[str] = None) -> None:
         """
         Load prefix database from CSV file.
+
+        Rows are merged into the current prefix database. The merged copy is
+        compiled before it replaces the current table, so concurrent lookups
+        never see a partly loaded database.
         
         Args:
             csv_path: Path to the CSV file
+            encoding: Text encoding of the file (detected when omitted)
         """
         try:
-            with open(csv_path, 'r', encoding='utf-8', errors='ignore') as file:
-                reader = csv.reader(file, delimiter=';')
-                next(reader)  # Skip header
-                
-                for row in reader:
-                    if len(row) >= 2:
-                        prefix = row[0].replace('+48', '').strip()
-                        operator = row[1].strip()
-                        if prefix and operator:
-                            self.prefix_database[prefix] = operator
+            loaded = read_prefix_csv(csv_path, encoding)
         except Exception as e:
             print(f"Error loading CSV file: {e}")
+            loaded = {}
+
+        with self._publish_lock:
+            database = dict(self._loaded_prefix_database())
+            database.update(loaded)
+            self._publish(PrefixTable.compile(database, self._prefix_table.version + 1, csv_path))
+
+    def load_frozen_prefixes(self, module_name: str = 'prefix_data') -> None:
+        """
+        Use the prefix tables of a module generated by ``python frozen_prefixes.py build``.
+
+        Nothing is parsed: the module's constants come from cached bytecode
+        and the index is rebuilt from its stored slot runs. A CSV loaded
+        later with load_prefix_database replaces these tables instead of
+        merging into them.
+
+        Args:
+            module_name: Importable name of the generated module
+
+        Raises:
+            ImportError: If the module cannot be imported
+        """
+        from frozen_prefixes import load_frozen_table
+
+        table = load_frozen_table(module_name)
+        with self._publish_lock:
+            table.version = self._prefix_table.version + 1
+            self._builtin_table = self._publish(table)
+
+    def reload_prefix_database(self, csv_path: str, encoding: Optional[str] = None) -> PrefixTable:
+        """
+        Replace the prefix database with the contents of a CSV file, without blocking readers.
+
+        The file is parsed and compiled into a new table off to the side, then
+        published with a single reference swap. Unlike load_prefix_database,
+        rows are not merged and errors are raised, leaving the current table in
+        place. A file whose content hash matches the current table is not
+        republished.
+
+        Args:
+            csv_path: Path to the CSV file
+            encoding: Text encoding of the file (detected when omitted)
+
+        Returns:
+            The table now in use
+        """
+        database = read_prefix_csv(csv_path, encoding)
+        with self._publish_lock:
+            current = self._prefix_table
+            table = PrefixTable.compile(database, current.version + 1, csv_path)
+            if current.index is not None and table.content_hash == current.content_hash:
+                return current
+            return self._publish(table)
+
+    def watch_prefix_database(self, csv_path: str, interval: float = 1.0, encoding: Optional[str] = None,
+                              on_reload: Optional[Callable[[PrefixTable], None]] = None,
+                              on_error: Optional[Callable[[Exception], None]] = None):
+        """
+        Reload the prefix database whenever a CSV file changes on disk.
+
+        Args:
+            csv_path: Path to the CSV file
+            interval: Seconds between checks of the file's modification time and size
+            encoding: Text encoding of the file (detected when omitted)
+            on_reload: Called with each newly published table
+            on_error: Called with the exception when a reload fails (the current table stays)
+
+        Returns:
+            The started PrefixFileWatcher; call stop() to end watching
+        """
+        from file_watcher import PrefixFileWatcher
+
+        watcher = PrefixFileWatcher(self, csv_path, interval, encoding, on_reload, on_error)
+        watcher.start()
+        return watcher
+
+    @property
+    def prefix_table(self) -> PrefixTable:
+        """The prefix table in use, with its version and content hash (see PrefixTable.describe)."""
+        return self._prefix_table
+
+    def get_range_index(self):
+        """
+        Get the range index of the current prefix table, compiling it on first use.
+
+        Returns:
+            RangeIndex answering range, reverse (operator to ranges) and count queries
+        """
+        self.get_prefix_index()  # recompile first if prefix_database was edited in place
+        return self._prefix_table.range_index
+
+    def get_allocation_bitmap(self):
+        """
+        Get the allocated-block bitmap of the current prefix table, deriving it on first use.
+
+        Returns:
+            AllocationBitmap, or None when no prefix database is loaded
+        """
+        if self.get_prefix_index() is None:
+            return None
+        return self._prefix_table.allocation
+
+    def load_allocation_bitmap(self, bitmap_path: str, verify: bool = True) -> None:
+        """
+        Use a bitmap saved with AllocationBitmap.save instead of deriving one.
+
+        Args:
+            bitmap_path: Bitmap file written by ``python allocation.py build``
+            verify: Check the checksum, and that the bitmap was built from the
+                prefix table in use when both content hashes are known
+        """
+        from allocation import AllocationBitmap, AllocationError
+
+        bitmap = AllocationBitmap.load(bitmap_path, verify=verify)
+        table = self._prefix_table
+        if verify and bitmap.content_hash and table.content_hash and bitmap.content_hash != table.content_hash:
+            raise AllocationError(f'{bitmap_path} was built from different prefix data')
+        table.attach_allocation(bitmap)
+
+    def _require_allocation(self):
+        bitmap = self.get_allocation_bitmap()
+        if bitmap is None:
+            raise ValueError('Strict validation needs a loaded prefix database')
+        return bitmap
+
+    def is_allocated(self, phone_number: str) -> bool:
+        """
+        Check whether a number lies in a 7-digit block assigned to an operator.
+
+        Args:
+            phone_number: Phone number to check
+
+        Returns:
+            True for 9-digit numbers whose block is covered by the prefix database
+        """
+        normalized = self.normalize_phone_number(phone_number)
+        if len(normalized) != 9 or not normalized.isdigit():
+            return False
+        return self._require_allocation().is_allocated(int(normalized))
+
+    def allocation_stats(self) -> Dict[str, any]:
+        """
+        Get counters of strict batch validation.
+
+        Returns:
+            Dictionary with batches, checked, rejected_unallocated and rejected_fraction
+            totals, plus the same figures for the most recent batch under last_batch
+        """
+        stats = dict(self._allocation_stats)
+        stats['rejected_fraction'] = stats['rejected_unallocated'] / stats['checked'] if stats['checked'] else 0.0
+        return stats
+
+    def _record_allocation_batch(self, checked: int, rejected: int) -> None:
+        """Add one strict batch to allocation_stats."""
+        previous = self._allocation_stats
+        self._allocation_stats = {
+            'batches': previous['batches'] + 1,
+            'checked': previous['checked'] + checked,
+            'rejected_unallocated': previous['rejected_unallocated'] + rejected,
+            'last_batch': {
+                'checked': checked,
+                'rejected_unallocated': rejected,
+                'rejected_fraction': rejected / checked if checked else 0.0,
+            },
+        }
+
+    def load_portability(self, overlay_path: str, verify: bool = True):
+        """
+        Consult a number-portability overlay before the prefix lookup.
+
+        Ported numbers then report their current operator as detailed_operator
+        from recognize_operator, recognize, batch_validate and batch_classify;
+        find_detailed_operator keeps answering from the prefix database. The
+        overlay is memory-mapped, and loading a refreshed file swaps it in
+        without blocking readers.
+
+        Args:
+            overlay_path: Overlay file written by ``python portability.py build``
+            verify: Check the overlay checksum before use
+
+        Returns:
+            The loaded PortabilityOverlay
+        """
+        from portability import PortabilityOverlay
+
+        return self.attach_portability(PortabilityOverlay.load(overlay_path, verify))
+
+    def attach_portability(self, overlay):
+        """
+        Use a portability overlay, or stop consulting one.
+
+        Args:
+            overlay: PortabilityOverlay, or None
+
+        Returns:
+            The overlay
+        """
+        with self._publish_lock:
+            self._portability = overlay
+            self.clear_cache()
+        return overlay
+
+    def refresh_portability(self, delta_paths: List[str], overlay_path: Optional[str] = None,
+                            encoding: Optional[str] = None):
+        """
+        Apply daily delta files to the current overlay and swap the result in.
+
+        Args:
+            delta_paths: Delta files (``number;operator``, empty operator to remove), applied in order
+            overlay_path: File to save the result to and map it back from; defaults to the
+                file the current overlay was loaded from, and without one the result stays in memory
+            encoding: Text encoding of the delta files (detected when omitted)
+
+        Returns:
+            The new PortabilityOverlay
+        """
+        from portability import PortabilityOverlay, iter_portability_rows
+
+        with self._publish_lock:
+            overlay = self._portability
+            if overlay is None:
+                overlay = PortabilityOverlay.from_rows(())
+            overlay_path = overlay_path or overlay.path
+            for delta_path in delta_paths:
+                overlay = overlay.apply_delta(iter_portability_rows(delta_path, encoding))
+            if overlay_path:
+                overlay.save(overlay_path)
+                overlay = PortabilityOverlay.load(overlay_path, verify=False)
+            self._portability = overlay
+            self.clear_cache()
+        return overlay
+
+    def get_portability_overlay(self):
+        """
+        Get the portability overlay in use.
+
+        Returns:
+            PortabilityOverlay, or None when none is loaded
+        """
+        return self._portability
+
+    def is_ported(self, phone_number: str) -> bool:
+        """
+        Check whether a number appears in the portability overlay.
+
+        Args:
+            phone_number: Phone number to check
+
+        Returns:
+            True when the overlay lists the number
+        """
+        overlay = self._portability
+        normalized = self.normalize_phone_number(phone_number)
+        if overlay is None or len(normalized) != 9 or not normalized.isdigit():
+            return False
+        return int(normalized) in overlay
+
+    def find_current_operator(self, normalized: str) -> Optional[str]:
+        """
+        Find the operator currently serving a number: the portability overlay first, then the prefix index.
+
+        Args:
+            normalized: Normalized 9-digit phone number
+
+        Returns:
+            Operator name, or None
+        """
+        overlay = self._portability
+        if overlay is not None:
+            operator = overlay.lookup(int(normalized))
+            if operator is not None:
+                return operator
+        return self.find_detailed_operator(normalized)
+
+    def load_snapshot(self, snapshot_path: str, verify: bool = True) -> None:
+        """
+        Answer detailed operator lookups from a precompiled binary snapshot.
+
+        The snapshot is memory-mapped and used in place, so nothing is parsed.
+        prefix_database is left untouched, except that the built-in
+        tables are dropped; build snapshots with
+        ``python snapshot.py compile``.
+
+        Args:
+            snapshot_path: Path to the snapshot file
+            verify: Check the snapshot checksum before use
+        """
+        from snapshot import PrefixSnapshot
+
+        snapshot = PrefixSnapshot(snapshot_path, verify=verify)
+        with self._publish_lock:
+            current = self._prefix_table
+            self._publish(PrefixTable(self._loaded_prefix_database(), snapshot.index, current.version + 1,
+                                      snapshot_path, snapshot.prefixes, owner=snapshot))
+
+    def compile_prefix_index(self) -> PrefixIndex:
+        """
+        Compile prefix_database into the lookup index used by recognize_operator.
+
+        Called automatically by load_prefix_database. Call it again after
+        editing prefix_database directly without changing its size.
+
+        Returns:
+            The compiled prefix index
+        """
+        with self._publish_lock:
+            current = self._prefix_table
+            table = PrefixTable.compile(current.prefix_database, current.version + 1, current.source)
+            return self._publish(table).index
+
+    def attach_prefix_index(self, index: PrefixIndex) -> None:
+        """
+        Use a prefix index compiled elsewhere, such as one backed by shared memory.
+
+        Args:
+            index: Compiled prefix index
+        """
+        with self._publish_lock:
+            current = self._prefix_table
+            self._publish(PrefixTable(self._loaded_prefix_database(), index, current.version + 1))
+
+    def enable_cache(self, maxsize: int = 100000) -> None:
+        """
+        Cache recognize_operator results by normalized number, with LRU eviction.
+
+        The cache is cleared whenever the prefix database is reloaded or
+        recompiled. Call clear_cache() after changing operator_prefixes or
+        valid_prefixes.
+
+        Args:
+            maxsize: Maximum number of cached numbers
+        """
+        self._result_cache = LRUCache(maxsize)
+
+    def disable_cache(self) -> None:
+        """Stop caching recognize_operator results and drop the cache."""
+        self._result_cache = None
+
+    def clear_cache(self) -> None:
+        """Drop all cached recognize_operator results."""
+        if self._result_cache is not None:
+            self._result_cache.clear()
+
+    def cache_stats(self) -> Optional[Dict[str, int]]:
+        """
+        Get result cache counters.
+
+        Returns:
+            Dictionary with hits, misses, evictions, invalidations, size and maxsize,
+            or None when caching is disabled
+        """
+        if self._result_cache is None:
+            return None
+        return self._result_cache.stats()
+
+    def enable_instrumentation(self, slow_hook: Optional[Callable[[SlowSample], None]] = None,
+                               slow_threshold_ns: int = 100000, keep_slowest: int = 10) -> None:
+        """
+        Collect per-stage timings and counters for recognize_operator.
+
+        Stages are normalize, cache (when the result cache is enabled),
+        validate, prefix_match and build_result. batch_validate goes through
+        recognize_operator and is covered as well. While disabled, the only
+        cost is one attribute check per call.
+
+        Args:
+            slow_hook: Called with a SlowSample for every call slower than slow_threshold_ns
+            slow_threshold_ns: Threshold for slow_hook, in nanoseconds
+            keep_slowest: Number of slowest calls kept in instrumentation_stats()
+        """
+        self._instrumentation = Instrumentation(slow_hook, slow_threshold_ns, keep_slowest)
+
+    def disable_instrumentation(self) -> None:
+        """Stop collecting instrumentation and drop the collected data."""
+        self._instrumentation = None
+
+    def reset_instrumentation(self) -> None:
+        """Zero the collected instrumentation, keeping it enabled."""
+        if self._instrumentation is not None:
+            self._instrumentation.reset()
+
+    def instrumentation_stats(self) -> Optional[Dict[str, any]]:
+        """
+        Export a snapshot of the collected instrumentation.
+
+        Returns:
+            Dictionary with call counts, per-stage timers, the prefix-probe
+            histogram and the slowest calls, or None when instrumentation is disabled
+        """
+        if self._instrumentation is None:
+            return None
+        return self._instrumentation.stats()
+
+    def get_prefix_index(self) -> Optional[PrefixIndex]:
+        """
+        Get the compiled prefix index, recompiling it if prefix_database grew or shrank.
+
+        Returns:
+            The compiled prefix index, or None when no database is loaded
+        """
+        table = self._prefix_table
+        index = table.index
+        if index is None or table.size != len(table.prefix_database):
+            if not table.prefix_database:
+                return None
+            index = self.compile_prefix_index()
+        return index
+
+    def find_detailed_operator(self, normalized: str) -> Optional[str]:
+        """
+        Find the detailed operator for a number using the compiled prefix index.
+
+        Args:
+            normalized: Normalized 9-digit phone number
+
+        Returns:
+            Operator name of the longest matching prefix, or None
+        """
+        index = self.get_prefix_index()
+        if index is None:
+            return None
+        if not normalized.isascii():
+            return self.find_detailed_operator_reference(normalized)
+        return index.lookup(int(normalized))
+
+    def _find_detailed_operator_probes(self, normalized: str) -> Tuple[Optional[str], int]:
+        """find_detailed_operator that also reports how many prefix probes it needed."""
+        index = self.get_prefix_index()
+        if index is None:
+            return None, 0
+        if normalized.isascii():
+            return index.lookup_probes(int(normalized))
+        database = self.prefix_database
+        probes = 0
+        for i in range(len(normalized), 1, -1):
+            probes += 1
+            if normalized[:i] in database:
+                return database[normalized[:i]], probes
+        return None, probes
+
+    def find_detailed_operator_reference(self, normalized: str) -> Optional[str]:
+        """
+        Find the detailed operator by probing prefix_database for the longest prefix.
+
+        Reference implementation for find_detailed_operator.
+
+        Args:
+            normalized: Normalized phone number
+
+        Returns:
+            Operator name of the longest matching prefix, or None
+        """
+        database = self.prefix_database
+        for i in range(len(normalized), 1, -1):
+            test_prefix = normalized[:i]
+            if test_prefix in database:
+                return database[test_prefix]
+        return None
 
     def normalize_phone_number(self, phone_number: Optional[str]) -> str:
         """
@@ -67,30 +648,43 @@ class PolishMobileValidator:
         Returns:
             Normalized phone number (9 digits)
         """
-        if not phone_number:
-            return ''
-        
-        # Remove all non-digit characters
-        normalized = re.sub(r'\D', '', str(phone_number))
-        
-        # Remove country code if present
-        if normalized.startswith('48') and len(normalized) > 9:
-            normalized = normalized[2:]
-        
-        return normalized
+        return normalize(phone_number)
+
+    def normalize_phone_numbers(self, phone_numbers) -> List[str]:
+        """
+        Normalize many phone numbers in one call.
+
+        Args:
+            phone_numbers: List of phone numbers, or a bytes buffer of newline-separated numbers
+
+        Returns:
+            List of normalized phone numbers, in input order
+        """
+        return normalize_many(phone_numbers)
 
-    def validate_phone_number(self, phone_number: str) -> Dict[str, any]:
+    def validate_phone_number(self, phone_number: str, strict: bool = False) -> Dict[str, any]:
         """
         Validate if the phone number is a valid Polish mobile number.
         
         Args:
             phone_number: Phone number to validate
+            strict: Also reject numbers in 7-digit blocks no operator was assigned
             
         Returns:
             Dictionary containing validation result with status and message
         """
-        normalized = self.normalize_phone_number(phone_number)
-        
+        validation = self._validate_normalized(self.normalize_phone_number(phone_number))
+        if strict and validation['valid'] and not self._require_allocation().is_allocated(int(validation['normalized'])):
+            validation = {
+                'valid': False,
+                'message': UNALLOCATED_MESSAGE,
+                'normalized': validation['normalized'],
+                'prefix': validation['prefix']
+            }
+        return validation
+
+    def _validate_normalized(self, normalized: str) -> Dict[str, any]:
+        """Validate an already normalized number."""
         # Check if the number has 9 digits
         if len(normalized) != 9:
             return {
@@ -116,17 +710,51 @@ class PolishMobileValidator:
             'prefix': prefix
         }
 
-    def recognize_operator(self, phone_number: str) -> Dict[str, any]:
+    def recognize_operator(self, phone_number: str, strict: bool = False) -> Dict[str, any]:
         """
         Recognize the operator from phone number.
         
         Args:
             phone_number: Phone number to check
+            strict: Also reject numbers in 7-digit blocks no operator was assigned
             
         Returns:
             Dictionary containing operator information
         """
-        validation = self.validate_phone_number(phone_number)
+        if strict:
+            return self._recognize_strict(phone_number, self._require_allocation())
+        if self._instrumentation is not None:
+            return self._recognize_instrumented(phone_number, self._instrumentation)
+        normalized = self.normalize_phone_number(phone_number)
+        cache = self._result_cache
+        if cache is None:
+            return self._recognize_normalized(phone_number, normalized)
+
+        # Recompile after in-place edits of prefix_database first; publishing
+        # the new table clears the cache, so no stale result is served
+        self.get_prefix_index()
+        # A reload between computing and storing bumps the generation, so a
+        # result from the previous prefix table is never stored
+        generation = cache.generation
+        cached = cache.get(normalized)
+        if cached is None:
+            cached = self._recognize_normalized(None, normalized)
+            cache.put(normalized, cached, generation)
+        # Hand out a copy so callers cannot modify the cached entry
+        result = cached.copy()
+        result['phone_number'] = phone_number
+        return result
+
+    def _recognize_strict(self, phone_number: str, bitmap) -> Dict[str, any]:
+        """recognize_operator that rejects numbers in unallocated blocks."""
+        result = self.recognize_operator(phone_number)
+        if result['success'] and not bitmap.is_allocated(int(result['normalized'])):
+            return {'success': False, 'message': UNALLOCATED_MESSAGE, 'phone_number': phone_number}
+        return result
+
+    def _recognize_normalized(self, phone_number: Optional[str], normalized: str) -> Dict[str, any]:
+        """Recognize the operator of an already normalized number."""
+        validation = self._validate_normalized(normalized)
         
         if not validation['valid']:
             return {
@@ -135,17 +763,16 @@ class PolishMobileValidator:
                 'phone_number': phone_number
             }
         
-        normalized = validation['normalized']
-        prefix = validation['prefix']
-        
-        # Try to find exact match in database
-        detailed_operator = None
-        for i in range(len(normalized), 1, -1):
-            test_prefix = normalized[:i]
-            if test_prefix in self.prefix_database:
-                detailed_operator = self.prefix_database[test_prefix]
-                break
-        
+        # Ported numbers first, then the longest matching prefix from the compiled index
+        if self._portability is None:
+            detailed_operator = self.find_detailed_operator(normalized)
+        else:
+            detailed_operator = self.find_current_operator(normalized)
+        return self._build_recognition(phone_number, normalized, validation['prefix'], detailed_operator)
+
+    def _build_recognition(self, phone_number: Optional[str], normalized: str, prefix: str,
+                           detailed_operator: Optional[str]) -> Dict[str, any]:
+        """Build the recognize_operator result for a valid number."""
         # Determine main operator from 2-digit prefix
         main_operator = 'Unknown'
         for operator, prefixes in self.operator_prefixes.items():
@@ -155,18 +782,206 @@ class PolishMobileValidator:
         
         # Check if it's M2M (prefixes 21 and 69)
         is_m2m = prefix == '21' or prefix == '69'
+        if is_m2m:
+            message = M2M_MESSAGE
+        else:
+            message = _OPERATOR_MESSAGES.get(main_operator)
+            if message is None:
+                message = _OPERATOR_MESSAGES.setdefault(main_operator, f'Operator: {main_operator}')
         
         return {
             'success': True,
             'phone_number': phone_number,
             'normalized': normalized,
-            'prefix': prefix,
+            'prefix': sys.intern(prefix),
             'operator': main_operator,
             'detailed_operator': detailed_operator,
             'is_m2m': is_m2m,
-            'message': 'Machine to Machine (M2M) connection' if is_m2m else f'Operator: {main_operator}'
+            'message': message
         }
 
+    def _recognize_instrumented(self, phone_number: str, instrumentation: Instrumentation) -> Dict[str, any]:
+        """recognize_operator with per-stage timing, used while instrumentation is enabled."""
+        clock = time.perf_counter_ns
+        stages = {}
+        probes = None
+        started = clock()
+        normalized = self.normalize_phone_number(phone_number)
+        mark = clock()
+        stages['normalize'] = mark - started
+
+        cache = self._result_cache
+        if cache is not None:
+            self.get_prefix_index()
+            generation = cache.generation
+            cached = cache.get(normalized)
+            now = clock()
+            stages['cache'] = now - mark
+            mark = now
+            if cached is not None:
+                result = cached.copy()
+                result['phone_number'] = phone_number
+                instrumentation.record(phone_number, normalized, stages, clock() - started, cache_hit=True)
+                return result
+
+        validation = self._validate_normalized(normalized)
+        now = clock()
+        stages['validate'] = now - mark
+        mark = now
+
+        if validation['valid']:
+            overlay = self._portability
+            detailed_operator = overlay.lookup(int(normalized)) if overlay is not None else None
+            if detailed_operator is None:
+                detailed_operator, probes = self._find_detailed_operator_probes(normalized)
+            now = clock()
+            stages['prefix_match'] = now - mark
+            mark = now
+            result = self._build_recognition(None, normalized, validation['prefix'], detailed_operator)
+        else:
+            result = {'success': False, 'message': validation['message'], 'phone_number': None}
+        if cache is not None:
+            cache.put(normalized, result, generation)
+            result = result.copy()
+        result['phone_number'] = phone_number
+        now = clock()
+        stages['build_result'] = now - mark
+
+        instrumentation.record(phone_number, normalized, stages, now - started, probes)
+        return result
+
+    def recognize(self, phone_number: str) -> RecognitionResult:
+        """
+        Recognize the operator, returning a compact result object.
+
+        The result reads like the dictionary from recognize_operator
+        (result['operator'], result.get('message'), dict(result)) but keeps
+        only references to shared operator names and builds its message on
+        access, which matters when millions of results are held in memory.
+
+        Args:
+            phone_number: Phone number to check
+
+        Returns:
+            RecognitionResult for the number
+        """
+        normalized = normalize(phone_number)
+        if len(normalized) != 9:
+            return RecognitionResult(phone_number, normalized, RecognitionStatus.INVALID_LENGTH)
+
+        prefix = normalized[:2]
+        if prefix not in self.valid_prefixes:
+            return RecognitionResult(phone_number, normalized, RecognitionStatus.INVALID_PREFIX,
+                                     valid_prefixes=self.valid_prefixes)
+
+        main_operator = 'Unknown'
+        for operator, prefixes in self.operator_prefixes.items():
+            if prefix in prefixes:
+                main_operator = operator
+                break
+
+        if self._portability is None:
+            detailed_operator = self.find_detailed_operator(normalized)
+        else:
+            detailed_operator = self.find_current_operator(normalized)
+        return RecognitionResult(
+            phone_number, normalized, RecognitionStatus.VALID,
+            main_operator, detailed_operator, prefix == '21' or prefix == '69'
+        )
+
+    def batch_recognize(self, phone_numbers: List[str]) -> List[RecognitionResult]:
+        """
+        Batch recognize multiple phone numbers into compact result objects.
+
+        Args:
+            phone_numbers: List of phone numbers
+
+        Returns:
+            List of RecognitionResult objects
+        """
+        return list(map(self.recognize, phone_numbers))
+
+    def freeze(self):
+        """
+        Snapshot the current configuration and prefix table into an immutable validator.
+
+        The result can be shared by any number of threads without locks;
+        see compiled_validator.ThreadValidatorPool for a thread-pool batch API.
+        Later changes to this validator do not affect it.
+
+        Returns:
+            CompiledValidator answering like this validator
+        """
+        from compiled_validator import CompiledValidator
+        return CompiledValidator(self)
+
+    def operator_registry(self):
+        """
+        Get the operator registry of the current prefix table.
+
+        Returns:
+            OperatorRegistry numbering the canonical operators of the prefix database
+        """
+        return self._prefix_table.registry
+
+    def batch_recognize_ids(self, phone_numbers: Sequence) -> RecognitionBatch:
+        """
+        Batch recognize into integer columns that carry operator registry IDs.
+
+        Holds about 12 bytes per number instead of a result object; names are
+        resolved from operator_registry() only when a position is read.
+
+        Args:
+            phone_numbers: Phone numbers, kept by reference for the results' phone_number
+
+        Returns:
+            RecognitionBatch in input order
+        """
+        index = self.get_prefix_index()
+        registry = self.operator_registry()
+        index_ids = registry.translate(index.operators) if index is not None else array('H', [0])
+        overlay = self._portability
+        operator_names = ('Unknown',) + tuple(self.operator_prefixes)
+        operator_codes = {}
+        for code, prefixes in enumerate(self.operator_prefixes.values(), 1):
+            for prefix in prefixes:
+                operator_codes.setdefault(prefix, code)
+        valid_prefixes = frozenset(self.valid_prefixes)
+
+        count = len(phone_numbers)
+        normalized_column = array('q', bytes(8 * count))
+        status = array('B', bytes(count))
+        operator = array('B', bytes(count))
+        operator_id = array('H', bytes(2 * count))
+        irregular = {}
+        for position, number in enumerate(phone_numbers):
+            normalized = normalize(number)
+            # Strings that int() would not give back unchanged are kept as they are
+            integral = (normalized.isascii() and normalized.isdigit() and normalized[0] != '0'
+                        and len(normalized) <= 18)
+            if integral:
+                normalized_column[position] = value = int(normalized)
+            else:
+                normalized_column[position] = -1
+                irregular[position] = normalized
+            if len(normalized) != 9:
+                status[position] = RecognitionStatus.INVALID_LENGTH
+                continue
+            prefix = normalized[:2]
+            if prefix not in valid_prefixes:
+                status[position] = RecognitionStatus.INVALID_PREFIX
+                continue
+            operator[position] = operator_codes.get(prefix, 0)
+            name = overlay.lookup(value) if overlay is not None and integral else None
+            if name is not None:
+                operator_id[position] = registry.intern(name)
+            elif integral and index is not None:
+                operator_id[position] = index_ids[index.lookup_id(value)]
+            else:
+                operator_id[position] = registry.intern(self.find_detailed_operator_reference(normalized))
+        return RecognitionBatch(phone_numbers, normalized_column, status, operator, operator_id,
+                                operator_names, registry, self.valid_prefixes, irregular=irregular)
+
     def get_operator_by_prefix(self, prefix: str) -> str:
         """
         Get operator by prefix.
@@ -214,17 +1029,88 @@ class PolishMobileValidator:
         """
         return {k: v.copy() for k, v in self.operator_prefixes.items()}
 
-    def batch_validate(self, phone_numbers: List[str]) -> List[Dict[str, any]]:
+    def numbering_plan(self):
+        """
+        Describe this validator's configuration as the Polish plan of a NumberingPlanEngine.
+
+        Returns:
+            NumberingPlan for +48 with the current prefixes and prefix database
+        """
+        from numbering_plan import NumberingPlan
+        return NumberingPlan('48', 9, self.prefix_database, self.operator_prefixes,
+                             self.valid_prefixes, ('21', '69'), region='PL')
+
+    def batch_validate(self, phone_numbers: List[str], strict: bool = False) -> List[Dict[str, any]]:
         """
         Batch validate multiple phone numbers.
         
         Args:
             phone_numbers: List of phone numbers
+            strict: Also reject numbers in 7-digit blocks no operator was assigned;
+                the rejected fraction is reported by allocation_stats()
             
         Returns:
             List of validation results
         """
-        return [self.recognize_operator(number) for number in phone_numbers]
+        if not strict:
+            return [self.recognize_operator(number) for number in phone_numbers]
+
+        bitmap = self._require_allocation()
+        results = [self._recognize_strict(number, bitmap) for number in phone_numbers]
+        rejected = sum(1 for result in results if result.get('message') == UNALLOCATED_MESSAGE)
+        self._record_allocation_batch(len(results), rejected)
+        return results
+
+    def parallel_batch_validate(self, phone_numbers: List[str], workers: Optional[int] = None,
+                                chunk_size: int = 10000) -> List[Dict[str, any]]:
+        """
+        Batch validate multiple phone numbers across a pool of worker processes.
+
+        Workers attach to the compiled prefix index through shared memory
+        instead of receiving a pickled validator or re-parsing the CSV. Use
+        parallel.ParallelValidatorPool directly to reuse one pool across batches.
+
+        Args:
+            phone_numbers: List of phone numbers
+            workers: Number of worker processes (defaults to the CPU count)
+            chunk_size: Numbers sent to a worker per task
+
+        Returns:
+            List of validation results, in input order
+        """
+        from parallel import ParallelValidatorPool
+
+        with ParallelValidatorPool(self, workers=workers, chunk_size=chunk_size) as pool:
+            return pool.batch_validate(phone_numbers)
+
+    def batch_classify(self, phone_numbers, width: Optional[int] = None,
+                       strict: bool = False) -> BatchClassification:
+        """
+        Classify a large batch with NumPy instead of building one dict per number.
+
+        Requires NumPy. Accepts an integer array of 9-digit or 11-digit
+        (48-prefixed) numbers, a fixed-width bytes array (dtype 'S'), or a
+        bytes-like buffer of fixed-width records together with ``width``.
+
+        Byte records are ASCII only: a record holding any byte of 0x80 or
+        above is reported invalid rather than parsed around, since UTF-8 text
+        may carry Unicode digits. Callers that need recognize_operator's
+        answer for such records should send them through recognize instead.
+
+        Args:
+            phone_numbers: Numbers to classify
+            width: Record width in bytes, required for raw bytes-like buffers
+            strict: Also reject numbers in 7-digit blocks no operator was assigned;
+                the rejected fraction is reported by allocation_stats()
+
+        Returns:
+            BatchClassification with validity mask, operator codes and M2M flags
+        """
+        if not strict:
+            return classify(self, phone_numbers, width)
+        result = classify(self, phone_numbers, width, self._require_allocation())
+        self._record_allocation_batch(len(result.valid), result.unallocated_count())
+        return result
 
     def format_phone_number(self, phone_number: str, format_type: str = 'standard') -> str:
         """
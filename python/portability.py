@@ -0,0 +1,453 @@
+"""
+Number-portability overlay
+Maps individually ported numbers to their current operator, consulted before the prefix lookup
+
+Usage:
+    python portability.py build ported.csv ported.port
+    python portability.py apply ported.port delta-2024-05-01.csv [delta-2024-05-02.csv ...]
+    python portability.py info ported.port
+    python portability.py lookup ported.port 501234567
+
+Portability and delta files are ``number;operator`` rows (numbers with or
+without +48, an optional header line). In a delta file an empty operator or
+'-' removes the number from the overlay, e.g. when it returns to the operator
+holding its block.
+
+File layout (little-endian):
+    header      magic, format version, operator count, number count,
+                name blob length, CRC-32 of the body
+    names       (operators + 1) uint32 offsets, then UTF-8 operator names (ID 1 first)
+    numbers     uint32 national numbers in ascending order, 4-byte aligned
+    operators   uint8 operator ID per number
+"""
+
+import csv
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from normalization import normalize
+
+
+MAGIC = b'PLPORTAB'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sHHIII')
+NAMES_OFFSET = 32
+MAX_OPERATORS = 255
+# Numbers >> BUCKET_SHIFT select a bucket; the directory holds each bucket's first position
+BUCKET_SHIFT = 14
+BUCKETS = (10 ** 9 >> BUCKET_SHIFT) + 1
+REMOVED = ('', '-')
+
+
+class PortabilityError(ValueError):
+    """Raised when an overlay file is malformed, from another version, or corrupted."""
+
+
+def iter_portability_rows(path: str, encoding: Optional[str] = None) -> Iterator[Tuple[int, Optional[str]]]:
+    """
+    Read (number, operator) rows from a portability or delta file, in file order.
+
+    The file is decoded line by line, so dumps with millions of rows are never
+    held in memory as text. Lines without a 9-digit national number (such as
+    the header) are skipped.
+
+    Args:
+        path: Path to the file
+        encoding: Text encoding of the file (UTF-8, then Windows-1250 when omitted)
+
+    Yields:
+        National number and operator name, or None when the row removes the number
+    """
+    from polish_mobile_validator import decode_prefix_csv
+
+    with open(path, 'rb') as file:
+        lines = (decode_prefix_csv(line, encoding) for line in file)
+        for row in csv.reader(lines, delimiter=';'):
+            if not row:
+                continue
+            number = normalize(row[0].strip())
+            if len(number) != 9 or not number.isascii():
+                continue
+            operator = row[1].strip() if len(row) > 1 else ''
+            yield int(number), None if operator in REMOVED else operator
+
+
+def _operator_rows(rows: Iterable[Tuple[int, Optional[str]]],
+                   operators: List[Optional[str]]) -> Iterator[Tuple[int, int]]:
+    """
+    Replace operator names by IDs, registering new names in operators.
+
+    Args:
+        rows: National numbers and operator names, None to remove the number
+        operators: Operator names by ID, None first; extended in place
+
+    Yields:
+        National number and operator ID, 0 for removals
+    """
+    ids: Dict[str, int] = {name: op_id for op_id, name in enumerate(operators) if op_id}
+    for number, operator in rows:
+        if not 0 <= number < 10 ** 9:
+            raise PortabilityError(f'Not a national number: {number}')
+        if operator is None:
+            yield number, 0
+            continue
+        op_id = ids.get(operator)
+        if op_id is None:
+            if len(operators) > MAX_OPERATORS:
+                raise PortabilityError(f'More than {MAX_OPERATORS} operators in the overlay')
+            op_id = ids[operator] = len(operators)
+            operators.append(sys.intern(operator))
+        yield number, op_id
+
+
+class PortabilityOverlay:
+    """
+    Ported numbers as a sorted uint32 array with a parallel uint8 operator ID array.
+
+    Each entry costs 5 bytes, whether the arrays are in memory or mapped from
+    a file written by save(). Lookups bisect the number array, O(log n); a
+    fixed 240 KB directory of bucket start positions, built on the first
+    lookup, narrows the search to numbers sharing the top bits. Overlays are
+    never modified; apply_delta returns a new one.
+    """
+
+    def __init__(self, numbers: Union[array, memoryview], operator_ids: Union[array, memoryview],
+                 operators: Tuple[Optional[str], ...], path: Optional[str] = None, owner=None):
+        """
+        Wrap existing arrays.
+
+        Args:
+            numbers: Ascending national numbers (typecode or format 'I')
+            operator_ids: Operator ID per number (typecode or format 'B'), indexing operators
+            operators: Operator names, None first (ID 0 is unused)
+            path: File the arrays are mapped from, if any
+            owner: Object that must stay alive while the arrays are used (e.g. a memory map)
+        """
+        if len(numbers) != len(operator_ids):
+            raise PortabilityError('numbers and operator_ids must have the same length')
+        self.numbers = numbers
+        self.operator_ids = operator_ids
+        self.operators = operators
+        self.path = path
+        self._owner = owner
+        self._directory: Optional[array] = None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[int, Optional[str]]]) -> 'PortabilityOverlay':
+        """
+        Build an overlay from (number, operator) rows.
+
+        Rows are collected into uint32/uint8 arrays and bucket-sorted by the
+        lookup directory's buckets, so a full build holds about 10 bytes per
+        row instead of a dictionary entry; only one bucket's rows at a time
+        are sorted as Python objects.
+
+        Args:
+            rows: National numbers and operator names; later rows win, and a
+                row without an operator removes an earlier row for its number
+
+        Returns:
+            The overlay, held in memory
+        """
+        operators: List[Optional[str]] = [None]
+        numbers, operator_ids = array('I'), array('B')
+        for number, op_id in _operator_rows(rows, operators):
+            numbers.append(number)
+            operator_ids.append(op_id)
+
+        # Counting sort by bucket keeps the input order within each bucket
+        starts = array('I', bytes(4 * (BUCKETS + 1)))
+        for number in numbers:
+            starts[(number >> BUCKET_SHIFT) + 1] += 1
+        for bucket in range(1, BUCKETS + 1):
+            starts[bucket] += starts[bucket - 1]
+        bucketed_numbers, bucketed_ids = array('I', bytes(4 * len(numbers))), array('B', bytes(len(numbers)))
+        fill = array('I', starts)
+        for number, op_id in zip(numbers, operator_ids):
+            bucket = number >> BUCKET_SHIFT
+            position = fill[bucket]
+            bucketed_numbers[position] = number
+            bucketed_ids[position] = op_id
+            fill[bucket] = position + 1
+        del numbers, operator_ids, fill
+
+        sorted_numbers, sorted_ids = array('I'), array('B')
+        for bucket in range(BUCKETS):
+            start, end = starts[bucket], starts[bucket + 1]
+            if start == end:
+                continue
+            # Later rows overwrite earlier ones for the same number
+            latest = dict(zip(bucketed_numbers[start:end], bucketed_ids[start:end]))
+            for number in sorted(latest):
+                op_id = latest[number]
+                if op_id:
+                    sorted_numbers.append(number)
+                    sorted_ids.append(op_id)
+        return cls(sorted_numbers, sorted_ids, tuple(operators))
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def __contains__(self, number: int) -> bool:
+        return self.lookup_id(number) != 0
+
+    def lookup_id(self, number: int) -> int:
+        """
+        Find the operator ID of a ported number.
+
+        Args:
+            number: National number as an integer
+
+        Returns:
+            Operator ID, or 0 when the number is not ported
+        """
+        directory = self._directory
+        if directory is None:
+            directory = self._build_directory()
+        bucket = number >> BUCKET_SHIFT
+        if not 0 <= bucket < BUCKETS:
+            return 0
+        numbers = self.numbers
+        i = bisect_left(numbers, number, directory[bucket], directory[bucket + 1])
+        if i < len(numbers) and numbers[i] == number:
+            return self.operator_ids[i]
+        return 0
+
+    def _build_directory(self) -> array:
+        """Record where each bucket starts in the number array."""
+        numbers = self.numbers
+        directory = array('I', bytes(4 * (BUCKETS + 1)))
+        position = 0
+        for bucket in range(BUCKETS + 1):
+            position = bisect_left(numbers, bucket << BUCKET_SHIFT, position)
+            directory[bucket] = position
+        self._directory = directory
+        return directory
+
+    def lookup(self, number: int) -> Optional[str]:
+        """
+        Find the current operator of a ported number.
+
+        Args:
+            number: National number as an integer
+
+        Returns:
+            Operator name, or None when the number is not ported
+        """
+        return self.operators[self.lookup_id(number)]
+
+    def apply_delta(self, rows: Iterable[Tuple[int, Optional[str]]]) -> 'PortabilityOverlay':
+        """
+        Merge changes into a new overlay.
+
+        Unchanged runs between changed numbers are copied as whole byte
+        slices, so a daily delta costs one pass of memcpy over the overlay
+        plus O(d log n) for d changes. Changes are collected in a dictionary,
+        which suits deltas; use from_rows for full builds.
+
+        Args:
+            rows: National numbers and their new operator, or None to remove the
+                number; later rows win
+
+        Returns:
+            New in-memory overlay; this one is left unchanged
+        """
+        operators = list(self.operators)
+        changes: Dict[int, int] = dict(_operator_rows(rows, operators))
+
+        old_numbers = self.numbers
+        old_number_bytes = memoryview(old_numbers).cast('B')
+        old_id_bytes = memoryview(self.operator_ids).cast('B')
+        numbers, operator_ids = array('I'), array('B')
+        position = 0
+        for number, op_id in sorted(changes.items()):
+            i = bisect_left(old_numbers, number, position)
+            numbers.frombytes(old_number_bytes[4 * position:4 * i])
+            operator_ids.frombytes(old_id_bytes[position:i])
+            position = i + 1 if i < len(old_numbers) and old_numbers[i] == number else i
+            if op_id:
+                numbers.append(number)
+                operator_ids.append(op_id)
+        numbers.frombytes(old_number_bytes[4 * position:])
+        operator_ids.frombytes(old_id_bytes[position:])
+        old_number_bytes.release()
+        old_id_bytes.release()
+        return PortabilityOverlay(numbers, operator_ids, tuple(operators))
+
+    def counts_by_operator(self) -> Dict[str, int]:
+        """
+        Count ported numbers per current operator.
+
+        Returns:
+            Mapping of operator names to counts, largest first
+        """
+        counts = [0] * len(self.operators)
+        for op_id in self.operator_ids:
+            counts[op_id] += 1
+        totals = {self.operators[op_id]: count for op_id, count in enumerate(counts) if count}
+        return dict(sorted(totals.items(), key=lambda item: (-item[1], item[0])))
+
+    def save(self, path: str) -> None:
+        """
+        Write the overlay to a file, replacing it atomically.
+
+        Processes that have mapped the previous file keep reading it until
+        they load the new one.
+
+        Args:
+            path: Destination path
+        """
+        encoded = [name.encode('utf-8') for name in self.operators[1:]]
+        offsets = array('I', [0])
+        for name in encoded:
+            offsets.append(offsets[-1] + len(name))
+        numbers = array('I', memoryview(self.numbers).cast('B').tobytes())
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+            numbers.byteswap()
+        names = offsets.tobytes() + b''.join(encoded)
+
+        padding = b'\0' * (-(NAMES_OFFSET + len(names)) % 4)
+        body = [names, padding, numbers.tobytes(), memoryview(self.operator_ids).cast('B').tobytes()]
+        checksum = 0
+        for part in body:
+            checksum = zlib.crc32(part, checksum)
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, len(encoded), len(numbers), len(names), checksum)
+
+        temporary = f'{path}.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(header.ljust(NAMES_OFFSET, b'\0'))
+            for part in body:
+                file.write(part)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str, verify: bool = True) -> 'PortabilityOverlay':
+        """
+        Memory-map an overlay written by save().
+
+        Args:
+            path: Overlay file
+            verify: Check the body checksum before use
+
+        Returns:
+            The overlay, backed by the mapping
+        """
+        with open(path, 'rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(data) < NAMES_OFFSET or data[:len(MAGIC)] != MAGIC:
+                raise PortabilityError(f'Not a portability overlay: {path}')
+            _, version, operator_count, count, names_nbytes, checksum = HEADER.unpack_from(data)
+            if version != FORMAT_VERSION:
+                raise PortabilityError(f'Unsupported overlay version {version} (expected {FORMAT_VERSION})')
+            numbers_offset = NAMES_OFFSET + names_nbytes + (-(NAMES_OFFSET + names_nbytes) % 4)
+            ids_offset = numbers_offset + 4 * count
+            if len(data) != ids_offset + count:
+                raise PortabilityError(f'Truncated portability overlay: {path}')
+            if verify:
+                with memoryview(data) as view:
+                    crc = zlib.crc32(view[NAMES_OFFSET:])
+                if crc != checksum:
+                    raise PortabilityError(f'Overlay checksum mismatch: {path}')
+
+            offsets = array('I', data[NAMES_OFFSET:NAMES_OFFSET + 4 * (operator_count + 1)])
+            if sys.byteorder != 'little':
+                offsets.byteswap()
+            blob = data[NAMES_OFFSET + 4 * (operator_count + 1):NAMES_OFFSET + names_nbytes]
+            operators = (None,) + tuple(
+                sys.intern(blob[offsets[i]:offsets[i + 1]].decode('utf-8')) for i in range(operator_count)
+            )
+
+            view = memoryview(data)
+            numbers = view[numbers_offset:ids_offset].cast('I')
+            if sys.byteorder != 'little':
+                numbers = array('I', numbers.tobytes())
+                numbers.byteswap()
+            operator_ids = view[ids_offset:]
+            view.release()
+        except Exception:
+            data.close()
+            raise
+        return cls(numbers, operator_ids, operators, path, owner=data)
+
+    def close(self) -> None:
+        """Release the arrays and unmap the file, if the overlay was loaded from one."""
+        if self._owner is not None:
+            for buffer in (self.numbers, self.operator_ids):
+                if isinstance(buffer, memoryview):
+                    buffer.release()
+            self._owner.close()
+            self._owner = None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    import argparse  # only the command line needs it
+
+    parser = argparse.ArgumentParser(description='Build, update or inspect number-portability overlays.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build_parser = commands.add_parser('build', help='build an overlay from a full portability file')
+    build_parser.add_argument('source_path', help='number;operator file')
+    build_parser.add_argument('overlay_path', help='overlay file to write')
+    build_parser.add_argument('--encoding', help='text encoding (detected when omitted)')
+    apply_parser = commands.add_parser('apply', help='merge daily delta files into an overlay, in order')
+    apply_parser.add_argument('overlay_path', help='overlay file to update')
+    apply_parser.add_argument('delta_paths', nargs='+', help='number;operator delta files')
+    apply_parser.add_argument('-o', '--output', help='write here instead of replacing overlay_path')
+    apply_parser.add_argument('--encoding', help='text encoding (detected when omitted)')
+    info_parser = commands.add_parser('info', help='describe an overlay file')
+    info_parser.add_argument('overlay_path', help='overlay file to read')
+    lookup_parser = commands.add_parser('lookup', help='show the current operator of numbers')
+    lookup_parser.add_argument('overlay_path', help='overlay file to read')
+    lookup_parser.add_argument('numbers', nargs='+')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'build':
+            overlay = PortabilityOverlay.from_rows(iter_portability_rows(args.source_path, args.encoding))
+            overlay.save(args.overlay_path)
+            print(f'Wrote {len(overlay):,} ported numbers to {args.overlay_path}')
+            return 0
+
+        overlay = PortabilityOverlay.load(args.overlay_path)
+        if args.command == 'apply':
+            updated = overlay
+            for delta_path in args.delta_paths:
+                updated = updated.apply_delta(iter_portability_rows(delta_path, args.encoding))
+            overlay.close()
+            updated.save(args.output or args.overlay_path)
+            print(f'Wrote {len(updated):,} ported numbers to {args.output or args.overlay_path}')
+        elif args.command == 'info':
+            print(f'Overlay:   {args.overlay_path}')
+            print(f'Numbers:   {len(overlay):,}')
+            print(f'Size:      {os.path.getsize(args.overlay_path):,} bytes')
+            for operator, count in overlay.counts_by_operator().items():
+                print(f'{count:>13,}  {operator}')
+        else:
+            for number in args.numbers:
+                national = normalize(number)
+                operator = overlay.lookup(int(national)) if len(national) == 9 else None
+                print(f'{number}: {operator or "not ported"}')
+    except PortabilityError as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,1106 @@
+"""
+Frozen prefix tables generated from Mobileprefix_corrected.csv
+Do not edit; regenerate with: python frozen_prefixes.py build <csv> <module>
+"""
+
+FORMAT_VERSION = 1
+DEPTH = 6
+SOURCE_NAME = 'Mobileprefix_corrected.csv'
+SOURCE_SHA256 = '08584eaab72985e2dcdc8e65441b519df55e6dde2f1c29f56fe221964fd57d3f'
+INDEXED_OPERATORS = 75
+
+OPERATORS = (
+    None,
+    'Orange Polska S.A. (Sie? komórkowa Orange)',
+    'P4 Sp. z\xa0o.o. (Sie? komórkowa Play)',
+    'T-MOBILE POLSKA S.A. (Sie? komórkowa T-Mobile)',
+    'SIA Ntel Solutions',
+    'Polkomtel Sp. z\xa0o.o. (Sie? komórkowa Plus)',
+    'PKP Polskie Linie Kolejowe S.A.',
+    'Polska Spó?ka Gazownictwa Sp. z\xa0o.o.',
+    'Virgin Mobile Polska Sp. z\xa0o.o.',
+    'Cyfrowy POLSAT S.A.',
+    'Polskie Sieci Cyfrowe Sp. z\xa0o.o.',
+    'Lycamobile Sp. z\xa0o.o.',
+    'Netia S.A.',
+    'AERO 2 Sp. z\xa0o.o.',
+    '4RE Sp. z\xa0o.o.',
+    '3S S.A.',
+    'Politechnika ?ódzka Uczelniane Centrum Informatyczne',
+    'VCOM Polska Sp. z\xa0o.o.',
+    'Telestrada S.A.',
+    'CLAUDE ICT POLAND Sp. z\xa0o.o.',
+    'Pomagacz Sp. Z o.o.',
+    'PIKA POLSKA Sp. z\xa0o.o.',
+    'ITI Neovision S.A. (Sie? komórkowa CANAL+)',
+    'Next Mobile Sp. z\xa0o.o.',
+    'Mobiledata Sp. z\xa0o.o.',
+    'Benemen Poland Sp. z\xa0o.o.',
+    'OTVARTA Sp. z\xa0o.o.',
+    'NordConnect OU',
+    'Vonage B.V.',
+    'NAU Profit Sp. z\xa0o.o.',
+    'BSG ESTONIA OU',
+    'Telestrada S.A. (Sie? komórkowa Lajt Mobile)',
+    'UPC Polska Sp. z\xa0o.o.',
+    'Fundacja Nasza Wizja',
+    'Messagebird B.V.',
+    'SIA NetBalt',
+    'Nowa Telefonia Sp. z\xa0o.o.',
+    'SGT S.A.',
+    'Klucz Telekomunikacja Sp. z\xa0o. o. (Sie? komórkowa Klucz Mobile)',
+    'NIMBUSFIVE GmbH',
+    'PRZEDSI?BIORSTWO TELEKOMUNIKACYJNE "TELGAM" SPÓ?KA AKCYJNA',
+    'TELENABLER Sp. z\xa0o.o.',
+    'I.M. Consulting Izabela Mi?osz',
+    'EZ PHONE MOBILE Sp. z\xa0o.o.',
+    'AMD Telecom SA',
+    'e-Telko Sp. z\xa0o.o.',
+    'Twilio Ireland Limited',
+    'SOFTELNET Spó?ka akcyjna Spó?ka komandytowa',
+    'Move Telecom S.A.',
+    'Sat Film Sp. z\xa0o.o. i\xa0Wspólnicy Sp.k.',
+    'TeleGo sp. z\xa0o.o.',
+    'COMPATEL LIMITED',
+    'VOXBONE SA',
+    'Pomagacz Sp. z\xa0o.o.',
+    'Plintron Poland Sp. z\xa0o.o.',
+    'Multimedia Polska Sp. z\xa0o.o. (Sie? komórkowa multiMOBILE)',
+    'Vectra S.A.',
+    'PREMIUM MOBILE Sp. z\xa0o.o.',
+    'TELCO LEADERS LTD',
+    'VikingCo Poland Sp. z\xa0o. o.',
+    'Polvoice Sp. Z o.o.',
+    'AGILE TELECOM S.P.A.',
+    'MobiWeb Telecom Limited',
+    'AHMES Sp. z\xa0o.o.',
+    'TOYA Sp. z\xa0o.o.',
+    'INEA S.A.',
+    'CrossMobile Sp. z\xa0o.o.',
+    'METROPORT Sp. z\xa0o.o.',
+    'SMSHIGHWAY LIMITED',
+    'JMDI J. Maleszko',
+    'TISMI B.V.',
+    'Lancelot B.V.',
+    'CLUDO Sp z\xa0o.o.',
+    'CARITAS ??CZY Sp. z\xa0o.o.',
+    'INTERKONEKT Pawe? Barczyk Tomasz Furman Spó?ka Jawna',
+)
+
+PREFIXES = (
+    ('2111', 7),
+    ('2112', 7),
+    ('21131', 7),
+    ('21132', 7),
+    ('21133', 7),
+    ('21134', 7),
+    ('21135', 7),
+    ('2114', 5),
+    ('2115', 5),
+    ('2120', 1),
+    ('2121', 1),
+    ('2122', 1),
+    ('2123', 1),
+    ('2124', 1),
+    ('4500', 2),
+    ('4501', 2),
+    ('45021', 14),
+    ('4510', 1),
+    ('4511', 1),
+    ('4512', 1),
+    ('45140', 15),
+    ('45141', 16),
+    ('45145', 17),
+    ('4515', 1),
+    ('4516', 1),
+    ('452', 1),
+    ('45540', 18),
+    ('45544', 18),
+    ('45545', 19),
+    ('45555', 20),
+    ('45678', 21),
+    ('45900', 22),
+    ('45901', 22),
+    ('45902', 22),
+    ('45903', 22),
+    ('45904', 22),
+    ('45906', 24),
+    ('45907', 24),
+    ('45905', 23),
+    ('45908', 24),
+    ('45909', 25),
+    ('45920', 4),
+    ('4593', 8),
+    ('45941', 26),
+    ('45942', 27),
+    ('45943', 24),
+    ('45944', 28),
+    ('45945', 29),
+    ('45951', 9),
+    ('45952', 9),
+    ('45953', 9),
+    ('45954', 9),
+    ('45955', 9),
+    ('45958', 31),
+    ('45959', 31),
+    ('45950', 4),
+    ('45956', 23),
+    ('45957', 30),
+    ('4598', 9),
+    ('500', 1),
+    ('501', 1),
+    ('502', 1),
+    ('503', 1),
+    ('504', 1),
+    ('505', 1),
+    ('506', 1),
+    ('507', 1),
+    ('508', 1),
+    ('509', 1),
+    ('510', 1),
+    ('511', 1),
+    ('512', 1),
+    ('513', 1),
+    ('514', 1),
+    ('515', 1),
+    ('516', 1),
+    ('517', 1),
+    ('518', 1),
+    ('519', 1),
+    ('530', 2),
+    ('531', 2),
+    ('532', 3),
+    ('533', 2),
+    ('534', 2),
+    ('535', 2),
+    ('5360', 2),
+    ('5361', 2),
+    ('5362', 2),
+    ('5363', 2),
+    ('5364', 2),
+    ('5365', 2),
+    ('5366', 10),
+    ('5367', 2),
+    ('5368', 2),
+    ('5369', 2),
+    ('537', 2),
+    ('538', 3),
+    ('539', 3),
+    ('570', 2),
+    ('5710', 1),
+    ('5711', 1),
+    ('5712', 1),
+    ('5713', 1),
+    ('5714', 1),
+    ('5715', 1),
+    ('5716', 1),
+    ('5717', 1),
+    ('5718', 1),
+    ('5719', 1),
+    ('572', 1),
+    ('5730', 1),
+    ('5731', 1),
+    ('5732', 1),
+    ('5733', 1),
+    ('5734', 1),
+    ('57350', 23),
+    ('57351', 32),
+    ('57352', 32),
+    ('57353', 32),
+    ('57354', 32),
+    ('57355', 32),
+    ('57356', 23),
+    ('57357', 1),
+    ('57358', 23),
+    ('57359', 33),
+    ('5736', 1),
+    ('5737', 1),
+    ('5738', 1),
+    ('5739', 1),
+    ('574', 2),
+    ('575', 2),
+    ('576', 2),
+    ('577', 2),
+    ('578', 2),
+    ('5790', 8),
+    ('5791', 11),
+    ('5792', 11),
+    ('5793', 11),
+    ('57940', 22),
+    ('57941', 34),
+    ('57942', 35),
+    ('57943', 22),
+    ('57944', 22),
+    ('57945', 22),
+    ('57946', 33),
+    ('57947', 36),
+    ('579', 4),
+    ('57949', 37),
+    ('57950', 38),
+    ('57951', 8),
+    ('57952', 8),
+    ('57953', 35),
+    ('57954', 8),
+    ('57955', 8),
+    ('57956', 8),
+    ('57957', 15),
+    ('57958', 39),
+    ('57959', 22),
+    ('5796', 8),
+    ('57970', 40),
+    ('57971', 32),
+    ('57972', 32),
+    ('57973', 32),
+    ('57974', 32),
+    ('57975', 32),
+    ('57976', 41),
+    ('57977', 42),
+    ('57978', 43),
+    ('57979', 43),
+    ('5798', 8),
+    ('5799', 8),
+    ('600', 3),
+    ('601', 5),
+    ('602', 3),
+    ('603', 5),
+    ('604', 3),
+    ('605', 5),
+    ('606', 3),
+    ('607', 5),
+    ('608', 3),
+    ('609', 5),
+    ('660', 3),
+    ('661', 5),
+    ('662', 3),
+    ('663', 5),
+    ('664', 3),
+    ('665', 5),
+    ('6660', 3),
+    ('6661', 3),
+    ('6662', 3),
+    ('6663', 3),
+    ('6664', 3),
+    ('6665', 3),
+    ('6666', 2),
+    ('6667', 3),
+    ('6668', 3),
+    ('6669', 3),
+    ('667', 5),
+    ('668', 3),
+    ('669', 5),
+    ('6900', 2),
+    ('6901', 1),
+    ('6902', 1),
+    ('6903', 1),
+    ('6904', 1),
+    ('6905', 1),
+    ('6906', 1),
+    ('69070', 2),
+    ('69071', 28),
+    ('69072', 1),
+    ('69073', 1),
+    ('69074', 2),
+    ('69075', 2),
+    ('69076', 2),
+    ('69077', 2),
+    ('69078', 2),
+    ('69079', 2),
+    ('6909', 2),
+    ('691', 5),
+    ('692', 3),
+    ('693', 5),
+    ('694', 3),
+    ('695', 5),
+    ('696', 3),
+    ('697', 5),
+    ('698', 3),
+    ('69900', 9),
+    ('69901', 44),
+    ('69902', 9),
+    ('69903', 9),
+    ('69904', 9),
+    ('69905', 9),
+    ('69906', 9),
+    ('69907', 9),
+    ('69908', 9),
+    ('69909', 9),
+    ('69910', 9),
+    ('69911', 9),
+    ('69912', 9),
+    ('69913', 9),
+    ('69914', 9),
+    ('69915', 9),
+    ('69916', 9),
+    ('69917', 9),
+    ('69918', 9),
+    ('69919', 9),
+    ('69920', 9),
+    ('69921', 9),
+    ('69922', 45),
+    ('69923', 9),
+    ('69924', 9),
+    ('69925', 9),
+    ('69926', 9),
+    ('69927', 9),
+    ('69928', 9),
+    ('69929', 9),
+    ('6993', 9),
+    ('6994', 9),
+    ('69950', 44),
+    ('69951', 24),
+    ('69952', 24),
+    ('69953', 24),
+    ('69954', 24),
+    ('69955', 24),
+    ('69956', 46),
+    ('69957', 47),
+    ('69958', 42),
+    ('69959', 48),
+    ('69960', 15),
+    ('69961', 9),
+    ('69962', 9),
+    ('69963', 9),
+    ('69964', 9),
+    ('69965', 9),
+    ('69966', 9),
+    ('69967', 36),
+    ('69968', 9),
+    ('69969', 9),
+    ('69970', 22),
+    ('69971', 49),
+    ('69972', 50),
+    ('69973', 50),
+    ('69974', 51),
+    ('69975', 50),
+    ('69976', 50),
+    ('69977', 50),
+    ('69978', 52),
+    ('69979', 22),
+    ('6998', 12),
+    ('6999', 12),
+    ('7200', 13),
+    ('7201', 13),
+    ('7202', 13),
+    ('7203', 13),
+    ('7204', 13),
+    ('7205', 13),
+    ('7206', 13),
+    ('7207', 13),
+    ('7208', 2),
+    ('7209', 13),
+    ('721', 5),
+    ('722', 5),
+    ('723', 5),
+    ('724', 5),
+    ('725', 5),
+    ('726', 5),
+    ('7270', 5),
+    ('72710', 53),
+    ('72711', 54),
+    ('72712', 54),
+    ('72713', 54),
+    ('72714', 54),
+    ('72715', 54),
+    ('72716', 54),
+    ('72717', 54),
+    ('72718', 54),
+    ('72719', 54),
+    ('7272', 3),
+    ('7273', 3),
+    ('7274', 5),
+    ('7275', 5),
+    ('7276', 5),
+    ('72770', 5),
+    ('72771', 5),
+    ('72772', 5),
+    ('72773', 55),
+    ('72774', 55),
+    ('72775', 55),
+    ('72776', 55),
+    ('72777', 5),
+    ('72778', 55),
+    ('72779', 5),
+    ('7278', 5),
+    ('7279', 5),
+    ('7280', 13),
+    ('7281', 3),
+    ('7282', 3),
+    ('7283', 3),
+    ('7284', 3),
+    ('7285', 3),
+    ('7286', 3),
+    ('7287', 3),
+    ('7288', 3),
+    ('7289', 3),
+    ('72900', 2),
+    ('72901', 2),
+    ('72902', 2),
+    ('72903', 2),
+    ('72904', 2),
+    ('72905', 2),
+    ('72906', 2),
+    ('72907', 23),
+    ('72908', 2),
+    ('7291', 2),
+    ('7292', 11),
+    ('7293', 11),
+    ('7294', 11),
+    ('7295', 11),
+    ('7296', 11),
+    ('72970', 44),
+    ('72971', 49),
+    ('72972', 51),
+    ('72973', 56),
+    ('72974', 56),
+    ('72975', 24),
+    ('72976', 49),
+    ('72977', 12),
+    ('72978', 56),
+    ('72979', 56),
+    ('72980', 12),
+    ('72981', 56),
+    ('72982', 56),
+    ('72983', 57),
+    ('72984', 57),
+    ('72985', 57),
+    ('72986', 12),
+    ('72987', 57),
+    ('72988', 57),
+    ('72989', 57),
+    ('72990', 58),
+    ('72991', 57),
+    ('72992', 57),
+    ('72993', 28),
+    ('72994', 57),
+    ('72995', 57),
+    ('72996', 57),
+    ('72997', 57),
+    ('72998', 57),
+    ('72999', 57),
+    ('730', 2),
+    ('731', 2),
+    ('73200', 2),
+    ('73201', 2),
+    ('73202', 2),
+    ('73203', 2),
+    ('73204', 2),
+    ('73205', 2),
+    ('73206', 59),
+    ('73207', 2),
+    ('73208', 2),
+    ('73209', 2),
+    ('73210', 2),
+    ('73211', 2),
+    ('73212', 2),
+    ('73213', 59),
+    ('73214', 2),
+    ('73215', 2),
+    ('73216', 2),
+    ('73217', 2),
+    ('73218', 2),
+    ('73219', 2),
+    ('73223', 2),
+    ('73224', 2),
+    ('73225', 2),
+    ('73226', 2),
+    ('73227', 2),
+    ('73228', 2),
+    ('73229', 2),
+    ('7323', 2),
+    ('73240', 2),
+    ('73241', 2),
+    ('73242', 2),
+    ('73243', 2),
+    ('73244', 2),
+    ('73245', 2),
+    ('73246', 2),
+    ('73247', 12),
+    ('73248', 2),
+    ('7325', 2),
+    ('7326', 2),
+    ('7327', 2),
+    ('7328', 2),
+    ('7329', 2),
+    ('7330', 2),
+    ('7331', 2),
+    ('7332', 2),
+    ('7333', 2),
+    ('7334', 2),
+    ('7335', 2),
+    ('7336', 2),
+    ('73370', 2),
+    ('73371', 2),
+    ('73372', 59),
+    ('73373', 2),
+    ('73374', 2),
+    ('73375', 2),
+    ('73376', 2),
+    ('73377', 2),
+    ('73378', 2),
+    ('73379', 2),
+    ('7338', 2),
+    ('7339', 2),
+    ('734', 3),
+    ('735', 3),
+    ('7360', 8),
+    ('7361', 3),
+    ('7362', 3),
+    ('7363', 3),
+    ('7364', 3),
+    ('7365', 3),
+    ('7366', 3),
+    ('7367', 8),
+    ('7368', 8),
+    ('7369', 8),
+    ('7370', 5),
+    ('7371', 5),
+    ('73720', 5),
+    ('73721', 5),
+    ('73722', 5),
+    ('73723', 5),
+    ('73724', 5),
+    ('73725', 5),
+    ('73726', 33),
+    ('73727', 33),
+    ('73728', 33),
+    ('73729', 33),
+    ('7373', 8),
+    ('7374', 8),
+    ('7375', 8),
+    ('7376', 8),
+    ('7377', 8),
+    ('7378', 8),
+    ('7379', 8),
+    ('738', 6),
+    ('7390', 2),
+    ('73910', 42),
+    ('73911', 56),
+    ('73912', 56),
+    ('73913', 56),
+    ('73914', 56),
+    ('73915', 56),
+    ('73916', 56),
+    ('73917', 56),
+    ('73918', 60),
+    ('73919', 12),
+    ('7392', 2),
+    ('73930', 56),
+    ('73931', 9),
+    ('73932', 9),
+    ('73933', 9),
+    ('73934', 9),
+    ('73935', 9),
+    ('73936', 9),
+    ('73937', 9),
+    ('73938', 9),
+    ('73939', 9),
+    ('7394', 11),
+    ('7395', 11),
+    ('7396', 11),
+    ('7397', 9),
+    ('7398', 9),
+    ('73990', 59),
+    ('73991', 61),
+    ('73992', 62),
+    ('73993', 35),
+    ('73994', 55),
+    ('73995', 55),
+    ('73996', 55),
+    ('73997', 59),
+    ('73998', 59),
+    ('73999', 63),
+    ('7800', 1),
+    ('7801', 1),
+    ('78020', 64),
+    ('78021', 65),
+    ('78022', 65),
+    ('78023', 65),
+    ('78024', 65),
+    ('78025', 66),
+    ('78026', 35),
+    ('78027', 65),
+    ('78028', 67),
+    ('78029', 68),
+    ('7803', 3),
+    ('78040', 5),
+    ('78041', 32),
+    ('78042', 32),
+    ('78043', 32),
+    ('78044', 32),
+    ('78045', 32),
+    ('78046', 32),
+    ('78047', 32),
+    ('78048', 32),
+    ('78049', 32),
+    ('7805', 1),
+    ('7806', 1),
+    ('78070', 5),
+    ('78071', 1),
+    ('78072', 1),
+    ('78073', 1),
+    ('78074', 1),
+    ('78075', 1),
+    ('78076', 1),
+    ('78077', 1),
+    ('78078', 1),
+    ('78079', 1),
+    ('7808', 1),
+    ('78090', 23),
+    ('78091', 1),
+    ('78092', 1),
+    ('78093', 1),
+    ('78094', 1),
+    ('78095', 1),
+    ('78096', 1),
+    ('78097', 1),
+    ('78098', 1),
+    ('78099', 1),
+    ('781', 5),
+    ('782', 5),
+    ('783', 5),
+    ('784', 3),
+    ('785', 5),
+    ('78600', 69),
+    ('78601', 55),
+    ('78602', 55),
+    ('78603', 55),
+    ('78604', 55),
+    ('78605', 55),
+    ('78606', 55),
+    ('78607', 56),
+    ('78608', 64),
+    ('78609', 70),
+    ('7861', 2),
+    ('7862', 2),
+    ('7863', 1),
+    ('7864', 1),
+    ('7865', 1),
+    ('7866', 1),
+    ('78670', 71),
+    ('78678', 72),
+    ('7868', 1),
+    ('7869', 1),
+    ('787', 3),
+    ('788', 3),
+    ('7890', 1),
+    ('7891', 1),
+    ('7892', 1),
+    ('7893', 1),
+    ('7894', 1),
+    ('78950', 5),
+    ('78951', 5),
+    ('78952', 5),
+    ('78953', 5),
+    ('78954', 5),
+    ('78955', 5),
+    ('78956', 57),
+    ('78957', 57),
+    ('78958', 57),
+    ('7896', 1),
+    ('7897', 1),
+    ('7898', 1),
+    ('7899', 1),
+    ('790', 2),
+    ('791', 2),
+    ('792', 2),
+    ('7930', 2),
+    ('7931', 2),
+    ('7932', 2),
+    ('7933', 2),
+    ('7934', 2),
+    ('7935', 2),
+    ('7936', 2),
+    ('7937', 2),
+    ('7938', 12),
+    ('7939', 2),
+    ('794', 2),
+    ('7950', 2),
+    ('7951', 3),
+    ('7952', 3),
+    ('7953', 3),
+    ('7954', 3),
+    ('7955', 3),
+    ('7956', 2),
+    ('7957', 2),
+    ('7958', 2),
+    ('7959', 2),
+    ('796', 2),
+    ('797', 1),
+    ('798', 1),
+    ('7990', 1),
+    ('7991', 2),
+    ('7992', 2),
+    ('7993', 2),
+    ('7994', 2),
+    ('79950', 2),
+    ('79951', 2),
+    ('79952', 2),
+    ('79953', 2),
+    ('79954', 23),
+    ('79955', 2),
+    ('79956', 2),
+    ('79957', 2),
+    ('79958', 2),
+    ('79959', 2),
+    ('7996', 1),
+    ('7997', 8),
+    ('7998', 8),
+    ('7999', 8),
+    ('880', 3),
+    ('8810', 3),
+    ('8811', 13),
+    ('8812', 2),
+    ('8813', 2),
+    ('8814', 2),
+    ('8815', 2),
+    ('8816', 2),
+    ('8817', 2),
+    ('8818', 3),
+    ('8819', 3),
+    ('882', 3),
+    ('8830', 2),
+    ('8831', 2),
+    ('8832', 2),
+    ('8833', 3),
+    ('8834', 2),
+    ('8835', 2),
+    ('8836', 2),
+    ('8837', 2),
+    ('8838', 3),
+    ('8839', 2),
+    ('8840', 2),
+    ('8841', 3),
+    ('8842', 3),
+    ('8843', 2),
+    ('88444', 73),
+    ('88449', 74),
+    ('8846', 2),
+    ('8847', 2),
+    ('8848', 2),
+    ('8849', 2),
+    ('885', 5),
+    ('886', 3),
+    ('887', 5),
+    ('888', 3),
+    ('889', 3),
+)
+
+SLOT_RUNS = (
+    (0, 0),
+    (211100, 7),
+    (211300, 0),
+    (211310, 7),
+    (211360, 0),
+    (211400, 5),
+    (211600, 0),
+    (212000, 1),
+    (212500, 0),
+    (450000, 2),
+    (450200, 0),
+    (450210, 14),
+    (450220, 0),
+    (451000, 1),
+    (451300, 0),
+    (451400, 15),
+    (451410, 16),
+    (451420, 0),
+    (451450, 17),
+    (451460, 0),
+    (451500, 1),
+    (451700, 0),
+    (452000, 1),
+    (453000, 0),
+    (455400, 18),
+    (455410, 0),
+    (455440, 18),
+    (455450, 19),
+    (455460, 0),
+    (455550, 20),
+    (455560, 0),
+    (456780, 21),
+    (456790, 0),
+    (459000, 22),
+    (459050, 23),
+    (459060, 24),
+    (459090, 25),
+    (459100, 0),
+    (459200, 4),
+    (459210, 0),
+    (459300, 8),
+    (459400, 0),
+    (459410, 26),
+    (459420, 27),
+    (459430, 24),
+    (459440, 28),
+    (459450, 29),
+    (459460, 0),
+    (459500, 4),
+    (459510, 9),
+    (459560, 23),
+    (459570, 30),
+    (459580, 31),
+    (459600, 0),
+    (459800, 9),
+    (459900, 0),
+    (500000, 1),
+    (520000, 0),
+    (530000, 2),
+    (532000, 3),
+    (533000, 2),
+    (536600, 10),
+    (536700, 2),
+    (538000, 3),
+    (540000, 0),
+    (570000, 2),
+    (571000, 1),
+    (573500, 23),
+    (573510, 32),
+    (573560, 23),
+    (573570, 1),
+    (573580, 23),
+    (573590, 33),
+    (573600, 1),
+    (574000, 2),
+    (579000, 8),
+    (579100, 11),
+    (579400, 22),
+    (579410, 34),
+    (579420, 35),
+    (579430, 22),
+    (579460, 33),
+    (579470, 36),
+    (579480, 4),
+    (579490, 37),
+    (579500, 38),
+    (579510, 8),
+    (579530, 35),
+    (579540, 8),
+    (579570, 15),
+    (579580, 39),
+    (579590, 22),
+    (579600, 8),
+    (579700, 40),
+    (579710, 32),
+    (579760, 41),
+    (579770, 42),
+    (579780, 43),
+    (579800, 8),
+    (580000, 0),
+    (600000, 3),
+    (601000, 5),
+    (602000, 3),
+    (603000, 5),
+    (604000, 3),
+    (605000, 5),
+    (606000, 3),
+    (607000, 5),
+    (608000, 3),
+    (609000, 5),
+    (610000, 0),
+    (660000, 3),
+    (661000, 5),
+    (662000, 3),
+    (663000, 5),
+    (664000, 3),
+    (665000, 5),
+    (666000, 3),
+    (666600, 2),
+    (666700, 3),
+    (667000, 5),
+    (668000, 3),
+    (669000, 5),
+    (670000, 0),
+    (690000, 2),
+    (690100, 1),
+    (690700, 2),
+    (690710, 28),
+    (690720, 1),
+    (690740, 2),
+    (690800, 0),
+    (690900, 2),
+    (691000, 5),
+    (692000, 3),
+    (693000, 5),
+    (694000, 3),
+    (695000, 5),
+    (696000, 3),
+    (697000, 5),
+    (698000, 3),
+    (699000, 9),
+    (699010, 44),
+    (699020, 9),
+    (699220, 45),
+    (699230, 9),
+    (699500, 44),
+    (699510, 24),
+    (699560, 46),
+    (699570, 47),
+    (699580, 42),
+    (699590, 48),
+    (699600, 15),
+    (699610, 9),
+    (699670, 36),
+    (699680, 9),
+    (699700, 22),
+    (699710, 49),
+    (699720, 50),
+    (699740, 51),
+    (699750, 50),
+    (699780, 52),
+    (699790, 22),
+    (699800, 12),
+    (700000, 0),
+    (720000, 13),
+    (720800, 2),
+    (720900, 13),
+    (721000, 5),
+    (727100, 53),
+    (727110, 54),
+    (727200, 3),
+    (727400, 5),
+    (727730, 55),
+    (727770, 5),
+    (727780, 55),
+    (727790, 5),
+    (728000, 13),
+    (728100, 3),
+    (729000, 2),
+    (729070, 23),
+    (729080, 2),
+    (729090, 0),
+    (729100, 2),
+    (729200, 11),
+    (729700, 44),
+    (729710, 49),
+    (729720, 51),
+    (729730, 56),
+    (729750, 24),
+    (729760, 49),
+    (729770, 12),
+    (729780, 56),
+    (729800, 12),
+    (729810, 56),
+    (729830, 57),
+    (729860, 12),
+    (729870, 57),
+    (729900, 58),
+    (729910, 57),
+    (729930, 28),
+    (729940, 57),
+    (730000, 2),
+    (732060, 59),
+    (732070, 2),
+    (732130, 59),
+    (732140, 2),
+    (732200, 0),
+    (732230, 2),
+    (732470, 12),
+    (732480, 2),
+    (732490, 0),
+    (732500, 2),
+    (733720, 59),
+    (733730, 2),
+    (734000, 3),
+    (736000, 8),
+    (736100, 3),
+    (736700, 8),
+    (737000, 5),
+    (737260, 33),
+    (737300, 8),
+    (738000, 6),
+    (739000, 2),
+    (739100, 42),
+    (739110, 56),
+    (739180, 60),
+    (739190, 12),
+    (739200, 2),
+    (739300, 56),
+    (739310, 9),
+    (739400, 11),
+    (739700, 9),
+    (739900, 59),
+    (739910, 61),
+    (739920, 62),
+    (739930, 35),
+    (739940, 55),
+    (739970, 59),
+    (739990, 63),
+    (740000, 0),
+    (780000, 1),
+    (780200, 64),
+    (780210, 65),
+    (780250, 66),
+    (780260, 35),
+    (780270, 65),
+    (780280, 67),
+    (780290, 68),
+    (780300, 3),
+    (780400, 5),
+    (780410, 32),
+    (780500, 1),
+    (780700, 5),
+    (780710, 1),
+    (780900, 23),
+    (780910, 1),
+    (781000, 5),
+    (784000, 3),
+    (785000, 5),
+    (786000, 69),
+    (786010, 55),
+    (786070, 56),
+    (786080, 64),
+    (786090, 70),
+    (786100, 2),
+    (786300, 1),
+    (786700, 71),
+    (786710, 0),
+    (786780, 72),
+    (786790, 0),
+    (786800, 1),
+    (787000, 3),
+    (789000, 1),
+    (789500, 5),
+    (789560, 57),
+    (789590, 0),
+    (789600, 1),
+    (790000, 2),
+    (793800, 12),
+    (793900, 2),
+    (795100, 3),
+    (795600, 2),
+    (797000, 1),
+    (799100, 2),
+    (799540, 23),
+    (799550, 2),
+    (799600, 1),
+    (799700, 8),
+    (800000, 0),
+    (880000, 3),
+    (881100, 13),
+    (881200, 2),
+    (881800, 3),
+    (883000, 2),
+    (883300, 3),
+    (883400, 2),
+    (883800, 3),
+    (883900, 2),
+    (884100, 3),
+    (884300, 2),
+    (884400, 0),
+    (884440, 73),
+    (884450, 0),
+    (884490, 74),
+    (884500, 0),
+    (884600, 2),
+    (885000, 5),
+    (886000, 3),
+    (887000, 5),
+    (888000, 3),
+    (890000, 0),
+)
+
+OVERFLOW_BASE = (
+)
+
+LONG_PREFIXES = (
+)
@@ -0,0 +1,198 @@
+"""
+Compiled prefix index for Polish mobile numbers
+Replaces longest-prefix dictionary probing with a flat, fixed-depth lookup table
+"""
+
+import sys
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class PrefixIndex:
+    """
+    Flat lookup table indexed by the first ``DEPTH`` digits of a 9-digit number.
+
+    Every slot holds a small operator ID (0 means "no prefix matched") that
+    resolves to a name through ``operators``. Prefixes of up to ``DEPTH``
+    digits are expanded into the slots they cover, with longer prefixes
+    overwriting shorter ones, so a lookup is a single array access. Prefixes
+    longer than ``DEPTH`` digits mark their slot as ``OVERFLOW`` and are
+    resolved from a small side table.
+    """
+
+    DEPTH = 6
+    SLOTS_NBYTES = 2 * 10 ** DEPTH
+    NO_MATCH = 0
+    OVERFLOW = 0xFFFF
+
+    def __init__(self, prefix_database: Dict[str, str]):
+        """
+        Compile the index from a prefix database.
+
+        Args:
+            prefix_database: Mapping of national prefixes (without +48) to operator names
+        """
+        self._size = len(prefix_database)
+        self._operator_ids: Dict[str, int] = {}
+        names: List[Optional[str]] = [None]
+        self._slots = array('H', bytes(self.SLOTS_NBYTES))
+        self._overflow_base: Dict[int, int] = {}
+        self._long_prefixes: Dict[int, Dict[int, int]] = {}
+
+        # Shorter prefixes first so that longer (more specific) ones overwrite them
+        entries = sorted(
+            ((prefix, operator) for prefix, operator in prefix_database.items()
+             if 2 <= len(prefix) <= 9 and prefix.isdigit() and prefix.isascii()),
+            key=lambda entry: (len(entry[0]), entry[0])
+        )
+
+        for prefix, operator in entries:
+            op_id = self._operator_ids.get(operator)
+            if op_id is None:
+                op_id = len(names)
+                if op_id >= self.OVERFLOW:
+                    raise ValueError('Too many distinct operators for a 16-bit index')
+                operator = sys.intern(operator)
+                self._operator_ids[operator] = op_id
+                names.append(operator)
+
+            if len(prefix) <= self.DEPTH:
+                span = 10 ** (self.DEPTH - len(prefix))
+                start = int(prefix) * span
+                self._slots[start:start + span] = array('H', [op_id]) * span
+            else:
+                slot = int(prefix[:self.DEPTH])
+                if self._slots[slot] != self.OVERFLOW:
+                    self._overflow_base[slot] = self._slots[slot]
+                    self._slots[slot] = self.OVERFLOW
+                self._long_prefixes.setdefault(len(prefix), {})[int(prefix)] = op_id
+
+        self.operators: Tuple[Optional[str], ...] = tuple(names)
+
+    @classmethod
+    def from_buffer(cls, buffer, metadata: Dict[str, Any]) -> 'PrefixIndex':
+        """
+        Attach to a slot table that lives in an existing buffer, without copying it.
+
+        Args:
+            buffer: Buffer holding at least SLOTS_NBYTES bytes of native 16-bit slots
+                    (e.g. shared memory or an mmap)
+            metadata: Dictionary produced by export_metadata on the source index
+
+        Returns:
+            PrefixIndex backed by the buffer
+        """
+        index = cls.__new__(cls)
+        index._size = metadata['size']
+        index.operators = tuple(metadata['operators'])
+        index._operator_ids = {name: op_id for op_id, name in enumerate(index.operators) if op_id}
+        index._slots = memoryview(buffer).cast('B')[:cls.SLOTS_NBYTES].cast('H')
+        index._overflow_base = dict(metadata['overflow_base'])
+        index._long_prefixes = {length: dict(prefixes) for length, prefixes in metadata['long_prefixes'].items()}
+        return index
+
+    def export_metadata(self) -> Dict[str, Any]:
+        """
+        Export everything except the slot table, for use with from_buffer.
+
+        Returns:
+            Small picklable dictionary with operator names and overflow tables
+        """
+        return {
+            'size': self._size,
+            'operators': self.operators,
+            'overflow_base': dict(self._overflow_base),
+            'long_prefixes': {length: dict(prefixes) for length, prefixes in self._long_prefixes.items()},
+        }
+
+    def release(self) -> None:
+        """Release a buffer attached with from_buffer so its owner can be closed."""
+        if isinstance(self._slots, memoryview):
+            self._slots.release()
+
+    def operator_id(self, operator: str) -> int:
+        """
+        Get the ID assigned to an operator name.
+
+        Args:
+            operator: Operator name
+
+        Returns:
+            Operator ID, or NO_MATCH for unknown names
+        """
+        return self._operator_ids.get(operator, self.NO_MATCH)
+
+    @property
+    def slots(self):
+        """The unsigned 16-bit slot table, indexed by the first DEPTH digits."""
+        return self._slots
+
+    def __len__(self) -> int:
+        """Number of prefixes in the database the index was compiled from."""
+        return self._size
+
+    def lookup_id(self, number: int) -> int:
+        """
+        Find the operator ID for a 9-digit national number.
+
+        Args:
+            number: National number as an integer (0 <= number < 10**9)
+
+        Returns:
+            Operator ID, or NO_MATCH when no prefix covers the number
+        """
+        op_id = self._slots[number // 1000]
+        if op_id == self.OVERFLOW:
+            return self._resolve_overflow(number)
+        return op_id
+
+    def lookup(self, number: int) -> Optional[str]:
+        """
+        Find the detailed operator name for a 9-digit national number.
+
+        Args:
+            number: National number as an integer (0 <= number < 10**9)
+
+        Returns:
+            Operator name, or None when no prefix covers the number
+        """
+        op_id = self._slots[number // 1000]
+        if op_id == self.OVERFLOW:
+            op_id = self._resolve_overflow(number)
+        return self.operators[op_id]
+
+    def lookup_probes(self, number: int) -> Tuple[Optional[str], int]:
+        """
+        Find the detailed operator name and count the table probes it took.
+
+        Same result as lookup; used by instrumentation to show how often
+        lookups fall through to the overflow tables.
+
+        Args:
+            number: National number as an integer (0 <= number < 10**9)
+
+        Returns:
+            (operator name or None, number of slot and side-table probes)
+        """
+        op_id = self._slots[number // 1000]
+        if op_id != self.OVERFLOW:
+            return self.operators[op_id], 1
+        probes = 1
+        for length in range(9, self.DEPTH, -1):
+            prefixes = self._long_prefixes.get(length)
+            if prefixes:
+                probes += 1
+                op_id = prefixes.get(number // 10 ** (9 - length))
+                if op_id is not None:
+                    return self.operators[op_id], probes
+        return self.operators[self._overflow_base[number // 1000]], probes + 1
+
+    def _resolve_overflow(self, number: int) -> int:
+        """Resolve a slot shared with prefixes longer than DEPTH digits."""
+        for length in range(9, self.DEPTH, -1):
+            prefixes = self._long_prefixes.get(length)
+            if prefixes:
+                op_id = prefixes.get(number // 10 ** (9 - length))
+                if op_id is not None:
+                    return op_id
+        return self._overflow_base[number // 1000]
@@ -0,0 +1,145 @@
+"""
+Versioned prefix tables for lock-free reloads
+A prefix database and its compiled index, published to readers as one immutable object
+"""
+
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from prefix_index import PrefixIndex
+
+
+def content_hash(prefixes: Iterable[Tuple[str, str]]) -> str:
+    """
+    SHA-256 of a prefix database's content, independent of file layout and order.
+
+    Args:
+        prefixes: (prefix, operator name) pairs
+
+    Returns:
+        Hex digest
+    """
+    import hashlib  # only needed when a hash is requested; keeps validator import lean
+
+    digest = hashlib.sha256()
+    for prefix, operator in sorted(prefixes):
+        digest.update(f'{prefix};{operator}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class PrefixTable:
+    """
+    Prefix database, compiled index, version and content hash as one unit.
+
+    The validator reads its current table through a single attribute, so a
+    reload that builds a new table and assigns it is seen by readers either
+    completely or not at all. Tables are never modified after publication;
+    the content hash, range index, allocation bitmap and operator registry
+    are derived on first access.
+    """
+
+    __slots__ = ('prefix_database', 'index', 'size', 'version', 'source', 'loaded_at',
+                 '_content_hash', '_range_index', '_allocation', '_registry', '_prefix_source', '_owner')
+
+    def __init__(self, prefix_database: Dict[str, str], index: Optional[PrefixIndex], version: int,
+                 source: Optional[str] = None, prefix_source: Optional[Callable[[], Iterable]] = None,
+                 owner: Any = None):
+        """
+        Args:
+            prefix_database: Mapping of national prefixes to operator names
+            index: Compiled index for prefix_database, or None to compile on first use
+            version: Version number, increasing with every published table
+            source: Path the table was loaded from, if any
+            prefix_source: Callable returning the (prefix, operator) pairs the index
+                answers, used for the content hash and the range index
+            owner: Object that must stay alive while the index is used (e.g. a mapped snapshot)
+        """
+        self.prefix_database = prefix_database
+        self.index = index
+        self.size = len(prefix_database)
+        self.version = version
+        self.source = source
+        self.loaded_at = time.time()
+        self._content_hash: Optional[str] = None
+        self._range_index = None
+        self._allocation = None
+        self._registry = None
+        self._prefix_source = prefix_source
+        self._owner = owner
+
+    @classmethod
+    def compile(cls, prefix_database: Dict[str, str], version: int, source: Optional[str] = None) -> 'PrefixTable':
+        """
+        Compile a prefix database into a new table.
+
+        Args:
+            prefix_database: Mapping of national prefixes to operator names
+            version: Version number of the new table
+            source: Path the database was loaded from, if any
+
+        Returns:
+            The compiled table
+        """
+        return cls(prefix_database, PrefixIndex(prefix_database), version, source, prefix_database.items)
+
+    @property
+    def content_hash(self) -> Optional[str]:
+        """SHA-256 of the prefixes the index answers, or None when they are unknown."""
+        if self._content_hash is None and self._prefix_source is not None:
+            self._content_hash = content_hash(self._prefix_source())
+        return self._content_hash
+
+    @property
+    def range_index(self):
+        """RangeIndex of the table's prefixes, compiled on first access."""
+        if self._range_index is None:
+            from range_index import RangeIndex
+
+            source = self._prefix_source
+            self._range_index = RangeIndex(dict(source()) if source is not None else self.prefix_database)
+        return self._range_index
+
+    @property
+    def allocation(self):
+        """AllocationBitmap of the table's prefixes, built on first access unless one was attached."""
+        if self._allocation is None:
+            from allocation import AllocationBitmap
+
+            source = self._prefix_source
+            prefixes = dict(source()) if source is not None else self.prefix_database
+            self._allocation = AllocationBitmap.from_prefixes(prefixes, self.content_hash)
+        return self._allocation
+
+    @property
+    def registry(self):
+        """OperatorRegistry of the table's operators, built on first access."""
+        if self._registry is None:
+            from operators import OperatorRegistry
+
+            source = self._prefix_source
+            self._registry = OperatorRegistry(dict(source()) if source is not None else self.prefix_database)
+        return self._registry
+
+    def attach_allocation(self, bitmap) -> None:
+        """
+        Use a bitmap loaded from disk instead of deriving one.
+
+        Args:
+            bitmap: AllocationBitmap built from this table's prefixes
+        """
+        self._allocation = bitmap
+
+    def describe(self) -> Dict[str, Any]:
+        """
+        Summarize the table.
+
+        Returns:
+            Dictionary with version, content_hash, prefixes, source and loaded_at
+        """
+        return {
+            'version': self.version,
+            'content_hash': self.content_hash,
+            'prefixes': len(self.index) if self.index is not None else self.size,
+            'source': self.source,
+            'loaded_at': self.loaded_at,
+        }
@@ -0,0 +1,318 @@
+"""
+Sorted numeric range index for Polish mobile prefixes
+Compiles prefixes into disjoint [start, end) number ranges for range, reverse and aggregate queries
+
+Usage:
+    python range_index.py audit ../Mobileprefix.csv ../Mobileprefix_corrected.csv
+    python range_index.py owners ../Mobileprefix_corrected.csv 512000000 513000000
+    python range_index.py ranges ../Mobileprefix_corrected.csv "P4 Sp. z o.o."
+    python range_index.py counts ../Mobileprefix_corrected.csv
+"""
+
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+NATIONAL_DIGITS = 9
+NATIONAL_LIMIT = 10 ** NATIONAL_DIGITS
+
+
+def prefix_range(prefix: str) -> Tuple[int, int]:
+    """
+    Numbers covered by a national prefix.
+
+    Args:
+        prefix: National prefix of 1 to 9 digits
+
+    Returns:
+        (start, end) of the half-open range of 9-digit numbers starting with prefix
+    """
+    scale = 10 ** (NATIONAL_DIGITS - len(prefix))
+    start = int(prefix) * scale
+    return start, start + scale
+
+
+def _usable(prefix: str) -> bool:
+    """Prefixes the lookup paths can match: 2 to 9 ASCII digits."""
+    return 2 <= len(prefix) <= NATIONAL_DIGITS and prefix.isascii() and prefix.isdigit()
+
+
+class NumberRange(NamedTuple):
+    """Half-open range of national numbers assigned to one operator."""
+
+    start: int
+    end: int
+    operator: str
+
+    @property
+    def size(self) -> int:
+        """Count of numbers in the range."""
+        return self.end - self.start
+
+
+class PrefixConflict(NamedTuple):
+    """
+    Questionable prefix entry found by audit_prefixes.
+
+    kind is one of:
+        duplicate   the prefix is listed more than once (the last row wins)
+        overlap     the prefix lies inside a shorter prefix of another operator and overrides part of it
+        redundant   the prefix lies inside a shorter prefix of the same operator and changes nothing
+        shadowed    longer prefixes cover the whole prefix, so it never answers a lookup
+    """
+
+    kind: str
+    prefix: str
+    operator: str
+    other_prefix: Optional[str]
+    other_operator: Optional[str]
+
+
+class RangeIndex:
+    """
+    Disjoint [start, end) number ranges with operator IDs, searched with bisect.
+
+    Longer prefixes win over the shorter prefixes they lie in, as in
+    PrefixIndex, and adjacent ranges of the same operator are merged. Forward
+    lookups and range queries are O(log n + k); per-operator range lists and
+    number counts are precomputed.
+    """
+
+    def __init__(self, prefix_database: Dict[str, str]):
+        """
+        Compile the index from a prefix database.
+
+        Args:
+            prefix_database: Mapping of national prefixes (without +48) to operator names
+        """
+        names: Dict[str, int] = {}
+        entries = []
+        for prefix, operator in prefix_database.items():
+            if _usable(prefix):
+                op_id = names.setdefault(sys.intern(operator), len(names) + 1)
+                start, end = prefix_range(prefix)
+                entries.append((start, -end, op_id))
+        self.operators: Tuple[Optional[str], ...] = (None,) + tuple(names)
+
+        self.starts = array('I')
+        self.ends = array('I')
+        self.operator_ids = array('H')
+
+        # Prefix ranges are either nested or disjoint, so one sweep in start
+        # order (outer ranges first) with a stack of open ranges flattens them
+        stack: List[Tuple[int, int]] = []
+        position = 0
+        for start, negative_end, op_id in sorted(entries):
+            while stack and stack[-1][0] <= start:
+                end, open_id = stack.pop()
+                self._emit(position, end, open_id)
+                position = end
+            if stack:
+                self._emit(position, start, stack[-1][1])
+            position = start
+            stack.append((-negative_end, op_id))
+        while stack:
+            end, open_id = stack.pop()
+            self._emit(position, end, open_id)
+            position = end
+
+        self._by_operator: Dict[int, array] = {}
+        self._totals: Dict[int, int] = {}
+        for i, op_id in enumerate(self.operator_ids):
+            self._by_operator.setdefault(op_id, array('I')).append(i)
+            self._totals[op_id] = self._totals.get(op_id, 0) + self.ends[i] - self.starts[i]
+
+    def _emit(self, start: int, end: int, op_id: int) -> None:
+        """Append a range, merging it into the previous one when they touch and share an operator."""
+        if start >= end:
+            return
+        if self.ends and self.ends[-1] == start and self.operator_ids[-1] == op_id:
+            self.ends[-1] = end
+            return
+        self.starts.append(start)
+        self.ends.append(end)
+        self.operator_ids.append(op_id)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def _range(self, i: int) -> NumberRange:
+        return NumberRange(self.starts[i], self.ends[i], self.operators[self.operator_ids[i]])
+
+    def __iter__(self):
+        return (self._range(i) for i in range(len(self.starts)))
+
+    def lookup(self, number: int) -> Optional[str]:
+        """
+        Find the operator of a 9-digit national number.
+
+        Args:
+            number: National number as an integer
+
+        Returns:
+            Operator name, or None when no range covers the number
+        """
+        i = bisect_right(self.starts, number) - 1
+        if i >= 0 and number < self.ends[i]:
+            return self.operators[self.operator_ids[i]]
+        return None
+
+    def owners(self, start: int, end: int) -> List[NumberRange]:
+        """
+        List who owns the numbers in [start, end).
+
+        Args:
+            start: First number of the queried range
+            end: Number after the last one of the queried range
+
+        Returns:
+            Assigned ranges overlapping the query, clipped to it, in number order
+        """
+        i = max(bisect_right(self.starts, start) - 1, 0)
+        last = bisect_left(self.starts, end)
+        owners = []
+        for j in range(i, last):
+            if self.ends[j] > start:
+                owners.append(NumberRange(max(self.starts[j], start), min(self.ends[j], end),
+                                          self.operators[self.operator_ids[j]]))
+        return owners
+
+    def count_by_operator(self, start: int = 0, end: int = NATIONAL_LIMIT) -> Dict[str, int]:
+        """
+        Count assigned numbers per operator.
+
+        Args:
+            start: First number counted (default: whole numbering space)
+            end: Number after the last one counted
+
+        Returns:
+            Mapping of operator names to number counts, largest first
+        """
+        if start <= 0 and end >= NATIONAL_LIMIT:
+            counts = {self.operators[op_id]: total for op_id, total in self._totals.items()}
+        else:
+            counts = {}
+            for owner in self.owners(start, end):
+                counts[owner.operator] = counts.get(owner.operator, 0) + owner.size
+        return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+    def ranges_for(self, operator: str) -> List[NumberRange]:
+        """
+        List every range assigned to an operator.
+
+        Args:
+            operator: Operator name as it appears in the database
+
+        Returns:
+            The operator's ranges in number order (empty for unknown operators)
+        """
+        try:
+            op_id = self.operators.index(operator, 1)
+        except ValueError:
+            return []
+        return [self._range(i) for i in self._by_operator.get(op_id, ())]
+
+
+def audit_prefixes(rows: Iterable[Tuple[str, str]]) -> List[PrefixConflict]:
+    """
+    Find duplicate, overlapping, redundant and shadowed prefixes.
+
+    Args:
+        rows: (prefix, operator name) pairs in file order, duplicates included
+
+    Returns:
+        Conflicts ordered by prefix
+    """
+    conflicts = []
+    database: Dict[str, str] = {}
+    for prefix, operator in rows:
+        if prefix in database:
+            conflicts.append(PrefixConflict('duplicate', prefix, operator, prefix, database[prefix]))
+        database[prefix] = operator
+
+    usable = {prefix: operator for prefix, operator in database.items() if _usable(prefix)}
+    for prefix, operator in usable.items():
+        for length in range(len(prefix) - 1, 1, -1):
+            parent = prefix[:length]
+            if parent in usable:
+                kind = 'redundant' if usable[parent] == operator else 'overlap'
+                conflicts.append(PrefixConflict(kind, prefix, operator, parent, usable[parent]))
+                break
+
+    # A prefix is shadowed when every number it covers matches a longer prefix
+    index = RangeIndex(usable)
+    children: Dict[str, List[str]] = {}
+    for prefix in usable:
+        for length in range(len(prefix) - 1, 1, -1):
+            if prefix[:length] in usable:
+                children.setdefault(prefix[:length], []).append(prefix)
+                break
+    for prefix, nested in children.items():
+        start, end = prefix_range(prefix)
+        covered = sum(prefix_range(child)[1] - prefix_range(child)[0] for child in nested)
+        if covered == end - start:
+            owner = index.lookup(start)
+            conflicts.append(PrefixConflict('shadowed', prefix, usable[prefix], None, owner))
+
+    return sorted(conflicts, key=lambda conflict: (conflict.prefix, conflict.kind))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code (1 when audit finds conflicts)
+    """
+    import argparse  # only the command line needs it
+
+    from polish_mobile_validator import iter_prefix_rows, read_prefix_csv
+
+    parser = argparse.ArgumentParser(description='Range queries and audits over prefix CSVs.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    audit_parser = commands.add_parser('audit', help='report duplicate, overlapping and shadowed prefixes')
+    audit_parser.add_argument('csv_paths', nargs='+', help='prefix CSV files')
+    owners_parser = commands.add_parser('owners', help='who owns the numbers in [start, end)')
+    owners_parser.add_argument('csv_path')
+    owners_parser.add_argument('start', type=int)
+    owners_parser.add_argument('end', type=int)
+    ranges_parser = commands.add_parser('ranges', help='list every range assigned to an operator')
+    ranges_parser.add_argument('csv_path')
+    ranges_parser.add_argument('operator')
+    counts_parser = commands.add_parser('counts', help='count numbers held by each operator')
+    counts_parser.add_argument('csv_path')
+    args = parser.parse_args(argv)
+
+    if args.command == 'audit':
+        found = 0
+        for csv_path in args.csv_paths:
+            conflicts = audit_prefixes(iter_prefix_rows(csv_path))
+            found += len(conflicts)
+            print(f'{csv_path}: {len(conflicts)} finding(s)')
+            for conflict in conflicts:
+                against = f' (vs {conflict.other_prefix or "longer prefixes"}: {conflict.other_operator})'
+                print(f'  {conflict.kind:<10} {conflict.prefix:<10} {conflict.operator}{against}')
+        return 1 if found else 0
+
+    index = RangeIndex(read_prefix_csv(args.csv_path))
+    if args.command == 'owners':
+        for owner in index.owners(args.start, args.end):
+            print(f'{owner.start:09d}-{owner.end - 1:09d}  {owner.size:>12,}  {owner.operator}')
+    elif args.command == 'ranges':
+        ranges = index.ranges_for(args.operator)
+        for owner in ranges:
+            print(f'{owner.start:09d}-{owner.end - 1:09d}  {owner.size:>12,}')
+        print(f'{len(ranges)} range(s), {sum(owner.size for owner in ranges):,} numbers')
+    else:
+        for operator, count in index.count_by_operator().items():
+            print(f'{count:>13,}  {operator}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Compact operator recognition results
+Slotted result objects that read like the dictionaries returned by recognize_operator
+"""
+
+from array import array
+from collections.abc import Mapping
+from enum import IntEnum
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+
+class RecognitionStatus(IntEnum):
+    """Outcome of validating a phone number."""
+
+    VALID = 0
+    INVALID_LENGTH = 1
+    INVALID_PREFIX = 2
+
+
+_VALID_KEYS = ('success', 'phone_number', 'normalized', 'prefix', 'operator',
+               'detailed_operator', 'is_m2m', 'message')
+_INVALID_KEYS = ('success', 'message', 'phone_number')
+
+
+class RecognitionResult(Mapping):
+    """
+    Memory-compact result of recognize.
+
+    Holds references to the input, the normalized digits, shared operator
+    name strings and an enum status; prefix and message are derived only
+    when accessed. Behaves as a read-only mapping with the same keys and
+    values as the dictionary returned by recognize_operator, and to_dict()
+    produces exactly that dictionary.
+    """
+
+    __slots__ = ('phone_number', 'normalized', 'status', 'operator', 'detailed_operator',
+                 'is_m2m', '_valid_prefixes')
+
+    def __init__(self, phone_number: Any, normalized: str, status: RecognitionStatus,
+                 operator: Optional[str] = None, detailed_operator: Optional[str] = None,
+                 is_m2m: bool = False, valid_prefixes: Sequence[str] = ()):
+        self.phone_number = phone_number
+        self.normalized = normalized
+        self.status = status
+        self.operator = operator
+        self.detailed_operator = detailed_operator
+        self.is_m2m = is_m2m
+        self._valid_prefixes = valid_prefixes
+
+    @property
+    def success(self) -> bool:
+        """Whether the number is a valid Polish mobile number."""
+        return self.status is RecognitionStatus.VALID
+
+    @property
+    def prefix(self) -> Optional[str]:
+        """Two-digit prefix, or None when the number is not 9 digits long."""
+        if self.status is RecognitionStatus.INVALID_LENGTH:
+            return None
+        return self.normalized[:2]
+
+    @property
+    def message(self) -> str:
+        """Human-readable description, built on access."""
+        status = self.status
+        if status is RecognitionStatus.VALID:
+            return 'Machine to Machine (M2M) connection' if self.is_m2m else f'Operator: {self.operator}'
+        if status is RecognitionStatus.INVALID_LENGTH:
+            return 'Polish mobile numbers must have exactly 9 digits'
+        return f'Invalid prefix: {self.prefix}. Valid prefixes are: {", ".join(self._valid_prefixes)}'
+
+    def _keys(self) -> Tuple[str, ...]:
+        return _VALID_KEYS if self.status is RecognitionStatus.VALID else _INVALID_KEYS
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys():
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.to_dict()!r})'
+
+    def __reduce__(self) -> Tuple[type, tuple]:
+        # Positional arguments pickle about twice as fast as the default slot
+        # state, which matters for results returned from worker processes
+        return type(self), (self.phone_number, self.normalized, self.status, self.operator,
+                            self.detailed_operator, self.is_m2m, self._valid_prefixes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to the dictionary format of recognize_operator.
+
+        Returns:
+            Dictionary with the same keys, in the same order, as recognize_operator
+        """
+        return {key: getattr(self, key) for key in self._keys()}
+
+
+class RecognitionBatch(Sequence):
+    """
+    Columnar results of batch_recognize_ids.
+
+    Stores each number as an integer, a status byte, a main operator code
+    and a 16-bit operator registry ID (about 12 bytes per number) instead of
+    one result object per number. Indexing builds the RecognitionResult for
+    a position on demand; its detailed operator is the registry's canonical
+    name. Normalized forms that do not round-trip through an integer (empty,
+    leading zeros, non-ASCII digits) are kept as strings on the side.
+    """
+
+    __slots__ = ('phone_numbers', 'normalized', 'status', 'operator', 'operator_id',
+                 'operator_names', 'registry', 'valid_prefixes', 'm2m_prefixes', '_irregular')
+
+    def __init__(self, phone_numbers: Sequence[Any], normalized: array, status: array,
+                 operator: array, operator_id: array, operator_names: Sequence[str], registry: Any,
+                 valid_prefixes: Sequence[str] = (), m2m_prefixes: Tuple[str, ...] = ('21', '69'),
+                 irregular: Optional[Dict[int, str]] = None):
+        """
+        Args:
+            phone_numbers: The inputs, in order
+            normalized: array('q') of normalized numbers, -1 where the string is kept in irregular
+            status: array('B') of RecognitionStatus values
+            operator: array('B') of codes into operator_names (0 is 'Unknown')
+            operator_id: array('H') of OperatorRegistry IDs (0 for no operator)
+            operator_names: Main operator names by code
+            registry: OperatorRegistry resolving operator_id
+            valid_prefixes: Valid prefixes, quoted in invalid-prefix messages
+            m2m_prefixes: Prefixes reserved for M2M connections
+            irregular: Normalized strings by position, where normalized holds -1
+        """
+        self.phone_numbers = phone_numbers
+        self.normalized = normalized
+        self.status = status
+        self.operator = operator
+        self.operator_id = operator_id
+        self.operator_names = tuple(operator_names)
+        self.registry = registry
+        self.valid_prefixes = valid_prefixes
+        self.m2m_prefixes = m2m_prefixes
+        self._irregular = irregular or {}
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        status = RecognitionStatus(self.status[position])
+        normalized = self.normalized_number(position)
+        if status is not RecognitionStatus.VALID:
+            return RecognitionResult(self.phone_numbers[position], normalized, status,
+                                     valid_prefixes=self.valid_prefixes)
+        return RecognitionResult(
+            self.phone_numbers[position], normalized, status,
+            self.operator_names[self.operator[position]], self.registry.name(self.operator_id[position]),
+            normalized.startswith(self.m2m_prefixes)
+        )
+
+    def normalized_number(self, position: int) -> str:
+        """
+        Normalized form of the number at a position.
+
+        Args:
+            position: Index into the batch
+
+        Returns:
+            Normalized digits as a string
+        """
+        number = self.normalized[position]
+        return self._irregular[position] if number < 0 else str(number)
+
+    def operator_info(self, position: int):
+        """
+        Registry entry of the detailed operator at a position.
+
+        Args:
+            position: Index into the batch
+
+        Returns:
+            OperatorInfo, or None when the number is invalid or no prefix matched
+        """
+        op_id = self.operator_id[position]
+        return self.registry[op_id] if op_id else None
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the result columns, excluding the inputs."""
+        return sum(column.itemsize * len(column)
+                   for column in (self.normalized, self.status, self.operator, self.operator_id))
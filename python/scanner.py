@@ -0,0 +1,301 @@
+"""
+Phone number extraction from free text
+Finds and classifies Polish mobile numbers in large text files through a memory map
+
+Usage:
+    python scanner.py crm-dump.txt
+    python scanner.py app.log --all --fields start,match,valid,detailed_operator -o found.csv
+
+Numbers are matched on bytes in the formats normalize_phone_number accepts
+for free text: nine digits, optionally preceded by +48 or 48 (also written
+as (+48)), grouped with single spaces or dashes, with the first two or three
+digits optionally in parentheses. Digits glued to letters, '+' or other
+digits are not matched.
+"""
+
+import csv
+import mmap
+import re
+import sys
+import time
+from typing import Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from results import RecognitionResult
+
+
+CANDIDATE = re.compile(
+    rb'(?<![\w+])'
+    rb'(?:\+?48[ \-]?|\(\+?48\)[ \-]?)?'
+    rb'(?:\(\d{2,3}\)[ \-]?|\d)(?:[ \-]?\d){5,10}'
+    rb'(?!\w)'
+)
+# Runs of bytes a candidate can consist of, found before CANDIDATE is tried
+CANDIDATE_RUN = re.compile(rb'[\d(+][\d()+ \-]{8,}')
+RUN_BREAK = re.compile(rb'[^\d()+ \-]')
+WORD_BYTES = b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_'
+_NON_DIGIT_BYTES = bytes(byte for byte in range(256) if not 0x30 <= byte <= 0x39)
+WINDOW_SIZE = 1 << 22
+DEFAULT_BATCH_SIZE = 4096
+OUTPUT_FIELDS = ('start', 'end', 'match', 'valid', 'normalized', 'operator', 'detailed_operator', 'is_m2m')
+
+
+class ScanMatch(NamedTuple):
+    """A number found in the input, with its byte offsets and classification."""
+
+    start: int
+    end: int
+    text: str
+    result: RecognitionResult
+
+
+def _run_sums(mask, starts, ends):
+    """Number of set bytes of mask in each [start, end) run."""
+    import numpy as np
+
+    if not len(starts):
+        return np.zeros(0, dtype=np.int32)
+    bounds = np.empty(2 * len(starts), dtype=np.intp)
+    bounds[0::2], bounds[1::2] = starts, ends
+    if bounds[-1] == len(mask):
+        bounds = bounds[:-1]  # the last run then sums to the end of mask
+    return np.add.reduceat(mask, bounds, dtype=np.int32)[0::2]
+
+
+def _runs_numpy(buffer, start: int, end: int) -> Iterator[Tuple[int, int]]:
+    """Candidate runs with at least nine digits, found window by window with NumPy."""
+    import numpy as np
+
+    # Byte classes: 0 ends a run, 1 separator, 2 digit, 3 parenthesis or '+'
+    byte_class = np.zeros(256, dtype=np.uint8)
+    byte_class[list(b' -')] = 1
+    byte_class[list(b'0123456789')] = 2
+    byte_class[list(b'()+')] = 3
+    word = np.zeros(256, dtype=bool)
+    word[list(WORD_BYTES)] = True
+    size = len(buffer)
+    position = start
+    while position < end:
+        stop = min(position + WINDOW_SIZE, end)
+        window = np.frombuffer(buffer, dtype=np.uint8, count=stop - position, offset=position)
+        classes = byte_class[window]
+        if stop < end:
+            # End the window at its last break so no run is split between windows
+            last_break = len(classes) - 1 - int(np.argmin(classes[::-1]))
+            if not classes[last_break] and last_break > 0:
+                stop = position + last_break
+                window, classes = window[:stop - position], classes[:stop - position]
+            else:
+                following = RUN_BREAK.search(buffer, stop, end)
+                stop = following.start() if following else end
+                window = np.frombuffer(buffer, dtype=np.uint8, count=stop - position, offset=position)
+                classes = byte_class[window]
+
+        edges = np.flatnonzero(np.diff(classes != 0, prepend=False, append=False))
+        run_starts, run_ends = edges[0::2], edges[1::2]
+        long_enough = run_ends - run_starts >= 9
+        run_starts, run_ends = run_starts[long_enough], run_ends[long_enough]
+        digits = _run_sums(classes == 2, run_starts, run_ends)
+
+        # A plain run of exactly ten digits (a date and an hour, say) is
+        # matched whole by CANDIDATE and then rejected, unless a letter
+        # touches its first or last digit and moves the match inside it
+        ten = np.flatnonzero(digits == 10)
+        if len(ten):
+            starts, ends = run_starts[ten], run_ends[ten]
+            separator = classes == 1
+            # Parentheses, '+' or doubled separators can end a number inside a run
+            irregular = classes == 3
+            irregular[:-1] |= separator[:-1] & separator[1:]
+            before = window[np.maximum(starts - 1, 0)]
+            before[starts == 0] = buffer[position - 1] if position else 0x20
+            after = window[np.minimum(ends, len(window) - 1)]
+            after[ends == len(window)] = buffer[stop] if stop < size else 0x20
+            plain = ((_run_sums(irregular, starts, ends) == 0)
+                     & (separator[starts] | ~word[before]) & (separator[ends - 1] | ~word[after]))
+            digits[ten[plain]] = 0
+        keep = digits >= 9
+        runs = list(zip((run_starts[keep] + position).tolist(), (run_ends[keep] + position).tolist()))
+        # Views of an mmap must be gone before yielding, or closing it fails
+        del window, classes
+        yield from runs
+        position = stop
+
+
+def _runs_regex(buffer, start: int, end: int) -> Iterator[Tuple[int, int]]:
+    """Candidate runs found with a plain regular expression, used without NumPy."""
+    for match in CANDIDATE_RUN.finditer(buffer, start, end):
+        yield match.span()
+
+
+def find_candidates(buffer, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, int, bytes]]:
+    """
+    Find phone number candidates in a bytes-like buffer.
+
+    A cheap pass finds runs of digits, spaces, dashes, parentheses and '+'
+    holding at least nine digits; the exact pattern only runs inside them.
+
+    Args:
+        buffer: bytes, bytearray, memoryview or mmap
+        start: Offset to start at
+        end: Offset to stop at (defaults to the end of the buffer)
+
+    Yields:
+        (start, end, matched bytes) of candidates that reduce to 9 digits, or 11 starting with 48
+    """
+    size = len(buffer)
+    end = size if end is None else min(end, size)
+    try:
+        import numpy  # noqa: F401
+        runs = _runs_numpy(buffer, start, end)
+    except ImportError:
+        runs = _runs_regex(buffer, start, end)
+
+    for run_start, run_end in runs:
+        # One byte past the run lets the trailing (?!\w) see a glued letter
+        for match in CANDIDATE.finditer(buffer, run_start, min(run_end + 1, size)):
+            text = match.group()
+            digits = text.translate(None, _NON_DIGIT_BYTES)
+            if len(digits) == 9 or (len(digits) == 11 and digits.startswith(b'48')):
+                yield match.start(), match.end(), text
+
+
+def scan_buffer(validator, buffer, batch_size: int = DEFAULT_BATCH_SIZE,
+                valid_only: bool = True) -> Iterator[ScanMatch]:
+    """
+    Find and classify phone numbers in a bytes-like buffer.
+
+    Args:
+        validator: PolishMobileValidator used for classification
+        buffer: bytes, bytearray, memoryview or mmap
+        batch_size: Candidates classified per batch_recognize call
+        valid_only: Skip candidates that are not valid Polish mobile numbers
+
+    Yields:
+        ScanMatch for each number, in offset order
+    """
+    batch: List[Tuple[int, int, str]] = []
+
+    def flush() -> Iterator[ScanMatch]:
+        results = validator.batch_recognize([text for _, _, text in batch])
+        for (start, end, text), result in zip(batch, results):
+            if result.success or not valid_only:
+                yield ScanMatch(start, end, text, result)
+        batch.clear()
+
+    for start, end, text in find_candidates(buffer):
+        batch.append((start, end, text.decode('ascii')))
+        if len(batch) >= batch_size:
+            yield from flush()
+    if batch:
+        yield from flush()
+
+
+def scan_file(validator, path: str, batch_size: int = DEFAULT_BATCH_SIZE,
+              valid_only: bool = True) -> Iterator[ScanMatch]:
+    """
+    Find and classify phone numbers in a file without reading it into memory.
+
+    The file is memory-mapped, so only the pages being scanned are resident.
+
+    Args:
+        validator: PolishMobileValidator used for classification
+        path: Text file in any ASCII-compatible encoding (UTF-8, Windows-1250, Latin-2)
+        batch_size: Candidates classified per batch_recognize call
+        valid_only: Skip candidates that are not valid Polish mobile numbers
+
+    Yields:
+        ScanMatch for each number, in offset order
+    """
+    with open(path, 'rb') as file:
+        if not file.seek(0, 2):
+            return
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        if hasattr(data, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            data.madvise(mmap.MADV_SEQUENTIAL)
+        yield from scan_buffer(validator, data, batch_size, valid_only)
+    finally:
+        data.close()
+
+
+def _field(match: ScanMatch, field: str) -> Union[str, int]:
+    result = match.result
+    if field == 'start':
+        return match.start
+    if field == 'end':
+        return match.end
+    if field == 'match':
+        return match.text
+    if field == 'valid':
+        return 'true' if result.success else 'false'
+    if not result.success:
+        return ''
+    if field == 'is_m2m':
+        return 'true' if result.is_m2m else 'false'
+    return getattr(result, field) or ''
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    import argparse  # only the command line needs it
+    import os
+
+    from polish_mobile_validator import PolishMobileValidator
+
+    parser = argparse.ArgumentParser(description='Extract and classify Polish mobile numbers from text files.')
+    parser.add_argument('input', help='text or log file to scan')
+    parser.add_argument('-o', '--output', default='-', help='output CSV file (default: stdout)')
+    parser.add_argument('-f', '--fields', default='start,match,normalized,operator,detailed_operator',
+                        help=f'comma-separated output fields from: {", ".join(OUTPUT_FIELDS)}')
+    parser.add_argument('--all', action='store_true', help='also report candidates that are not valid mobile numbers')
+    parser.add_argument('--database', help='prefix database CSV for detailed_operator (default: built-in tables)')
+    parser.add_argument('--no-database', action='store_true', help='run without a prefix database, CSV or built-in')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'candidates classified per batch (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('-q', '--quiet', action='store_true', help='do not print the throughput summary')
+    args = parser.parse_args(argv)
+
+    fields = [field.strip() for field in args.fields.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in OUTPUT_FIELDS]
+    if unknown:
+        print(f'Error: unknown output fields: {", ".join(unknown)}', file=sys.stderr)
+        return 2
+
+    if args.database and not os.path.exists(args.database):
+        print(f'Error: prefix database not found: {args.database}', file=sys.stderr)
+        return 2
+    validator = PolishMobileValidator(builtin_prefixes=not args.no_database and not args.database)
+    if args.database and not args.no_database:
+        validator.load_prefix_database(args.database)
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+    started = time.perf_counter()
+    found = 0
+    try:
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(fields)
+        for match in scan_file(validator, args.input, args.batch_size, valid_only=not args.all):
+            writer.writerow([_field(match, field) for field in fields])
+            found += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    if not args.quiet:
+        elapsed = time.perf_counter() - started or 1e-9
+        size = os.path.getsize(args.input)
+        print(f'Scanned {size / 1e6:,.1f} MB in {elapsed:.2f}s ({size / 1e6 / elapsed:,.1f} MB/s), '
+              f'{found:,} numbers', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
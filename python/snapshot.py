@@ -0,0 +1,271 @@
+"""
+Precompiled binary prefix snapshots
+Compiles a prefix CSV once into a versioned binary file that validators open with mmap
+
+Usage:
+    python snapshot.py compile ../Mobileprefix_corrected.csv prefixes.snap
+    python snapshot.py info prefixes.snap
+
+Layout (little-endian):
+    header          magic, format version, index depth, section counts,
+                    CRC-32 of the body and SHA-256 of the source CSV
+    slots           PrefixIndex slot table, 10**DEPTH unsigned 16-bit operator IDs
+    name offsets    (operators + 1) uint32 offsets into the name blob
+    name blob       UTF-8 operator names, ID 1 first (ID 0 is "no match")
+    prefixes        (length uint8, prefix uint32, operator ID uint16) per source prefix
+    overflow slots  (slot uint32, operator ID uint16) for slots shared with longer prefixes
+"""
+
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from polish_mobile_validator import PolishMobileValidator
+from prefix_index import PrefixIndex
+
+
+MAGIC = b'PLPFXSNP'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sHHIIIII32s')
+SLOTS_OFFSET = 128
+PREFIX_ENTRY = struct.Struct('<BIH')
+OVERFLOW_ENTRY = struct.Struct('<IH')
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is malformed, from another version, or corrupted."""
+
+
+def _hash_file(path: str) -> bytes:
+    """SHA-256 digest of a file."""
+    import hashlib  # only needed when compiling; keeps snapshot loading lean
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 16), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def build_snapshot(prefix_database: Dict[str, str], source_hash: bytes = b'') -> bytes:
+    """
+    Serialize a prefix database into snapshot bytes.
+
+    Args:
+        prefix_database: Mapping of national prefixes to operator names
+        source_hash: SHA-256 digest of the source file, recorded in the header
+
+    Returns:
+        Snapshot file contents
+    """
+    index = PrefixIndex(prefix_database)
+    metadata = index.export_metadata()
+
+    slots = array('H', memoryview(index.slots).cast('B').tobytes())
+    if sys.byteorder != 'little':
+        slots.byteswap()
+
+    encoded_names = [name.encode('utf-8') for name in index.operators[1:]]
+    offsets = array('I', [0])
+    for name in encoded_names:
+        offsets.append(offsets[-1] + len(name))
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+
+    prefixes = [
+        PREFIX_ENTRY.pack(len(prefix), int(prefix), index.operator_id(operator))
+        for prefix, operator in sorted(prefix_database.items())
+        if 2 <= len(prefix) <= 9 and prefix.isdigit() and prefix.isascii()
+    ]
+    overflow = [OVERFLOW_ENTRY.pack(slot, op_id) for slot, op_id in sorted(metadata['overflow_base'].items())]
+
+    body = b''.join([
+        slots.tobytes(), offsets.tobytes(), b''.join(encoded_names), b''.join(prefixes), b''.join(overflow)
+    ])
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, PrefixIndex.DEPTH, len(prefix_database), len(encoded_names),
+        len(prefixes), len(overflow), zlib.crc32(body), source_hash.ljust(32, b'\0')
+    )
+    return header.ljust(SLOTS_OFFSET, b'\0') + body
+
+
+def compile_snapshot(csv_path: str, snapshot_path: str, encoding: Optional[str] = None) -> int:
+    """
+    Compile a prefix CSV into a snapshot file.
+
+    Args:
+        csv_path: Path to the prefix CSV
+        snapshot_path: Path of the snapshot to write
+        encoding: Text encoding of the CSV (detected when omitted)
+
+    Returns:
+        Number of prefixes written
+    """
+    validator = PolishMobileValidator(builtin_prefixes=False)
+    validator.load_prefix_database(csv_path, encoding)
+    data = build_snapshot(validator.prefix_database, _hash_file(csv_path))
+    with open(snapshot_path, 'wb') as file:
+        file.write(data)
+    return len(validator.prefix_database)
+
+
+class PrefixSnapshot:
+    """
+    Memory-mapped snapshot answering prefix lookups without parsing.
+
+    The slot table is used in place through the mapping; only the operator
+    names and the small overflow tables are unpacked when the file is opened.
+    """
+
+    def __init__(self, path: str, verify: bool = True):
+        """
+        Open a snapshot file.
+
+        Args:
+            path: Path to the snapshot
+            verify: Check the body checksum before use
+        """
+        self.path = path
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.index = self._open(verify)
+        except Exception:
+            self._mmap.close()
+            raise
+
+    def _open(self, verify: bool) -> PrefixIndex:
+        """Validate the header and attach a PrefixIndex to the mapping."""
+        data = self._mmap
+        if len(data) < SLOTS_OFFSET or data[:len(MAGIC)] != MAGIC:
+            raise SnapshotError(f'Not a prefix snapshot: {self.path}')
+        (_, version, depth, self.prefix_count, operator_count, prefix_entries,
+         overflow_entries, checksum, source_hash) = HEADER.unpack_from(data)
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f'Unsupported snapshot version {version} (expected {FORMAT_VERSION})')
+        if depth != PrefixIndex.DEPTH:
+            raise SnapshotError(f'Snapshot index depth {depth} does not match {PrefixIndex.DEPTH}')
+
+        self.version = version
+        self.checksum = checksum
+        self.source_hash = source_hash
+        if verify:
+            with memoryview(data) as view:
+                crc = zlib.crc32(view[SLOTS_OFFSET:])
+            if crc != checksum:
+                raise SnapshotError(f'Snapshot checksum mismatch: {self.path}')
+
+        position = SLOTS_OFFSET + PrefixIndex.SLOTS_NBYTES
+        offsets = array('I', data[position:position + 4 * (operator_count + 1)])
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        position += 4 * (operator_count + 1)
+        blob = data[position:position + offsets[-1]]
+        names = [None] + [
+            sys.intern(blob[offsets[i]:offsets[i + 1]].decode('utf-8')) for i in range(operator_count)
+        ]
+        position += offsets[-1]
+
+        long_prefixes: Dict[int, Dict[int, int]] = {}
+        self._prefix_entries: List[Tuple[int, int, int]] = []
+        for length, prefix, op_id in PREFIX_ENTRY.iter_unpack(
+                data[position:position + PREFIX_ENTRY.size * prefix_entries]):
+            self._prefix_entries.append((length, prefix, op_id))
+            if length > PrefixIndex.DEPTH:
+                long_prefixes.setdefault(length, {})[prefix] = op_id
+        position += PREFIX_ENTRY.size * prefix_entries
+
+        overflow_base = dict(OVERFLOW_ENTRY.iter_unpack(
+            data[position:position + OVERFLOW_ENTRY.size * overflow_entries]))
+
+        metadata = {
+            'size': self.prefix_count,
+            'operators': tuple(names),
+            'overflow_base': overflow_base,
+            'long_prefixes': long_prefixes,
+        }
+        slots = memoryview(data)[SLOTS_OFFSET:SLOTS_OFFSET + PrefixIndex.SLOTS_NBYTES]
+        if sys.byteorder != 'little':
+            swapped = array('H', slots.tobytes())
+            swapped.byteswap()
+            slots.release()
+            slots = swapped
+        return PrefixIndex.from_buffer(slots, metadata)
+
+    def prefixes(self) -> Iterator[Tuple[str, str]]:
+        """
+        Iterate over the source prefixes.
+
+        Yields:
+            (prefix, operator name) pairs
+        """
+        for length, prefix, op_id in self._prefix_entries:
+            yield str(prefix).zfill(length), self.index.operators[op_id]
+
+    def to_prefix_database(self) -> Dict[str, str]:
+        """
+        Rebuild the prefix dictionary the snapshot was compiled from.
+
+        Returns:
+            Mapping of national prefixes to operator names
+        """
+        return dict(self.prefixes())
+
+    def close(self) -> None:
+        """Release the index and unmap the file."""
+        self.index.release()
+        self._mmap.close()
+
+    def __enter__(self) -> 'PrefixSnapshot':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    import argparse  # only the command line needs it; keeps snapshot loading lean
+
+    parser = argparse.ArgumentParser(description='Compile or inspect binary prefix snapshots.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    compile_parser = commands.add_parser('compile', help='compile a prefix CSV into a snapshot')
+    compile_parser.add_argument('csv_path', help='prefix CSV, e.g. ../Mobileprefix_corrected.csv')
+    compile_parser.add_argument('snapshot_path', help='snapshot file to write')
+    compile_parser.add_argument('--encoding', help='CSV text encoding (detected when omitted)')
+    info_parser = commands.add_parser('info', help='describe a snapshot file')
+    info_parser.add_argument('snapshot_path', help='snapshot file to read')
+    args = parser.parse_args(argv)
+
+    if args.command == 'compile':
+        count = compile_snapshot(args.csv_path, args.snapshot_path, args.encoding)
+        print(f'Wrote {count} prefixes to {args.snapshot_path}')
+        return 0
+
+    try:
+        with PrefixSnapshot(args.snapshot_path) as snapshot:
+            print(f'Snapshot:  {snapshot.path}')
+            print(f'Version:   {snapshot.version}')
+            print(f'Prefixes:  {snapshot.prefix_count}')
+            print(f'Operators: {len(snapshot.index.operators) - 1}')
+            print(f'Checksum:  {snapshot.checksum:08x}')
+            print(f'Source:    {snapshot.source_hash.hex()}')
+    except SnapshotError as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,450 @@
+"""
+Partition-by-operator file splitter
+Splits a large list of numbers into one file per operator, classifying line-aligned chunks in parallel
+
+Usage:
+    python splitter.py numbers.txt -o by-operator/
+    python splitter.py export.csv -o by-operator/ --column phone --workers 8 --preserve-order
+    python splitter.py numbers.txt -o by-network/ --by detailed_operator
+
+Partitions:
+    Valid numbers go to their main operator (Play, Orange, T-Mobile, Plus)
+    or, with --by detailed_operator, to their network from the prefix
+    database. M2M numbers go to 'M2M', everything else to 'invalid'; blank
+    lines are dropped. Output files keep the input lines byte for byte,
+    with the CSV header repeated at the top of each file.
+
+Pipeline:
+    The input is cut into byte ranges ending on line boundaries. Each worker
+    reads one range, classifies it with batch_classify (recognize without
+    NumPy) and writes one part file per partition. Part files are appended
+    to the outputs as chunks finish, or in input order with preserve_order.
+"""
+
+import csv
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import as_completed
+from operator import itemgetter
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from normalization import normalize_many
+
+
+INVALID = 'invalid'
+M2M = 'M2M'
+UNKNOWN = 'Unknown'
+PARTITION_KEYS = ('operator', 'detailed_operator')
+DEFAULT_CHUNK_BYTES = 1 << 23
+COPY_BUFFER_SIZE = 1 << 20
+MAX_RECORD_WIDTH = 64
+
+
+class SplitChunk(NamedTuple):
+    """A line-aligned byte range of the input and how to read it."""
+
+    index: int
+    path: str
+    start: int
+    end: int
+    parts_dir: str
+    by: str = 'operator'
+    column: Optional[int] = None
+    delimiter: str = ','
+    encoding: str = 'utf-8'
+
+
+class SplitReport:
+    """Rows per partition, output files and throughput of a split."""
+
+    def __init__(self):
+        self.rows: Dict[str, int] = {}
+        self.files: Dict[str, str] = {}
+        self.bytes_read = 0
+        self.chunks = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def total_rows(self) -> int:
+        """Rows written across all partitions."""
+        return sum(self.rows.values())
+
+    def finish(self) -> None:
+        """Record the total elapsed time."""
+        self.elapsed = time.perf_counter() - self.started
+
+    def summary(self) -> str:
+        """
+        Format rows per partition and throughput.
+
+        Returns:
+            Human-readable summary with rows/s and MB/s
+        """
+        elapsed = self.elapsed or 1e-9
+        lines = [
+            f'Split {self.total_rows:,} rows from {self.chunks:,} chunks in {self.elapsed:.2f}s: '
+            f'{self.total_rows / elapsed:,.0f} rows/s, {self.bytes_read / elapsed / 1e6:,.2f} MB/s'
+        ]
+        width = max((len(partition) for partition in self.rows), default=0)
+        for partition, rows in sorted(self.rows.items(), key=lambda item: (-item[1], item[0])):
+            lines.append(f'  {partition:<{width}}  {rows:>12,}  {self.files[partition]}')
+        return '\n'.join(lines)
+
+
+def partition_label(result, by: str = 'operator') -> str:
+    """
+    Partition a recognition result belongs to.
+
+    Args:
+        result: recognize or recognize_operator result
+        by: 'operator' for the main operator or 'detailed_operator' for the network
+
+    Returns:
+        Partition name
+    """
+    if not result['success']:
+        return INVALID
+    if result['is_m2m']:
+        return M2M
+    return result[by] or UNKNOWN
+
+
+def partition_filename(partition: str) -> str:
+    """
+    File name stem for a partition, made of characters valid on every platform.
+
+    Different partitions can map to the same stem, or to stems differing only
+    in case, which case-insensitive file systems (macOS, Windows) treat as
+    one file; see unique_filename.
+
+    Args:
+        partition: Partition name
+
+    Returns:
+        Name with runs of characters other than letters, digits, '.' and '-' replaced by '_'
+    """
+    return re.sub(r'[^\w.\-]+', '_', partition).strip('_.') or UNKNOWN
+
+
+def unique_filename(partition: str, taken: Set[str]) -> str:
+    """
+    File name stem for a partition that no earlier partition uses, ignoring case.
+
+    Args:
+        partition: Partition name
+        taken: Case-folded stems already in use; the returned stem is added
+
+    Returns:
+        partition_filename(partition), with '-2', '-3', ... appended on a clash
+    """
+    stem = name = partition_filename(partition)
+    count = 1
+    while name.casefold() in taken:
+        count += 1
+        name = f'{stem}-{count}'
+    taken.add(name.casefold())
+    return name
+
+
+def line_ranges(path: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES, start: int = 0) -> List[Tuple[int, int]]:
+    """
+    Cut a file into byte ranges of about chunk_bytes that end on line boundaries.
+
+    Args:
+        path: Input file
+        chunk_bytes: Target range size
+        start: Offset of the first range, e.g. after a header line
+
+    Returns:
+        (start, end) offsets covering the file from start
+    """
+    if chunk_bytes < 1:
+        raise ValueError('chunk_bytes must be at least 1')
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as file:
+        while start < size:
+            file.seek(min(start + chunk_bytes, size) - 1)
+            file.readline()
+            end = min(file.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _partition_codes(validator, data: bytes, lines: List[bytes],
+                     chunk: SplitChunk) -> Tuple[List[str], Sequence[int]]:
+    """Partition names and, for each line of data, its index into them (-1 for blank lines)."""
+    numbers = None
+    if chunk.column is not None:
+        decoded = [line.decode(chunk.encoding, errors='replace') for line in lines]
+        rows = list(csv.reader(decoded, delimiter=chunk.delimiter))
+        if len(rows) != len(decoded):
+            # An unbalanced quote joined lines; parse each line on its own
+            rows = [next(csv.reader([line], delimiter=chunk.delimiter), []) for line in decoded]
+        numbers = [row[chunk.column].strip() if len(row) > chunk.column else '' for row in rows]
+
+    def raw(position: int) -> str:
+        if numbers is not None:
+            return numbers[position]
+        return lines[position].decode(chunk.encoding, errors='replace')
+
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is None:
+        table: List[str] = []
+        codes = []
+        positions: Dict[str, int] = {}
+        for position, line in enumerate(lines):
+            if not line.strip():
+                codes.append(-1)
+                continue
+            label = partition_label(validator.recognize(raw(position)), chunk.by)
+            if label not in positions:
+                positions[label] = len(table)
+                table.append(label)
+            codes.append(positions[label])
+        return table, codes
+
+    # Non-ASCII values may hold Unicode digits, which only the scalar path counts
+    fallback = [position for position, value in enumerate(lines if numbers is None else numbers)
+                if not value.isascii()]
+    if numbers is None and max(map(len, lines), default=0) <= MAX_RECORD_WIDTH:
+        # Whole lines go to batch_classify as fixed-width records
+        records = np.array(lines, dtype=bytes)
+    else:
+        national = [int(number) if len(number) == 9 and number.isascii() else -1
+                    for number in normalize_many(data if numbers is None else numbers)]
+        records = np.array(national, dtype=np.int64)
+    batch = validator.batch_classify(records)
+    names = batch.operator_names if chunk.by == 'operator' else batch.detailed_operator_names
+    operators = batch.operator if chunk.by == 'operator' else batch.detailed_operator
+    table = [INVALID, M2M] + [name or UNKNOWN for name in names]
+    codes = np.where(batch.valid, np.where(batch.is_m2m, 1, operators.astype(np.int64) + 2), 0)
+    for position in fallback:
+        label = partition_label(validator.recognize(raw(position)), chunk.by)
+        codes[position] = len(table)
+        table.append(label)
+    for position in np.flatnonzero(~batch.valid).tolist():
+        if not lines[position].strip():
+            codes[position] = -1
+    return table, codes
+
+
+def _group_positions(table: List[str], codes: Sequence[int]) -> Dict[str, Sequence[int]]:
+    """Line positions per partition, in input order."""
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    groups: Dict[str, list] = {}
+    if np is None:
+        for position, code in enumerate(codes):
+            if code >= 0:
+                groups.setdefault(table[code], []).append(position)
+        return groups
+
+    codes = np.asarray(codes)
+    order = np.argsort(codes, kind='stable')
+    for group in np.split(order, np.flatnonzero(np.diff(codes[order])) + 1):
+        if len(group) and codes[group[0]] >= 0:
+            groups.setdefault(table[codes[group[0]]], []).append(group)
+    # Names shared by several codes are merged back into input order
+    return {label: (arrays[0] if len(arrays) == 1 else np.sort(np.concatenate(arrays))).tolist()
+            for label, arrays in groups.items()}
+
+
+def split_chunk(validator, chunk: SplitChunk) -> Tuple[int, Dict[str, Tuple[str, int]], int]:
+    """
+    Classify one byte range and write a part file per partition.
+
+    Args:
+        validator: PolishMobileValidator used for classification
+        chunk: Range to split
+
+    Returns:
+        (chunk index, {partition: (part file, rows)}, bytes read)
+    """
+    with open(chunk.path, 'rb') as file:
+        file.seek(chunk.start)
+        data = file.read(chunk.end - chunk.start)
+    lines = data.split(b'\n')
+    if data.endswith(b'\n'):
+        lines.pop()
+
+    groups = _group_positions(*_partition_codes(validator, data, lines, chunk))
+    parts = {}
+    for number, (label, positions) in enumerate(groups.items()):
+        part_path = os.path.join(chunk.parts_dir, f'{chunk.index:06d}-{number:04d}.part')
+        selected = itemgetter(*positions)(lines) if len(positions) > 1 else (lines[positions[0]],)
+        with open(part_path, 'wb') as part:
+            part.write(b'\n'.join(selected))
+            part.write(b'\n')
+        parts[label] = (part_path, len(positions))
+    return chunk.index, parts, len(data)
+
+
+def split_file(validator, path: str, output_dir: str, workers: Optional[int] = None,
+               chunk_bytes: int = DEFAULT_CHUNK_BYTES, by: str = 'operator', column: Optional[str] = None,
+               delimiter: str = ',', header: bool = True, encoding: str = 'utf-8',
+               preserve_order: bool = False) -> SplitReport:
+    """
+    Split a file of numbers into one output file per partition.
+
+    With more than one worker, chunks are classified in a ParallelValidatorPool
+    sharing the validator's compiled prefix index. Without preserve_order,
+    each output holds its rows grouped by chunk in completion order; with
+    it, rows keep their input order.
+
+    Args:
+        validator: PolishMobileValidator used for classification
+        path: Input file with one number per line, or a CSV file with column
+        output_dir: Directory for the output files, created if missing
+        workers: Worker processes (defaults to the CPU count; 1 splits in this process)
+        chunk_bytes: Target size of each line-aligned chunk
+        by: 'operator' or 'detailed_operator'
+        column: CSV column name or 0-based index; None reads one number per line
+        delimiter: CSV delimiter
+        header: Whether the CSV input starts with a header row
+        encoding: Text encoding of the input
+        preserve_order: Keep input order within each output
+
+    Returns:
+        SplitReport with rows and file per partition
+    """
+    if by not in PARTITION_KEYS:
+        raise ValueError(f'Unknown partition key: {by}')
+    report = SplitReport()
+    header_line = b''
+    position = None
+    if column is not None:
+        with open(path, 'rb') as file:
+            header_line = file.readline() if header else b''
+        names = next(csv.reader([header_line.decode(encoding, errors='replace')], delimiter=delimiter), [])
+        if column.isdigit():
+            position = int(column)
+        elif column in names:
+            position = names.index(column)
+        else:
+            raise ValueError(f'Column not found in CSV header: {column}')
+        if header_line and not header_line.endswith(b'\n'):
+            header_line += b'\n'
+
+    os.makedirs(output_dir, exist_ok=True)
+    suffix = os.path.splitext(path)[1] or '.txt'
+    parts_dir = tempfile.mkdtemp(prefix='.parts-', dir=output_dir)
+    chunks = [SplitChunk(index, path, start, end, parts_dir, by, position, delimiter, encoding)
+              for index, (start, end) in enumerate(line_ranges(path, chunk_bytes, len(header_line)))]
+    outputs = {}
+    taken: Set[str] = set()
+
+    def merge(result: Tuple[int, Dict[str, Tuple[str, int]], int]) -> None:
+        _, parts, nbytes = result
+        report.bytes_read += nbytes
+        report.chunks += 1
+        for label, (part_path, rows) in parts.items():
+            if label not in outputs:
+                report.files[label] = os.path.join(output_dir, unique_filename(label, taken) + suffix)
+                outputs[label] = open(report.files[label], 'wb', buffering=COPY_BUFFER_SIZE)
+                outputs[label].write(header_line)
+            with open(part_path, 'rb') as part:
+                shutil.copyfileobj(part, outputs[label], COPY_BUFFER_SIZE)
+            os.remove(part_path)
+            report.rows[label] = report.rows.get(label, 0) + rows
+
+    try:
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(chunks) < 2:
+            for chunk in chunks:
+                merge(split_chunk(validator, chunk))
+        else:
+            from parallel import ParallelValidatorPool
+
+            with ParallelValidatorPool(validator, workers=min(workers, len(chunks))) as pool:
+                futures = [pool.submit(split_chunk, chunk) for chunk in chunks]
+                finished = {}
+                next_index = 0
+                for future in as_completed(futures):
+                    result = future.result()
+                    if not preserve_order:
+                        merge(result)
+                        continue
+                    finished[result[0]] = result
+                    while next_index in finished:
+                        merge(finished.pop(next_index))
+                        next_index += 1
+    finally:
+        for output in outputs.values():
+            output.close()
+        shutil.rmtree(parts_dir, ignore_errors=True)
+    report.bytes_read += len(header_line)
+    report.finish()
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    import argparse  # only the command line needs it
+
+    from polish_mobile_validator import PolishMobileValidator
+
+    parser = argparse.ArgumentParser(description='Split a list of Polish mobile numbers into one file per operator.')
+    parser.add_argument('input', help='input file with one number per line, or a CSV file with --column')
+    parser.add_argument('-o', '--output-dir', required=True, help='directory for the per-operator files')
+    parser.add_argument('--by', default='operator', choices=PARTITION_KEYS,
+                        help='partition by main operator or by network from the database (default: operator)')
+    parser.add_argument('-c', '--column', help='CSV column name or 0-based index holding the numbers')
+    parser.add_argument('-d', '--delimiter', default=',', help='CSV delimiter (default: ,)')
+    parser.add_argument('--no-header', action='store_true', help='CSV input has no header row')
+    parser.add_argument('--encoding', default='utf-8', help='input text encoding (default: utf-8)')
+    parser.add_argument('-w', '--workers', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--chunk-bytes', type=int, default=DEFAULT_CHUNK_BYTES,
+                        help=f'target bytes per chunk (default: {DEFAULT_CHUNK_BYTES})')
+    parser.add_argument('--preserve-order', action='store_true', help='keep input order within each output file')
+    parser.add_argument('--database', help='prefix database CSV for detailed_operator (default: built-in tables)')
+    parser.add_argument('--no-database', action='store_true', help='run without a prefix database, CSV or built-in')
+    parser.add_argument('--portability', help='number-portability overlay for detailed_operator (see portability.py)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='do not print the partition report')
+    args = parser.parse_args(argv)
+
+    if args.database and not os.path.exists(args.database):
+        print(f'Error: prefix database not found: {args.database}', file=sys.stderr)
+        return 2
+    validator = PolishMobileValidator(builtin_prefixes=not args.no_database and not args.database)
+    if args.database and not args.no_database:
+        validator.load_prefix_database(args.database)
+    if args.portability:
+        validator.load_portability(args.portability)
+
+    try:
+        report = split_file(
+            validator, args.input, args.output_dir, workers=args.workers, chunk_bytes=args.chunk_bytes,
+            by=args.by, column=args.column, delimiter=args.delimiter, header=not args.no_header,
+            encoding=args.encoding, preserve_order=args.preserve_order
+        )
+    except (OSError, ValueError) as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 2
+
+    if not args.quiet:
+        print(report.summary(), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
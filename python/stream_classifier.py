@@ -0,0 +1,399 @@
+"""
+Streaming file classifier for Polish mobile numbers
+Reads, normalizes, classifies and writes numbers through a generator pipeline in constant memory
+
+Usage:
+    python stream_classifier.py numbers.txt -o classified.csv
+    python stream_classifier.py export.csv --column phone --fields normalized,operator,is_m2m
+    cat numbers.txt | python stream_classifier.py - --fields normalized,formatted --format international
+    python stream_classifier.py numbers.txt --aggregate --distinct hll
+    python stream_classifier.py shard-1.txt --aggregate json -o shard-1.json
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from aggregation import DEFAULT_PRECISION, DISTINCT_MODES, OperatorAggregate
+from polish_mobile_validator import PolishMobileValidator
+
+
+OUTPUT_FIELDS = ('input', 'valid', 'normalized', 'operator', 'detailed_operator', 'is_m2m', 'formatted')
+DEFAULT_FIELDS = ('input', 'valid', 'normalized', 'operator', 'is_m2m')
+READ_BUFFER_SIZE = 1 << 20
+WRITE_BUFFER_SIZE = 1 << 20
+DEFAULT_CHUNK_SIZE = 10000
+
+
+class StreamStats:
+    """Counters collected while a stream is processed."""
+
+    def __init__(self):
+        self.rows = 0
+        self.valid = 0
+        self.bytes_read = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def finish(self) -> None:
+        """Record the total elapsed time."""
+        self.elapsed = time.perf_counter() - self.started
+
+    def summary(self) -> str:
+        """
+        Format a throughput summary.
+
+        Returns:
+            Human-readable summary with rows/s and MB/s
+        """
+        elapsed = self.elapsed or 1e-9
+        return (
+            f'Processed {self.rows:,} rows ({self.valid:,} valid) in {self.elapsed:.2f}s: '
+            f'{self.rows / elapsed:,.0f} rows/s, '
+            f'{self.bytes_read / elapsed / 1e6:,.2f} MB/s'
+        )
+
+
+def read_lines(stream: BinaryIO, stats: StreamStats, encoding: str = 'utf-8') -> Iterator[str]:
+    """
+    Decode a binary stream line by line, counting the bytes consumed.
+
+    Args:
+        stream: Buffered binary input stream
+        stats: Counters to update
+        encoding: Text encoding of the input
+
+    Yields:
+        Decoded lines, including line terminators
+    """
+    for line in stream:
+        stats.bytes_read += len(line)
+        yield line.decode(encoding, errors='replace')
+
+
+def read_numbers(lines: Iterable[str], column: Optional[str] = None,
+                 delimiter: str = ',', header: bool = True) -> Iterator[str]:
+    """
+    Extract raw phone numbers from newline-separated text or a CSV column.
+
+    Args:
+        lines: Decoded input lines
+        column: CSV column name or 0-based index; None reads one number per line
+        delimiter: CSV delimiter
+        header: Whether the CSV input starts with a header row
+
+    Yields:
+        Raw phone number values
+    """
+    if column is None:
+        for line in lines:
+            value = line.strip()
+            if value:
+                yield value
+        return
+
+    reader = csv.reader(lines, delimiter=delimiter)
+    header_row = next(reader, None) if header else None
+    if column.isdigit():
+        position = int(column)
+    elif header_row is not None and column in header_row:
+        position = header_row.index(column)
+    else:
+        raise ValueError(f'Column not found in CSV header: {column}')
+
+    for row in reader:
+        if len(row) > position:
+            yield row[position].strip()
+        elif row:
+            yield ''
+
+
+def chunked(values: Iterable[str], size: int) -> Iterator[List[str]]:
+    """
+    Group an iterable into lists of at most ``size`` items.
+
+    Args:
+        values: Values to group
+        size: Maximum chunk length, at least 1
+
+    Yields:
+        Consecutive chunks
+
+    Raises:
+        ValueError: If size is less than 1
+    """
+    if size < 1:
+        raise ValueError(f'Chunk size must be at least 1, got {size}')
+    iterator = iter(values)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def classify_numbers(validator: PolishMobileValidator, numbers: Iterable[str],
+                     stats: StreamStats, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, any]]:
+    """
+    Classify numbers chunk by chunk with batch_validate.
+
+    Args:
+        validator: Validator used for classification
+        numbers: Raw phone numbers
+        stats: Counters to update
+        chunk_size: Numbers classified per batch
+
+    Yields:
+        recognize_operator results, in input order
+    """
+    for chunk in chunked(numbers, chunk_size):
+        for result in validator.batch_validate(chunk):
+            stats.rows += 1
+            if result['success']:
+                stats.valid += 1
+            yield result
+
+
+def format_rows(validator: PolishMobileValidator, results: Iterable[Dict[str, any]],
+                fields: Iterable[str], format_type: str = 'international') -> Iterator[List[str]]:
+    """
+    Project classification results onto the requested output fields.
+
+    Args:
+        validator: Validator used for the 'formatted' field
+        results: recognize_operator results
+        fields: Output field names, see OUTPUT_FIELDS
+        format_type: Format for the 'formatted' field
+
+    Yields:
+        Output rows as lists of strings
+    """
+    fields = tuple(fields)
+    for result in results:
+        success = result['success']
+        row = []
+        for field in fields:
+            if field == 'input':
+                row.append(result['phone_number'])
+            elif field == 'valid':
+                row.append('true' if success else 'false')
+            elif not success:
+                row.append('')
+            elif field == 'is_m2m':
+                row.append('true' if result['is_m2m'] else 'false')
+            elif field == 'formatted':
+                row.append(validator.format_phone_number(result['normalized'], format_type))
+            else:
+                row.append(result[field] or '')
+        yield row
+
+
+def write_rows(rows: Iterable[List[str]], output: TextIO, fields: Iterable[str],
+               header: bool = True) -> None:
+    """
+    Write output rows as CSV.
+
+    Args:
+        rows: Output rows
+        output: Buffered text output stream
+        fields: Field names for the header row
+        header: Whether to write a header row
+    """
+    writer = csv.writer(output, lineterminator='\n')
+    if header:
+        writer.writerow(fields)
+    writer.writerows(rows)
+
+
+def classify_stream(validator: PolishMobileValidator, source: BinaryIO, output: TextIO,
+                    fields: Iterable[str] = DEFAULT_FIELDS, column: Optional[str] = None,
+                    delimiter: str = ',', header: bool = True, format_type: str = 'international',
+                    encoding: str = 'utf-8', chunk_size: int = DEFAULT_CHUNK_SIZE) -> StreamStats:
+    """
+    Run the full read, normalize, classify, write pipeline over a stream.
+
+    Args:
+        validator: Validator used for classification
+        source: Binary input stream
+        output: Text output stream
+        fields: Output field names, see OUTPUT_FIELDS
+        column: CSV column name or 0-based index; None reads one number per line
+        delimiter: CSV delimiter
+        header: Whether the CSV input starts with a header row
+        format_type: Format for the 'formatted' field
+        encoding: Text encoding of the input
+        chunk_size: Numbers classified per batch
+
+    Returns:
+        StreamStats for the processed stream
+    """
+    fields = tuple(fields)
+    unknown = [field for field in fields if field not in OUTPUT_FIELDS]
+    if unknown:
+        raise ValueError(f'Unknown output fields: {", ".join(unknown)}')
+
+    stats = StreamStats()
+    lines = read_lines(source, stats, encoding)
+    numbers = read_numbers(lines, column, delimiter, header)
+    results = classify_numbers(validator, numbers, stats, chunk_size)
+    write_rows(format_rows(validator, results, fields, format_type), output, fields)
+    output.flush()
+    stats.finish()
+    return stats
+
+
+def aggregate_stream(validator: PolishMobileValidator, source: BinaryIO, column: Optional[str] = None,
+                     delimiter: str = ',', header: bool = True, encoding: str = 'utf-8',
+                     chunk_size: int = DEFAULT_CHUNK_SIZE, distinct: Optional[str] = None,
+                     precision: int = DEFAULT_PRECISION) -> Tuple[OperatorAggregate, StreamStats]:
+    """
+    Count a stream per operator, prefix and M2M split without keeping per-number results.
+
+    Args:
+        validator: Validator used for classification
+        source: Binary input stream
+        column: CSV column name or 0-based index; None reads one number per line
+        delimiter: CSV delimiter
+        header: Whether the CSV input starts with a header row
+        encoding: Text encoding of the input
+        chunk_size: Numbers classified per batch
+        distinct: None, 'exact' or 'hll' distinct counting per detailed operator
+        precision: HyperLogLog precision when distinct is 'hll'
+
+    Returns:
+        The aggregate and StreamStats for the processed stream
+    """
+    stats = StreamStats()
+    aggregate = OperatorAggregate(distinct, precision)
+    numbers = read_numbers(read_lines(source, stats, encoding), column, delimiter, header)
+    for chunk in chunked(numbers, chunk_size):
+        aggregate.add_numbers(validator, chunk)
+    stats.rows = aggregate.rows
+    stats.valid = aggregate.valid
+    stats.finish()
+    return aggregate, stats
+
+
+def positive_int(value: str) -> int:
+    """
+    argparse type for sizes that must be at least 1.
+
+    Args:
+        value: Command-line value
+
+    Returns:
+        The value as an integer
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'must be at least 1, got {number}')
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        description='Classify Polish mobile numbers from a file or stdin in constant memory.'
+    )
+    parser.add_argument('input', nargs='?', default='-',
+                        help='input file with one number per line, or a CSV file with --column (default: stdin)')
+    parser.add_argument('-o', '--output', default='-', help='output CSV file (default: stdout)')
+    parser.add_argument('-c', '--column', help='CSV column name or 0-based index holding the numbers')
+    parser.add_argument('-d', '--delimiter', default=',', help='CSV delimiter (default: ,)')
+    parser.add_argument('--no-header', action='store_true', help='CSV input has no header row')
+    parser.add_argument('-f', '--fields', default=','.join(DEFAULT_FIELDS),
+                        help=f'comma-separated output fields from: {", ".join(OUTPUT_FIELDS)}')
+    parser.add_argument('--format', default='international', choices=('standard', 'international', 'spaced'),
+                        help='format used for the formatted field (default: international)')
+    parser.add_argument('--database', help='prefix database CSV for detailed_operator (default: built-in tables)')
+    parser.add_argument('--no-database', action='store_true', help='run without a prefix database, CSV or built-in')
+    parser.add_argument('--portability', help='number-portability overlay for detailed_operator (see portability.py)')
+    parser.add_argument('--encoding', default='utf-8', help='input text encoding (default: utf-8)')
+    parser.add_argument('--chunk-size', type=positive_int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'numbers classified per batch (default: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--aggregate', nargs='?', const='report', choices=('report', 'json'),
+                        help='write counts per operator, prefix and M2M split instead of one row per number; '
+                             '"json" writes a partial aggregate for "python aggregation.py merge"')
+    parser.add_argument('--distinct', choices=DISTINCT_MODES,
+                        help='with --aggregate, also count distinct numbers per operator')
+    parser.add_argument('--precision', type=int, default=DEFAULT_PRECISION,
+                        help=f'HyperLogLog precision for --distinct hll (default: {DEFAULT_PRECISION})')
+    parser.add_argument('-q', '--quiet', action='store_true', help='do not print the throughput summary')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    fields = [field.strip() for field in args.fields.split(',') if field.strip()]
+
+    if args.database and not os.path.exists(args.database):
+        print(f'Error: prefix database not found: {args.database}', file=sys.stderr)
+        return 2
+    validator = PolishMobileValidator(builtin_prefixes=not args.no_database and not args.database)
+    if args.database and not args.no_database:
+        validator.load_prefix_database(args.database)
+    if args.portability:
+        validator.load_portability(args.portability)
+
+    if args.input == '-':
+        source = open(sys.stdin.fileno(), 'rb', buffering=READ_BUFFER_SIZE, closefd=False)
+    else:
+        try:
+            source = open(args.input, 'rb', buffering=READ_BUFFER_SIZE)
+        except OSError as error:
+            print(f'Error: {error}', file=sys.stderr)
+            return 2
+
+    if args.output == '-':
+        sys.stdout.flush()
+        output = open(sys.stdout.fileno(), 'w', encoding='utf-8', newline='',
+                      buffering=WRITE_BUFFER_SIZE, closefd=False)
+    else:
+        output = open(args.output, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_SIZE)
+
+    try:
+        if args.aggregate:
+            aggregate, stats = aggregate_stream(
+                validator, source, column=args.column, delimiter=args.delimiter, header=not args.no_header,
+                encoding=args.encoding, chunk_size=args.chunk_size, distinct=args.distinct,
+                precision=args.precision
+            )
+            if args.aggregate == 'json':
+                json.dump(aggregate.to_dict(), output, ensure_ascii=False)
+            else:
+                output.write(aggregate.report())
+            output.write('\n')
+        else:
+            stats = classify_stream(
+                validator, source, output, fields,
+                column=args.column, delimiter=args.delimiter, header=not args.no_header,
+                format_type=args.format, encoding=args.encoding, chunk_size=args.chunk_size
+            )
+    except ValueError as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 2
+    finally:
+        source.close()
+        output.close()
+
+    if not args.quiet:
+        print(stats.summary(), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Unit Tests for streaming operator aggregation
+"""
+
+import unittest
+import io
+import json
+import os
+import random
+import tempfile
+from polish_mobile_validator import PolishMobileValidator
+from aggregation import HyperLogLog, OperatorAggregate, UNMATCHED, aggregate_numbers, main
+import stream_classifier
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TestHyperLogLog(unittest.TestCase):
+    """Test cases for the HyperLogLog sketch"""
+
+    def test_estimate(self):
+        """Test small and large cardinalities against exact counts"""
+        sketch = HyperLogLog()
+        self.assertEqual(sketch.count(), 0)
+        for number in range(500000000, 500000100):
+            sketch.add(number)
+            sketch.add(number)
+        self.assertAlmostEqual(sketch.count(), 100, delta=2)
+        rng = random.Random(5)
+        values = {rng.randrange(10 ** 9) for _ in range(100000)}
+        sketch = HyperLogLog(12)
+        for value in values:
+            sketch.add(value)
+        self.assertLess(abs(sketch.count() - len(values)) / len(values), 0.05)
+
+    def test_merge(self):
+        """Test that merged sketches equal one sketch over all values"""
+        whole, first, second = HyperLogLog(10), HyperLogLog(10), HyperLogLog(10)
+        for value in range(20000):
+            whole.add(value)
+            (first if value % 3 else second).add(value)
+        first.merge(second)
+        self.assertEqual(first.registers, whole.registers)
+        with self.assertRaises(ValueError):
+            first.merge(HyperLogLog(11))
+        with self.assertRaises(ValueError):
+            HyperLogLog(3)
+
+    @unittest.skipIf(numpy is None, 'NumPy not installed')
+    def test_add_array_matches_add(self):
+        """Test that the vectorized path hashes exactly like add() at every precision"""
+        values = [0, 1, 2 ** 32, 999999999] + random.Random(2).sample(range(10 ** 9), 5000)
+        # hashes to 0x31ff...ff, whose 57 low one bits round up if taken through a single float64
+        rounding = [2682756357879429884]
+        for precision in (4, 8, 14, 18):
+            for sample in (values, rounding):
+                scalar, vectorized = HyperLogLog(precision), HyperLogLog(precision)
+                for value in sample:
+                    scalar.add(value)
+                vectorized.add_array(numpy.array(sample, dtype=numpy.int64))
+                self.assertEqual(scalar.registers, vectorized.registers, precision)
+
+
+class TestOperatorAggregate(unittest.TestCase):
+    """Test cases for OperatorAggregate"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.validator = PolishMobileValidator()
+        self.validator.prefix_database = {'501': 'Orange Polska S.A.', '53': 'P4 Sp. z o.o.'}
+        rng = random.Random(9)
+        self.numbers = [f'{rng.choice(("50", "53", "21", "99"))}{rng.randrange(10 ** 7):07d}' for _ in range(3000)]
+        self.numbers += ['+48 501 234 567', '501234567', '', 'abc', '4850123456']
+
+    def test_counts(self):
+        """Test counters for a handful of numbers"""
+        aggregate = OperatorAggregate('exact')
+        for number in ['501234567', '+48501234567', '531234567', '211234567', '991234567', '123']:
+            aggregate.add(self.validator.recognize_operator(number))
+        self.assertEqual((aggregate.rows, aggregate.valid, aggregate.invalid), (6, 4, 2))
+        self.assertEqual((aggregate.m2m, aggregate.non_m2m), (1, 3))
+        self.assertEqual(aggregate.operators, {'Orange': 2, 'Play': 1, 'Plus': 1})
+        self.assertEqual(aggregate.detailed_operators,
+                         {'Orange Polska S.A.': 2, 'P4 Sp. z o.o.': 1, UNMATCHED: 1})
+        self.assertEqual(aggregate.prefixes, {'50': 2, '53': 1, '21': 1})
+        self.assertEqual(aggregate.distinct_counts(),
+                         {'Orange Polska S.A.': 1, 'P4 Sp. z o.o.': 1, UNMATCHED: 1})
+        with self.assertRaises(ValueError):
+            OperatorAggregate().distinct_counts()
+        with self.assertRaises(ValueError):
+            OperatorAggregate('approximate')
+
+    def test_add_numbers_matches_scalar_results(self):
+        """Test that the batch path counts like adding results one by one"""
+        for distinct in (None, 'exact', 'hll'):
+            expected = OperatorAggregate(distinct)
+            for number in self.numbers:
+                expected.add(self.validator.recognize(number))
+            aggregate = aggregate_numbers(self.validator, self.numbers, distinct, chunk_size=700)
+            self.assertEqual(aggregate.to_dict(), expected.to_dict())
+            compact = OperatorAggregate(distinct)
+            for number in self.numbers:
+                compact._add_recognition(self.validator.recognize(number))
+            self.assertEqual(compact.to_dict(), expected.to_dict())
+
+    def test_merge_shards(self):
+        """Test that merged shard aggregates equal one pass over all numbers"""
+        for distinct in (None, 'exact', 'hll'):
+            whole = aggregate_numbers(self.validator, self.numbers, distinct)
+            shards = [aggregate_numbers(self.validator, self.numbers[i::3], distinct) for i in range(3)]
+            merged = OperatorAggregate(distinct)
+            for shard in shards:
+                merged.merge(OperatorAggregate.from_dict(json.loads(json.dumps(shard.to_dict()))))
+            self.assertEqual(merged.to_dict(), whole.to_dict())
+        with self.assertRaises(ValueError):
+            OperatorAggregate('hll', 12).merge(OperatorAggregate('hll', 14))
+        with self.assertRaises(ValueError):
+            OperatorAggregate().merge(OperatorAggregate('exact'))
+
+
+class TestAggregateCommandLine(unittest.TestCase):
+    """Test cases for the aggregation CLI mode and the merge command"""
+
+    def test_stream_and_merge(self):
+        """Test writing shard aggregates and merging them"""
+        aggregate, stats = stream_classifier.aggregate_stream(
+            PolishMobileValidator(), io.BytesIO(b'phone\n501234567\n211234567\nbad\n'),
+            column='phone', distinct='hll')
+        self.assertEqual((aggregate.rows, stats.rows, stats.valid), (3, 3, 2))
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for i, data in enumerate(('501234567\n531234567\n', '501234567\n991234567\n')):
+                source = os.path.join(directory, f'shard-{i}.txt')
+                with open(source, 'w') as file:
+                    file.write(data)
+                paths.append(os.path.join(directory, f'shard-{i}.json'))
+                self.assertEqual(stream_classifier.main([
+                    source, '--no-database', '--aggregate', 'json', '--distinct', 'exact', '-o', paths[-1], '-q'
+                ]), 0)
+            merged_path = os.path.join(directory, 'total.json')
+            self.assertEqual(main(['merge', *paths, '-o', merged_path]), 0)
+            with open(merged_path, encoding='utf-8') as file:
+                merged = OperatorAggregate.from_dict(json.load(file))
+        self.assertEqual((merged.rows, merged.valid), (4, 3))
+        self.assertEqual(merged.distinct_counts(), {UNMATCHED: 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+"""
+Unit Tests for the allocated-block bitmap and strict validation
+"""
+
+import unittest
+import os
+import random
+import tempfile
+from polish_mobile_validator import PolishMobileValidator, UNALLOCATED_MESSAGE
+from allocation import AllocationBitmap, AllocationError, _set_bits
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
+
+
+class TestAllocationBitmap(unittest.TestCase):
+    """Test cases for AllocationBitmap"""
+
+    def test_set_bits_matches_bit_by_bit(self):
+        """Test range setting against setting one bit at a time"""
+        rng = random.Random(7)
+        for _ in range(200):
+            start = rng.randrange(0, 200)
+            end = start + rng.randrange(0, 100)
+            fast, slow = bytearray(64), bytearray(64)
+            _set_bits(fast, start, end)
+            for bit in range(start, end):
+                slow[bit >> 3] |= 1 << (bit & 7)
+            self.assertEqual(fast, slow, (start, end))
+
+    def test_from_prefixes(self):
+        """Test which blocks short and long prefixes mark as allocated"""
+        bitmap = AllocationBitmap.from_prefixes({'501': 'A', '50212345': 'B', 'x': 'C'})
+        self.assertTrue(bitmap.is_allocated(501000000))
+        self.assertTrue(bitmap.is_allocated(501999999))
+        self.assertFalse(bitmap.is_allocated(502000000))
+        self.assertTrue(bitmap.is_allocated(502123400))
+        self.assertTrue(bitmap.is_allocated(502123499))
+        self.assertFalse(bitmap.is_allocated(502123500))
+        self.assertEqual(bitmap.allocated_blocks(), 10001)
+
+    def test_save_and_load(self):
+        """Test persisting a bitmap and detecting corruption"""
+        bitmap = AllocationBitmap.from_prefixes({'501': 'A'}, 'ab' * 32)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'prefixes.alloc')
+            bitmap.save(path)
+            loaded = AllocationBitmap.load(path)
+            self.assertEqual(bytes(loaded.bits), bytes(bitmap.bits))
+            self.assertEqual(loaded.content_hash, 'ab' * 32)
+            del loaded
+
+            with open(path, 'r+b') as file:
+                file.seek(-1, os.SEEK_END)
+                file.write(b'\x01')
+            with self.assertRaises(AllocationError):
+                AllocationBitmap.load(path)
+            AllocationBitmap.load(path, verify=False)
+
+            with open(path, 'wb') as file:
+                file.write(b'not a bitmap')
+            with self.assertRaises(AllocationError):
+                AllocationBitmap.load(path)
+
+
+class TestStrictValidation(unittest.TestCase):
+    """Test cases for strict validation in the scalar and batch APIs"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.validator = PolishMobileValidator()
+        self.validator.prefix_database = {'501': 'Orange', '531': 'Play'}
+
+    def test_validate_phone_number(self):
+        """Test that strict mode rejects unallocated blocks only"""
+        self.assertTrue(self.validator.validate_phone_number('502123456')['valid'])
+        result = self.validator.validate_phone_number('502123456', strict=True)
+        self.assertFalse(result['valid'])
+        self.assertEqual(result['message'], UNALLOCATED_MESSAGE)
+        self.assertEqual(result['prefix'], '50')
+        self.assertTrue(self.validator.validate_phone_number('+48 501 123 456', strict=True)['valid'])
+        self.assertIn('9 digits', self.validator.validate_phone_number('5011', strict=True)['message'])
+
+    def test_recognize_operator(self):
+        """Test strict recognition results"""
+        self.assertEqual(self.validator.recognize_operator('502123456', strict=True),
+                         {'success': False, 'message': UNALLOCATED_MESSAGE, 'phone_number': '502123456'})
+        self.assertEqual(self.validator.recognize_operator('501123456', strict=True),
+                         self.validator.recognize_operator('501123456'))
+        self.assertTrue(self.validator.is_allocated('+48501123456'))
+        self.assertFalse(self.validator.is_allocated('502123456'))
+        self.assertFalse(self.validator.is_allocated('123'))
+
+    def test_batch_validate_reports_rejected_fraction(self):
+        """Test allocation_stats after strict batches"""
+        self.assertIsNone(self.validator.allocation_stats()['last_batch'])
+        results = self.validator.batch_validate(['501123456', '502123456', '531000000', '991234567'], strict=True)
+        self.assertEqual([result['success'] for result in results], [True, False, True, False])
+        self.validator.batch_validate(['502000000'], strict=True)
+        stats = self.validator.allocation_stats()
+        self.assertEqual(stats['batches'], 2)
+        self.assertEqual(stats['checked'], 5)
+        self.assertEqual(stats['rejected_unallocated'], 2)
+        self.assertEqual(stats['rejected_fraction'], 0.4)
+        self.assertEqual(stats['last_batch'], {'checked': 1, 'rejected_unallocated': 1, 'rejected_fraction': 1.0})
+
+    @unittest.skipIf(numpy is None, 'NumPy not installed')
+    def test_batch_classify(self):
+        """Test strict vectorized classification"""
+        numbers = numpy.array([501123456, 502123456, 48531000000, 991234567])
+        relaxed = self.validator.batch_classify(numbers)
+        strict = self.validator.batch_classify(numbers, strict=True)
+        self.assertEqual(relaxed.valid.tolist(), [True, True, True, False])
+        self.assertEqual(strict.valid.tolist(), [True, False, True, False])
+        self.assertEqual(strict.unallocated.tolist(), [False, True, False, False])
+        self.assertEqual(strict.unallocated_fraction(), 0.25)
+        self.assertEqual(strict.operator.tolist()[1], 0)
+        self.assertEqual(self.validator.allocation_stats()['rejected_unallocated'], 1)
+
+    def test_requires_database(self):
+        """Test that strict mode needs prefix data"""
+        with self.assertRaises(ValueError):
+            PolishMobileValidator(builtin_prefixes=False).validate_phone_number('501123456', strict=True)
+
+    def test_reload_rebuilds_bitmap(self):
+        """Test that a new prefix table gets its own bitmap"""
+        self.assertFalse(self.validator.is_allocated('502123456'))
+        self.validator.prefix_database = {'502': 'Orange'}
+        self.assertTrue(self.validator.is_allocated('502123456'))
+
+    @unittest.skipUnless(os.path.exists(CSV_PATH), 'prefix CSV not available')
+    def test_load_allocation_bitmap(self):
+        """Test loading a saved bitmap and rejecting one built from other data"""
+        validator = PolishMobileValidator()
+        validator.reload_prefix_database(CSV_PATH)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'prefixes.alloc')
+            validator.get_allocation_bitmap().save(path)
+
+            fresh = PolishMobileValidator()
+            fresh.reload_prefix_database(CSV_PATH)
+            fresh.load_allocation_bitmap(path)
+            self.assertIsInstance(fresh.get_allocation_bitmap().bits, memoryview)
+            self.assertEqual(fresh.is_allocated('500123456'), validator.is_allocated('500123456'))
+
+            other_path = os.path.join(directory, 'other.csv')
+            with open(other_path, 'w', encoding='utf-8') as file:
+                file.write('Prefix;Operator Name\n+48501;Orange\n')
+            other = PolishMobileValidator()
+            other.reload_prefix_database(other_path)
+            with self.assertRaises(AllocationError):
+                other.load_allocation_bitmap(path)
+            del fresh
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Unit Tests for asyncio stream classification
+"""
+
+import unittest
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from polish_mobile_validator import PolishMobileValidator
+from async_classifier import batch_numbers, classify_batches, classify_numbers
+from parallel import ParallelValidatorPool
+
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
+
+
+async def numbers_from(numbers, pause_every=0, pause=0.0):
+    """Async source that sleeps after every pause_every numbers"""
+    for position, number in enumerate(numbers):
+        if pause_every and position and position % pause_every == 0:
+            await asyncio.sleep(pause)
+        yield number
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+class TestBatchNumbers(unittest.TestCase):
+    """Test cases for size and time-window batching"""
+
+    def test_batches_by_size(self):
+        """Test that a fast source is cut into full batches and a final partial one"""
+        batches = asyncio.run(collect(batch_numbers(numbers_from(range(25)), batch_size=10)))
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 5])
+        self.assertEqual([number for batch in batches for number in batch], list(range(25)))
+
+    def test_time_window_closes_partial_batches(self):
+        """Test that a batch is yielded when its window expires while the source waits"""
+        source = numbers_from(range(9), pause_every=3, pause=0.2)
+        batches = asyncio.run(collect(batch_numbers(source, batch_size=100, max_delay=0.02)))
+        self.assertEqual(batches, [[0, 1, 2], [3, 4, 5], [6, 7, 8]])
+
+    def test_without_time_window(self):
+        """Test that max_delay=None waits for full batches"""
+        source = numbers_from(range(9), pause_every=3, pause=0.01)
+        batches = asyncio.run(collect(batch_numbers(source, batch_size=4, max_delay=None)))
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 1])
+
+    def test_source_errors_propagate_after_earlier_batches(self):
+        """Test that an exception from the source is raised once earlier numbers are yielded"""
+        async def failing():
+            yield '501234567'
+            raise RuntimeError('source failed')
+
+        async def scenario():
+            seen = []
+            with self.assertRaises(RuntimeError):
+                async for batch in batch_numbers(failing(), batch_size=10, max_delay=0.01):
+                    seen.extend(batch)
+            return seen
+
+        self.assertEqual(asyncio.run(scenario()), ['501234567'])
+
+    def test_rejects_empty_batches(self):
+        """Test that batch_size must be positive"""
+        with self.assertRaises(ValueError):
+            asyncio.run(collect(batch_numbers([], batch_size=0)))
+
+
+class TestClassifyNumbers(unittest.TestCase):
+    """Test cases for off-loop classification"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the prefix database and build a mixed input"""
+        cls.validator = PolishMobileValidator(CSV_PATH) if os.path.exists(CSV_PATH) else PolishMobileValidator()
+        cls.numbers = [str(500000000 + step * 7919) for step in range(3000)]
+        cls.numbers += ['+48 501 234 567', '(601) 234-567', '991234567', '12345', '', 501234567]
+        cls.expected = [result.to_dict() for result in cls.validator.batch_recognize(cls.numbers)]
+
+    def test_results_in_order(self):
+        """Test that results equal batch_recognize in source order"""
+        results = asyncio.run(collect(classify_numbers(self.validator, numbers_from(self.numbers),
+                                                       batch_size=256, max_in_flight=2)))
+        self.assertEqual([result.to_dict() for result in results], self.expected)
+
+    def test_plain_iterable_and_executor(self):
+        """Test a list source classified in a caller-provided thread pool"""
+        async def scenario():
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                return await collect(classify_batches(self.validator, self.numbers, batch_size=500,
+                                                      executor=executor))
+
+        batches = asyncio.run(scenario())
+        self.assertEqual([len(batch) for batch in batches], [500] * 6 + [6])
+        self.assertEqual([result.to_dict() for batch in batches for result in batch], self.expected)
+
+    def test_process_pool(self):
+        """Test classification in a ParallelValidatorPool"""
+        async def scenario():
+            with ParallelValidatorPool(self.validator, workers=2) as pool:
+                return await collect(classify_numbers(self.validator, self.numbers, batch_size=700,
+                                                      executor=pool))
+
+        self.assertEqual([result.to_dict() for result in asyncio.run(scenario())], self.expected)
+
+    def test_backpressure_bounds_reading(self):
+        """Test that an idle consumer stops the source after a bounded number of batches"""
+        read = []
+
+        async def counting():
+            for number in self.numbers:
+                read.append(number)
+                yield number
+
+        async def scenario():
+            batches = classify_batches(self.validator, counting(), batch_size=100, max_in_flight=2)
+            first = await batches.__anext__()
+            await asyncio.sleep(0.2)
+            await batches.aclose()
+            return first
+
+        first = asyncio.run(scenario())
+        self.assertEqual(len(first), 100)
+        # Two in flight, one held by the batcher, one being filled, plus the batch consumed
+        self.assertLessEqual(len(read), 100 * 5 + 1)
+
+    def test_rejects_zero_in_flight(self):
+        """Test that max_in_flight must be positive"""
+        with self.assertRaises(ValueError):
+            asyncio.run(collect(classify_batches(self.validator, [], max_in_flight=0)))
+
+
+if __name__ == '__main__':
+    unittest.main()
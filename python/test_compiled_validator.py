@@ -0,0 +1,113 @@
+"""
+Unit Tests for immutable compiled validators and the thread pool
+"""
+
+import unittest
+import os
+import random
+import threading
+from polish_mobile_validator import PolishMobileValidator
+from compiled_validator import CompiledValidator, ThreadValidatorPool
+from portability import PortabilityOverlay
+
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
+
+
+class TestCompiledValidator(unittest.TestCase):
+    """Test cases for PolishMobileValidator.freeze"""
+
+    def setUp(self):
+        """Set up a validator with a ported number and a mixed input"""
+        self.validator = PolishMobileValidator(CSV_PATH) if os.path.exists(CSV_PATH) else PolishMobileValidator()
+        self.validator.attach_portability(PortabilityOverlay.from_rows([(501234567, 'Ported Operator')]))
+        rng = random.Random(4)
+        self.numbers = [str(rng.randrange(10 ** 8, 10 ** 9)) for _ in range(3000)]
+        self.numbers += ['501234567', '+48 211 234 567', '(601) 234-567', '991234567', '12345', '', None,
+                         48691234567, '５０１２３４５６７']
+
+    def test_matches_validator(self):
+        """Test that results equal the validator's dictionaries and compact results"""
+        compiled = self.validator.freeze()
+        self.assertIsInstance(compiled, CompiledValidator)
+        self.assertEqual(compiled.batch_validate(self.numbers), self.validator.batch_validate(self.numbers))
+        self.assertEqual([result.to_dict() for result in compiled.batch_recognize(self.numbers)],
+                         [result.to_dict() for result in self.validator.batch_recognize(self.numbers)])
+        self.assertEqual(compiled.recognize_operator('501234567')['detailed_operator'], 'Ported Operator')
+        for number in ('501234567', '531234567'):
+            self.assertEqual(compiled.find_detailed_operator(number), self.validator.find_detailed_operator(number))
+            self.assertEqual(compiled.find_current_operator(number), self.validator.find_current_operator(number))
+        self.assertNotEqual(compiled.find_detailed_operator('501234567'), 'Ported Operator')
+
+    def test_immutable(self):
+        """Test that the snapshot rejects changes and ignores later validator changes"""
+        compiled = self.validator.freeze()
+        with self.assertRaises(AttributeError):
+            compiled.valid_prefixes = ('50',)
+        with self.assertRaises(AttributeError):
+            del compiled.table
+        with self.assertRaises(TypeError):
+            compiled.operator_prefixes['Play'] = ('50',)
+        with self.assertRaises(TypeError):
+            compiled.prefix_database['50'] = 'Changed'
+
+        expected = compiled.recognize_operator('531234567')
+        self.validator.operator_prefixes['Other'] = ['53']
+        self.validator.operator_prefixes['Play'].remove('53')
+        self.validator.prefix_database = {'53': 'Changed'}
+        self.validator.attach_portability(None)
+        self.assertEqual(compiled.recognize_operator('531234567'), expected)
+        self.assertEqual(compiled.recognize_operator('501234567')['detailed_operator'], 'Ported Operator')
+
+    def test_shared_by_threads(self):
+        """Test that concurrent threads get the sequential results"""
+        compiled = self.validator.freeze()
+        expected = compiled.batch_validate(self.numbers)
+        results = {}
+        start = threading.Barrier(8)
+
+        def work(position):
+            start.wait()
+            results[position] = compiled.batch_validate(self.numbers)
+
+        threads = [threading.Thread(target=work, args=(position,)) for position in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(all(result == expected for result in results.values()))
+
+
+class TestThreadValidatorPool(unittest.TestCase):
+    """Test cases for ThreadValidatorPool"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the prefix database and build a mixed input"""
+        cls.validator = PolishMobileValidator(CSV_PATH) if os.path.exists(CSV_PATH) else PolishMobileValidator()
+        cls.numbers = [str(500000000 + step * 7919) for step in range(5000)] + ['991234567', '', '+48 501 234 567']
+
+    def test_batches_in_order(self):
+        """Test that chunked results come back in input order"""
+        with ThreadValidatorPool(self.validator, workers=4, chunk_size=700) as pool:
+            self.assertEqual(pool.batch_validate(self.numbers), self.validator.batch_validate(self.numbers))
+            self.assertEqual([result.to_dict() for result in pool.batch_recognize(self.numbers)],
+                             [result.to_dict() for result in self.validator.batch_recognize(self.numbers)])
+            self.assertEqual(pool.batch_validate([]), [])
+
+    def test_submit(self):
+        """Test running a function with the shared validator"""
+        compiled = self.validator.freeze()
+        with ThreadValidatorPool(compiled, workers=2) as pool:
+            self.assertIs(pool.validator, compiled)
+            future = pool.submit(lambda validator, number: validator.recognize(number).operator, '501234567')
+            self.assertEqual(future.result(), 'Orange')
+
+    def test_rejects_empty_chunks(self):
+        """Test that chunk_size must be positive"""
+        with self.assertRaises(ValueError):
+            ThreadValidatorPool(self.validator, chunk_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Unit Tests for pandas and PyArrow classification
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+import dataframes
+from polish_mobile_validator import PolishMobileValidator
+
+try:
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+except ImportError:
+    np = pd = pa = None
+
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
+VALUES = ['501234567', '+48 601 234 567', '48 791 234 567', '211234567', '(69) 123-45-67', '123', '',
+          'x' * 70 + '501234567', 'tel. 881 234 567 ł', '５０１２３４５６７', '784290091٣', None]
+
+
+def expected_rows(validator, values):
+    rows = []
+    for value in values:
+        result = validator.recognize(value) if value is not None else None
+        if result is None or not result.success:
+            rows.append((None, None, None, None))
+        else:
+            rows.append((result.normalized, result.operator, result.detailed_operator, result.is_m2m))
+    return rows
+
+
+def frame_rows(frame):
+    return [tuple(None if value is pd.NA or value != value else value for value in row)
+            for row in frame.itertuples(index=False)]
+
+
+@unittest.skipUnless(pa is not None, 'pandas and pyarrow are not installed')
+class TestClassifyArrow(unittest.TestCase):
+    """Test Arrow column classification"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.validator = PolishMobileValidator(CSV_PATH)
+        cls.expected = expected_rows(cls.validator, VALUES)
+
+    def rows(self, table):
+        return list(zip(*(table.column(name).to_pylist() for name in dataframes.OUTPUT_COLUMNS)))
+
+    def test_string_arrays_match_recognize(self):
+        """Test string, large_string, chunked, sliced and dictionary arrays give recognize's results"""
+        array = pa.array(VALUES)
+        self.assertEqual(self.rows(dataframes.classify_arrow(self.validator, array)), self.expected)
+        chunked = pa.chunked_array([pa.array(VALUES[:4], pa.large_string()), pa.array(VALUES[4:], pa.large_string())])
+        self.assertEqual(self.rows(dataframes.classify_arrow(self.validator, chunked)), self.expected)
+        self.assertEqual(self.rows(dataframes.classify_arrow(self.validator, array.slice(3))), self.expected[3:])
+        encoded = array.dictionary_encode()
+        self.assertEqual(self.rows(dataframes.classify_arrow(self.validator, encoded)), self.expected)
+
+    def test_non_ascii_values_match_recognize(self):
+        """Test values with Unicode digits or letters get recognize's results"""
+        extras = ('\u0663', '\u00e9', ' \u0142', '\uff15', '')
+        values = [f'{prefix}{number:07d}{extras[number % 5]}'
+                  for prefix in (50, 78, 21) for number in range(0, 10 ** 7, 9973)]
+        table = dataframes.classify_arrow(self.validator, pa.array(values))
+        self.assertEqual(self.rows(table), expected_rows(self.validator, values))
+
+    def test_output_types(self):
+        """Test operator columns are dictionary-encoded and invalid rows are null"""
+        table = dataframes.classify_arrow(self.validator, pa.array(VALUES))
+        self.assertTrue(pa.types.is_dictionary(table.column('operator').type))
+        self.assertTrue(pa.types.is_dictionary(table.column('detailed_operator').type))
+        self.assertEqual(table.column('normalized').type, pa.string())
+        self.assertEqual(table.column('is_m2m').null_count, 5)
+        self.assertEqual(table.column('is_m2m').to_pylist()[3], True)
+
+    def test_integer_arrays(self):
+        """Test integer arrays with nulls and the 48 country code"""
+        table = dataframes.classify_arrow(self.validator, pa.array([501234567, 48601234567, None, 12], pa.int64()))
+        self.assertEqual(table.column('normalized').to_pylist(), ['501234567', '601234567', None, None])
+
+    def test_many_rows_across_passes(self):
+        """Test results stay aligned across several fixed-width passes"""
+        values = [f'{prefix}{number:07d}' if number % 3 else f'+48 {prefix}{number:07d}'
+                  for prefix in (50, 60, 72, 12) for number in range(0, 10 ** 7, 9973)]
+        with mock.patch.object(dataframes, 'ROWS_PER_PASS', 1000):
+            table = dataframes.classify_arrow(self.validator, pa.array(values))
+        self.assertEqual(self.rows(table), expected_rows(self.validator, values))
+
+
+@unittest.skipUnless(pa is not None, 'pandas and pyarrow are not installed')
+class TestClassifySeries(unittest.TestCase):
+    """Test pandas Series classification"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.validator = PolishMobileValidator(CSV_PATH)
+        cls.expected = expected_rows(cls.validator, VALUES)
+
+    def test_string_dtypes_match_recognize(self):
+        """Test Arrow-backed, Python-backed, object and categorical Series"""
+        for dtype in ('string[pyarrow]', 'string[python]', object, 'category'):
+            frame = dataframes.classify_series(self.validator, pd.Series(VALUES, dtype=dtype))
+            self.assertEqual(frame_rows(frame), self.expected, dtype)
+
+    def test_output_dtypes_and_index(self):
+        """Test categorical operators, nullable flags, the index and the column prefix"""
+        series = pd.Series(VALUES, index=[f'row{i}' for i in range(len(VALUES))])
+        frame = dataframes.classify_series(self.validator, series, prefix='phone_')
+        self.assertEqual(list(frame.columns), ['phone_' + name for name in dataframes.OUTPUT_COLUMNS])
+        self.assertEqual(list(frame.index), list(series.index))
+        self.assertIsInstance(frame['phone_operator'].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(frame['phone_detailed_operator'].dtype, pd.CategoricalDtype)
+        self.assertEqual(str(frame['phone_is_m2m'].dtype), 'boolean')
+
+    def test_numeric_dtypes(self):
+        """Test nullable integer and float Series, as read_csv gives for number columns with gaps"""
+        expected = ['501234567', '601234567', None, None]
+        for series in (pd.Series([501234567, 48601234567, None, 12], dtype='Int64'),
+                       pd.Series([501234567.0, 48601234567.0, np.nan, 5.5])):
+            frame = dataframes.classify_series(self.validator, series)
+            self.assertEqual([None if value is pd.NA else value for value in frame['normalized']], expected)
+
+    def test_without_pyarrow(self):
+        """Test object Series are classified when pyarrow is unavailable"""
+        with mock.patch.dict(sys.modules, {'pyarrow': None}), mock.patch.object(dataframes, 'pa', None):
+            frame = dataframes.classify_series(self.validator, pd.Series(VALUES + [501234567], dtype=object))
+            with self.assertRaises(ImportError):
+                dataframes.classify_arrow(self.validator, VALUES)
+        self.assertEqual(frame_rows(frame), self.expected + [self.expected[0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
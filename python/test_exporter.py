@@ -0,0 +1,172 @@
+"""
+Unit Tests for bulk formatting and export
+"""
+
+import unittest
+import contextlib
+import csv
+import io
+import json
+import os
+import random
+import tempfile
+from polish_mobile_validator import PolishMobileValidator
+from operators import canonical_operator_name
+from exporter import EXPORT_COLUMNS, BulkExporter, export, format_numbers, infer_format, main
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
+
+
+@unittest.skipIf(np is None, 'NumPy not installed')
+class TestFormatNumbers(unittest.TestCase):
+    """Test cases for format_numbers"""
+
+    def setUp(self):
+        """Set up a validator for the reference formatting"""
+        self.validator = PolishMobileValidator()
+
+    def test_matches_format_phone_number(self):
+        """Test that every format equals format_phone_number of the same number"""
+        rng = random.Random(5)
+        numbers = [rng.randrange(10 ** 8, 10 ** 9) for _ in range(2000)]
+        for number_format in ('international', 'spaced', 'standard'):
+            expected = [self.validator.format_phone_number(str(number), number_format) for number in numbers]
+            formatted = format_numbers(np.array(numbers), number_format)
+            self.assertEqual([value.decode('ascii') for value in formatted], expected)
+        self.assertEqual(format_numbers(numbers[:1], 'e164')[0].decode('ascii'), f'+48{numbers[0]}')
+
+    def test_inputs(self):
+        """Test strings, bytes, 48-prefixed and invalid values"""
+        formatted = format_numbers(['501234567', '+48 601 234 567', '12', '', '５０１２３４５６７'], 'spaced')
+        self.assertEqual(formatted.tolist(), [b'501 234 567', b'601 234 567', b'', b'', b''])
+        formatted = format_numbers(np.array([48501234567, 501234567, -1], dtype=np.int64), 'e164')
+        self.assertEqual(formatted.tolist(), [b'+48501234567', b'+48501234567', b''])
+        self.assertEqual(format_numbers(np.array([b'211234567']), 'standard').tolist(), [b'211234567'])
+        with self.assertRaises(ValueError):
+            format_numbers([501234567], 'dotted')
+
+
+@unittest.skipIf(np is None, 'NumPy not installed')
+class TestExport(unittest.TestCase):
+    """Test cases for CSV, JSONL and Parquet export"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Classify a mixed batch and compute the expected rows from recognize_operator"""
+        cls.validator = PolishMobileValidator(CSV_PATH) if os.path.exists(CSV_PATH) else PolishMobileValidator()
+        rng = random.Random(6)
+        cls.numbers = [rng.randrange(10 ** 8, 10 ** 9) for _ in range(5000)] + [211234567, 691234567, 991234567]
+        cls.batch = cls.validator.batch_classify(np.array(cls.numbers))
+        cls.expected = [result for result in cls.validator.batch_validate([str(n) for n in cls.numbers])
+                        if result['success']]
+        for result in cls.expected:
+            if result['detailed_operator'] is not None:
+                result['detailed_operator'] = canonical_operator_name(result['detailed_operator'])
+
+    def test_csv(self):
+        """Test that CSV rows match the scalar results"""
+        output = io.BytesIO()
+        self.assertEqual(export(self.batch, output, 'csv', 'international'), len(self.expected))
+        rows = list(csv.reader(io.StringIO(output.getvalue().decode('utf-8'))))
+        self.assertEqual(rows[0], list(EXPORT_COLUMNS))
+        self.assertEqual(rows[1:], [[
+            self.validator.format_phone_number(result['normalized'], 'international'), result['operator'],
+            result['detailed_operator'] or '', 'true' if result['is_m2m'] else 'false',
+        ] for result in self.expected])
+
+    def test_jsonl(self):
+        """Test that JSONL lines match the scalar results"""
+        output = io.BytesIO()
+        export(self.batch, output, 'jsonl')
+        lines = [json.loads(line) for line in output.getvalue().decode('utf-8').splitlines()]
+        self.assertEqual(lines, [{
+            'number': '+48' + result['normalized'], 'operator': result['operator'],
+            'detailed_operator': result['detailed_operator'], 'is_m2m': result['is_m2m'],
+        } for result in self.expected])
+
+    def test_recognition_batch(self):
+        """Test that RecognitionBatch and BatchClassification export identical bytes"""
+        numbers = [str(number) for number in self.numbers] + ['+48 211 234 567', 'x']
+        recognized = self.validator.batch_recognize_ids(numbers)
+        classified = self.validator.batch_classify(np.array([number.encode('ascii') for number in numbers]))
+        for export_format in ('csv', 'jsonl'):
+            from_ids, from_batch = io.BytesIO(), io.BytesIO()
+            export(recognized, from_ids, export_format, 'spaced')
+            export(classified, from_batch, export_format, 'spaced')
+            self.assertEqual(from_ids.getvalue(), from_batch.getvalue())
+
+    def test_streaming_writes(self):
+        """Test that several batches share one header and the row count adds up"""
+        output = io.BytesIO()
+        with BulkExporter(output, 'csv', 'standard') as exporter:
+            exporter.write(self.batch)
+            exporter.write(self.batch)
+        self.assertEqual(exporter.rows, 2 * len(self.expected))
+        self.assertEqual(output.getvalue().count(b'number,operator'), 1)
+        self.assertEqual(output.getvalue().count(b'\n'), 2 * len(self.expected) + 1)
+
+    @unittest.skipIf(pq is None, 'pyarrow not installed')
+    def test_parquet(self):
+        """Test that a Parquet file round-trips with dictionary-encoded operators"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'numbers.parquet')
+            self.assertEqual(infer_format(path), 'parquet')
+            with BulkExporter(path, number_format='spaced') as exporter:
+                exporter.write(self.batch)
+                exporter.write(self.batch)
+            table = pq.read_table(path)
+        self.assertEqual(table.column_names, list(EXPORT_COLUMNS))
+        self.assertEqual(table.num_rows, 2 * len(self.expected))
+        self.assertEqual(table.schema.field('operator').type.index_type.bit_width, 32)
+        self.assertEqual(table.slice(0, len(self.expected)).to_pylist(), [{
+            'number': self.validator.format_phone_number(result['normalized'], 'spaced'),
+            'operator': result['operator'], 'detailed_operator': result['detailed_operator'],
+            'is_m2m': result['is_m2m'],
+        } for result in self.expected])
+
+    def test_rejects_unclassified_input(self):
+        """Test that plain number lists must be classified first"""
+        with self.assertRaises(TypeError):
+            export(['501234567'], io.BytesIO(), 'csv')
+        with self.assertRaises(ValueError):
+            BulkExporter(io.BytesIO(), 'xml')
+
+
+@unittest.skipIf(np is None, 'NumPy not installed')
+class TestCommandLine(unittest.TestCase):
+    """Test cases for the exporter command line"""
+
+    def test_export_file(self):
+        """Test exporting a number list with the format taken from the extension"""
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'numbers.txt')
+            with open(source, 'w', encoding='utf-8') as file:
+                file.write('501234567\n+48 211 234 567\nnot a number\n991234567\n')
+            output = os.path.join(directory, 'numbers.jsonl')
+            self.assertEqual(main([source, '-o', output, '--number-format', 'international', '-q']), 0)
+            with open(output, encoding='utf-8') as file:
+                lines = [json.loads(line) for line in file]
+            self.assertEqual(main([source, '--output-format', 'parquet', '-q']), 2)
+            self.assertEqual(main([source, '-o', output, '--database', source + '.missing', '-q']), 2)
+            with contextlib.redirect_stderr(io.StringIO()) as errors:
+                self.assertEqual(main([source + '.missing', '-o', output, '-q']), 2)
+            self.assertTrue(errors.getvalue().startswith('Error: '))
+            with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+                main([source, '-o', output, '--chunk-size', '0'])
+        self.assertEqual([line['number'] for line in lines], ['+48 501 234 567', '+48 211 234 567'])
+        self.assertEqual([line['is_m2m'] for line in lines], [False, True])
+
+
+if __name__ == '__main__':
+    unittest.main()
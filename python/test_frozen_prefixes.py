@@ -0,0 +1,119 @@
+"""
+Unit Tests for generated frozen prefix modules
+"""
+
+import unittest
+import importlib
+import os
+import random
+import sys
+import tempfile
+from polish_mobile_validator import PolishMobileValidator
+from frozen_prefixes import FORMAT_VERSION, FrozenModuleError, build_module, frozen_index, is_current, main
+from prefix_index import PrefixIndex
+import prefix_data
+
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
+CUSTOM_CSV = (
+    'Prefix;Operator Name\n'
+    '+4850;Orange\n'
+    '+48501;Operator A\n'
+    '+485012345;Operator B\n'
+    '+4850123;Operator C\n'
+    '+48602;Operator A\n'
+    '+48xx;Operator D\n'
+)
+
+
+class TestBuiltinPrefixes(unittest.TestCase):
+    """Test cases for validators using the committed prefix_data module"""
+
+    @unittest.skipUnless(os.path.exists(CSV_PATH), 'prefix CSV not available')
+    def test_module_is_current(self):
+        """Test that prefix_data was generated from the CSV in the repository"""
+        self.assertTrue(is_current(CSV_PATH, prefix_data))
+
+    @unittest.skipUnless(os.path.exists(CSV_PATH), 'prefix CSV not available')
+    def test_matches_csv(self):
+        """Test that a validator without csv_path answers like a CSV-backed one"""
+        builtin = PolishMobileValidator()
+        from_csv = PolishMobileValidator(CSV_PATH)
+        self.assertEqual(builtin.prefix_database, from_csv.prefix_database)
+        self.assertEqual(builtin.get_prefix_index().slots, from_csv.get_prefix_index().slots)
+        rng = random.Random(3)
+        for _ in range(20000):
+            number = str(rng.randrange(10 ** 8, 10 ** 9))
+            self.assertEqual(builtin.recognize_operator(number), from_csv.recognize_operator(number))
+
+    def test_csv_replaces_builtin_tables(self):
+        """Test that loading a CSV replaces the built-in tables instead of merging into them"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'custom.csv')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(CUSTOM_CSV)
+            validator = PolishMobileValidator()
+            validator.load_prefix_database(path)
+            self.assertEqual(len(validator.prefix_database), 6)
+            validator.load_prefix_database(path)
+            self.assertEqual(len(validator.prefix_database), 6)
+        self.assertIsNone(validator.recognize_operator('661234567')['detailed_operator'])
+
+    def test_opt_out(self):
+        """Test that builtin_prefixes=False starts with an empty database"""
+        validator = PolishMobileValidator(builtin_prefixes=False)
+        self.assertEqual(validator.prefix_database, {})
+        self.assertIsNone(validator.recognize_operator('501234567')['detailed_operator'])
+
+
+class TestBuildModule(unittest.TestCase):
+    """Test cases for generating and checking frozen modules"""
+
+    def setUp(self):
+        """Generate a module from a small CSV into a directory on sys.path"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.directory.name, 'custom.csv')
+        with open(self.csv_path, 'w', encoding='utf-8') as file:
+            file.write(CUSTOM_CSV)
+        self.module_path = os.path.join(self.directory.name, 'custom_prefixes.py')
+        self.assertEqual(build_module(self.csv_path, self.module_path), 6)
+        sys.path.insert(0, self.directory.name)
+
+    def tearDown(self):
+        sys.path.remove(self.directory.name)
+        sys.modules.pop('custom_prefixes', None)
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """Test that the generated module rebuilds the compiled index and database"""
+        validator = PolishMobileValidator(builtin_prefixes=False)
+        validator.load_frozen_prefixes('custom_prefixes')
+        from_csv = PolishMobileValidator(self.csv_path)
+        self.assertEqual(validator.prefix_database, from_csv.prefix_database)
+        self.assertEqual(validator.get_prefix_index().slots, from_csv.get_prefix_index().slots)
+        for number in ('501234567', '501234999', '501239999', '501999999', '502123456', '602123456'):
+            self.assertEqual(validator.find_detailed_operator(number), from_csv.find_detailed_operator(number))
+        self.assertEqual(validator.find_detailed_operator('501234567'), 'Operator B')
+
+    def test_rejects_other_versions(self):
+        """Test that a module from another format version or depth is refused"""
+        module = importlib.import_module('custom_prefixes')
+        module.FORMAT_VERSION = FORMAT_VERSION + 1
+        with self.assertRaises(FrozenModuleError):
+            frozen_index(module)
+        module.FORMAT_VERSION = FORMAT_VERSION
+        module.DEPTH = PrefixIndex.DEPTH + 1
+        with self.assertRaises(FrozenModuleError):
+            frozen_index(module)
+
+    def test_check_command(self):
+        """Test that check reports stale modules"""
+        self.assertEqual(main(['check', self.csv_path, self.module_path]), 0)
+        with open(self.csv_path, 'a', encoding='utf-8') as file:
+            file.write('+48603;Operator E\n')
+        self.assertEqual(main(['check', self.csv_path, self.module_path]), 1)
+        self.assertEqual(main(['check', self.csv_path, self.module_path + '.missing']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+"""
+Unit Tests for prefix table hot reloads and the CSV file watcher
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+from polish_mobile_validator import PolishMobileValidator
+from file_watcher import PrefixFileWatcher
+from prefix_table import content_hash
+
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
+HEADER = 'Prefix;Operator\n'
+
+
+class HotReloadTestCase(unittest.TestCase):
+    """Base class writing prefix CSVs to a temporary directory"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'prefixes.csv')
+        self.validator = PolishMobileValidator()
+
+    def tearDown(self):
+        """Remove temporary files"""
+        shutil.rmtree(self.directory)
+
+    def write(self, rows, mtime_ns=None):
+        """Write a prefix CSV, optionally forcing its modification time"""
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write(HEADER + ''.join(f'{prefix};{operator}\n' for prefix, operator in rows.items()))
+        if mtime_ns is not None:
+            os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+
+class TestReloadPrefixDatabase(HotReloadTestCase):
+    """Test cases for reload_prefix_database"""
+
+    def test_reload_replaces_and_versions(self):
+        """Test that reload replaces rather than merges, with a new version and hash"""
+        self.write({'501': 'A', '502': 'A'})
+        first = self.validator.reload_prefix_database(self.path)
+        self.write({'501': 'B'})
+        second = self.validator.reload_prefix_database(self.path)
+
+        self.assertEqual(self.validator.prefix_database, {'501': 'B'})
+        self.assertIsNone(self.validator.find_detailed_operator('502123456'))
+        self.assertEqual(self.validator.find_detailed_operator('501123456'), 'B')
+        self.assertGreater(second.version, first.version)
+        self.assertNotEqual(second.content_hash, first.content_hash)
+        self.assertIs(self.validator.prefix_table, second)
+        self.assertEqual(second.describe()['prefixes'], 1)
+        self.assertEqual(second.source, self.path)
+
+    def test_unchanged_content_is_not_republished(self):
+        """Test that reloading identical content keeps the current table"""
+        self.write({'501': 'A'})
+        first = self.validator.reload_prefix_database(self.path)
+        self.write({'501': 'A'})
+        self.assertIs(self.validator.reload_prefix_database(self.path), first)
+
+    def test_failed_reload_keeps_table(self):
+        """Test that a missing file raises and leaves the current table in place"""
+        self.write({'501': 'A'})
+        table = self.validator.reload_prefix_database(self.path)
+        with self.assertRaises(OSError):
+            self.validator.reload_prefix_database(os.path.join(self.directory, 'missing.csv'))
+        self.assertIs(self.validator.prefix_table, table)
+
+    def test_reload_clears_cache(self):
+        """Test that cached results from the old table are dropped"""
+        self.validator.enable_cache()
+        self.write({'501': 'A'})
+        self.validator.reload_prefix_database(self.path)
+        self.assertEqual(self.validator.recognize_operator('501123456')['detailed_operator'], 'A')
+        self.write({'501': 'B'})
+        self.validator.reload_prefix_database(self.path)
+        self.assertEqual(self.validator.recognize_operator('501123456')['detailed_operator'], 'B')
+
+    def test_readers_see_whole_tables(self):
+        """Test that concurrent lookups only ever see one complete table"""
+        tables = [{str(prefix): name for prefix in range(500, 520)} for name in ('A', 'B')]
+        paths = []
+        for index, rows in enumerate(tables):
+            self.path = os.path.join(self.directory, f'prefixes{index}.csv')
+            self.write(rows)
+            paths.append(self.path)
+        self.validator.reload_prefix_database(paths[0])
+
+        numbers = [f'{prefix}123456' for prefix in range(500, 520)]
+        seen = set()
+        failures = []
+        stop = threading.Event()
+
+        def reader():
+            while not stop.is_set():
+                table = self.validator.prefix_table
+                operators = {table.index.lookup(int(number)) for number in numbers}
+                if len(operators) != 1:
+                    failures.append(operators)
+                seen.update(operators)
+                for number in numbers:
+                    if self.validator.find_detailed_operator(number) not in ('A', 'B'):
+                        failures.append(number)
+
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for index in range(40):
+            self.validator.reload_prefix_database(paths[index % 2])
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(failures, [])
+        self.assertTrue(seen <= {'A', 'B'})
+
+    @unittest.skipUnless(os.path.exists(CSV_PATH), 'prefix CSV not available')
+    def test_snapshot_hash_matches_csv(self):
+        """Test that a snapshot and its source CSV report the same content hash"""
+        from snapshot import compile_snapshot
+
+        snapshot_path = os.path.join(self.directory, 'prefixes.snap')
+        compile_snapshot(CSV_PATH, snapshot_path)
+        from_csv = PolishMobileValidator()
+        table = from_csv.reload_prefix_database(CSV_PATH)
+        self.validator.load_snapshot(snapshot_path)
+        self.assertEqual(self.validator.prefix_table.content_hash, table.content_hash)
+        self.assertEqual(table.content_hash, content_hash(from_csv.prefix_database.items()))
+
+    def test_direct_edits_still_recompile(self):
+        """Test that editing prefix_database in place publishes a new version"""
+        self.write({'501': 'A'})
+        version = self.validator.reload_prefix_database(self.path).version
+        self.validator.prefix_database['5021'] = 'C'
+        self.assertEqual(self.validator.find_detailed_operator('502123456'), 'C')
+        self.assertGreater(self.validator.prefix_table.version, version)
+
+
+class TestPrefixFileWatcher(HotReloadTestCase):
+    """Test cases for PrefixFileWatcher"""
+
+    def test_reloads_after_change_settles(self):
+        """Test that a change is reloaded once the file stops changing"""
+        self.write({'501': 'A'}, mtime_ns=10 ** 18)
+        self.validator.reload_prefix_database(self.path)
+        reloaded = []
+        watcher = PrefixFileWatcher(self.validator, self.path, on_reload=reloaded.append)
+
+        self.assertIsNone(watcher.check())
+        self.write({'501': 'B'}, mtime_ns=10 ** 18 + 1)
+        self.assertIsNone(watcher.check())
+        table = watcher.check()
+        self.assertIsNotNone(table)
+        self.assertEqual(reloaded, [table])
+        self.assertEqual(self.validator.find_detailed_operator('501123456'), 'B')
+        self.assertIsNone(watcher.check())
+
+    def test_errors_keep_current_table(self):
+        """Test that an unreadable update is reported and not applied"""
+        self.write({'501': 'A'}, mtime_ns=10 ** 18)
+        table = self.validator.reload_prefix_database(self.path)
+        errors = []
+        watcher = PrefixFileWatcher(self.validator, self.path, encoding='ascii', on_error=errors.append)
+        with open(self.path, 'wb') as file:
+            file.write(HEADER.encode() + '501;Żabka\n'.encode('utf-8'))
+        os.utime(self.path, ns=(10 ** 18 + 1, 10 ** 18 + 1))
+        watcher.check()
+        watcher.check()
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(watcher.errors, 1)
+        self.assertIs(self.validator.prefix_table, table)
+
+    def test_background_thread(self):
+        """Test watching in a background thread"""
+        self.write({'501': 'A'}, mtime_ns=10 ** 18)
+        self.validator.reload_prefix_database(self.path)
+        reloaded = threading.Event()
+        watcher = self.validator.watch_prefix_database(self.path, interval=0.01,
+                                                       on_reload=lambda table: reloaded.set())
+        try:
+            self.write({'501': 'B'}, mtime_ns=10 ** 18 + 1)
+            self.assertTrue(reloaded.wait(5))
+        finally:
+            watcher.stop()
+        self.assertEqual(self.validator.find_detailed_operator('501123456'), 'B')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Unit Tests for recognize_operator instrumentation
+"""
+
+import unittest
+import os
+from polish_mobile_validator import PolishMobileValidator
+from instrumentation import Instrumentation, SlowSample, STAGES
+
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test cases for the Instrumentation collector"""
+
+    def test_keeps_slowest_calls(self):
+        """Test that only the slowest calls are kept, slowest first"""
+        collector = Instrumentation(keep_slowest=2)
+        for elapsed in (5, 50, 20, 1):
+            collector.record(str(elapsed), str(elapsed), {'normalize': elapsed}, elapsed)
+        stats = collector.stats()
+        self.assertEqual([sample['elapsed_ns'] for sample in stats['slowest']], [50, 20])
+        self.assertEqual(stats['calls'], 4)
+        self.assertEqual(stats['stages']['normalize'], {'calls': 4, 'total_ns': 76, 'mean_ns': 19.0})
+
+    def test_slow_hook_threshold(self):
+        """Test that the hook only sees calls at or above the threshold"""
+        samples = []
+        collector = Instrumentation(slow_hook=samples.append, slow_threshold_ns=100)
+        collector.record('a', 'a', {}, 99)
+        collector.record('b', 'b', {}, 100)
+        self.assertEqual(samples, [SlowSample('b', 'b', 100, {})])
+
+    def test_reset(self):
+        """Test that reset zeroes counters and samples"""
+        collector = Instrumentation()
+        collector.record('a', 'a', {'validate': 3}, 3, probes=1)
+        collector.reset()
+        stats = collector.stats()
+        self.assertEqual(stats['calls'], 0)
+        self.assertEqual(stats['probe_histogram'], {})
+        self.assertEqual(stats['slowest'], [])
+
+
+class TestValidatorInstrumentation(unittest.TestCase):
+    """Test cases for PolishMobileValidator instrumentation"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.validator = PolishMobileValidator(CSV_PATH if os.path.exists(CSV_PATH) else None)
+
+    def test_disabled_by_default(self):
+        """Test that instrumentation is opt-in"""
+        self.assertIsNone(self.validator.instrumentation_stats())
+
+    def test_results_unchanged(self):
+        """Test that instrumented calls return the same results"""
+        numbers = ['501234567', '+48 211 234 567', '991234567', '12345', '', '５０１２３４５６７']
+        expected = [self.validator.recognize_operator(number) for number in numbers]
+        self.validator.enable_instrumentation()
+        self.assertEqual([self.validator.recognize_operator(number) for number in numbers], expected)
+        self.validator.enable_cache()
+        self.assertEqual(self.validator.batch_validate(numbers + numbers), expected + expected)
+
+    def test_stage_counters(self):
+        """Test per-stage call counts and the probe histogram"""
+        self.validator.enable_instrumentation()
+        self.validator.batch_validate(['501234567', '531234567', '991234567'])
+        stats = self.validator.instrumentation_stats()
+        self.assertEqual(set(stats['stages']), set(STAGES))
+        self.assertEqual(stats['calls'], 3)
+        self.assertEqual(stats['stages']['normalize']['calls'], 3)
+        self.assertEqual(stats['stages']['validate']['calls'], 3)
+        self.assertEqual(stats['stages']['prefix_match']['calls'], 2)
+        self.assertEqual(stats['stages']['build_result']['calls'], 3)
+        self.assertEqual(stats['stages']['cache']['calls'], 0)
+        self.assertEqual(sum(stats['probe_histogram'].values()), 2)
+        self.assertGreater(stats['total_ns'], 0)
+
+    def test_cache_stage(self):
+        """Test that cache hits skip the later stages"""
+        self.validator.enable_cache()
+        self.validator.enable_instrumentation()
+        self.validator.recognize_operator('501234567')
+        result = self.validator.recognize_operator('+48 501 234 567')
+        self.assertEqual(result['phone_number'], '+48 501 234 567')
+        stats = self.validator.instrumentation_stats()
+        self.assertEqual(stats['cache_hits'], 1)
+        self.assertEqual(stats['stages']['cache']['calls'], 2)
+        self.assertEqual(stats['stages']['validate']['calls'], 1)
+
+    def test_slow_hook(self):
+        """Test that the slow hook receives the input and stage timings"""
+        samples = []
+        self.validator.enable_instrumentation(slow_hook=samples.append, slow_threshold_ns=0)
+        self.validator.recognize_operator('+48 501 234 567')
+        self.assertEqual(len(samples), 1)
+        self.assertEqual(samples[0].phone_number, '+48 501 234 567')
+        self.assertEqual(samples[0].normalized, '501234567')
+        self.assertIn('prefix_match', samples[0].stages)
+
+    def test_reset_and_disable(self):
+        """Test resetting and disabling instrumentation"""
+        self.validator.enable_instrumentation()
+        self.validator.recognize_operator('501234567')
+        self.validator.reset_instrumentation()
+        self.assertEqual(self.validator.instrumentation_stats()['calls'], 0)
+        self.validator.disable_instrumentation()
+        self.assertIsNone(self.validator.instrumentation_stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
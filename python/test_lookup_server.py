@@ -0,0 +1,261 @@
+"""
+Unit Tests for the asyncio lookup server
+"""
+
+import unittest
+import asyncio
+import contextlib
+import io
+import json
+import os
+import socket
+import tempfile
+from unittest import mock
+from polish_mobile_validator import PolishMobileValidator
+import lookup_server
+from lookup_server import MAX_BODY_BYTES, LookupServer, MicroBatcher, percentile
+
+
+async def read_http_response(reader):
+    """Read one HTTP response and return (status, headers, decoded JSON body)"""
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line == b'\r\n':
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers['content-length']))
+    return status, headers, json.loads(body)
+
+
+class TestMicroBatcher(unittest.TestCase):
+    """Test cases for request coalescing"""
+
+    def test_concurrent_requests_share_batches(self):
+        """Test that concurrent lookups are answered in order from few batches"""
+        async def scenario():
+            batcher = MicroBatcher(PolishMobileValidator(), max_batch_size=64)
+            batcher.start()
+            try:
+                numbers = ['501234567', '991234567', '+48 211 234 567'] * 50
+                results = await batcher.recognize_many(numbers)
+            finally:
+                await batcher.stop()
+            return numbers, results, batcher.stats.snapshot()
+
+        numbers, results, stats = asyncio.run(scenario())
+        validator = PolishMobileValidator()
+        self.assertEqual(results, [validator.recognize_operator(number) for number in numbers])
+        self.assertEqual(stats['requests'], 150)
+        self.assertLessEqual(stats['batches'], 4)
+        self.assertGreater(stats['p99_ms'], 0)
+
+    def test_failed_batch_does_not_stop_batcher(self):
+        """Test that a failing batch fails its lookups and later lookups are still answered"""
+        async def scenario():
+            validator = PolishMobileValidator()
+            batcher = MicroBatcher(validator)
+            batcher.start()
+            try:
+                with mock.patch.object(validator, 'batch_recognize', side_effect=RuntimeError('boom')):
+                    try:
+                        await asyncio.wait_for(batcher.recognize('501234567'), 5)
+                    except RuntimeError as error:
+                        failure = str(error)
+                return failure, await asyncio.wait_for(batcher.recognize('501234567'), 5)
+            finally:
+                await batcher.stop()
+
+        failure, result = asyncio.run(scenario())
+        self.assertEqual(failure, 'boom')
+        self.assertEqual(result['operator'], 'Orange')
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        samples = [float(value) for value in range(1, 101)]
+        self.assertEqual(percentile(samples, 50), 51.0)
+        self.assertEqual(percentile(samples, 99), 99.0)
+        self.assertEqual(percentile([], 99), 0.0)
+
+
+class TestLookupServer(unittest.TestCase):
+    """Test cases for the HTTP and Unix socket front ends"""
+
+    def run_with_server(self, client, **listen):
+        """Start a server, run the client coroutine against it and return its result"""
+        async def scenario():
+            server = LookupServer(PolishMobileValidator())
+            await server.start(**listen)
+            try:
+                return await client(server)
+            finally:
+                await server.close()
+        return asyncio.run(scenario())
+
+    def http(self, client):
+        async def connect(server):
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.http_port)
+            try:
+                return await client(reader, writer)
+            finally:
+                writer.close()
+        return self.run_with_server(connect, http_port=0)
+
+    def test_http_get(self):
+        """Test recognition through a query parameter"""
+        async def client(reader, writer):
+            writer.write(b'GET /recognize?number=%2B48501234567 HTTP/1.1\r\nHost: x\r\n\r\n')
+            return await read_http_response(reader)
+
+        status, headers, body = self.http(client)
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['connection'], 'keep-alive')
+        self.assertTrue(body['success'])
+        self.assertEqual(body['operator'], 'Orange')
+        self.assertEqual(body['phone_number'], '+48501234567')
+
+    def test_http_post_batch(self):
+        """Test recognition of a JSON list of numbers"""
+        async def client(reader, writer):
+            payload = json.dumps({'numbers': ['531234567', '991234567']}).encode()
+            writer.write(b'POST /recognize HTTP/1.1\r\nContent-Length: %d\r\n\r\n' % len(payload) + payload)
+            return await read_http_response(reader)
+
+        status, _, body = self.http(client)
+        self.assertEqual(status, 200)
+        self.assertEqual([result['success'] for result in body['results']], [True, False])
+        self.assertEqual(body['results'][0]['operator'], 'Play')
+
+    def test_http_pipelining(self):
+        """Test that pipelined requests on one connection are answered in order"""
+        async def client(reader, writer):
+            writer.write(
+                b'GET /recognize?number=501234567 HTTP/1.1\r\n\r\n'
+                b'GET /recognize?number=211234567 HTTP/1.1\r\n\r\n'
+            )
+            responses = [await read_http_response(reader) for _ in range(2)]
+            writer.write(b'GET /stats HTTP/1.1\r\nConnection: close\r\n\r\n')
+            responses.append(await read_http_response(reader))
+            return responses, await reader.read()
+
+        responses, remainder = self.http(client)
+        self.assertEqual(responses[0][2]['operator'], 'Orange')
+        self.assertTrue(responses[1][2]['is_m2m'])
+        self.assertEqual(responses[2][1]['connection'], 'close')
+        self.assertEqual(responses[2][2]['requests'], 2)
+        self.assertIn('p50_ms', responses[2][2])
+        self.assertIn('qps', responses[2][2])
+        self.assertEqual(remainder, b'')
+
+    def test_http_errors(self):
+        """Test error statuses"""
+        async def client(reader, writer):
+            writer.write(
+                b'GET /missing HTTP/1.1\r\n\r\n'
+                b'GET /recognize HTTP/1.1\r\n\r\n'
+                b'POST /recognize HTTP/1.1\r\nContent-Length: 3\r\n\r\nnot'
+                b'DELETE /recognize HTTP/1.1\r\n\r\n'
+            )
+            return [(await read_http_response(reader))[0] for _ in range(4)]
+
+        self.assertEqual(self.http(client), [404, 400, 400, 405])
+
+    def test_http_invalid_body_framing(self):
+        """Test that bad Content-Length and chunked bodies get an error and close the connection"""
+        requests = [
+            (b'POST /recognize HTTP/1.1\r\nContent-Length: abc\r\n\r\n', 400),
+            (b'POST /recognize HTTP/1.1\r\nContent-Length: -5\r\n\r\n', 400),
+            (b'POST /recognize HTTP/1.1\r\nContent-Length: %d\r\n\r\n' % (MAX_BODY_BYTES + 1), 413),
+            (b'POST /recognize HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n'
+             b'5\r\nhello\r\n0\r\n\r\nGET /health HTTP/1.1\r\n\r\n', 501),
+        ]
+        for request, expected in requests:
+            async def client(reader, writer):
+                writer.write(request)
+                response = await read_http_response(reader)
+                return response, await reader.read()
+
+            (status, headers, _), remainder = self.http(client)
+            self.assertEqual(status, expected)
+            self.assertEqual(headers['connection'], 'close')
+            self.assertEqual(remainder, b'')
+
+    def test_http_lookup_failure(self):
+        """Test that a failed lookup is a 500 and the connection keeps serving"""
+        async def client(server):
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.http_port)
+            with mock.patch.object(server.batcher.validator, 'batch_recognize', side_effect=RuntimeError):
+                writer.write(b'GET /recognize?number=501234567 HTTP/1.1\r\n\r\n')
+                failed = await read_http_response(reader)
+            writer.write(b'GET /recognize?number=501234567 HTTP/1.1\r\n\r\n')
+            answered = await read_http_response(reader)
+            writer.close()
+            return failed, answered
+
+        (status, _, body), (retry_status, _, result) = self.run_with_server(client, http_port=0)
+        self.assertEqual((status, body), (500, {'error': 'Lookup failed'}))
+        self.assertEqual((retry_status, result['operator']), (200, 'Orange'))
+
+    def test_http_overlong_request_line(self):
+        """Test that a request line over the reader limit closes only that connection"""
+        async def client(server):
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.http_port)
+            writer.write(b'GET /' + b'a' * (1 << 17) + b' HTTP/1.1\r\n\r\n')
+            try:
+                remainder = await asyncio.wait_for(reader.read(), 5)
+            except ConnectionResetError:
+                remainder = b''  # closed with the rest of the line unread
+            writer.close()
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.http_port)
+            writer.write(b'GET /health HTTP/1.1\r\n\r\n')
+            status = (await read_http_response(reader))[0]
+            writer.close()
+            return remainder, status
+
+        self.assertEqual(self.run_with_server(client, http_port=0), (b'', 200))
+
+    def test_http_10_closes(self):
+        """Test that HTTP/1.0 requests close the connection by default"""
+        async def client(reader, writer):
+            writer.write(b'GET /health HTTP/1.0\r\n\r\n')
+            response = await read_http_response(reader)
+            return response, await reader.read()
+
+        (status, headers, body), remainder = self.http(client)
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['connection'], 'close')
+        self.assertEqual(body, {'status': 'ok'})
+        self.assertEqual(remainder, b'')
+
+    def test_main_missing_database(self):
+        """Test that an explicitly given database that does not exist is an error"""
+        with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stderr(io.StringIO()):
+            missing = os.path.join(directory, 'missing.csv')
+            self.assertEqual(lookup_server.main(['--http', '127.0.0.1:0', '--database', missing]), 2)
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'Unix sockets not available')
+    def test_unix_socket_lines(self):
+        """Test the line protocol over a Unix socket"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'lookup.sock')
+
+            async def client(server):
+                reader, writer = await asyncio.open_unix_connection(path)
+                writer.write(b'501234567\n991234567\n')
+                lines = [json.loads(await reader.readline()) for _ in range(2)]
+                writer.write(b'STATS\n')
+                lines.append(json.loads(await reader.readline()))
+                writer.close()
+                return lines
+
+            lines = self.run_with_server(client, unix_path=path)
+
+        self.assertEqual(lines[0]['operator'], 'Orange')
+        self.assertFalse(lines[1]['success'])
+        self.assertEqual(lines[2]['requests'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Unit Tests for the normalization engine
+"""
+
+import unittest
+import random
+from polish_mobile_validator import PolishMobileValidator
+from normalization import normalize, normalize_buffer, normalize_many, normalize_reference
+
+
+class TestNormalize(unittest.TestCase):
+    """Test cases for single-number normalization"""
+
+    def test_matches_reference_on_messy_inputs(self):
+        """Test random messy inputs against the regular expression implementation"""
+        rng = random.Random(11)
+        alphabet = '0123456789 +-()./#abc\t٤٥６²'
+        samples = ['', '48', '4812345678', '48123456789', '0048501234567', '+48 (501) 234-567']
+        samples += [''.join(rng.choice(alphabet) for _ in range(rng.randrange(1, 16))) for _ in range(5000)]
+        for sample in samples:
+            self.assertEqual(normalize(sample), normalize_reference(sample), repr(sample))
+
+    def test_clean_number_is_returned_unchanged(self):
+        """Test the early exit for clean 9-digit strings"""
+        number = '501234567'
+        self.assertIs(normalize(number), number)
+
+    def test_non_string_input(self):
+        """Test integers and None"""
+        self.assertEqual(normalize(48501234567), '501234567')
+        self.assertEqual(normalize(None), '')
+
+    def test_unicode_digits_keep_regex_semantics(self):
+        """Test that non-ASCII decimal digits are kept like re's \\d"""
+        self.assertEqual(normalize('50١234567'), '50١234567')
+        self.assertEqual(normalize('501²234567'), '501234567')
+
+
+class TestBulkNormalize(unittest.TestCase):
+    """Test cases for bulk normalization"""
+
+    def test_normalize_many_list(self):
+        """Test normalizing a list"""
+        self.assertEqual(
+            normalize_many(['+48 501 234 567', '48-211-234-567', '(601) 234 567', '']),
+            ['501234567', '211234567', '601234567', '']
+        )
+
+    def test_normalize_buffer(self):
+        """Test normalizing a newline-separated buffer with CRLF and blank lines"""
+        data = b'+48 501 234 567\r\n\n(601) 234-567\n48211234567\n4850123456'
+        self.assertEqual(normalize_buffer(data), ['501234567', '', '601234567', '211234567', '50123456'])
+
+    def test_normalize_buffer_trailing_newline(self):
+        """Test that a trailing newline does not add an entry"""
+        self.assertEqual(normalize_buffer(bytearray(b'501234567\n')), ['501234567'])
+        self.assertEqual(normalize_buffer(b''), [])
+
+    def test_buffer_matches_list(self):
+        """Test that buffer and list normalization agree on ASCII input"""
+        rng = random.Random(3)
+        numbers = [''.join(rng.choice('0123456789 +-()') for _ in range(rng.randrange(0, 16)))
+                   for _ in range(2000)]
+        data = '\n'.join(numbers).encode('ascii') + b'\n'
+        self.assertEqual(normalize_buffer(data), normalize_many(numbers))
+
+    def test_validator_bulk_method(self):
+        """Test PolishMobileValidator.normalize_phone_numbers"""
+        validator = PolishMobileValidator()
+        self.assertEqual(validator.normalize_phone_numbers(b'501-234-567\n'), ['501234567'])
+        self.assertEqual(validator.normalize_phone_numbers(['+48501234567']), ['501234567'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,121 @@
+"""
+Unit Tests for multi-country numbering plans
+"""
+
+import unittest
+import os
+import random
+import tempfile
+from polish_mobile_validator import PolishMobileValidator
+from numbering_plan import NumberingPlan, NumberingPlanEngine
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
+CZECH_CSV = (
+    'Prefix;Operator Name\n'
+    '+42060;T-Mobile Czech Republic a.s.\n'
+    '+420601;O2 Czech Republic a.s.\n'
+    '+42072;O2 Czech Republic a.s.\n'
+    '+42077;Vodafone Czech Republic a.s.\n'
+)
+
+
+class TestNumberingPlanEngine(unittest.TestCase):
+    """Test cases for country dispatch and the shared plan table"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Compile Poland from the prefix database with a Czech plan from the same CSV layout and a German one"""
+        cls.validator = PolishMobileValidator(CSV_PATH) if os.path.exists(CSV_PATH) else PolishMobileValidator()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cz.csv')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(CZECH_CSV)
+            czechia = NumberingPlan.from_csv(path, '420', 9, region='CZ')
+        germany = NumberingPlan('49', (10, 11), {'151': 'Telekom', '176': 'O2'}, m2m_prefixes=['1760'],
+                                region='DE')
+        cls.engine = NumberingPlanEngine([cls.validator.numbering_plan(), czechia, germany])
+        cls.mixed = ['501234567', '+48 501 234 567', '0048 212 345 678', '+420 601 123 456', '00420777123456',
+                     '+49 151 1234 5678', '+49 1760 123456', '+420 123 456 789', '+4915', '+1 212 555 0100',
+                     '', None, 'ł', '+48 ５０１ ２３４ ５６７', 48501234567]
+
+    def test_dispatch_by_country(self):
+        """Test that numbers reach the plan of their country code"""
+        czech = self.engine.recognize_operator('+420 601 123 456')
+        self.assertTrue(czech['success'])
+        self.assertEqual((czech['country_code'], czech['region'], czech['normalized']), ('420', 'CZ', '601123456'))
+        # The longest prefix wins: 601 over 60
+        self.assertEqual(czech['detailed_operator'], 'O2 Czech Republic a.s.')
+        self.assertEqual(self.engine.recognize_operator('00420 60 2123456')['detailed_operator'],
+                         'T-Mobile Czech Republic a.s.')
+
+        german = self.engine.recognize_operator('+49 1760 123456')
+        self.assertEqual((german['e164'], german['operator'], german['is_m2m']), ('+491760123456', 'O2', True))
+        self.assertTrue(self.engine.recognize_operator('+49 151 1234 5678')['success'])
+
+        self.assertEqual(self.engine.recognize_operator('+1 212 555 0100')['message'], 'Unknown country code')
+        self.assertFalse(self.engine.recognize_operator('+420 123 456 789')['success'])
+        self.assertIn('10 or 11', self.engine.recognize_operator('+4915')['message'])
+
+    def test_poland_matches_validator(self):
+        """Test that the Polish plan agrees with PolishMobileValidator"""
+        rng = random.Random(5)
+        numbers = []
+        for _ in range(3000):
+            digits = str(rng.randrange(10 ** 8, 10 ** 9))
+            numbers += [digits, f'+48 {digits[:3]} {digits[3:6]} {digits[6:]}', '48' + digits, digits[:7]]
+        fields = ('normalized', 'prefix', 'operator', 'detailed_operator', 'is_m2m', 'message')
+        for number in numbers:
+            expected = self.validator.recognize_operator(number)
+            result = self.engine.recognize_operator(number)
+            self.assertEqual(result['success'], expected['success'], number)
+            if expected['success']:
+                self.assertEqual([result[field] for field in fields], [expected[field] for field in fields])
+
+    def test_overlapping_country_codes_rejected(self):
+        """Test that country codes must be prefix-free"""
+        with self.assertRaises(ValueError):
+            NumberingPlanEngine([NumberingPlan('4', 9), NumberingPlan('48', 9)])
+        with self.assertRaises(ValueError):
+            NumberingPlan('4800', 9)
+        with self.assertRaises(ValueError):
+            NumberingPlanEngine([NumberingPlan('48', 9)], default_country='420')
+
+    def test_shared_operator_names(self):
+        """Test that plans share one operator name table"""
+        engine = NumberingPlanEngine([NumberingPlan('420', 9, {'60': 'Vodafone'}),
+                                      NumberingPlan('421', 9, {'90': 'Vodafone'})])
+        self.assertEqual(engine.operator_names, (None, 'Vodafone'))
+        self.assertEqual(engine.recognize_operator('+421 901 234 567')['operator'], 'Vodafone')
+
+    @unittest.skipUnless(np is not None, 'NumPy is not installed')
+    def test_batch_classify_matches_scalar(self):
+        """Test that vectorized mixed-country classification equals recognize_operator"""
+        batch = self.engine.batch_classify(self.mixed)
+        for position, number in enumerate(self.mixed):
+            expected = self.engine.recognize_operator(number)
+            self.assertEqual(bool(batch.valid[position]), expected['success'], number)
+            if expected['success']:
+                self.assertEqual(batch.country_labels()[position], expected['country_code'])
+                self.assertEqual('+' + str(batch.e164[position]), expected['e164'])
+                self.assertEqual(str(batch.national[position]), expected['normalized'])
+                self.assertEqual(batch.operator_labels()[position], expected['operator'])
+                self.assertEqual(batch.detailed_operator_labels()[position], expected['detailed_operator'])
+                self.assertEqual(bool(batch.is_m2m[position]), expected['is_m2m'])
+
+    @unittest.skipUnless(np is not None, 'NumPy is not installed')
+    def test_batch_classify_integers(self):
+        """Test integer input of national and E.164 numbers"""
+        numbers = np.array([501234567, 48501234567, 420601123456, 4915112345678, 5, -1], dtype=np.int64)
+        batch = self.engine.batch_classify(numbers)
+        self.assertEqual(batch.valid.tolist(), [True, True, True, True, False, False])
+        self.assertEqual(batch.country_labels().tolist(), ['48', '48', '420', '49', None, None])
+
+
+if __name__ == '__main__':
+    unittest.main()
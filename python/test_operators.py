@@ -0,0 +1,138 @@
+"""
+Unit Tests for the operator registry and ID-based batch results
+"""
+
+import unittest
+import os
+import random
+from polish_mobile_validator import PolishMobileValidator
+from operators import NO_OPERATOR, OperatorRegistry, canonical_operator_name, operator_brand
+from results import RecognitionStatus
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
+
+
+class TestCanonicalNames(unittest.TestCase):
+    """Test cases for name repair and brands"""
+
+    def test_repairs_csv_damage(self):
+        """Test spacing, legal form and lost Polish letters"""
+        self.assertEqual(canonical_operator_name('P4 Sp. z\xa0o.o. (Sie? komórkowa Play)'),
+                         'P4 Sp. z o.o. (Sieć komórkowa Play)')
+        self.assertEqual(canonical_operator_name('Pomagacz Sp. Z o.o.'), 'Pomagacz Sp. z o.o.')
+        self.assertEqual(canonical_operator_name('VikingCo Poland Sp. z\xa0o. o.'), 'VikingCo Poland Sp. z o.o.')
+        self.assertEqual(canonical_operator_name('CARITAS ??CZY Sp. z\xa0o.o.'), 'CARITAS ŁĄCZY Sp. z o.o.')
+        self.assertEqual(canonical_operator_name('Politechnika ?ódzka'), 'Politechnika Łódzka')
+
+    def test_brands(self):
+        """Test network brands and company names without legal form"""
+        self.assertEqual(operator_brand('P4 Sp. z o.o. (Sieć komórkowa Play)'), 'Play')
+        self.assertEqual(operator_brand('T-MOBILE POLSKA S.A. (Sieć komórkowa T-Mobile)'), 'T-Mobile')
+        self.assertEqual(operator_brand('Lycamobile Sp. z o.o.'), 'Lycamobile')
+        self.assertEqual(operator_brand('Vonage B.V.'), 'Vonage')
+
+
+class TestOperatorRegistry(unittest.TestCase):
+    """Test cases for OperatorRegistry"""
+
+    def setUp(self):
+        """Set up a small database with two spellings of one operator"""
+        self.database = {
+            '500': 'Orange Polska S.A. (Sie? komórkowa Orange)',
+            '5010': 'Pomagacz Sp. Z o.o.',
+            '5011': 'Pomagacz Sp. z\xa0o.o.',
+            '212': 'Move Telecom S.A.',
+            '6900': 'Move Telecom S.A.',
+        }
+        self.registry = OperatorRegistry(self.database)
+
+    def test_spellings_share_an_id(self):
+        """Test that raw spellings resolve to one canonical operator"""
+        op_id = self.registry.id_of('Pomagacz Sp. Z o.o.')
+        self.assertEqual(op_id, self.registry.id_of('Pomagacz Sp. z\xa0o.o.'))
+        self.assertEqual(op_id, self.registry.id_of('Pomagacz Sp. z o.o.'))
+        self.assertEqual(len(self.registry), 3)
+        self.assertEqual(set(self.registry[op_id].aliases), {'Pomagacz Sp. Z o.o.', 'Pomagacz Sp. z\xa0o.o.'})
+
+    def test_ids_are_ordered_by_name(self):
+        """Test that IDs do not depend on database order"""
+        reversed_registry = OperatorRegistry(dict(reversed(list(self.database.items()))))
+        self.assertEqual(reversed_registry.names, self.registry.names)
+        self.assertEqual(self.registry.names[NO_OPERATOR], None)
+        self.assertEqual([info.id for info in self.registry], [1, 2, 3])
+
+    def test_info(self):
+        """Test brand and M2M flag"""
+        orange = self.registry[self.registry.id_of('Orange Polska S.A. (Sie? komórkowa Orange)')]
+        self.assertEqual((orange.name, orange.brand, orange.is_m2m),
+                         ('Orange Polska S.A. (Sieć komórkowa Orange)', 'Orange', False))
+        self.assertTrue(self.registry[self.registry.id_of('Move Telecom S.A.')].is_m2m)
+
+    def test_unknown_names(self):
+        """Test lookups and registration of names outside the database"""
+        self.assertEqual(self.registry.id_of(None), NO_OPERATOR)
+        with self.assertRaises(KeyError):
+            self.registry.id_of('New Operator')
+        with self.assertRaises(KeyError):
+            self.registry[NO_OPERATOR]
+        op_id = self.registry.intern('New Operator')
+        self.assertEqual(op_id, 4)
+        self.assertEqual(self.registry.intern('New Operator'), op_id)
+        self.assertEqual(self.registry.name(op_id), 'New Operator')
+        self.assertEqual(list(self.registry.translate([None, 'Pomagacz Sp. Z o.o.'])),
+                         [NO_OPERATOR, self.registry.id_of('Pomagacz Sp. z o.o.')])
+
+
+class TestBatchRecognizeIds(unittest.TestCase):
+    """Test cases for PolishMobileValidator.batch_recognize_ids"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the prefix database and build a mixed input"""
+        cls.validator = PolishMobileValidator(CSV_PATH) if os.path.exists(CSV_PATH) else PolishMobileValidator()
+        rng = random.Random(11)
+        cls.numbers = [str(rng.randrange(10 ** 8, 10 ** 9)) for _ in range(3000)]
+        cls.numbers += ['+48 211 234 567', '(501) 234-567', '012345678', '12345', '', None, 48691234567,
+                        '５０１２３４５６７']
+
+    def test_matches_batch_recognize(self):
+        """Test that each position equals recognize with the canonical detailed operator"""
+        batch = self.validator.batch_recognize_ids(self.numbers)
+        self.assertEqual(len(batch), len(self.numbers))
+        for result, number in zip(batch, self.numbers):
+            expected = self.validator.recognize(number).to_dict()
+            if expected.get('detailed_operator') is not None:
+                expected['detailed_operator'] = canonical_operator_name(expected['detailed_operator'])
+            self.assertEqual(result.to_dict(), expected)
+
+    def test_columns(self):
+        """Test the integer columns and on-demand operator info"""
+        batch = self.validator.batch_recognize_ids(['501234567', '991234567', '012345678'])
+        self.assertEqual(list(batch.status), [RecognitionStatus.VALID, RecognitionStatus.INVALID_PREFIX,
+                                              RecognitionStatus.INVALID_PREFIX])
+        self.assertEqual(list(batch.normalized), [501234567, 991234567, -1])
+        self.assertEqual(batch.normalized_number(2), '012345678')
+        self.assertEqual(batch.operator_names[batch.operator[0]], 'Orange')
+        self.assertIsNone(batch.operator_info(1))
+        self.assertEqual(batch.nbytes, 3 * 12)
+        registry = self.validator.operator_registry()
+        if self.validator.prefix_database:
+            self.assertEqual(batch.operator_id[0], registry.id_of(self.validator.find_detailed_operator('501234567')))
+
+    @unittest.skipUnless(np is not None, 'NumPy is not installed')
+    def test_batch_classify_ids(self):
+        """Test that vectorized codes re-key to the same registry IDs"""
+        numbers = self.numbers[:3000]
+        registry = self.validator.operator_registry()
+        ids = self.validator.batch_classify(np.array(numbers, dtype='S9')).operator_ids(registry)
+        self.assertEqual(ids.tolist(), list(self.validator.batch_recognize_ids(numbers).operator_id))
+
+
+if __name__ == '__main__':
+    unittest.main()
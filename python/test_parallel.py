@@ -0,0 +1,92 @@
+"""
+Unit Tests for parallel batch validation
+"""
+
+import unittest
+import os
+import random
+import tempfile
+from polish_mobile_validator import PolishMobileValidator
+from parallel import ParallelValidatorPool
+from portability import PortabilityOverlay
+from prefix_index import PrefixIndex
+
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
+
+
+class TestParallelBatchValidate(unittest.TestCase):
+    """Test cases for multi-process batch validation"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build a mixed batch of valid, formatted and invalid numbers"""
+        rng = random.Random(7)
+        cls.numbers = [str(rng.randrange(2 * 10 ** 8, 9 * 10 ** 8)) for _ in range(2000)]
+        cls.numbers += ['+48 501 234 567', '(601) 234-567', '991234567', '12345', '']
+
+    def test_matches_batch_validate_with_csv(self):
+        """Test that parallel results equal batch_validate in input order"""
+        validator = PolishMobileValidator(CSV_PATH) if os.path.exists(CSV_PATH) else PolishMobileValidator()
+        results = validator.parallel_batch_validate(self.numbers, workers=2, chunk_size=300)
+        self.assertEqual(results, validator.batch_validate(self.numbers))
+
+    def test_without_database(self):
+        """Test parallel validation when no prefix database is loaded"""
+        validator = PolishMobileValidator()
+        results = validator.parallel_batch_validate(self.numbers[:50], workers=1, chunk_size=7)
+        self.assertEqual(results, validator.batch_validate(self.numbers[:50]))
+
+    def test_pool_reuse(self):
+        """Test that one pool can validate several batches"""
+        validator = PolishMobileValidator()
+        with ParallelValidatorPool(validator, workers=2, chunk_size=2) as pool:
+            self.assertEqual(pool.batch_validate([]), [])
+            first = pool.batch_validate(['501234567', '211234567', '991234567'])
+            second = pool.batch_validate(['881234567'])
+        self.assertEqual([r['success'] for r in first], [True, True, False])
+        self.assertEqual(second[0]['operator'], 'T-Mobile')
+
+    def test_submit(self):
+        """Test that submitted functions run with the worker's validator"""
+        validator = PolishMobileValidator(CSV_PATH) if os.path.exists(CSV_PATH) else PolishMobileValidator()
+        with ParallelValidatorPool(validator, workers=1) as pool:
+            future = pool.submit(PolishMobileValidator.recognize_operator, '+48 501 234 567')
+            self.assertEqual(future.result(), validator.recognize_operator('+48 501 234 567'))
+
+    def test_portability_overlay(self):
+        """Test that workers consult the overlay, mapped from its file or pickled"""
+        validator = PolishMobileValidator()
+        validator.prefix_database = {'501': 'Orange Polska S.A.'}
+        numbers = ['501234567', '501234568', '601234567']
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ported.port')
+            PortabilityOverlay.from_rows([(501234567, 'P4 Sp. z o.o.'), (601234567, 'Plus')]).save(path)
+            for overlay in (PortabilityOverlay.load(path), PortabilityOverlay.from_rows([(501234568, 'Plus')])):
+                validator.attach_portability(overlay)
+                results = validator.parallel_batch_validate(numbers, workers=1, chunk_size=2)
+                self.assertEqual(results, validator.batch_validate(numbers))
+            validator.attach_portability(None)
+        self.assertEqual(results[1]['detailed_operator'], 'Plus')
+
+    def test_invalid_chunk_size(self):
+        """Test that a non-positive chunk size is rejected"""
+        with self.assertRaises(ValueError):
+            ParallelValidatorPool(PolishMobileValidator(), chunk_size=0)
+
+
+class TestPrefixIndexFromBuffer(unittest.TestCase):
+    """Test cases for attaching a prefix index to an external buffer"""
+
+    def test_round_trip(self):
+        """Test that an attached index answers like the original"""
+        index = PrefixIndex({'50': 'A', '5012': 'B', '5012345': 'C'})
+        buffer = bytearray(memoryview(index.slots).cast('B'))
+        attached = PrefixIndex.from_buffer(buffer, index.export_metadata())
+        for number in (501234567, 501299999, 509999999, 601234567):
+            self.assertEqual(attached.lookup(number), index.lookup(number))
+        self.assertEqual(len(attached), len(index))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -253,6 +253,12 @@ class TestPolishMobileValidator(unittest.TestCase):
         if self.validator_with_csv != self.validator:
             self.assertGreater(len(self.validator_with_csv.prefix_database), 0)
 
+    def test_csv_operator_names_decoded(self):
+        """Test that Windows-1250 operator names are decoded instead of dropped"""
+        if self.validator_with_csv != self.validator:
+            result = self.validator_with_csv.recognize_operator('500123456')
+            self.assertIn('komórkowa', result['detailed_operator'])
+
     def test_recognize_with_csv_database(self):
         """Test operator recognition with CSV database"""
         result = self.validator_with_csv.recognize_operator('500123456')
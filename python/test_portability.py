@@ -0,0 +1,222 @@
+"""
+Unit Tests for the number-portability overlay
+"""
+
+import unittest
+import os
+import random
+import tempfile
+from polish_mobile_validator import PolishMobileValidator
+from portability import PortabilityError, PortabilityOverlay, iter_portability_rows, main
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TestPortabilityOverlay(unittest.TestCase):
+    """Test cases for building, updating and persisting overlays"""
+
+    def setUp(self):
+        """Set up a scratch directory"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'ported.port')
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        self.directory.cleanup()
+
+    def write(self, name, text, encoding='utf-8'):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding=encoding) as file:
+            file.write(text)
+        return path
+
+    def test_iter_portability_rows(self):
+        """Test parsing numbers, removals, headers and Windows-1250 names"""
+        path = self.write('delta.csv', 'Number;Operator\n+48 501 234 567;Żabka\n601234567;-\n'
+                          '48721234567;\n12345;Play\n\n', encoding='cp1250')
+        self.assertEqual(list(iter_portability_rows(path)),
+                         [(501234567, 'Żabka'), (601234567, None), (721234567, None)])
+
+    def test_lookup(self):
+        """Test lookups, duplicate rows and ignored removals"""
+        overlay = PortabilityOverlay.from_rows([(601234567, 'Play'), (501234567, 'Orange'),
+                                                (601234567, 'Plus'), (881234567, None)])
+        self.assertEqual(len(overlay), 2)
+        self.assertEqual(list(overlay.numbers), [501234567, 601234567])
+        self.assertEqual(overlay.lookup(601234567), 'Plus')
+        self.assertIsNone(overlay.lookup(881234567))
+        self.assertIsNone(overlay.lookup(0))
+        self.assertIsNone(overlay.lookup(999999999))
+        self.assertIn(501234567, overlay)
+        self.assertEqual(overlay.counts_by_operator(), {'Orange': 1, 'Plus': 1})
+
+    def test_from_rows_matches_dictionary(self):
+        """Test a full build with repeated numbers and removals against a plain dictionary"""
+        rng = random.Random(4)
+        rows = [(rng.choice((rng.randrange(10 ** 9), 500000000 + rng.randrange(50))),
+                 rng.choice(('Play', 'Orange', 'Plus', None))) for _ in range(5000)]
+        expected = {}
+        for number, operator in rows:
+            if operator is None:
+                expected.pop(number, None)
+            else:
+                expected[number] = operator
+        overlay = PortabilityOverlay.from_rows(iter(rows))
+        self.assertEqual(list(overlay.numbers), sorted(expected))
+        self.assertEqual([overlay.lookup(number) for number in sorted(expected)],
+                         [expected[number] for number in sorted(expected)])
+
+    def test_apply_delta_matches_dictionary(self):
+        """Test incremental updates against a plain dictionary"""
+        rng = random.Random(3)
+        operators = ['Play', 'Orange', 'Plus', 'T-Mobile']
+        expected = {rng.randrange(10 ** 9): rng.choice(operators) for _ in range(2000)}
+        overlay = PortabilityOverlay.from_rows(expected.items())
+        for _ in range(5):
+            delta = [(number, None) for number in rng.sample(sorted(expected), 100)]
+            delta += [(rng.randrange(10 ** 9), rng.choice(operators + ['MVNO'])) for _ in range(100)]
+            delta += [(rng.choice(sorted(expected)), 'Play') for _ in range(100)]
+            updated = overlay.apply_delta(delta)
+            self.assertEqual(len(overlay), len(expected))
+            for number, operator in delta:
+                if operator is None:
+                    expected.pop(number, None)
+                else:
+                    expected[number] = operator
+            overlay = updated
+            self.assertEqual(list(overlay.numbers), sorted(expected))
+            self.assertEqual([overlay.lookup(number) for number in sorted(expected)],
+                             [expected[number] for number in sorted(expected)])
+
+    def test_invalid_rows(self):
+        """Test rejecting out-of-range numbers and too many operators"""
+        with self.assertRaises(PortabilityError):
+            PortabilityOverlay.from_rows([(10 ** 9, 'Play')])
+        with self.assertRaises(PortabilityError):
+            PortabilityOverlay.from_rows((500000000 + i, f'Operator {i}') for i in range(256))
+
+    def test_save_and_load(self):
+        """Test the memory-mapped round trip at 5 bytes per number"""
+        overlay = PortabilityOverlay.from_rows((500000000 + 7 * i, ('Play', 'Żabka')[i % 2]) for i in range(1000))
+        overlay.save(self.path)
+        header = os.path.getsize(self.path) - 5 * len(overlay)
+        self.assertLess(header, 64)
+
+        loaded = PortabilityOverlay.load(self.path)
+        self.assertEqual(loaded.path, self.path)
+        self.assertEqual(loaded.operators, overlay.operators)
+        self.assertEqual(list(loaded.numbers), list(overlay.numbers))
+        self.assertEqual(loaded.lookup(500000007), 'Żabka')
+        self.assertIsNone(loaded.lookup(500000001))
+        refreshed = loaded.apply_delta([(500000001, 'Plus')])
+        loaded.close()
+        self.assertEqual(refreshed.lookup(500000001), 'Plus')
+
+    def test_load_rejects_bad_files(self):
+        """Test corrupted, truncated and foreign files"""
+        PortabilityOverlay.from_rows([(501234567, 'Play')]).save(self.path)
+        with open(self.path, 'r+b') as file:
+            file.seek(-1, os.SEEK_END)
+            file.write(b'\x07')
+        with self.assertRaises(PortabilityError):
+            PortabilityOverlay.load(self.path)
+        PortabilityOverlay.load(self.path, verify=False).close()
+
+        with open(self.path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.path) - 1)
+        with self.assertRaises(PortabilityError):
+            PortabilityOverlay.load(self.path, verify=False)
+        with self.assertRaises(PortabilityError):
+            PortabilityOverlay.load(self.write('other.port', 'not an overlay at all, not at all'))
+
+    def test_command_line(self):
+        """Test build and apply from the command line"""
+        source = self.write('ported.csv', 'Number;Operator\n501234567;Play\n601234567;Orange\n')
+        delta = self.write('delta.csv', '601234567;\n721234567;Plus\n')
+        self.assertEqual(main(['build', source, self.path]), 0)
+        self.assertEqual(main(['apply', self.path, delta]), 0)
+        overlay = PortabilityOverlay.load(self.path)
+        self.assertEqual(list(overlay.numbers), [501234567, 721234567])
+        overlay.close()
+
+
+class TestValidatorPortability(unittest.TestCase):
+    """Test cases for consulting the overlay in the validator"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.validator = PolishMobileValidator()
+        self.validator.prefix_database = {'501': 'Orange Polska S.A.', '721': 'P4 Sp. z o.o.'}
+        self.validator.attach_portability(PortabilityOverlay.from_rows(
+            [(501234567, 'P4 Sp. z o.o.'), (721234567, 'MVNO'), (991234567, 'Play')]))
+
+    def test_recognize_operator(self):
+        """Test that ported numbers report their current operator"""
+        result = self.validator.recognize_operator('+48 501 234 567')
+        self.assertEqual(result['detailed_operator'], 'P4 Sp. z o.o.')
+        self.assertEqual(result['operator'], 'Orange')
+        self.assertEqual(self.validator.recognize_operator('501234568')['detailed_operator'], 'Orange Polska S.A.')
+        self.assertFalse(self.validator.recognize_operator('991234567')['success'])
+        self.assertEqual(self.validator.find_detailed_operator('501234567'), 'Orange Polska S.A.')
+        self.assertEqual(self.validator.find_current_operator('501234567'), 'P4 Sp. z o.o.')
+        self.assertTrue(self.validator.is_ported('501 234 567'))
+        self.assertFalse(self.validator.is_ported('501234568'))
+
+    def test_other_paths_agree(self):
+        """Test recognize, batch_validate, cached and instrumented results"""
+        numbers = ['501234567', '721234567', '721000000', '991234567']
+        expected = [self.validator.recognize_operator(number) for number in numbers]
+        self.assertEqual([result.to_dict() for result in self.validator.batch_recognize(numbers)], expected)
+        self.assertEqual(self.validator.batch_validate(numbers), expected)
+        self.validator.enable_cache()
+        self.validator.enable_instrumentation()
+        self.assertEqual([self.validator.recognize_operator(number) for number in numbers], expected)
+        self.assertEqual([self.validator.recognize_operator(number) for number in numbers], expected)
+
+    def test_attach_clears_cache(self):
+        """Test that swapping the overlay drops cached results"""
+        self.validator.enable_cache()
+        self.assertEqual(self.validator.recognize_operator('501234567')['detailed_operator'], 'P4 Sp. z o.o.')
+        self.validator.attach_portability(None)
+        self.assertEqual(self.validator.recognize_operator('501234567')['detailed_operator'], 'Orange Polska S.A.')
+        self.assertFalse(self.validator.is_ported('501234567'))
+
+    def test_refresh_portability(self):
+        """Test applying delta files and mapping the saved overlay back"""
+        with tempfile.TemporaryDirectory() as directory:
+            delta_path = os.path.join(directory, 'delta.csv')
+            with open(delta_path, 'w', encoding='utf-8') as file:
+                file.write('501234567;-\n721000000;Orange Polska S.A.\n')
+            overlay_path = os.path.join(directory, 'ported.port')
+            overlay = self.validator.refresh_portability([delta_path], overlay_path)
+            self.assertIsInstance(overlay.numbers, memoryview)
+            self.assertEqual(list(overlay.numbers), [721000000, 721234567, 991234567])
+            self.assertEqual(self.validator.recognize_operator('501234567')['detailed_operator'], 'Orange Polska S.A.')
+
+            with open(delta_path, 'w', encoding='utf-8') as file:
+                file.write('501234567;Plus\n')
+            self.validator.refresh_portability([delta_path])
+            self.assertEqual(self.validator.recognize_operator('501234567')['detailed_operator'], 'Plus')
+            self.assertEqual(len(PortabilityOverlay.load(overlay_path)), 4)
+            self.validator.attach_portability(None)
+            overlay.close()
+
+    @unittest.skipIf(numpy is None, 'NumPy not installed')
+    def test_batch_classify(self):
+        """Test that the vectorized path consults the overlay"""
+        numbers = numpy.array([501234567, 501234568, 48721234567, 991234567])
+        result = self.validator.batch_classify(numbers)
+        self.assertEqual(result.ported.tolist(), [True, False, True, False])
+        self.assertEqual(result.detailed_operator_labels().tolist(),
+                         ['P4 Sp. z o.o.', 'Orange Polska S.A.', 'MVNO', None])
+        self.validator.attach_portability(PortabilityOverlay.from_rows(()))
+        self.assertFalse(self.validator.batch_classify(numbers).ported.any())
+        self.validator.attach_portability(None)
+        self.assertIsNone(self.validator.batch_classify(numbers).ported)
+
+
+if __name__ == '__main__':
+    unittest.main()
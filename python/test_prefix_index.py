@@ -0,0 +1,114 @@
+"""
+Unit Tests for the compiled prefix index
+"""
+
+import unittest
+import os
+from polish_mobile_validator import PolishMobileValidator
+from prefix_index import PrefixIndex
+
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
+
+
+class TestPrefixIndex(unittest.TestCase):
+    """Test cases for PrefixIndex"""
+
+    def test_empty_database(self):
+        """Test that an empty index matches nothing"""
+        index = PrefixIndex({})
+        self.assertEqual(len(index), 0)
+        self.assertIsNone(index.lookup(501234567))
+        self.assertEqual(index.lookup_id(501234567), PrefixIndex.NO_MATCH)
+
+    def test_longest_prefix_wins(self):
+        """Test that more specific prefixes override shorter ones"""
+        index = PrefixIndex({'50': 'A', '501': 'B', '50123': 'C'})
+        self.assertEqual(index.lookup(509999999), 'A')
+        self.assertEqual(index.lookup(501999999), 'B')
+        self.assertEqual(index.lookup(501234567), 'C')
+        self.assertIsNone(index.lookup(601234567))
+
+    def test_operator_ids_are_shared(self):
+        """Test that repeated operator names share one ID"""
+        index = PrefixIndex({'501': 'A', '502': 'A', '503': 'B'})
+        self.assertEqual(index.operators, (None, 'A', 'B'))
+        self.assertEqual(index.lookup_id(501000000), index.lookup_id(502000000))
+
+    def test_prefixes_longer_than_depth(self):
+        """Test exhaustively around prefixes longer than the index depth"""
+        database = {
+            '50': 'A', '5012': 'B', '501234': 'C',
+            '5012345': 'D', '50123456': 'E', '501234567': 'F', '5012349': 'G'
+        }
+        validator = PolishMobileValidator()
+        validator.prefix_database.update(database)
+        validator.compile_prefix_index()
+        for number in range(501230000, 501240000):
+            normalized = str(number)
+            self.assertEqual(
+                validator.find_detailed_operator(normalized),
+                validator.find_detailed_operator_reference(normalized),
+                normalized
+            )
+
+    def test_lookup_probes(self):
+        """Test that probe counts grow only for slots shared with long prefixes"""
+        index = PrefixIndex({'50': 'A', '5012345': 'B', '501234567': 'C'})
+        self.assertEqual(index.lookup_probes(509999999), ('A', 1))
+        self.assertEqual(index.lookup_probes(501234567), ('C', 2))
+        self.assertEqual(index.lookup_probes(501234566), ('B', 3))
+        self.assertEqual(index.lookup_probes(501234000), ('A', 4))
+        for number in range(501234000, 501235000):
+            self.assertEqual(index.lookup_probes(number)[0], index.lookup(number))
+
+    def test_ignores_unusable_prefixes(self):
+        """Test that prefixes the dictionary path can never match are skipped"""
+        index = PrefixIndex({'5': 'A', '50x': 'B', '5012345678': 'C', '501': 'D'})
+        self.assertEqual(index.lookup(501234567), 'D')
+        self.assertIsNone(index.lookup(509999999))
+
+
+@unittest.skipUnless(os.path.exists(CSV_PATH), 'prefix CSV not available')
+class TestPrefixIndexMatchesReference(unittest.TestCase):
+    """Compare the compiled index with the dictionary reference implementation"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the corrected prefix database once"""
+        cls.validator = PolishMobileValidator(CSV_PATH)
+
+    def test_identical_across_number_space(self):
+        """Test every 6-digit block of every valid prefix"""
+        validator = self.validator
+        # Database prefixes are at most DEPTH digits long, so every number in a
+        # block resolves the same way; both block boundaries are checked.
+        self.assertLessEqual(max(map(len, validator.prefix_database)), PrefixIndex.DEPTH)
+        for prefix in validator.get_valid_prefixes():
+            for block in range(10000):
+                for suffix in ('000', '999'):
+                    normalized = f'{prefix}{block:04d}{suffix}'
+                    self.assertEqual(
+                        validator.find_detailed_operator(normalized),
+                        validator.find_detailed_operator_reference(normalized),
+                        normalized
+                    )
+
+    def test_recognize_operator_uses_index(self):
+        """Test that recognize_operator reports the indexed detailed operator"""
+        result = self.validator.recognize_operator('+48 500 123 456')
+        self.assertEqual(
+            result['detailed_operator'],
+            self.validator.find_detailed_operator_reference('500123456')
+        )
+        self.assertIsNotNone(result['detailed_operator'])
+
+    def test_direct_database_edit_recompiles(self):
+        """Test that adding prefixes directly is picked up by the index"""
+        validator = PolishMobileValidator(CSV_PATH)
+        validator.prefix_database['5999'] = 'Test Operator'
+        self.assertEqual(validator.find_detailed_operator('599912345'), 'Test Operator')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,128 @@
+"""
+Unit Tests for the numeric range index and prefix audit
+"""
+
+import unittest
+import os
+import tempfile
+from polish_mobile_validator import PolishMobileValidator, iter_prefix_rows
+from prefix_index import PrefixIndex
+from range_index import NumberRange, PrefixConflict, RangeIndex, audit_prefixes, main, prefix_range
+
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
+ORIGINAL_CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix.csv')
+
+
+class TestRangeIndex(unittest.TestCase):
+    """Test cases for RangeIndex"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.index = RangeIndex({'50': 'A', '501': 'B', '5012': 'A', '51': 'A', '53': 'C', 'x1': 'D'})
+
+    def test_prefix_range(self):
+        """Test the numbers covered by a prefix"""
+        self.assertEqual(prefix_range('50'), (500000000, 510000000))
+        self.assertEqual(prefix_range('501234567'), (501234567, 501234568))
+
+    def test_disjoint_sorted_ranges(self):
+        """Test that nested prefixes are flattened and same-operator neighbours merged"""
+        self.assertEqual(list(self.index), [
+            NumberRange(500000000, 501000000, 'A'),
+            NumberRange(501000000, 501200000, 'B'),
+            NumberRange(501200000, 501300000, 'A'),
+            NumberRange(501300000, 502000000, 'B'),
+            NumberRange(502000000, 520000000, 'A'),
+            NumberRange(530000000, 540000000, 'C'),
+        ])
+
+    def test_lookup(self):
+        """Test forward lookups, including gaps"""
+        self.assertEqual(self.index.lookup(501299999), 'A')
+        self.assertEqual(self.index.lookup(501300000), 'B')
+        self.assertIsNone(self.index.lookup(525000000))
+        self.assertIsNone(self.index.lookup(0))
+
+    def test_owners(self):
+        """Test clipped range queries"""
+        self.assertEqual(self.index.owners(501100000, 501250000), [
+            NumberRange(501100000, 501200000, 'B'),
+            NumberRange(501200000, 501250000, 'A'),
+        ])
+        self.assertEqual(self.index.owners(521000000, 522000000), [])
+
+    def test_reverse_and_counts(self):
+        """Test per-operator range lists and number counts"""
+        self.assertEqual([r.size for r in self.index.ranges_for('B')], [200000, 700000])
+        self.assertEqual(self.index.ranges_for('unknown'), [])
+        self.assertEqual(self.index.count_by_operator(), {'A': 19100000, 'C': 10000000, 'B': 900000})
+        self.assertEqual(self.index.count_by_operator(501000000, 502000000), {'B': 900000, 'A': 100000})
+
+    def test_empty(self):
+        """Test that an empty index answers nothing"""
+        index = RangeIndex({})
+        self.assertEqual(len(index), 0)
+        self.assertIsNone(index.lookup(501234567))
+        self.assertEqual(index.owners(0, 10 ** 9), [])
+
+
+class TestAuditPrefixes(unittest.TestCase):
+    """Test cases for audit_prefixes"""
+
+    def test_finds_each_kind(self):
+        """Test duplicate, overlap, redundant and shadowed findings"""
+        rows = [('50', 'A'), ('501', 'B'), ('5012', 'B'), ('53', 'C'), ('53', 'D')]
+        rows += [('60', 'E')] + [(f'60{digit}', 'F') for digit in range(10)]
+        conflicts = audit_prefixes(rows)
+        self.assertIn(PrefixConflict('duplicate', '53', 'D', '53', 'C'), conflicts)
+        self.assertIn(PrefixConflict('overlap', '501', 'B', '50', 'A'), conflicts)
+        self.assertIn(PrefixConflict('redundant', '5012', 'B', '501', 'B'), conflicts)
+        self.assertIn(PrefixConflict('shadowed', '60', 'E', None, 'F'), conflicts)
+        self.assertEqual(len(conflicts), 14)
+
+    @unittest.skipUnless(os.path.exists(ORIGINAL_CSV_PATH), 'prefix CSV not available')
+    def test_original_csv_duplicate(self):
+        """Test that the duplicate prefix in Mobileprefix.csv is reported"""
+        conflicts = audit_prefixes(iter_prefix_rows(ORIGINAL_CSV_PATH))
+        self.assertEqual([c.prefix for c in conflicts if c.kind == 'duplicate'], ['5366'])
+
+    def test_audit_command(self):
+        """Test the audit command's exit status"""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as file:
+            file.write('Prefix;Operator\n+48501;A\n+48502;B\n')
+        try:
+            self.assertEqual(main(['audit', file.name]), 0)
+        finally:
+            os.unlink(file.name)
+
+
+@unittest.skipUnless(os.path.exists(CSV_PATH), 'prefix CSV not available')
+class TestRangeIndexMatchesPrefixIndex(unittest.TestCase):
+    """Compare the range index with the compiled prefix index"""
+
+    def test_identical_across_number_space(self):
+        """Test every block of 1000 numbers and the validator integration"""
+        validator = PolishMobileValidator(CSV_PATH)
+        ranges = validator.get_range_index()
+        slots = PrefixIndex(validator.prefix_database)
+        for number in range(0, 10 ** 9, 1000):
+            self.assertEqual(ranges.lookup(number), slots.lookup(number), number)
+        self.assertIs(validator.get_range_index(), ranges)
+        self.assertEqual(sum(ranges.count_by_operator().values()), sum(r.size for r in ranges))
+
+    def test_snapshot_range_index(self):
+        """Test that a snapshot-backed validator builds the same ranges"""
+        from snapshot import compile_snapshot
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'prefixes.snap')
+            compile_snapshot(CSV_PATH, path)
+            validator = PolishMobileValidator()
+            validator.load_snapshot(path)
+            self.assertEqual(list(validator.get_range_index()),
+                             list(PolishMobileValidator(CSV_PATH).get_range_index()))
+
+
+if __name__ == '__main__':
+    unittest.main()
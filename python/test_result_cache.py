@@ -0,0 +1,133 @@
+"""
+Unit Tests for the recognize_operator result cache
+"""
+
+import unittest
+import os
+from polish_mobile_validator import PolishMobileValidator
+from result_cache import LRUCache
+
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test cases for LRUCache"""
+
+    def test_eviction_order(self):
+        """Test that the least recently used entry is evicted"""
+        cache = LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.stats(), {
+            'hits': 3, 'misses': 1, 'evictions': 1, 'invalidations': 0, 'size': 2, 'maxsize': 2
+        })
+
+    def test_clear(self):
+        """Test that clearing drops entries and counts an invalidation"""
+        cache = LRUCache(4)
+        cache.put('a', 1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.stats()['invalidations'], 1)
+
+    def test_stale_generation_is_dropped(self):
+        """Test that values computed before a clear are not stored after it"""
+        cache = LRUCache(4)
+        generation = cache.generation
+        cache.clear()
+        cache.put('a', 1, generation)
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', 1, cache.generation)
+        self.assertEqual(cache.get('a'), 1)
+
+    def test_invalid_maxsize(self):
+        """Test that the cache needs room for at least one entry"""
+        with self.assertRaises(ValueError):
+            LRUCache(0)
+
+
+class TestValidatorCache(unittest.TestCase):
+    """Test cases for PolishMobileValidator result caching"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.validator = PolishMobileValidator()
+        self.validator.enable_cache(maxsize=3)
+
+    def test_disabled_by_default(self):
+        """Test that caching is opt-in"""
+        self.assertIsNone(PolishMobileValidator().cache_stats())
+
+    def test_hits_are_keyed_by_normalized_number(self):
+        """Test that differently formatted inputs share one entry"""
+        first = self.validator.recognize_operator('501234567')
+        second = self.validator.recognize_operator('+48 501 234 567')
+        self.assertEqual(second['phone_number'], '+48 501 234 567')
+        self.assertEqual(first['phone_number'], '501234567')
+        self.assertEqual(second['operator'], 'Orange')
+        stats = self.validator.cache_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (1, 1, 1))
+
+    def test_results_match_uncached(self):
+        """Test that cached results equal uncached ones, including invalid numbers"""
+        plain = PolishMobileValidator()
+        for number in ['501234567', '991234567', '123', '211234567', '501234567', '991234567']:
+            self.assertEqual(self.validator.recognize_operator(number), plain.recognize_operator(number))
+            self.assertEqual(list(self.validator.recognize_operator(number)),
+                             list(plain.recognize_operator(number)))
+
+    def test_results_are_copies(self):
+        """Test that modifying a returned result does not corrupt the cache"""
+        result = self.validator.recognize_operator('501234567')
+        result['operator'] = 'Tampered'
+        self.assertEqual(self.validator.recognize_operator('501234567')['operator'], 'Orange')
+
+    def test_eviction(self):
+        """Test that the configured maximum size is respected"""
+        for number in ['501234567', '511234567', '531234567', '571234567']:
+            self.validator.recognize_operator(number)
+        stats = self.validator.cache_stats()
+        self.assertEqual((stats['size'], stats['evictions']), (3, 1))
+
+    @unittest.skipUnless(os.path.exists(CSV_PATH), 'prefix CSV not available')
+    def test_invalidated_by_database_load(self):
+        """Test that loading a database clears cached results"""
+        validator = PolishMobileValidator(builtin_prefixes=False)
+        validator.enable_cache(maxsize=3)
+        self.assertIsNone(validator.recognize_operator('500123456')['detailed_operator'])
+        validator.load_prefix_database(CSV_PATH)
+        self.assertIsNotNone(validator.recognize_operator('500123456')['detailed_operator'])
+        self.assertEqual(validator.cache_stats()['invalidations'], 1)
+
+    def test_invalidated_by_in_place_edit(self):
+        """Test that adding a prefix to prefix_database is seen by cached numbers"""
+        validator = PolishMobileValidator(builtin_prefixes=False)
+        validator.prefix_database['50'] = 'Orange'
+        validator.enable_cache(maxsize=10)
+        for _ in range(2):
+            self.assertEqual(validator.recognize_operator('501234567')['detailed_operator'], 'Orange')
+        self.assertEqual(validator.cache_stats()['size'], 1)
+        validator.prefix_database['5012'] = 'Edited'
+        self.assertEqual(validator.recognize_operator('501234567')['detailed_operator'], 'Edited')
+        self.assertEqual(validator.recognize_operator('502234567')['detailed_operator'], 'Orange')
+
+    def test_batch_validate_uses_cache(self):
+        """Test that batch validation goes through the cache"""
+        self.validator.batch_validate(['501234567'] * 10)
+        self.assertEqual(self.validator.cache_stats()['hits'], 9)
+
+    def test_disable_cache(self):
+        """Test turning the cache off"""
+        self.validator.disable_cache()
+        self.assertIsNone(self.validator.cache_stats())
+        self.assertTrue(self.validator.recognize_operator('501234567')['success'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,83 @@
+"""
+Unit Tests for compact recognition results
+"""
+
+import unittest
+import json
+import os
+import pickle
+import random
+from polish_mobile_validator import PolishMobileValidator
+from results import RecognitionResult, RecognitionStatus
+
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
+
+
+class TestRecognize(unittest.TestCase):
+    """Test cases for PolishMobileValidator.recognize"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.validator = PolishMobileValidator(CSV_PATH) if os.path.exists(CSV_PATH) else PolishMobileValidator()
+
+    def test_matches_recognize_operator(self):
+        """Test that compact results convert to the recognize_operator dicts"""
+        rng = random.Random(9)
+        numbers = [str(rng.randrange(10 ** 8, 10 ** 9)) for _ in range(3000)]
+        numbers += ['+48 211 234 567', '(501) 234-567', '12345', '', None, 48691234567]
+        for number in numbers:
+            expected = self.validator.recognize_operator(number)
+            result = self.validator.recognize(number)
+            self.assertEqual(result.to_dict(), expected)
+            self.assertEqual(list(result.to_dict()), list(expected))
+            self.assertEqual(result, expected)
+            self.assertEqual(dict(result), expected)
+
+    def test_status_codes(self):
+        """Test the enum status of each outcome"""
+        self.assertIs(self.validator.recognize('501234567').status, RecognitionStatus.VALID)
+        self.assertIs(self.validator.recognize('5012345').status, RecognitionStatus.INVALID_LENGTH)
+        self.assertIs(self.validator.recognize('991234567').status, RecognitionStatus.INVALID_PREFIX)
+
+    def test_mapping_access(self):
+        """Test dictionary-style access used by existing callers"""
+        result = self.validator.recognize('211234567')
+        self.assertTrue(result['success'])
+        self.assertEqual(result['prefix'], '21')
+        self.assertTrue(result['is_m2m'])
+        self.assertEqual(result.get('missing', 'default'), 'default')
+        self.assertIn('message', result)
+        invalid = self.validator.recognize('991234567')
+        self.assertNotIn('operator', invalid)
+        with self.assertRaises(KeyError):
+            invalid['operator']
+        self.assertIn('Invalid prefix: 99', invalid['message'])
+
+    def test_operator_names_are_shared(self):
+        """Test that results reference one operator name string"""
+        first = self.validator.recognize('500123456')
+        second = self.validator.recognize('500123457')
+        self.assertIs(first.operator, second.operator)
+        self.assertIs(first.detailed_operator, second.detailed_operator)
+
+    def test_no_instance_dict(self):
+        """Test that results use slots only"""
+        result = self.validator.recognize('501234567')
+        self.assertFalse(hasattr(result, '__dict__'))
+
+    def test_pickle_and_json(self):
+        """Test that results survive pickling and serialize through to_dict"""
+        result = self.validator.recognize('501234567')
+        self.assertEqual(pickle.loads(pickle.dumps(result)), result)
+        self.assertEqual(json.loads(json.dumps(result.to_dict()))['operator'], 'Orange')
+
+    def test_batch_recognize(self):
+        """Test batch recognition"""
+        results = self.validator.batch_recognize(['501234567', '991234567'])
+        self.assertTrue(all(isinstance(result, RecognitionResult) for result in results))
+        self.assertEqual([result.success for result in results], [True, False])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
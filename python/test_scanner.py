@@ -0,0 +1,120 @@
+"""
+Unit Tests for the free-text phone number scanner
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import scanner
+from polish_mobile_validator import PolishMobileValidator
+from scanner import ScanMatch, find_candidates, scan_buffer, scan_file
+
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
+TEXT = (b'call +48 501 234 567 or (50) 123-45-67, id x501234567, 48501234567;\n'
+        b'bad 501234567a and +501234567, order 5012345678, tel:(+48) 601-234-567.\n')
+
+
+class TestFindCandidates(unittest.TestCase):
+    """Test candidate detection on bytes"""
+
+    def test_formats_and_offsets(self):
+        """Test every accepted format is found with exact byte offsets"""
+        found = [(start, end, text) for start, end, text in find_candidates(TEXT)]
+        texts = [text for _, _, text in found]
+        self.assertEqual(texts, [b'+48 501 234 567', b'(50) 123-45-67', b'48501234567', b'(+48) 601-234-567'])
+        for start, end, text in found:
+            self.assertEqual(TEXT[start:end], text)
+
+    def test_glued_numbers_rejected(self):
+        """Test digits glued to letters, '+' or extra digits are not candidates"""
+        for text in (b'x501234567', b'501234567a', b'+501234567', b'5012345678', b'1501234567 '):
+            self.assertEqual(list(find_candidates(text)), [], text)
+
+    def test_window_boundaries(self):
+        """Test numbers around window boundaries are found exactly once"""
+        text = b''.join(b'ab %d ' % (501234567 + i) for i in range(200))
+        expected = list(find_candidates(text))
+        self.assertEqual(len(expected), 200)
+        for window in (7, 16, 64, 1000):
+            with mock.patch.object(scanner, 'WINDOW_SIZE', window):
+                self.assertEqual(list(find_candidates(text)), expected, window)
+
+    def test_regex_runs_match_numpy_runs(self):
+        """Test the pure-Python fallback finds the same candidates"""
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest('NumPy not installed')
+        with mock.patch.object(scanner, '_runs_numpy', scanner._runs_regex):
+            fallback = list(find_candidates(TEXT))
+        self.assertEqual(fallback, list(find_candidates(TEXT)))
+
+
+class TestScan(unittest.TestCase):
+    """Test classification of scanned numbers"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.validator = PolishMobileValidator(CSV_PATH)
+
+    def test_scan_buffer_classifies(self):
+        """Test matches carry recognition results in offset order"""
+        matches = list(scan_buffer(self.validator, TEXT, batch_size=2))
+        self.assertTrue(all(isinstance(match, ScanMatch) for match in matches))
+        self.assertEqual([match.result.normalized for match in matches],
+                         ['501234567', '501234567', '501234567', '601234567'])
+        self.assertEqual([match.start for match in matches], sorted(match.start for match in matches))
+        self.assertEqual(matches[0].result.operator,
+                         self.validator.recognize_operator('501234567')['operator'])
+
+    def test_valid_only(self):
+        """Test invalid candidates are reported only when asked for"""
+        text = b'valid 501234567, unknown prefix 123456789'
+        self.assertEqual([m.text for m in scan_buffer(self.validator, text)], ['501234567'])
+        everything = list(scan_buffer(self.validator, text, valid_only=False))
+        self.assertEqual([m.text for m in everything], ['501234567', '123456789'])
+        self.assertFalse(everything[1].result.success)
+
+    def test_scan_file(self):
+        """Test files are scanned through a memory map, including empty files"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'log.txt')
+            with open(path, 'wb') as file:
+                file.write('Zażółć 501 234 567 gęślą\n'.encode('utf-8') * 3)
+            matches = list(scan_file(self.validator, path))
+            self.assertEqual(len(matches), 3)
+            with open(path, 'rb') as file:
+                data = file.read()
+            self.assertEqual(data[matches[1].start:matches[1].end], b'501 234 567')
+
+            empty = os.path.join(directory, 'empty.txt')
+            open(empty, 'wb').close()
+            self.assertEqual(list(scan_file(self.validator, empty)), [])
+
+    def test_main_writes_csv(self):
+        """Test the command line writes a CSV of found numbers"""
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'log.txt')
+            output = os.path.join(directory, 'found.csv')
+            with open(source, 'wb') as file:
+                file.write(TEXT)
+            code = scanner.main([source, '-o', output, '-q', '--database', CSV_PATH,
+                                 '-f', 'start,match,normalized'])
+            self.assertEqual(code, 0)
+            with open(output, encoding='utf-8') as file:
+                lines = file.read().splitlines()
+            self.assertEqual(lines[0], 'start,match,normalized')
+            self.assertEqual(lines[1], '5,+48 501 234 567,501234567')
+            self.assertEqual(len(lines), 5)
+            self.assertEqual(scanner.main([source, '-f', 'nope', '-q']), 2)
+            with contextlib.redirect_stderr(io.StringIO()):
+                self.assertEqual(scanner.main([source, '-q', '--database', source + '.missing']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Unit Tests for binary prefix snapshots
+"""
+
+import unittest
+import os
+import random
+import shutil
+import tempfile
+from polish_mobile_validator import PolishMobileValidator
+from snapshot import PrefixSnapshot, SnapshotError, build_snapshot, compile_snapshot, main
+
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test cases for snapshot compilation and loading"""
+
+    def setUp(self):
+        """Create a scratch directory"""
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'prefixes.snap')
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        shutil.rmtree(self.directory)
+
+    def write(self, data):
+        """Write raw snapshot bytes to the scratch path"""
+        with open(self.path, 'wb') as file:
+            file.write(data)
+
+    @unittest.skipUnless(os.path.exists(CSV_PATH), 'prefix CSV not available')
+    def test_snapshot_matches_csv(self):
+        """Test that a snapshot-backed validator answers like a CSV-backed one"""
+        self.assertEqual(compile_snapshot(CSV_PATH, self.path), 695)
+        from_csv = PolishMobileValidator(CSV_PATH)
+        from_snapshot = PolishMobileValidator()
+        from_snapshot.load_snapshot(self.path)
+
+        rng = random.Random(5)
+        for _ in range(20000):
+            number = str(rng.randrange(10 ** 8, 10 ** 9))
+            self.assertEqual(from_snapshot.recognize_operator(number), from_csv.recognize_operator(number))
+        self.assertEqual(from_snapshot.prefix_database, {})
+
+    @unittest.skipUnless(os.path.exists(CSV_PATH), 'prefix CSV not available')
+    def test_operator_names_are_decoded(self):
+        """Test that Polish characters survive compilation"""
+        compile_snapshot(CSV_PATH, self.path)
+        with PrefixSnapshot(self.path) as snapshot:
+            self.assertIn('P4 Sp. z\xa0o.o. (Sie? komórkowa Play)', snapshot.index.operators)
+
+    def test_round_trip_with_long_prefixes(self):
+        """Test prefixes longer than the index depth and the prefix listing"""
+        database = {'50': 'Ąlfa', '5012': 'Beta', '5012345': 'Gamma', '501234567': 'Delta'}
+        self.write(build_snapshot(database, b'\x01' * 32))
+        with PrefixSnapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.to_prefix_database(), database)
+            self.assertEqual(snapshot.source_hash, b'\x01' * 32)
+            self.assertEqual(snapshot.index.lookup(501234567), 'Delta')
+            self.assertEqual(snapshot.index.lookup(501234568), 'Gamma')
+            self.assertEqual(snapshot.index.lookup(501299999), 'Beta')
+            self.assertEqual(snapshot.index.lookup(509999999), 'Ąlfa')
+            self.assertIsNone(snapshot.index.lookup(601234567))
+
+    def test_rejects_corrupted_body(self):
+        """Test that a flipped body byte fails the checksum"""
+        data = bytearray(build_snapshot({'501': 'A'}))
+        data[-1] ^= 0xFF
+        self.write(bytes(data))
+        with self.assertRaises(SnapshotError):
+            PrefixSnapshot(self.path)
+        PrefixSnapshot(self.path, verify=False).close()
+
+    def test_rejects_other_files(self):
+        """Test that files without the snapshot magic are rejected"""
+        self.write(b'Prefix;Operator Name\n' * 10)
+        with self.assertRaises(SnapshotError):
+            PrefixSnapshot(self.path)
+
+    def test_rejects_other_versions(self):
+        """Test that a different format version is rejected"""
+        data = bytearray(build_snapshot({'501': 'A'}))
+        data[8] = 99
+        self.write(bytes(data))
+        with self.assertRaises(SnapshotError):
+            PrefixSnapshot(self.path)
+
+    def test_info_command(self):
+        """Test the info command on a valid and an invalid file"""
+        self.write(build_snapshot({'501': 'A'}))
+        self.assertEqual(main(['info', self.path]), 0)
+        self.write(b'junk')
+        self.assertEqual(main(['info', self.path]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,192 @@
+"""
+Unit Tests for the partition-by-operator file splitter
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import splitter
+from polish_mobile_validator import PolishMobileValidator
+from splitter import (INVALID, M2M, line_ranges, partition_filename, partition_label, split_file,
+                      unique_filename)
+
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
+
+
+def read_lines(path):
+    with open(path, 'rb') as file:
+        return file.read().decode('utf-8').splitlines()
+
+
+class TestLineRanges(unittest.TestCase):
+    """Test line-aligned chunking"""
+
+    def test_ranges_cover_file_on_line_boundaries(self):
+        """Test ranges are contiguous, cover the file and end after a newline"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'numbers.txt')
+            data = b'501234567\n+48 601 234 567\n\n12\n881234567'
+            with open(path, 'wb') as file:
+                file.write(data)
+            for chunk_bytes in (1, 5, 10, 11, 100):
+                ranges = line_ranges(path, chunk_bytes)
+                self.assertEqual(b''.join(data[start:end] for start, end in ranges), data)
+                for _, end in ranges[:-1]:
+                    self.assertEqual(data[end - 1:end], b'\n')
+            self.assertEqual(line_ranges(path, 100, start=10), [(10, len(data))])
+            with self.assertRaises(ValueError):
+                line_ranges(path, 0)
+
+
+class TestSplitFile(unittest.TestCase):
+    """Test splitting files into per-operator outputs"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build a mixed list of valid, M2M, formatted, invalid and blank lines"""
+        cls.validator = PolishMobileValidator(CSV_PATH) if os.path.exists(CSV_PATH) else PolishMobileValidator()
+        rng = random.Random(3)
+        prefixes = ('50', '51', '60', '66', '69', '72', '79', '88', '12', '99')
+        cls.lines = [f'{rng.choice(prefixes)}{rng.randrange(10 ** 7):07d}' for _ in range(3000)]
+        cls.lines += ['+48 501 234 567', '(601) 234-567', '', '  ', 'abc', '12345']
+        rng.shuffle(cls.lines)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.input = os.path.join(self.directory.name, 'numbers.txt')
+        with open(self.input, 'w', encoding='utf-8', newline='') as file:
+            file.write('\n'.join(self.lines))
+
+    def expected(self, by='operator'):
+        partitions = {}
+        for line in self.lines:
+            if line.strip():
+                partitions.setdefault(partition_label(self.validator.recognize(line), by), []).append(line)
+        return partitions
+
+    def test_in_process_split_keeps_order(self):
+        """Test each output holds its input lines in order, without blank lines"""
+        output = os.path.join(self.directory.name, 'out')
+        report = split_file(self.validator, self.input, output, workers=1, chunk_bytes=1000)
+        expected = self.expected()
+        self.assertEqual(set(report.rows), set(expected))
+        self.assertIn(INVALID, expected)
+        self.assertIn(M2M, expected)
+        for partition, lines in expected.items():
+            self.assertEqual(report.rows[partition], len(lines))
+            self.assertEqual(read_lines(report.files[partition]), lines)
+        self.assertEqual(report.total_rows, sum(len(lines) for lines in expected.values()))
+        self.assertEqual(report.bytes_read, os.path.getsize(self.input))
+        self.assertEqual(sorted(os.listdir(output)), sorted(f'{partition}.txt' for partition in expected))
+
+    def test_parallel_split(self):
+        """Test worker processes give the same outputs, ordered or in completion order"""
+        expected = self.expected()
+        ordered = split_file(self.validator, self.input, os.path.join(self.directory.name, 'ordered'),
+                             workers=2, chunk_bytes=2000, preserve_order=True)
+        unordered = split_file(self.validator, self.input, os.path.join(self.directory.name, 'unordered'),
+                               workers=2, chunk_bytes=2000)
+        self.assertGreater(ordered.chunks, 2)
+        for partition, lines in expected.items():
+            self.assertEqual(read_lines(ordered.files[partition]), lines)
+            self.assertEqual(sorted(read_lines(unordered.files[partition])), sorted(lines))
+
+    def test_without_numpy_and_long_lines(self):
+        """Test the recognize path and overlong lines split like batch_classify"""
+        with open(self.input, 'a', encoding='utf-8') as file:
+            file.write('\n' + ' ' * 80 + '501234567\n')
+        expected = split_file(self.validator, self.input, os.path.join(self.directory.name, 'numpy'), workers=1)
+        with mock.patch.dict(sys.modules, {'numpy': None}):
+            fallback = split_file(self.validator, self.input, os.path.join(self.directory.name, 'plain'), workers=1)
+        self.assertEqual(fallback.rows, expected.rows)
+        for partition, path in expected.files.items():
+            self.assertEqual(read_lines(fallback.files[partition]), read_lines(path))
+        self.assertEqual(read_lines(expected.files['Orange'])[-1].strip(), '501234567')
+
+    def test_non_ascii_lines_split_like_recognize(self):
+        """Test lines with Unicode digits or letters land where recognize puts them, on both paths"""
+        short = ['784290091\u0663', '501 234 567\u00e9', '\uff15\uff10\uff11234567', '501234567']
+        for name, self.lines in (('short', short), ('wide', short + [' ' * 80 + '601234567'])):
+            with open(self.input, 'w', encoding='utf-8', newline='') as file:
+                file.write('\n'.join(self.lines))
+            report = split_file(self.validator, self.input, os.path.join(self.directory.name, name), workers=1)
+            for partition, lines in self.expected().items():
+                self.assertEqual(read_lines(report.files[partition]), lines)
+            self.assertEqual(read_lines(report.files[INVALID])[0], '784290091\u0663')
+
+    def test_csv_column_with_header(self):
+        """Test CSV rows are split on a named column and each output repeats the header"""
+        path = os.path.join(self.directory.name, 'contacts.csv')
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            file.write('id;phone;name\r\n1;501234567;"Nowak; Jan"\r\n2;(601) 234-567;Kowalska\r\n3;12;x\r\n')
+        report = split_file(self.validator, path, os.path.join(self.directory.name, 'csv'),
+                            workers=1, column='phone', delimiter=';')
+        orange = report.files['Orange']
+        self.assertTrue(orange.endswith('Orange.csv'))
+        self.assertEqual(read_lines(orange), ['id;phone;name', '1;501234567;"Nowak; Jan"'])
+        self.assertEqual(read_lines(report.files[INVALID]), ['id;phone;name', '3;12;x'])
+        with self.assertRaises(ValueError):
+            split_file(self.validator, path, os.path.join(self.directory.name, 'csv'), column='missing')
+
+    def test_by_detailed_operator(self):
+        """Test partitioning by network from the prefix database"""
+        if not os.path.exists(CSV_PATH):
+            self.skipTest('Prefix database not available')
+        report = split_file(self.validator, self.input, os.path.join(self.directory.name, 'detailed'),
+                            workers=1, by='detailed_operator')
+        self.assertEqual(report.rows, {partition: len(lines)
+                                       for partition, lines in self.expected('detailed_operator').items()})
+        for path in report.files.values():
+            self.assertNotIn(' ', os.path.basename(path))
+        with self.assertRaises(ValueError):
+            split_file(self.validator, self.input, self.directory.name, by='prefix')
+
+    def test_partition_filename(self):
+        """Test partition names become safe file names"""
+        self.assertEqual(partition_filename('T-Mobile'), 'T-Mobile')
+        self.assertEqual(partition_filename('P4 Sp. z o.o. (Sieć Play)'), 'P4_Sp._z_o.o._Sieć_Play')
+        self.assertEqual(partition_filename('..'), 'Unknown')
+
+    def test_unique_filename(self):
+        """Test stems differing only in case or separators get distinct names"""
+        taken = set()
+        self.assertEqual(unique_filename('Pomagacz Sp. z\xa0o.o.', taken), 'Pomagacz_Sp._z_o.o')
+        self.assertEqual(unique_filename('Pomagacz Sp. Z o.o.', taken), 'Pomagacz_Sp._Z_o.o-2')
+        self.assertEqual(unique_filename('Pomagacz Sp. z o.o.', taken), 'Pomagacz_Sp._z_o.o-3')
+
+    def test_labels_differing_in_case_keep_separate_files(self):
+        """Test partitions whose file names clash ignoring case are not written to one file"""
+        database = os.path.join(self.directory.name, 'clash.csv')
+        with open(database, 'w', encoding='utf-8') as file:
+            file.write('Prefix;Operator Name\n+48501;Pomagacz Sp. z\xa0o.o.\n+48502;Pomagacz Sp. Z o.o.\n')
+        source = os.path.join(self.directory.name, 'clash.txt')
+        with open(source, 'w', encoding='utf-8') as file:
+            file.write('501000001\n502000002\n501000003\n')
+        validator = PolishMobileValidator(database)
+        report = split_file(validator, source, os.path.join(self.directory.name, 'clash'), workers=1,
+                            by='detailed_operator')
+        files = {path.casefold() for path in report.files.values()}
+        self.assertEqual(len(files), 2)
+        self.assertEqual(read_lines(report.files['Pomagacz Sp. z\xa0o.o.']), ['501000001', '501000003'])
+        self.assertEqual(read_lines(report.files['Pomagacz Sp. Z o.o.']), ['502000002'])
+
+    def test_main(self):
+        """Test the command line writes outputs and cleans up part files"""
+        output = os.path.join(self.directory.name, 'cli')
+        self.assertEqual(splitter.main([self.input, '-o', output, '-w', '1', '-q', '--database', CSV_PATH]), 0)
+        self.assertFalse([name for name in os.listdir(output) if name.startswith('.parts-')])
+        self.assertEqual(splitter.main([self.input, '-o', output, '-c', 'phone', '-q']), 2)
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(splitter.main([self.input, '-o', output, '-q', '--database', self.input + '.x']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
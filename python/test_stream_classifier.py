@@ -0,0 +1,124 @@
+"""
+Unit Tests for the streaming file classifier
+"""
+
+import unittest
+import contextlib
+import io
+import os
+import sys
+import tempfile
+from polish_mobile_validator import PolishMobileValidator
+import stream_classifier
+
+
+class TestClassifyStream(unittest.TestCase):
+    """Test cases for the classify_stream pipeline"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.validator = PolishMobileValidator()
+
+    def run_stream(self, data, **kwargs):
+        """Run the pipeline over bytes and return output lines and stats"""
+        output = io.StringIO()
+        stats = stream_classifier.classify_stream(self.validator, io.BytesIO(data), output, **kwargs)
+        return output.getvalue().splitlines(), stats
+
+    def test_newline_list(self):
+        """Test classification of a newline-separated list"""
+        lines, stats = self.run_stream(b'501234567\n\n+48 531 234 567\r\n991234567\n')
+        self.assertEqual(lines[0], 'input,valid,normalized,operator,is_m2m')
+        self.assertEqual(lines[1], '501234567,true,501234567,Orange,false')
+        self.assertEqual(lines[2], '+48 531 234 567,true,531234567,Play,false')
+        self.assertEqual(lines[3], '991234567,false,,,')
+        self.assertEqual(stats.rows, 3)
+        self.assertEqual(stats.valid, 2)
+
+    def test_csv_column_by_name(self):
+        """Test reading numbers from a named CSV column"""
+        data = b'id;phone\n1;211234567\n2;"(501) 234-567"\n'
+        lines, _ = self.run_stream(data, column='phone', delimiter=';', fields=['normalized', 'is_m2m'])
+        self.assertEqual(lines, ['normalized,is_m2m', '211234567,true', '501234567,false'])
+
+    def test_csv_column_by_index_without_header(self):
+        """Test reading numbers from a CSV column index"""
+        lines, stats = self.run_stream(b'a,601234567\nb,881234567\n', column='1', header=False,
+                                       fields=['operator'])
+        self.assertEqual(lines, ['operator', 'T-Mobile', 'T-Mobile'])
+        self.assertEqual(stats.rows, 2)
+
+    def test_missing_column(self):
+        """Test that an unknown column name is reported"""
+        with self.assertRaises(ValueError):
+            self.run_stream(b'id,number\n1,501234567\n', column='phone')
+
+    def test_formatted_field(self):
+        """Test the formatted output field"""
+        lines, _ = self.run_stream(b'501234567\n', fields=['formatted'], format_type='spaced')
+        self.assertEqual(lines[1], '501 234 567')
+
+    def test_unknown_field(self):
+        """Test that unknown output fields are rejected"""
+        with self.assertRaises(ValueError):
+            self.run_stream(b'501234567\n', fields=['carrier'])
+
+    def test_small_chunks_preserve_order(self):
+        """Test that chunking keeps the input order"""
+        numbers = [f'50{i:07d}' for i in range(25)]
+        lines, stats = self.run_stream('\n'.join(numbers).encode(), fields=['normalized'], chunk_size=4)
+        self.assertEqual(lines[1:], numbers)
+        self.assertEqual(stats.bytes_read, len('\n'.join(numbers)))
+
+    def test_rejects_empty_chunks(self):
+        """Test that a chunk size below 1 is an error instead of empty output"""
+        with self.assertRaises(ValueError):
+            self.run_stream(b'501234567\n', chunk_size=0)
+
+    def test_summary(self):
+        """Test the throughput summary text"""
+        _, stats = self.run_stream(b'501234567\n')
+        self.assertIn('rows/s', stats.summary())
+        self.assertIn('MB/s', stats.summary())
+
+
+class TestCommandLine(unittest.TestCase):
+    """Test cases for the command-line entry point"""
+
+    def test_main_with_files(self):
+        """Test running the CLI between files"""
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'numbers.txt')
+            target = os.path.join(directory, 'out.csv')
+            with open(source, 'w') as file:
+                file.write('501234567\n691234567\n')
+
+            stderr = io.StringIO()
+            original_stderr, sys.stderr = sys.stderr, stderr
+            try:
+                code = stream_classifier.main([source, '-o', target, '-f', 'normalized,operator'])
+            finally:
+                sys.stderr = original_stderr
+
+            self.assertEqual(code, 0)
+            with open(target) as file:
+                self.assertEqual(file.read(), 'normalized,operator\n501234567,Orange\n691234567,Plus\n')
+            self.assertIn('Processed 2 rows', stderr.getvalue())
+
+    def test_main_rejects_bad_arguments(self):
+        """Test that a missing input, a missing explicit database and a chunk size below 1 fail"""
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'numbers.txt')
+            target = os.path.join(directory, 'out.csv')
+            with open(source, 'w') as file:
+                file.write('501234567\n')
+            with contextlib.redirect_stderr(io.StringIO()):
+                missing = os.path.join(directory, 'missing.csv')
+                self.assertEqual(stream_classifier.main([source, '-o', target, '--database', missing]), 2)
+                self.assertEqual(stream_classifier.main([missing, '-o', target]), 2)
+                with self.assertRaises(SystemExit):
+                    stream_classifier.main([source, '-o', target, '--chunk-size', '0'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
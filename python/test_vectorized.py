@@ -0,0 +1,103 @@
+"""
+Unit Tests for the NumPy-vectorized batch classifier
+"""
+
+import unittest
+import os
+import random
+from polish_mobile_validator import PolishMobileValidator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+CSV_PATH = os.path.join(os.path.dirname(__file__), '..', 'Mobileprefix_corrected.csv')
+
+
+@unittest.skipIf(np is None, 'NumPy not installed')
+class TestBatchClassify(unittest.TestCase):
+    """Test cases for PolishMobileValidator.batch_classify"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.validator = PolishMobileValidator(builtin_prefixes=False)
+        if os.path.exists(CSV_PATH):
+            self.validator_with_csv = PolishMobileValidator(CSV_PATH)
+        else:
+            self.validator_with_csv = self.validator
+
+    def assertMatchesScalar(self, validator, numbers, batch):
+        """Check every row of a batch against recognize_operator"""
+        for i, number in enumerate(numbers):
+            expected = validator.recognize_operator(str(number))
+            self.assertEqual(bool(batch.valid[i]), expected['success'], number)
+            if expected['success']:
+                self.assertEqual(str(batch.normalized[i]), expected['normalized'])
+                self.assertEqual(batch.operator_names[batch.operator[i]], expected['operator'])
+                self.assertEqual(
+                    batch.detailed_operator_names[batch.detailed_operator[i]],
+                    expected['detailed_operator']
+                )
+                self.assertEqual(bool(batch.is_m2m[i]), expected['is_m2m'])
+
+    def test_int_array_matches_recognize_operator(self):
+        """Test random 9-digit and 11-digit integers against the scalar path"""
+        rng = random.Random(42)
+        numbers = [rng.randrange(10 ** 8, 10 ** 9) for _ in range(5000)]
+        numbers += [48 * 10 ** 9 + rng.randrange(10 ** 8, 10 ** 9) for _ in range(1000)]
+        batch = self.validator_with_csv.batch_classify(np.array(numbers, dtype=np.int64))
+        self.assertMatchesScalar(self.validator_with_csv, numbers, batch)
+
+    def test_fixed_width_bytes_array(self):
+        """Test formatted numbers stored as a fixed-width bytes array"""
+        numbers = [
+            b'+48 501 234 567', b'501-234-567', b'(531) 234 567', b'0048211234567',
+            b'991234567', b'50123456', b'48501234567', b'4850123456', b''
+        ]
+        batch = self.validator_with_csv.batch_classify(np.array(numbers, dtype='S15'))
+        self.assertMatchesScalar(self.validator_with_csv, [n.decode() for n in numbers], batch)
+
+    def test_raw_buffer_with_width(self):
+        """Test a raw buffer of newline-terminated fixed-width records"""
+        buffer = b'501234567\n211234567\n991234567\n'
+        batch = self.validator.batch_classify(buffer, width=10)
+        self.assertEqual(batch.valid.tolist(), [True, True, False])
+        self.assertEqual(list(batch.operator_labels()), ['Orange', 'Plus', 'Unknown'])
+        self.assertEqual(batch.is_m2m.tolist(), [False, True, False])
+
+    def test_non_ascii_records_are_invalid(self):
+        """Test that records with bytes of 0x80 or above are not parsed around"""
+        numbers = ['784290091\u0663', '501 234 567\u00e9', '\uff15\uff10\uff11234567', '501234567']
+        batch = self.validator.batch_classify(np.array([n.encode('utf-8') for n in numbers]))
+        self.assertEqual(batch.valid.tolist(), [False, False, False, True])
+        batch = self.validator.batch_classify('501234567 \n784290091\u0663'.encode('utf-8'), width=11)
+        self.assertEqual(batch.valid.tolist(), [True, False])
+
+    def test_raw_buffer_requires_width(self):
+        """Test that raw buffers need a record width"""
+        with self.assertRaises(ValueError):
+            self.validator.batch_classify(b'501234567\n')
+        with self.assertRaises(ValueError):
+            self.validator.batch_classify(b'501234567\n5', width=10)
+
+    def test_without_database(self):
+        """Test that detailed operator codes are empty without a database"""
+        batch = self.validator.batch_classify(np.array([501234567]))
+        self.assertTrue(batch.valid[0])
+        self.assertEqual(batch.detailed_operator_labels().tolist(), [None])
+
+    def test_empty_batch(self):
+        """Test classification of an empty batch"""
+        batch = self.validator.batch_classify(np.array([], dtype=np.int64))
+        self.assertEqual(len(batch.valid), 0)
+
+    def test_unsupported_dtype(self):
+        """Test that float input is rejected"""
+        with self.assertRaises(TypeError):
+            self.validator.batch_classify(np.array([501234567.0]))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
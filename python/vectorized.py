@@ -0,0 +1,299 @@
+"""
+NumPy-vectorized batch classification for Polish mobile numbers
+Classifies whole arrays of numbers through compiled lookup tables instead of Python loops
+
+NumPy is an optional dependency; the rest of the package works without it.
+"""
+
+from typing import NamedTuple, Optional, Tuple
+
+# Imported on first use so that importing the validator does not pay for NumPy
+np = None
+
+from prefix_index import PrefixIndex
+
+
+COUNTRY_CODE = 48
+NATIONAL_MIN = 10 ** 8
+NATIONAL_LIMIT = 10 ** 9
+M2M_PREFIXES = ('21', '69')
+
+
+class BatchClassification(NamedTuple):
+    """
+    Parallel result arrays for a classified batch.
+
+    Operator codes index into ``operator_names`` and ``detailed_operator_names``.
+    Code 0 means 'Unknown' for the main operator and None for the detailed one.
+    ``unallocated`` is only set by strict classification and marks numbers
+    rejected because their 7-digit block is not allocated. ``ported`` is only
+    set while a portability overlay is loaded and marks numbers whose
+    detailed operator comes from it.
+    """
+
+    valid: 'np.ndarray'
+    normalized: 'np.ndarray'
+    operator: 'np.ndarray'
+    detailed_operator: 'np.ndarray'
+    is_m2m: 'np.ndarray'
+    operator_names: Tuple[str, ...]
+    detailed_operator_names: Tuple[Optional[str], ...]
+    unallocated: Optional['np.ndarray'] = None
+    ported: Optional['np.ndarray'] = None
+
+    def unallocated_count(self) -> int:
+        """Number of entries rejected for lying in an unallocated block."""
+        return int(np.count_nonzero(self.unallocated)) if self.unallocated is not None else 0
+
+    def unallocated_fraction(self) -> float:
+        """Fraction of the batch rejected for lying in an unallocated block."""
+        return self.unallocated_count() / len(self.valid) if len(self.valid) else 0.0
+
+    def operator_labels(self) -> 'np.ndarray':
+        """Resolve main operator codes to an object array of names."""
+        return np.asarray(self.operator_names, dtype=object)[self.operator]
+
+    def detailed_operator_labels(self) -> 'np.ndarray':
+        """Resolve detailed operator codes to an object array of names (None when unmatched)."""
+        return np.asarray(self.detailed_operator_names, dtype=object)[self.detailed_operator]
+
+    def operator_ids(self, registry) -> 'np.ndarray':
+        """
+        Re-key detailed operator codes to operator registry IDs.
+
+        Args:
+            registry: OperatorRegistry, e.g. from validator.operator_registry()
+
+        Returns:
+            uint16 array of registry IDs (0 when unmatched)
+        """
+        ids = np.frombuffer(registry.translate(self.detailed_operator_names), dtype=np.uint16)
+        return ids[self.detailed_operator]
+
+
+class PrefixTables(NamedTuple):
+    """Lookup tables indexed by the 2-digit prefix (0-99)."""
+
+    valid: 'np.ndarray'
+    operator: 'np.ndarray'
+    is_m2m: 'np.ndarray'
+    operator_names: Tuple[str, ...]
+
+
+def require_numpy() -> None:
+    """Import NumPy, raising an ImportError that explains how to enable the vectorized engine."""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError(
+                'NumPy is required for vectorized batch classification; '
+                'install it with "pip install numpy"'
+            ) from None
+        np = numpy
+
+
+def compile_prefix_tables(validator) -> PrefixTables:
+    """
+    Compile the validator's 2-digit prefix configuration into lookup tables.
+
+    Args:
+        validator: PolishMobileValidator whose valid_prefixes and operator_prefixes are used
+
+    Returns:
+        PrefixTables indexed by the 2-digit prefix
+    """
+    require_numpy()
+    operator_names = ('Unknown',) + tuple(validator.operator_prefixes)
+    valid = np.zeros(100, dtype=bool)
+    operator = np.zeros(100, dtype=np.uint8)
+    is_m2m = np.zeros(100, dtype=bool)
+
+    for prefix in validator.valid_prefixes:
+        valid[int(prefix)] = True
+    # First listed operator wins, as in recognize_operator
+    for code in range(len(operator_names) - 1, 0, -1):
+        for prefix in validator.operator_prefixes[operator_names[code]]:
+            operator[int(prefix)] = code
+    for prefix in M2M_PREFIXES:
+        is_m2m[int(prefix)] = True
+
+    return PrefixTables(valid, operator, is_m2m, operator_names)
+
+
+def normalize_int_array(numbers) -> 'np.ndarray':
+    """
+    Strip the 48 country code from an array of integer phone numbers.
+
+    Args:
+        numbers: Integer array of 9-digit or 11-digit (48-prefixed) numbers
+
+    Returns:
+        int64 array of national numbers (values outside 9 digits are left as is)
+    """
+    require_numpy()
+    numbers = np.asarray(numbers, dtype=np.int64)
+    international = (numbers >= COUNTRY_CODE * NATIONAL_LIMIT) & \
+        (numbers < (COUNTRY_CODE + 1) * NATIONAL_LIMIT)
+    return np.where(international, numbers - COUNTRY_CODE * NATIONAL_LIMIT, numbers)
+
+
+def normalize_fixed_width(records) -> 'np.ndarray':
+    """
+    Parse fixed-width byte records into national numbers.
+
+    Non-digit ASCII bytes (spaces, dashes, parentheses, '+', padding) are
+    skipped, exactly like normalize_phone_number. Records that do not reduce
+    to nine digits, or eleven digits starting with 48, come back as -1, and
+    so does any record holding a byte of 0x80 or above: UTF-8 text may carry
+    Unicode digits, which normalize_phone_number counts, so it is not parsed
+    around.
+
+    Args:
+        records: uint8 array of shape (rows, width)
+
+    Returns:
+        int64 array of national numbers, -1 where the record is not 9 digits
+    """
+    require_numpy()
+    rows = records.shape[0]
+    values = np.zeros(rows, dtype=np.int64)
+    counts = np.zeros(rows, dtype=np.int64)
+
+    for column in range(records.shape[1]):
+        digits = records[:, column].astype(np.int64) - ord('0')
+        is_digit = (digits >= 0) & (digits <= 9)
+        # Values of records with more than 11 digits are never used, so wraparound is harmless
+        values = np.where(is_digit, values * 10 + digits, values)
+        counts += is_digit
+
+    international = (counts == 11) & (values // NATIONAL_LIMIT == COUNTRY_CODE)
+    values = np.where(international, values - COUNTRY_CODE * NATIONAL_LIMIT, values)
+    national = ((counts == 9) | international) & ~(records >= 0x80).any(axis=1)
+    return np.where(national, values, -1)
+
+
+def as_national_numbers(numbers, width: Optional[int] = None) -> 'np.ndarray':
+    """
+    Convert supported batch inputs into an int64 array of national numbers.
+
+    Args:
+        numbers: Integer array, fixed-width bytes array (dtype 'S'), or a bytes-like buffer
+        width: Record width in bytes, required for raw bytes-like buffers
+
+    Returns:
+        int64 array of national numbers
+    """
+    require_numpy()
+    if isinstance(numbers, (bytes, bytearray, memoryview)):
+        if not width:
+            raise ValueError('width is required when classifying a raw bytes buffer')
+        buffer = np.frombuffer(numbers, dtype=np.uint8)
+        if buffer.size % width:
+            raise ValueError(f'Buffer length {buffer.size} is not a multiple of width {width}')
+        return normalize_fixed_width(buffer.reshape(-1, width))
+
+    array = np.asarray(numbers)
+    if array.dtype.kind == 'S':
+        width = array.dtype.itemsize
+        records = np.ascontiguousarray(array).reshape(-1).view(np.uint8).reshape(-1, width)
+        return normalize_fixed_width(records)
+    if array.dtype.kind in 'iu' or array.size == 0:
+        return normalize_int_array(array.reshape(-1))
+    raise TypeError(f'Unsupported input dtype for vectorized classification: {array.dtype}')
+
+
+def classify(validator, numbers, width: Optional[int] = None, allocation=None) -> BatchClassification:
+    """
+    Classify a batch of numbers with vectorized table lookups.
+
+    Args:
+        validator: PolishMobileValidator providing prefixes and the loaded database
+        numbers: Integer array, fixed-width bytes array (dtype 'S'), or a bytes-like buffer
+        width: Record width in bytes, required for raw bytes-like buffers
+        allocation: AllocationBitmap; when given, numbers in unallocated blocks are invalid
+
+    Returns:
+        BatchClassification with parallel result arrays
+    """
+    tables = compile_prefix_tables(validator)
+    national = as_national_numbers(numbers, width)
+
+    in_range = (national >= NATIONAL_MIN) & (national < NATIONAL_LIMIT)
+    prefix = np.where(in_range, national // 10 ** 7, 0)
+    valid = in_range & tables.valid[prefix]
+
+    unallocated = None
+    if allocation is not None:
+        bits = np.frombuffer(allocation.bits, dtype=np.uint8)
+        blocks = np.where(valid, national // allocation.BLOCK_SIZE, 0)
+        allocated = (bits[blocks >> 3] >> (blocks & 7).astype(np.uint8)) & 1
+        unallocated = valid & (allocated == 0)
+        valid = valid & ~unallocated
+
+    operator = np.where(valid, tables.operator[prefix], 0).astype(np.uint8)
+    is_m2m = valid & tables.is_m2m[prefix]
+    detailed_operator, detailed_names = _lookup_detailed(validator, national, valid)
+    ported = None
+    overlay = validator.get_portability_overlay()
+    if overlay is not None:
+        detailed_operator, detailed_names, ported = _apply_portability(
+            overlay, national, valid, detailed_operator, detailed_names)
+
+    return BatchClassification(
+        valid=valid,
+        normalized=np.where(valid, national, -1),
+        operator=operator,
+        detailed_operator=detailed_operator,
+        is_m2m=is_m2m,
+        operator_names=tables.operator_names,
+        detailed_operator_names=detailed_names,
+        unallocated=unallocated,
+        ported=ported,
+    )
+
+
+def _lookup_detailed(validator, national, valid) -> Tuple['np.ndarray', Tuple[Optional[str], ...]]:
+    """Resolve detailed operator codes through a zero-copy view of the prefix index."""
+    index = validator.get_prefix_index()
+    if index is None:
+        return np.zeros(national.shape, dtype=np.uint16), (None,)
+
+    slots = np.frombuffer(index.slots, dtype=np.uint16)
+    blocks = np.where(valid, national // 10 ** (9 - PrefixIndex.DEPTH), 0)
+    codes = np.where(valid, slots[blocks], PrefixIndex.NO_MATCH).astype(np.uint16)
+
+    # Slots shared with prefixes longer than DEPTH digits are rare; resolve them one by one
+    for position in np.flatnonzero(codes == PrefixIndex.OVERFLOW):
+        codes[position] = index.lookup_id(int(national[position]))
+
+    return codes, index.operators
+
+
+def _apply_portability(overlay, national, valid, codes, names):
+    """
+    Replace the detailed operator codes of ported numbers.
+
+    Returns:
+        (codes, names, ported mask); names is extended with overlay operators the prefix index does not know
+    """
+    if not len(overlay):
+        return codes, names, np.zeros(national.shape, dtype=bool)
+    numbers = np.frombuffer(overlay.numbers, dtype=np.uint32)
+    candidates = np.where(valid, national, 0).astype(np.uint32)
+    positions = np.minimum(np.searchsorted(numbers, candidates), len(numbers) - 1)
+    ported = valid & (numbers[positions] == candidates)
+
+    names = list(names)
+    known = {name: code for code, name in enumerate(names) if code}
+    remap = np.zeros(len(overlay.operators), dtype=np.uint16)
+    for op_id, name in enumerate(overlay.operators[1:], 1):
+        if name not in known:
+            known[name] = len(names)
+            names.append(name)
+        remap[op_id] = known[name]
+
+    operator_ids = np.frombuffer(overlay.operator_ids, dtype=np.uint8)
+    codes = np.where(ported, remap[operator_ids[positions]], codes).astype(np.uint16)
+    return codes, tuple(names), ported